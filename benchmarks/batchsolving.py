@@ -0,0 +1,99 @@
+"""Time solving a batch of scenarios one after the other in this process and
+on worker processes.
+
+Run from the repository root with:
+    python -m benchmarks.batchsolving [--scenarios N] [--workers N]
+The docs are synthetic, and each scenario asks for the same targets with a
+different availability of the raw resources.  With enough scenarios, the
+time on worker processes should be close to the time in this process divided
+by the number of CPUs.
+"""
+import argparse
+import logging
+import os
+import pathlib
+import tempfile
+import time
+
+from headless.batch import iter_scenario_results
+from satisfactoryobjects import docsstream, nativeclasses
+
+from .docscaching import register_handlers
+from .syntheticdocs import write_synthetic_docs
+
+
+def solve(problem_paths: list[pathlib.Path], workers: int) -> float:
+    start = time.perf_counter()
+    for result in iter_scenario_results(problem_paths, workers):
+        assert result.error is None, result.error
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=None)
+    arguments = parser.parse_args()
+
+    # see benchmarks.docscaching
+    logging.disable(logging.CRITICAL)
+    register_handlers()
+    workers = (
+        max(os.cpu_count() or 1, 2)
+        if arguments.workers is None
+        else arguments.workers
+    )
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        docs_path = pathlib.Path(temporary_directory, 'Docs.json')
+        write_synthetic_docs(
+            docs_path,
+            n_items=40,
+            n_machines=5,
+            n_recipes=60,
+            n_unhandled_classes=0
+        )
+        with open(docs_path, 'r', encoding='UTF-16') as fptr:
+            for obj in docsstream.iter_native_class_blocks(
+                fptr,
+                nativeclasses.SatisfactoryNativeClassHandler.handlers
+            ):
+                nativeclasses.SatisfactoryNativeClassHandler.enqueue_handle(
+                    obj
+                )
+        nativeclasses.SatisfactoryNativeClassHandler.handle(0)
+
+        problem_paths = list()
+        for scenario_index in range(arguments.scenarios):
+            problem_path = pathlib.Path(
+                temporary_directory,
+                f'scenario{scenario_index}.toml'
+            )
+            problem_path.write_text(
+                'power_usage_weight = -1\n'
+                '[targets]\n'
+                'Desc_Part1_C = 1\n'
+                'Desc_Part2_C = 2\n'
+                '[availability]\n'
+                + ''.join(
+                    f'Desc_Part{item_index}_C = '
+                    f'{10 * (scenario_index + item_index + 1)}\n'
+                    for item_index
+                    in range(0, 40, 4)
+                ),
+                encoding='utf-8'
+            )
+            problem_paths.append(problem_path)
+
+        serial = solve(problem_paths, 0)
+        parallel = solve(problem_paths, workers)
+
+    print(f'{arguments.scenarios} scenarios')
+    print(f'    in this process:     {serial * 1000:8.1f} ms')
+    print(
+        f'    in {workers} workers:        {parallel * 1000:8.1f} ms '
+        f'({os.cpu_count()} CPUs)'
+    )
+
+
+if __name__ == '__main__':
+    main()
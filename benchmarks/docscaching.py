@@ -0,0 +1,120 @@
+"""Compare loading the docs (streaming them and running the handlers) with
+loading the registries from the docs cache.
+
+Run from the repository root with:
+    python -m benchmarks.docscaching [path to docs]
+A synthetic docs file is used if no path is given.  main.register_handlers()
+needs Qt to be importable, so the handlers used by the synthetic docs are
+registered here instead.
+"""
+import argparse
+import logging
+import pathlib
+import tempfile
+import time
+
+from satisfactoryobjects import (
+    docscache,
+    docsstream,
+    itemhandler,
+    machinehandler,
+    nativeclasses,
+    recipehandler
+)
+
+from .syntheticdocs import (
+    ITEM_NATIVE_CLASS,
+    MACHINE_NATIVE_CLASS,
+    RECIPE_NATIVE_CLASS,
+    write_synthetic_docs
+)
+
+
+def register_handlers() -> None:
+    nativeclasses.SatisfactoryNativeClassHandler(
+        RECIPE_NATIVE_CLASS,
+        recipehandler.handler,
+        defer_pass=10,
+        registry_name='recipes'
+    )
+    nativeclasses.SatisfactoryNativeClassHandler(
+        MACHINE_NATIVE_CLASS,
+        machinehandler.fixed_power_machine_handler,
+        registry_name='machines'
+    )
+    nativeclasses.SatisfactoryNativeClassHandler(
+        ITEM_NATIVE_CLASS,
+        itemhandler.handler,
+        registry_name='items'
+    )
+
+
+def clear_registries() -> None:
+    itemhandler.items.clear()
+    machinehandler.machines.clear()
+    recipehandler.recipes.clear()
+
+
+def load_uncached(path: pathlib.Path) -> None:
+    with open(path, 'r', encoding='UTF-16') as fptr:
+        for obj in docsstream.iter_native_class_blocks(
+            fptr,
+            nativeclasses.SatisfactoryNativeClassHandler.handlers
+        ):
+            nativeclasses.SatisfactoryNativeClassHandler.enqueue_handle(obj)
+    nativeclasses.SatisfactoryNativeClassHandler.handle()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', nargs='?', type=pathlib.Path)
+    parser.add_argument('--unhandled-classes', type=int, default=20000)
+    arguments = parser.parse_args()
+
+    # the synthetic recipes are also made in a workbench, which has no
+    # handler, so every recipe would log an error
+    logging.disable(logging.CRITICAL)
+    register_handlers()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path = arguments.path
+        if path is None:
+            path = pathlib.Path(temporary_directory, 'Docs.json')
+            write_synthetic_docs(
+                path,
+                n_unhandled_classes=arguments.unhandled_classes
+            )
+        cache_path = pathlib.Path(temporary_directory, 'docs.cache')
+        print(f'Docs file is {path.stat().st_size / 1e6:.1f} MB')
+
+        start = time.perf_counter()
+        keys = [docscache.make_docs_key(path)]
+        load_uncached(path)
+        docscache.save(cache_path, keys)
+        cold = time.perf_counter() - start
+        loaded = (
+            dict(itemhandler.items),
+            dict(machinehandler.machines),
+            dict(recipehandler.recipes)
+        )
+        print(
+            f'Cache file is {cache_path.stat().st_size / 1e3:.1f} kB for '
+            f'{len(loaded[0])} items, {len(loaded[1])} machines and '
+            f'{len(loaded[2])} recipes'
+        )
+
+        clear_registries()
+        start = time.perf_counter()
+        assert docscache.load([path], cache_path)
+        warm = time.perf_counter() - start
+        assert loaded == (
+            itemhandler.items,
+            machinehandler.machines,
+            recipehandler.recipes
+        )
+
+        print(f'cold (load docs, hash and save cache): {cold * 1000:8.1f} ms')
+        print(f'warm (load cache):                     {warm * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Compare deserialising the whole docs file at once with streaming only the
+blocks that have a registered handler.
+
+Run from the repository root with:
+    python -m benchmarks.docsloading [path to docs]
+A synthetic docs file is used if no path is given.
+"""
+import argparse
+import json
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+from satisfactoryobjects import docsstream
+
+from .syntheticdocs import (
+    ITEM_NATIVE_CLASS,
+    MACHINE_NATIVE_CLASS,
+    RECIPE_NATIVE_CLASS,
+    write_synthetic_docs
+)
+
+# the native classes with handlers registered by main.register_handlers()
+HANDLED_NATIVE_CLASSES = {
+    ITEM_NATIVE_CLASS,
+    MACHINE_NATIVE_CLASS,
+    RECIPE_NATIVE_CLASS,
+    "/Script/CoreUObject.Class'/Script/FactoryGame."
+    "FGBuildableManufacturerVariablePower'",
+    "/Script/CoreUObject.Class'/Script/FactoryGame.FGResourceDescriptor'",
+    "/Script/CoreUObject.Class'/Script/FactoryGame."
+    "FGItemDescriptorNuclearFuel'",
+    "/Script/CoreUObject.Class'/Script/FactoryGame.FGItemDescriptorBiomass'"
+}
+
+
+def load_whole(path: pathlib.Path) -> list[dict]:
+    with open(path, 'r', encoding='UTF-16') as fptr:
+        return [
+            obj
+            for obj
+            in json.load(fptr)
+            if obj['NativeClass'] in HANDLED_NATIVE_CLASSES
+        ]
+
+
+def load_streamed(path: pathlib.Path) -> list[dict]:
+    with open(path, 'r', encoding='UTF-16') as fptr:
+        return list(
+            docsstream.iter_native_class_blocks(fptr, HANDLED_NATIVE_CLASSES)
+        )
+
+
+def measure(function, path: pathlib.Path) -> tuple[float, int]:
+    # timed separately from the memory measurement, since tracemalloc slows
+    # down allocations a lot
+    start = time.perf_counter()
+    function(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (elapsed, peak)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', nargs='?', type=pathlib.Path)
+    parser.add_argument('--unhandled-classes', type=int, default=20000)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path = arguments.path
+        if path is None:
+            path = pathlib.Path(temporary_directory, 'Docs.json')
+            write_synthetic_docs(
+                path,
+                n_unhandled_classes=arguments.unhandled_classes
+            )
+        print(f'Docs file is {path.stat().st_size / 1e6:.1f} MB')
+        assert load_whole(path) == load_streamed(path)
+        for name, function in (
+            ('json.load', load_whole),
+            ('streamed', load_streamed)
+        ):
+            elapsed, peak = measure(function, path)
+            print(
+                f'{name:>10}: {elapsed * 1000:8.1f} ms, '
+                f'peak {peak / 1e6:7.1f} MB'
+            )
+
+
+if __name__ == '__main__':
+    main()
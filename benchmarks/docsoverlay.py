@@ -0,0 +1,90 @@
+"""Time reading and merging several docs files (as when loading the docs of
+mods over those of the base game), in this process and on worker processes,
+and loading the merged result from the cache.
+
+Run from the repository root with:
+    python -m benchmarks.docsoverlay [--overlays N] [--workers N]
+The base docs are synthetic, and each overlay is a smaller synthetic docs
+file whose classes partly replace those of the base docs.
+"""
+import argparse
+import logging
+import os
+import pathlib
+import tempfile
+import time
+
+from satisfactoryobjects import docscache, docsoverlay, nativeclasses
+
+from .docscaching import register_handlers, clear_registries
+from .syntheticdocs import write_synthetic_docs
+
+
+def load(docs_paths: list[pathlib.Path], workers: int) -> float:
+    clear_registries()
+    start = time.perf_counter()
+    for obj in docsoverlay.iter_merged_docs_blocks(
+        docs_paths,
+        nativeclasses.SatisfactoryNativeClassHandler.handlers,
+        workers
+    ):
+        nativeclasses.SatisfactoryNativeClassHandler.enqueue_handle(obj)
+    nativeclasses.SatisfactoryNativeClassHandler.handle(0)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--overlays', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    arguments = parser.parse_args()
+
+    # see benchmarks.docscaching
+    logging.disable(logging.CRITICAL)
+    register_handlers()
+    workers = (
+        max(os.cpu_count() or 1, 2)
+        if arguments.workers is None
+        else arguments.workers
+    )
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        docs_paths = [pathlib.Path(temporary_directory, 'Docs.json')]
+        write_synthetic_docs(docs_paths[0])
+        for overlay_index in range(arguments.overlays):
+            docs_paths.append(
+                pathlib.Path(temporary_directory, f'Mod{overlay_index}.json')
+            )
+            # same class names as the base docs, so every class conflicts
+            write_synthetic_docs(
+                docs_paths[-1],
+                n_recipes=100,
+                n_unhandled_classes=1000,
+                seed=overlay_index + 1
+            )
+        print(
+            f'{len(docs_paths)} docs files, '
+            f'{sum(path.stat().st_size for path in docs_paths) / 1e6:.1f} MB'
+        )
+
+        serial = load(docs_paths, 0)
+        parallel = load(docs_paths, workers)
+        cache_path = pathlib.Path(temporary_directory, 'docs.cache')
+        docscache.save(
+            cache_path,
+            [docscache.make_docs_key(path) for path in docs_paths]
+        )
+        clear_registries()
+        start = time.perf_counter()
+        assert docscache.load(docs_paths, cache_path)
+        cached = time.perf_counter() - start
+
+    print(f'    in this process:     {serial * 1000:8.1f} ms')
+    print(
+        f'    in {workers} workers:        {parallel * 1000:8.1f} ms '
+        f'({os.cpu_count()} CPUs)'
+    )
+    print(f'    from the cache:      {cached * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Compare queueing docs objects for their handlers in a BinaryTreeNode (as
+SatisfactoryNativeClassHandler used to) with a BucketedPriorityQueue.
+
+Run from the repository root with:
+    python -m benchmarks.handlerqueue [--objects N [N ...]]
+
+The objects are NativeClass blocks of the kinds in the synthetic docs, with
+the same defer passes that main.register_handlers() gives them.  With only
+two distinct priorities the tree degenerates into a chain, and traversing it
+recurses once per object, so the recursion limit and the thread stack size
+are raised for it (otherwise it fails with a RecursionError at around a
+thousand objects).  Every object yielded from the tree passes back up
+through the whole chain, so the tree takes quadratic time and is skipped for
+more than --max-tree-objects objects (100000 objects take over ten minutes).
+"""
+import argparse
+import sys
+import threading
+import time
+
+from utils.queueutils import BucketedPriorityQueue, PrioritisedItem
+from utils.trees import BinaryTreeNode
+
+from .syntheticdocs import (
+    ITEM_NATIVE_CLASS,
+    MACHINE_NATIVE_CLASS,
+    RECIPE_NATIVE_CLASS
+)
+
+DEFER_PASSES = {
+    ITEM_NATIVE_CLASS: 0,
+    MACHINE_NATIVE_CLASS: 0,
+    RECIPE_NATIVE_CLASS: 10
+}
+
+
+def make_objects(n_objects: int) -> list[dict]:
+    native_classes = list(DEFER_PASSES)
+    return [
+        {
+            "NativeClass": native_classes[index % len(native_classes)],
+            "Classes": []
+        }
+        for index
+        in range(n_objects)
+    ]
+
+
+def run_tree(objects: list[dict]) -> list[dict]:
+    queue = None
+    for obj in objects:
+        item = PrioritisedItem(DEFER_PASSES[obj["NativeClass"]], obj)
+        if queue is None:
+            queue = BinaryTreeNode(item)
+        else:
+            queue.add_child(item)
+    return [item.item for item in queue.in_order_traverse()]
+
+
+def run_buckets(objects: list[dict]) -> list[dict]:
+    queue = BucketedPriorityQueue()
+    for obj in objects:
+        queue.push(DEFER_PASSES[obj["NativeClass"]], obj)
+    return list(queue.drain())
+
+
+def measure(function, objects: list[dict]) -> tuple[float, list[dict]]:
+    start = time.perf_counter()
+    result = function(objects)
+    return (time.perf_counter() - start, result)
+
+
+def measure_deeply_recursive(
+    function,
+    objects: list[dict]
+) -> tuple[float, list[dict]]:
+    outcome = list()
+    old_recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_recursion_limit, len(objects) * 4))
+    old_stack_size = threading.stack_size(1 << 30)
+    try:
+        thread = threading.Thread(
+            target=lambda: outcome.append(measure(function, objects))
+        )
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(old_stack_size)
+        sys.setrecursionlimit(old_recursion_limit)
+    return outcome[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--objects',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 100000]
+    )
+    parser.add_argument('--max-tree-objects', type=int, default=20000)
+    arguments = parser.parse_args()
+
+    for n_objects in arguments.objects:
+        objects = make_objects(n_objects)
+        buckets_elapsed, buckets_order = measure(run_buckets, objects)
+        print(f'{n_objects} objects')
+        print(f'{"buckets":>8}: {buckets_elapsed * 1000:10.1f} ms')
+        if n_objects > arguments.max_tree_objects:
+            print(f'{"tree":>8}: skipped')
+            continue
+        tree_elapsed, tree_order = measure_deeply_recursive(run_tree, objects)
+        # both dispatch every pass in order (the tree does not keep objects
+        # with the same pass in the order they were queued, so only compare
+        # passes)
+        assert [DEFER_PASSES[obj["NativeClass"]] for obj in tree_order] == [
+            DEFER_PASSES[obj["NativeClass"]] for obj in buckets_order
+        ]
+        print(f'{"tree":>8}: {tree_elapsed * 1000:10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
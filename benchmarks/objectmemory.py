@@ -0,0 +1,95 @@
+"""Measure the memory taken by the loaded items, machines and recipes, and
+how long it takes to read their attributes.
+
+Run from the repository root with:
+    python -m benchmarks.objectmemory [--items N] [--recipes N]
+The defaults are about the size of the 1.0 docs (which has a little over a
+thousand recipes, counting those for buildings that are skipped when
+loading).  The memory is what tracemalloc sees allocated by the handlers and
+still held once they are done, so it does not include the docs themselves.
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+
+from satisfactoryobjects import (
+    itemhandler,
+    machinehandler,
+    nativeclasses,
+    recipehandler
+)
+from utils.directionenums import Direction
+
+from .docscaching import register_handlers, clear_registries
+from .syntheticdocs import make_synthetic_docs
+
+
+def load(docs: list[dict]) -> int:
+    clear_registries()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for obj in docs:
+        nativeclasses.SatisfactoryNativeClassHandler.enqueue_handle(obj)
+    nativeclasses.SatisfactoryNativeClassHandler.handle(0)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def read_attributes() -> None:
+    # what building the problem does for every recipe
+    for recipe in recipehandler.recipes.values():
+        for flow_data in recipe.calc_resource_flow_rate(
+            calculated_direction=Direction.BIDIRECTIONAL
+        ):
+            flow_data.item.internal_class_identifier
+            flow_data.amount
+        recipe.calc_power_flow_rate()
+        recipe.internal_class_identifier
+        recipe.is_alternate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=250)
+    parser.add_argument('--recipes', type=int, default=1200)
+    parser.add_argument('--repeats', type=int, default=20)
+    arguments = parser.parse_args()
+
+    # see benchmarks.docscaching
+    logging.disable(logging.CRITICAL)
+    register_handlers()
+    docs = make_synthetic_docs(
+        n_items=arguments.items,
+        n_recipes=arguments.recipes,
+        n_unhandled_classes=0
+    )
+    used = load(docs)
+    n_objects = (
+        len(itemhandler.items)
+        + len(machinehandler.machines)
+        + len(recipehandler.recipes)
+    )
+    print(
+        f'{len(itemhandler.items)} items, {len(machinehandler.machines)} '
+        f'machines, {len(recipehandler.recipes)} recipes'
+    )
+    print(
+        f'    memory:     {used / 1e3:8.1f} kB '
+        f'({used / n_objects:.0f} B per object)'
+    )
+
+    timings = list()
+    for _ in range(arguments.repeats):
+        start = time.perf_counter()
+        read_attributes()
+        timings.append(time.perf_counter() - start)
+    print(f'    attributes: {min(timings) * 1000:8.2f} ms (best)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Compare running the native class handlers in this process with running
+them on worker processes, for docs large enough to be split up.
+
+Run from the repository root with:
+    python -m benchmarks.parallelhandlers [--items N] [--recipes N]
+        [--workers N]
+Only the handling is timed, not reading the docs.  At least two workers are
+always used, since handle() would not use worker processes with only one.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from satisfactoryobjects import (
+    itemhandler,
+    machinehandler,
+    nativeclasses,
+    recipehandler
+)
+
+from .docscaching import register_handlers, clear_registries
+from .syntheticdocs import make_synthetic_docs
+
+
+def handle(docs: list[dict], workers: int) -> tuple[float, tuple]:
+    clear_registries()
+    # copied so that the handlers cannot change the docs for the next run
+    docs = json.loads(json.dumps(docs))
+    start = time.perf_counter()
+    for obj in docs:
+        nativeclasses.SatisfactoryNativeClassHandler.enqueue_handle(obj)
+    nativeclasses.SatisfactoryNativeClassHandler.handle(workers)
+    elapsed = time.perf_counter() - start
+    return (
+        elapsed,
+        (
+            dict(itemhandler.items),
+            dict(machinehandler.machines),
+            dict(recipehandler.recipes)
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--recipes', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=None)
+    arguments = parser.parse_args()
+
+    # see benchmarks.docscaching
+    logging.disable(logging.CRITICAL)
+    register_handlers()
+    docs = make_synthetic_docs(
+        n_items=arguments.items,
+        n_recipes=arguments.recipes,
+        n_unhandled_classes=0
+    )
+    serial_elapsed, serial_registries = handle(docs, 0)
+    workers = (
+        max(os.cpu_count() or 1, 2)
+        if arguments.workers is None
+        else arguments.workers
+    )
+    parallel_elapsed, parallel_registries = handle(docs, workers)
+    assert serial_registries == parallel_registries
+    print(f'{arguments.items} items and {arguments.recipes} recipes')
+    print(f'    in this process: {serial_elapsed * 1000:8.1f} ms')
+    print(
+        f'    in {workers} workers:   {parallel_elapsed * 1000:8.1f} ms '
+        f'({os.cpu_count()} CPUs)'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Time the recipe handler (which parses the ingredients, products and
+machines of every recipe) on docs that have already been read.
+
+Run from the repository root with:
+    python -m benchmarks.recipeloading [path to docs] [--recipes N]
+A synthetic docs file is used if no path is given.
+"""
+import argparse
+import json
+import logging
+import pathlib
+import time
+
+from satisfactoryobjects import (
+    itemhandler,
+    machinehandler,
+    nativeclasses,
+    recipehandler
+)
+
+from .docscaching import register_handlers
+from .syntheticdocs import make_synthetic_docs
+
+RECIPE_NATIVE_CLASS = (
+    "/Script/CoreUObject.Class'/Script/FactoryGame.FGRecipe'"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', nargs='?', type=pathlib.Path)
+    parser.add_argument('--recipes', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=5)
+    arguments = parser.parse_args()
+
+    # see benchmarks.docscaching
+    logging.disable(logging.CRITICAL)
+    if arguments.path is None:
+        docs = make_synthetic_docs(
+            n_items=1000,
+            n_recipes=arguments.recipes,
+            n_unhandled_classes=0
+        )
+    else:
+        with open(arguments.path, 'r', encoding='UTF-16') as fptr:
+            docs = json.load(fptr)
+
+    register_handlers()
+    recipe_blocks = list()
+    for obj in docs:
+        if obj['NativeClass'] == RECIPE_NATIVE_CLASS:
+            recipe_blocks.append(obj)
+        elif obj['NativeClass'] in (
+            nativeclasses.SatisfactoryNativeClassHandler.handlers
+        ):
+            nativeclasses.SatisfactoryNativeClassHandler.handlers[
+                obj['NativeClass']
+            ]._handle(obj)
+    n_recipes = sum(len(obj['Classes']) for obj in recipe_blocks)
+    print(
+        f'{n_recipes} recipes, {len(itemhandler.items)} items, '
+        f'{len(machinehandler.machines)} machines'
+    )
+
+    timings = list()
+    for _ in range(arguments.repeats):
+        recipehandler.recipes.clear()
+        start = time.perf_counter()
+        for obj in recipe_blocks:
+            recipehandler.handler(obj)
+        timings.append(time.perf_counter() - start)
+    print(
+        f'recipe handler: best {min(timings) * 1000:.1f} ms of '
+        f'{arguments.repeats}, {len(recipehandler.recipes)} recipes loaded'
+    )
+
+
+if __name__ == '__main__':
+    main()
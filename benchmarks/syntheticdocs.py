@@ -0,0 +1,145 @@
+"""Generator for synthetic docs files in the same format as the game's
+Docs.json, for benchmarking the docs loading code without the game files.
+
+The synthetic docs have the same NativeClass blocks that the registered
+handlers use (items, machines and recipes, which reference each other in the
+same way as in the real docs) plus many blocks that nothing handles, like
+the buildables and cosmetics that make up most of the real docs.
+"""
+import json
+import pathlib
+import random
+
+ITEM_NATIVE_CLASS = (
+    "/Script/CoreUObject.Class'/Script/FactoryGame.FGItemDescriptor'"
+)
+MACHINE_NATIVE_CLASS = (
+    "/Script/CoreUObject.Class'/Script/FactoryGame.FGBuildableManufacturer'"
+)
+RECIPE_NATIVE_CLASS = "/Script/CoreUObject.Class'/Script/FactoryGame.FGRecipe'"
+
+
+def _item_reference(item_index: int) -> str:
+    return (
+        "/Script/Engine.BlueprintGeneratedClass'/Game/FactoryGame/Resource/"
+        f"Parts/Part{item_index}/Desc_Part{item_index}.Desc_Part{item_index}_C'"
+    )
+
+
+def _machine_reference(machine_index: int) -> str:
+    return (
+        "/Game/FactoryGame/Buildable/Factory/"
+        f"Machine{machine_index}/Build_Machine{machine_index}."
+        f"Build_Machine{machine_index}_C"
+    )
+
+
+def make_synthetic_docs(
+    n_items: int = 200,
+    n_machines: int = 10,
+    n_recipes: int = 400,
+    n_unhandled_classes: int = 5000,
+    seed: int = 0
+) -> list[dict]:
+    """Make the deserialised form of a synthetic docs file, with the given
+    number of classes of each kind"""
+    rng = random.Random(seed)
+    items = [
+        {
+            "ClassName": f"Desc_Part{item_index}_C",
+            "mDisplayName": f"Part {item_index}",
+            "mDescription": f"Synthetic part number {item_index}.\r\n" * 3,
+            "mEnergyValue": "0.000000",
+            "mForm": "RF_LIQUID" if item_index % 10 == 0 else "RF_SOLID"
+        }
+        for item_index
+        in range(n_items)
+    ]
+    machines = [
+        {
+            "ClassName": f"Build_Machine{machine_index}_C",
+            "mDisplayName": f"Machine {machine_index}",
+            "mPowerConsumption": f"{rng.randint(1, 100)}.000000"
+        }
+        for machine_index
+        in range(n_machines)
+    ]
+    recipes = list()
+    for recipe_index in range(n_recipes):
+        resources = [
+            "(("
+            + "),(".join(
+                f'ItemClass="{_item_reference(item_index)}",'
+                f'Amount={rng.randint(1, 10)}'
+                for item_index
+                in rng.sample(range(n_items), rng.randint(1, 4))
+            )
+            + "))"
+            for _ in range(2)
+        ]
+        recipe_name = f"Recipe_{recipe_index}_C"
+        recipes.append({
+            "ClassName": recipe_name,
+            "FullName": (
+                "BlueprintGeneratedClass /Game/FactoryGame/Recipes/"
+                + ("AlternateRecipes/" if recipe_index % 3 == 0 else "")
+                + f"{recipe_name[:-2]}.{recipe_name}"
+            ),
+            "mDisplayName": f"Recipe {recipe_index}",
+            "mIngredients": resources[0],
+            "mProduct": resources[1],
+            "mManufactoringDuration": f"{rng.randint(1, 60)}.000000",
+            "mProducedIn": (
+                '("'
+                + _machine_reference(rng.randrange(n_machines))
+                + '","/Game/FactoryGame/Buildable/-Shared/WorkBench/'
+                'BP_WorkBenchComponent.BP_WorkBenchComponent_C")'
+            ),
+            "mVariablePowerConsumptionConstant": "0.000000",
+            "mVariablePowerConsumptionFactor": "1.000000"
+        })
+    docs = [
+        {"NativeClass": ITEM_NATIVE_CLASS, "Classes": items},
+        {"NativeClass": MACHINE_NATIVE_CLASS, "Classes": machines},
+        {"NativeClass": RECIPE_NATIVE_CLASS, "Classes": recipes}
+    ]
+    # the classes that nothing handles are spread over many blocks, with
+    # plenty of nested data like the real buildables
+    unhandled_per_block = 50
+    for block_index in range(0, n_unhandled_classes, unhandled_per_block):
+        docs.append({
+            "NativeClass": (
+                "/Script/CoreUObject.Class'/Script/FactoryGame."
+                f"FGBuildableUnhandled{block_index}'"
+            ),
+            "Classes": [
+                {
+                    "ClassName": f"Build_Unhandled{class_index}_C",
+                    "mDisplayName": f"Unhandled {class_index}",
+                    "mDescription": "Something nothing uses. " * 10,
+                    "mHologramClass": (
+                        "/Script/CoreUObject.Class'/Script/FactoryGame."
+                        "FGBuildableHologram'"
+                    ),
+                    "mSnapPoints": [
+                        {"X": str(x), "Y": "0.0", "Z": "[{\"nested\"}]"}
+                        for x in range(5)
+                    ]
+                }
+                for class_index
+                in range(
+                    block_index,
+                    min(block_index + unhandled_per_block, n_unhandled_classes)
+                )
+            ]
+        })
+    # the real docs do not have the handled blocks in any particular place
+    rng.shuffle(docs)
+    return docs
+
+
+def write_synthetic_docs(path: pathlib.Path, **kwargs) -> None:
+    """Write a synthetic docs file to path, in UTF-16 like the real docs.
+    kwargs are passed to make_synthetic_docs."""
+    with open(path, 'w', encoding='UTF-16') as fptr:
+        json.dump(make_synthetic_docs(**kwargs), fptr, indent='\t')
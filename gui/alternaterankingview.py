@@ -0,0 +1,85 @@
+'''Widget for displaying how much each disabled alternate recipe would improve
+the solution'''
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QTableWidgetItem
+)
+
+from .tablehelpers import make_number_item
+from .sensitivityreportview import make_read_only_table
+
+from optimisationsolver.pricing import CandidateRanking
+from satisfactoryobjects.recipehandler import recipes
+
+
+class AlternateRankingView(QWidget):
+    def __init__(
+        self,
+        *args,
+        **kwargs
+    ):
+        super(AlternateRankingView, self).__init__(*args, **kwargs)
+
+        layout = QVBoxLayout()
+
+        self.title_label = QLabel(alignment=Qt.AlignmentFlag.AlignHCenter)
+        layout.addWidget(self.title_label)
+
+        self.table = make_read_only_table(
+            [
+                'Recipe',
+                'Improvement per machine',
+                'Exact improvement',
+                'Number of machines'
+            ]
+        )
+        self.table.setToolTip(
+            'The improvement per machine is estimated from the shadow prices '
+            'of the current solution, so is only accurate for small numbers '
+            'of machines.  The exact improvement is found by re-solving with '
+            'the recipe enabled, and is only calculated for the most '
+            'promising recipes.'
+        )
+        layout.addWidget(self.table)
+
+        self.setLayout(layout)
+
+    def set_ranking(self, ranking: CandidateRanking):
+        '''Show a ranking of alternate recipes, replacing any previous
+        ranking'''
+        self.reset_all()
+
+        self.title_label.setText(
+            f'{len(ranking.ranking)} disabled alternate recipes, ranked '
+            f'against an objective variable of '
+            f'{float(ranking.objective_value)}'
+        )
+
+        # the ranking is already sorted, so sorting is left disabled
+        self.table.setRowCount(len(ranking.ranking))
+        for row, priced_column in enumerate(ranking.ranking):
+            for column, table_item in enumerate((
+                QTableWidgetItem(
+                    recipes[priced_column.column.variable_id].user_facing_name
+                ),
+                make_number_item(priced_column.improvement_per_unit),
+                (
+                    QTableWidgetItem('Not calculated')
+                    if priced_column.exact_gain is None
+                    else make_number_item(priced_column.exact_gain)
+                ),
+                (
+                    QTableWidgetItem('Not calculated')
+                    if priced_column.value is None
+                    else make_number_item(priced_column.value)
+                )
+            )):
+                self.table.setItem(row, column, table_item)
+
+    def reset_all(self):
+        self.title_label.clear()
+        self.table.clearContents()
+        self.table.setRowCount(0)
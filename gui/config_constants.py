@@ -21,3 +21,18 @@ SUPPOSEDLY_UNLIMITED_DOUBLE_SPINBOX_MAX_DECIMALS = 4
 # minimum size.  Increase if you have a *comically large* display and this
 # doesn't behave as intended.
 LARGE_STRETCH_FACTOR_CONSTANT = 1 << 16
+
+# How often (in milliseconds) the docs are checked for changes, so that they
+# can be reloaded while the program is running.  Only the size and
+# modification time of the file are checked, so this is cheap.
+DOCS_POLL_INTERVAL_MS = 2000
+
+# How many times a second the progress of a solve is shown by default (it can
+# be changed in the settings).  Pivots are counted as they happen, but only
+# reported this often, so a fast solve does not flood the event loop.
+DEFAULT_PROGRESS_FREQUENCY = 10
+
+# How many times a second the solution reached so far is shown while solving,
+# if intermediate solutions were asked for.  Each one redraws the solution
+# tab, so this is much less often than progress is shown.
+SNAPSHOT_FREQUENCY = 1
@@ -8,12 +8,50 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QLayout
 )
+from PySide6.QtCore import QSignalBlocker
 import functools
 from typing import Optional
 
 from .config_constants import SUPPOSEDLY_UNLIMITED_DOUBLE_SPINBOX_MAX_DECIMALS
 
 from satisfactoryobjects.basesatisfactoryobject import BaseSatisfactoryObject
+from satisfactoryobjects.docsreload import RegistryDiff
+
+
+def update_combo_box(
+    combo_box: QComboBox,
+    dropdown_source: dict[str, BaseSatisfactoryObject],
+    registry_diff: RegistryDiff
+) -> bool:
+    '''Bring a combo box that was filled from dropdown_source up to date
+    after the docs were reloaded, keeping the current selection.  Returns
+    False if the selected entry was removed (in which case the first entry is
+    selected instead).'''
+    selected_internal_id = combo_box.currentData()
+    # signals blocked since the selection only moves around (or is
+    # deliberately changed) while the entries are updated
+    with QSignalBlocker(combo_box):
+        for game_internal_id in registry_diff.removed:
+            idx = combo_box.findData(game_internal_id)
+            if idx != -1:
+                combo_box.removeItem(idx)
+        for game_internal_id in registry_diff.changed:
+            idx = combo_box.findData(game_internal_id)
+            if idx != -1:
+                combo_box.setItemText(
+                    idx,
+                    dropdown_source[game_internal_id].user_facing_name
+                )
+        for game_internal_id in registry_diff.added:
+            combo_box.addItem(
+                dropdown_source[game_internal_id].user_facing_name,
+                game_internal_id
+            )
+        combo_box.model().sort(0)
+        combo_box.setCurrentIndex(
+            max(combo_box.findData(selected_internal_id), 0)
+        )
+    return selected_internal_id not in registry_diff.removed
 
 
 class Constraint():
@@ -107,6 +145,36 @@ class ConstraintsWidget(QWidget):
             # only one target now remains, so prevent it from being removed
             self.set_first_del_button_disabled(True)
 
+    def apply_registry_diff(
+        self,
+        dropdown_source: dict[str, BaseSatisfactoryObject],
+        registry_diff: RegistryDiff
+    ):
+        '''Update the dropdowns after the docs were reloaded.  Constraints on
+        something that no longer exists are removed (unless it is the only
+        constraint, which has to stay), and the rest are kept as they are.'''
+        removed_right_side_layouts: list[QLayout] = list()
+        for row in range(self.layout_.rowCount()):
+            if not update_combo_box(
+                self.layout_.itemAt(
+                    row,
+                    QFormLayout.ItemRole.LabelRole
+                ).widget(),
+                dropdown_source,
+                registry_diff
+            ):
+                removed_right_side_layouts.append(
+                    self.layout_.itemAt(
+                        row,
+                        QFormLayout.ItemRole.FieldRole
+                    ).layout()
+                )
+        if len(removed_right_side_layouts) == self.layout_.rowCount():
+            # the first constraint now points at the first entry instead
+            removed_right_side_layouts.pop(0)
+        for right_side_layout in removed_right_side_layouts:
+            self.remove_constraint(right_side_layout)
+
     def get_constraints(self) -> list[tuple[str, float]]:
         '''Get the values of each constraint'''
         # list comprehension because pyside6 doesnt let you easily iterate
@@ -1,5 +1,12 @@
+import time
+
 from PySide6.QtWidgets import QWidget, QProgressBar, QVBoxLayout, QLabel, QPushButton
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
+
+from .simplexworker import SolveProgress
+
+# how often the elapsed time is updated
+ELAPSED_TIME_INTERVAL_MS = 1000
 
 
 # Would have been a subclass of QDialog but we don't want the QDialog
@@ -20,7 +27,7 @@ class CustomProgressDialog(QWidget):
         # this is a dialog
         self.setWindowFlag(Qt.WindowType.Dialog, True)
         # only way to get swaywm to automatically make it floating
-        self.setFixedSize(350, 120)
+        self.setFixedSize(350, 160)
 
         layout = QVBoxLayout()
 
@@ -30,6 +37,13 @@ class CustomProgressDialog(QWidget):
         # the text in the progress label will get set later so dont bother
         # setting it yet anymore
         layout.addWidget(self.progress_label)
+        # updated by a timer rather than by progress, so that it keeps
+        # counting while nothing else changes
+        self.elapsed_time_label = QLabel()
+        layout.addWidget(self.elapsed_time_label)
+        self.elapsed_time_timer = QTimer(self)
+        self.elapsed_time_timer.timeout.connect(self.update_elapsed_time)
+        self.start_time = time.monotonic()
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 0)
         layout.addWidget(self.progress_bar)
@@ -45,22 +59,49 @@ class CustomProgressDialog(QWidget):
         # called by the cancel button callback
         self.external_cancellation_callback = external_cancellation_callback
 
-    def set_pivots(self, n_pivots: int) -> None:
+    def set_build_progress(self, steps_done: int, total_steps: int) -> None:
+        if steps_done == total_steps:
+            # back to a busy indicator, since the number of pivots needed is
+            # not known in advance
+            self.progress_bar.setRange(0, 0)
+            self.set_status('Problem built, solving.')
+        else:
+            self.progress_bar.setRange(0, total_steps)
+            self.progress_bar.setValue(steps_done)
+            self.set_status('Building problem.')
+
+    def set_progress(self, solve_progress: SolveProgress) -> None:
         partial_str: str = None
-        if n_pivots == 1:
+        if solve_progress.pivots == 1:
             partial_str = '1 pivot'
-        elif n_pivots == 0:
-            partial_str = 'No pivots'
         else:
-            partial_str = f'{n_pivots} pivots'
+            partial_str = f'{solve_progress.pivots} pivots'
         self.progress_label.setText(
-            partial_str + ' completed.'
+            f'{partial_str} completed, objective '
+            f'{float(solve_progress.objective_value):.6g}.\n'
+            f'{solve_progress.pivots_per_second:.1f} pivots/s, '
+            f'{solve_progress.degenerate_ratio:.0%} degenerate.'
         )
 
+    def update_elapsed_time(self) -> None:
+        minutes, seconds = divmod(int(time.monotonic() - self.start_time), 60)
+        self.elapsed_time_label.setText(f'Elapsed: {minutes}:{seconds:02}')
+
+    def set_status(self, status: str) -> None:
+        self.progress_label.setText(status)
+
     def reset_and_show(self):
-        self.set_pivots(0)
+        self.progress_bar.setRange(0, 0)
+        self.set_status('Building problem.')
+        self.start_time = time.monotonic()
+        self.update_elapsed_time()
+        self.elapsed_time_timer.start(ELAPSED_TIME_INTERVAL_MS)
         self.show()
 
+    def hideEvent(self, event):
+        self.elapsed_time_timer.stop()
+        return super().hideEvent(event)
+
     def cleanup_on_application_close(self):
         self.application_is_closing_flag = True
         self.close()
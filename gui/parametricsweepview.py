@@ -0,0 +1,130 @@
+'''Widget for displaying the breakpoints of a parametric resource sweep'''
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView
+)
+
+from .tablehelpers import describe_variable, make_number_item
+
+from optimisationsolver.parametric import ParametricSweep
+from satisfactoryobjects.items import Item
+from satisfactoryobjects.itemvariabletype import (
+    ItemVariableType,
+    ItemVariableTypes
+)
+from utils.variabletypetags import VariableType
+
+
+class ParametricSweepView(QWidget):
+    def __init__(
+        self,
+        *args,
+        **kwargs
+    ):
+        super(ParametricSweepView, self).__init__(*args, **kwargs)
+
+        layout = QVBoxLayout()
+
+        self.title_label = QLabel(alignment=Qt.AlignmentFlag.AlignHCenter)
+        layout.addWidget(self.title_label)
+
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        self.setLayout(layout)
+
+    def set_sweep(self, sweep: ParametricSweep):
+        '''Show the breakpoints of a sweep, replacing any previous sweep'''
+        self.title_label.setText(
+            f'{sweep.constraint_id} from {float(sweep.start)}/min to '
+            f'{float(sweep.end)}/min'
+            + (
+                ''
+                if sweep.reached_end
+                else ' (infeasible past the last row)'
+            )
+        )
+
+        # find every target item that is output at any breakpoint, so that
+        # they can each be given a column
+        output_items: list[Item] = list()
+        for breakpoint in sweep.breakpoints:
+            for variable, _ in breakpoint.variable_values:
+                if (
+                    variable.type == VariableType.NORMAL
+                    and isinstance(variable.name, ItemVariableType)
+                    and variable.name.type == ItemVariableTypes.OUTPUT
+                    and variable.name.item not in output_items
+                ):
+                    output_items.append(variable.name.item)
+
+        self.table.clear()
+        self.table.setColumnCount(3 + len(output_items))
+        self.table.setHorizontalHeaderLabels(
+            ['Availability (/min)', 'Objective variable']
+            + [f'{item.user_facing_name} (/min)' for item in output_items]
+            + ['Change in solution']
+        )
+        self.table.setRowCount(len(sweep.breakpoints))
+
+        for row, breakpoint in enumerate(sweep.breakpoints):
+            self.table.setItem(row, 0, make_number_item(breakpoint.rhs))
+            self.table.setItem(
+                row, 1, make_number_item(breakpoint.objective_value)
+            )
+            for column, item in enumerate(output_items, 2):
+                output_amount = 0
+                for variable, value in breakpoint.variable_values:
+                    if (
+                        variable.type == VariableType.NORMAL
+                        and
+                        variable.name == ItemVariableType(
+                            item,
+                            ItemVariableTypes.OUTPUT
+                        )
+                    ):
+                        output_amount = value
+                self.table.setItem(
+                    row, column, make_number_item(output_amount)
+                )
+            changes: list[str] = list()
+            if breakpoint.binding_constraint is not None:
+                changes.append(
+                    f'{breakpoint.binding_constraint} becomes binding'
+                )
+            elif breakpoint.leaving_variable is not None:
+                changes.append(
+                    f'{describe_variable(breakpoint.leaving_variable)} '
+                    'drops to zero'
+                )
+            if (
+                breakpoint.entering_variable is not None
+                and
+                breakpoint.entering_variable.type == VariableType.NORMAL
+            ):
+                changes.append(
+                    f'{describe_variable(breakpoint.entering_variable)} '
+                    'starts to be used'
+                )
+            self.table.setItem(
+                row,
+                2 + len(output_items),
+                QTableWidgetItem(', '.join(changes))
+            )
+
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.ResizeToContents
+        )
+
+    def reset_all(self):
+        self.title_label.clear()
+        self.table.clear()
+        self.table.setRowCount(0)
+        self.table.setColumnCount(0)
@@ -1,12 +1,12 @@
 import logging
 from fractions import Fraction
-from itertools import chain
+from functools import partial
 # prevent circular import at runtime but still allow for MainWindow type hint
 # static type checkers interpret this constant as True, but it is False at
 # runtime
 # source: https://medium.com/@k.a.fedorov/type-annotations-and-circular-imports-0a8014cd243b
 # [accessed 2025-01-31 at 09:21]
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 from PySide6.QtWidgets import (
     QWidget,
@@ -18,12 +18,23 @@ from PySide6.QtWidgets import (
     QFormLayout,
     QScrollArea,
     QSizePolicy,
-    QDoubleSpinBox
+    QDoubleSpinBox,
+    QSpinBox,
+    QComboBox,
+    QCheckBox
 )
 
-from .config_constants import SUPPOSEDLY_UNLIMITED_DOUBLE_SPINBOX_MAX_DECIMALS
-from .constraints_widget import ConstraintsWidget, Constraint
-from .simplexworker import SimplexWorker
+from .config_constants import (
+    SUPPOSEDLY_UNLIMITED_DOUBLE_SPINBOX_MAX_DECIMALS,
+    DEFAULT_PROGRESS_FREQUENCY
+)
+from .constraints_widget import (
+    ConstraintsWidget,
+    Constraint,
+    update_combo_box
+)
+from .simplexworker import BuiltProblem, SimplexWorker
+from .processsimplexworker import ProcessSimplexWorker
 from .recipeselector import RecipeSelector
 
 if TYPE_CHECKING:
@@ -31,24 +42,33 @@ if TYPE_CHECKING:
     # (and if it is, the code crashes due to a circular import)
     from .window import MainWindow
 
-from optimisationsolver.simplex import Inequality, ObjectiveEquation, Variable
+from optimisationsolver.anytime import SolveLimits
+from optimisationsolver.parametric import parametric_rhs_sweep
+from optimisationsolver.pricing import rank_candidates
+from optimisationsolver.subsetsearch import best_subset_search
+from optimisationsolver.integerprogramming import solve_integer
+from optimisationsolver.solutioncache import hash_problem
 
 
-from utils.directionenums import Direction
+from utils import startupprofile
 # from utils.variabletypetags import VariableType
 
-from satisfactoryobjects.items import Item
-from satisfactoryobjects.itemvariabletype import (
-    ItemVariableType,
-    ItemVariableTypes
+from satisfactoryobjects.itemconstrainttype import (
+    ItemConstraintType,
+    ItemConstraintTypes
 )
-from satisfactoryobjects.lookuperrors import RecipeLookupError
+from satisfactoryobjects.docsreload import DocsDiff
 from satisfactoryobjects.resourceduplicatetypingsaver import resource_duplicate_typing_saver
 # CAUTION: these better have been populated already, or things will definitely
 # break
 from satisfactoryobjects.itemhandler import items
 from satisfactoryobjects.recipehandler import recipes
-from satisfactoryobjects.recipelookup import lookup_recipes
+
+from headless.problemspec import ProblemSpec
+from headless.problembuilder import (
+    build_problem,
+    build_problem_with_alternate_candidates
+)
 
 
 toplevel_logger = logging.getLogger(__name__)
@@ -71,6 +91,100 @@ def make_form_subsection_header(
     return (subsection_header_layout, subsection_header_button)
 
 
+# the problem is built by the worker, from the inputs read beforehand by the
+# run methods of ProblemTabContent, since building it for a large set of
+# docs takes long enough to freeze the GUI.  these must not touch any widget.
+def build_optimisation(
+    spec: ProblemSpec,
+    progress: Callable[[int, int], None]
+) -> BuiltProblem:
+    problem_constraints = build_problem(spec, progress=progress)
+    cache_key = hash_problem(
+        problem_constraints,
+        {'whole_machines': spec.whole_machines}
+    )
+    if spec.whole_machines:
+        return BuiltProblem(
+            problem_constraints,
+            partial(
+                solve_integer,
+                # every recipe variable is a number of machines
+                integer_variables=recipes.keys()
+            ),
+            long_running_analysis=True,
+            cache_key=cache_key
+        )
+    return BuiltProblem(problem_constraints, cache_key=cache_key)
+
+
+def build_parametric_sweep(
+    spec: ProblemSpec,
+    swept_resource: str,
+    start: float,
+    end: float,
+    progress: Callable[[int, int], None]
+) -> BuiltProblem:
+    problem_constraints = build_problem(spec, progress=progress)
+    swept_constraint_id = ItemConstraintType(
+        items[swept_resource],
+        ItemConstraintTypes.SUPPLY
+    )
+    # every item has a supply constraint, so this will always be found
+    swept_constraint_index = [
+        constraint.id
+        for constraint
+        in problem_constraints
+    ].index(swept_constraint_id)
+    # solve at the start of the sweep (overriding any availability that
+    # was set for the resource in the resource availability section)
+    problem_constraints[swept_constraint_index].rhs = Fraction(start)
+    return BuiltProblem(
+        problem_constraints,
+        partial(
+            parametric_rhs_sweep,
+            constraint_index=swept_constraint_index,
+            end=Fraction(end)
+        )
+    )
+
+
+def build_alternate_ranking(
+    spec: ProblemSpec,
+    top_k: int,
+    progress: Callable[[int, int], None]
+) -> BuiltProblem:
+    problem_constraints, candidate_columns = (
+        build_problem_with_alternate_candidates(spec, progress)
+    )
+    return BuiltProblem(
+        problem_constraints,
+        partial(
+            rank_candidates,
+            columns=candidate_columns,
+            top_k=top_k
+        )
+    )
+
+
+def build_unlock_search(
+    spec: ProblemSpec,
+    k: int,
+    progress: Callable[[int, int], None]
+) -> BuiltProblem:
+    problem_constraints, candidate_columns = (
+        build_problem_with_alternate_candidates(spec, progress)
+    )
+    return BuiltProblem(
+        problem_constraints,
+        partial(
+            best_subset_search,
+            columns=candidate_columns,
+            k=k
+        ),
+        long_running_analysis=True
+    )
+
+
 class ProblemTabContent(QWidget):
     logger = toplevel_logger.getChild('ProblemTabContent')
 
@@ -112,7 +226,12 @@ class ProblemTabContent(QWidget):
         # a QVBoxLayout as the outermost layout for the form.
         form_layout = QVBoxLayout(form_layout_container)
 
+        # the time taken to build each section is recorded when profiling
+        # start-up
+        sections = startupprofile.Sections()
+
         # Production targets section
+        sections.start('targets')
 
         # custom widget for production targets
         self.targets_widget = ConstraintsWidget()
@@ -134,6 +253,7 @@ class ProblemTabContent(QWidget):
         form_layout.addWidget(self.targets_widget)
 
         # Resource availability constraints section
+        sections.start('resource availability')
         self.resource_availability_constraints_widget = ConstraintsWidget()
         # Start with one resource availability constraint per basic resource.
         # First, add the solid resources that are present in all versions of
@@ -251,6 +371,7 @@ class ProblemTabContent(QWidget):
             self.resource_availability_constraints_widget
         )
 
+        sections.start('weightings')
         # header for the weightings widget has no add button
         # since there are few weightings
         form_layout.addWidget(QLabel('Weightings'))
@@ -274,22 +395,169 @@ class ProblemTabContent(QWidget):
         # get a more consistent look with the margins
         form_layout.addLayout(self.weightings_form)
 
+        self.whole_machines_checkbox = QCheckBox(
+            'Use whole numbers of machines'
+        )
+        self.whole_machines_checkbox.setToolTip(
+            'Only allow whole numbers of each machine when running an '
+            'optimisation.  This can take much longer than a normal '
+            'optimisation, and the sensitivity report will still be for the '
+            'solution without whole numbers of machines.'
+        )
+        form_layout.addWidget(self.whole_machines_checkbox)
+
+        sections.start('solve limits')
+        # header for the solve limits section has no add button since there
+        # are a fixed number of limits
+        form_layout.addWidget(QLabel('Solve limits'))
+        self.limits_form = QFormLayout()
+        self.max_pivots_spin_box = QSpinBox()
+        self.max_pivots_spin_box.setRange(0, 2 ** 31 - 1)
+        # zero is shown as this instead
+        self.max_pivots_spin_box.setSpecialValueText('No limit')
+        self.max_pivots_spin_box.setToolTip(
+            'Stop after this many pivots, showing the solution reached so '
+            'far (which is not optimal) instead'
+        )
+        self.limits_form.addRow('Maximum pivots', self.max_pivots_spin_box)
+        self.max_seconds_spin_box = QDoubleSpinBox()
+        self.max_seconds_spin_box.setRange(0, float("inf"))
+        self.max_seconds_spin_box.setSuffix(' s')
+        self.max_seconds_spin_box.setSpecialValueText('No limit')
+        self.max_seconds_spin_box.setToolTip(
+            'Stop pivoting after this long, showing the solution reached so '
+            'far (which is not optimal) instead'
+        )
+        self.limits_form.addRow('Maximum time', self.max_seconds_spin_box)
+        target_objective_layout = QHBoxLayout()
+        self.target_objective_checkbox = QCheckBox()
+        self.target_objective_spin_box = QDoubleSpinBox()
+        self.target_objective_spin_box.setRange(float("-inf"), float("inf"))
+        self.target_objective_spin_box.setDecimals(
+            SUPPOSEDLY_UNLIMITED_DOUBLE_SPINBOX_MAX_DECIMALS
+        )
+        self.target_objective_spin_box.setToolTip(
+            'If ticked, stop pivoting as soon as the objective variable '
+            'value is at least this, showing the solution reached so far'
+        )
+        target_objective_layout.addWidget(self.target_objective_checkbox)
+        target_objective_layout.addWidget(self.target_objective_spin_box)
+        self.limits_form.addRow('Target objective', target_objective_layout)
+        form_layout.addLayout(self.limits_form)
+        self.stream_snapshots_checkbox = QCheckBox(
+            'Show intermediate solutions'
+        )
+        self.stream_snapshots_checkbox.setToolTip(
+            'Show the solution reached so far in the Solution tab every '
+            'second while solving'
+        )
+        form_layout.addWidget(self.stream_snapshots_checkbox)
+
+        sections.start('resource availability sweep')
+        # header for the parametric sweep section has no add button since
+        # only one resource can be swept at a time
+        form_layout.addWidget(QLabel('Resource availability sweep'))
+        self.sweep_form = QFormLayout()
+        self.sweep_resource_combo_box = QComboBox()
+        for game_internal_id, item in items.items():
+            self.sweep_resource_combo_box.addItem(
+                item.user_facing_name,
+                game_internal_id
+            )
+        self.sweep_resource_combo_box.model().sort(0)
+        self.sweep_resource_combo_box.setCurrentIndex(
+            # default to iron ore, since that is the resource most likely to
+            # be the bottleneck
+            max(
+                self.sweep_resource_combo_box.findData('Desc_OreIron_C'),
+                0
+            )
+        )
+        self.sweep_start_spin_box = QDoubleSpinBox()
+        self.sweep_end_spin_box = QDoubleSpinBox()
+        for sweep_spin_box in [
+            self.sweep_start_spin_box,
+            self.sweep_end_spin_box
+        ]:
+            sweep_spin_box.setRange(0, float("inf"))
+            sweep_spin_box.setDecimals(
+                SUPPOSEDLY_UNLIMITED_DOUBLE_SPINBOX_MAX_DECIMALS
+            )
+        self.sweep_end_spin_box.setValue(480)
+        self.sweep_form.addRow('Resource', self.sweep_resource_combo_box)
+        self.sweep_form.addRow('From (/min)', self.sweep_start_spin_box)
+        self.sweep_form.addRow('To (/min)', self.sweep_end_spin_box)
+        form_layout.addLayout(self.sweep_form)
+
+        sections.start('alternate recipe ranking')
+        form_layout.addWidget(QLabel('Alternate recipe ranking'))
+        self.ranking_form = QFormLayout()
+        self.ranking_top_k_spin_box = QSpinBox()
+        self.ranking_top_k_spin_box.setRange(0, len(recipes))
+        self.ranking_top_k_spin_box.setValue(5)
+        self.ranking_top_k_spin_box.setToolTip(
+            'How many of the most promising disabled alternate recipes to '
+            're-solve the problem with, to find their exact improvement'
+        )
+        self.ranking_form.addRow(
+            'Recipes to re-solve with',
+            self.ranking_top_k_spin_box
+        )
+        self.unlock_count_spin_box = QSpinBox()
+        self.unlock_count_spin_box.setRange(1, len(recipes))
+        self.unlock_count_spin_box.setValue(3)
+        self.unlock_count_spin_box.setToolTip(
+            'How many of the disabled alternate recipes can be unlocked when '
+            'searching for the best ones to unlock'
+        )
+        self.ranking_form.addRow(
+            'Recipes to unlock',
+            self.unlock_count_spin_box
+        )
+        form_layout.addLayout(self.ranking_form)
+
+        sections.start('recipes')
         form_layout.addWidget(QLabel('Recipes'))
         self.recipe_selector = RecipeSelector()
         form_layout.addLayout(self.recipe_selector)
+        sections.end()
 
         # put the layout container widget in the scroll area
         form_container.setWidget(form_layout_container)
 
         # add the scroll area to the tab layout
         layout.addWidget(form_container)
-        # create the run button
+        # create the run buttons
         run_optimisation_button = QPushButton('Run Optimisation')
-        # and connect the clicked signal to the appropriate slot
+        run_sweep_button = QPushButton('Run Sweep')
+        run_sweep_button.setToolTip(
+            'Solve the problem with the swept resource set to the "From" '
+            'value, then find how the solution changes as its availability is '
+            'moved to the "To" value'
+        )
+        rank_alternates_button = QPushButton('Rank Alternates')
+        rank_alternates_button.setToolTip(
+            'Solve the problem, then rank every disabled alternate recipe by '
+            'how much it would improve the solution if it were enabled'
+        )
+        find_unlocks_button = QPushButton('Find Best Unlocks')
+        find_unlocks_button.setToolTip(
+            'Search for the set of disabled alternate recipes that would '
+            'improve the solution the most if they were unlocked'
+        )
+        # and connect the clicked signals to the appropriate slots
         run_optimisation_button.clicked.connect(self.run_optimisation)
-        # Add the run button outside the scroll area but within the tab layout,
-        # so it is always visible without any scrolling required.
-        layout.addWidget(run_optimisation_button)
+        run_sweep_button.clicked.connect(self.run_parametric_sweep)
+        rank_alternates_button.clicked.connect(self.run_alternate_ranking)
+        find_unlocks_button.clicked.connect(self.run_unlock_search)
+        run_buttons_layout = QHBoxLayout()
+        run_buttons_layout.addWidget(run_optimisation_button)
+        run_buttons_layout.addWidget(run_sweep_button)
+        run_buttons_layout.addWidget(rank_alternates_button)
+        run_buttons_layout.addWidget(find_unlocks_button)
+        # Add the run buttons outside the scroll area but within the tab
+        # layout, so they are always visible without any scrolling required.
+        layout.addLayout(run_buttons_layout)
 
         # Now, set this widget's layout.
         self.setLayout(layout)
@@ -304,7 +572,66 @@ class ProblemTabContent(QWidget):
             Constraint(items)
         )
 
+    def apply_docs_diff(self, docs_diff: DocsDiff):
+        '''Update the inputs that depend on the items and recipes after the
+        docs were reloaded, keeping everything else that was entered'''
+        if not docs_diff.items.is_empty():
+            for constraints_widget in (
+                self.targets_widget,
+                self.resource_availability_constraints_widget
+            ):
+                constraints_widget.apply_registry_diff(items, docs_diff.items)
+            update_combo_box(
+                self.sweep_resource_combo_box,
+                items,
+                docs_diff.items
+            )
+        if not docs_diff.recipes.is_empty():
+            self.ranking_top_k_spin_box.setMaximum(len(recipes))
+            self.unlock_count_spin_box.setMaximum(len(recipes))
+            self.recipe_selector.apply_recipes_diff(docs_diff.recipes)
+
     def run_optimisation(self):
+        # only a plain optimisation can stop early, since the analyses of the
+        # other runs need the optimal solution
+        self.start_simplex_worker(
+            partial(build_optimisation, self.prepare_for_run()),
+            self.get_solve_limits(),
+            self.stream_snapshots_checkbox.isChecked()
+        )
+
+    def run_parametric_sweep(self):
+        self.start_simplex_worker(
+            partial(
+                build_parametric_sweep,
+                self.prepare_for_run(),
+                self.sweep_resource_combo_box.currentData(),
+                self.sweep_start_spin_box.value(),
+                self.sweep_end_spin_box.value()
+            )
+        )
+
+    def run_alternate_ranking(self):
+        self.start_simplex_worker(
+            partial(
+                build_alternate_ranking,
+                self.prepare_for_run(),
+                self.ranking_top_k_spin_box.value()
+            )
+        )
+
+    def run_unlock_search(self):
+        self.start_simplex_worker(
+            partial(
+                build_unlock_search,
+                self.prepare_for_run(),
+                self.unlock_count_spin_box.value()
+            )
+        )
+
+    def prepare_for_run(self) -> ProblemSpec:
+        '''Prepare the UI for an optimisation run, returning the current
+        inputs'''
         # disable this widget (to prevent settings from being overridden as
         # they are being read)
         self.setDisabled(True)
@@ -332,173 +659,69 @@ class ProblemTabContent(QWidget):
         # for the documentation on this.
         self.main_window_reference.qt_application_reference.processEvents()
 
-        disabled_recipes = self.recipe_selector.disabled_recipes
+        problem_spec = self.get_problem_spec()
 
         self.main_window_reference.progress_dialog.reset_and_show()
 
-        target_weights: list[tuple[str, float]] = self.targets_widget.get_constraints()
-        # used to more quickly filter what items need output "virtual recipes"
-        # created
-        target_items: set[Item] = {
-            items[target_weight[0]]
-            for target_weight
-            in target_weights
-        }
-
-        manually_set_constraints: set[Item] = set()
-        problem_constraints: list[Inequality] = list()
-
-        manually_set_constraint_values: dict[Item, Fraction] = dict()
-
-        # add the constraints for the input items
-        for available_resource, available_resource_rate in self.resource_availability_constraints_widget.get_constraints():
-            number_per_minute = available_resource_rate
-            if number_per_minute == 0:
-                ProblemTabContent.logger.warning(
-                    'Constraint for item with id '
-                    f'{available_resource}'
-                    ' is set to zero!  Skipping.'
-                )
-            else:
-                resource = items[available_resource]
-                manually_set_constraints.add(resource)
-                manually_set_constraint_values[resource] = Fraction(
-                    number_per_minute
-                )
-
-        # add the constraints for the absolute numbers of items
-        for resource in items.values():
-            constraint_variables: list[Variable] = [
-                Variable(
-                    ItemVariableType(resource, ItemVariableTypes.TOTAL),
-                    1
-                )
-            ]
-            # add data on the recipes producing this item
-            try:
-                producing_recipes = lookup_recipes(
-                    resource,
-                    disabled_recipes=disabled_recipes
-                )
-                for recipe in producing_recipes:
-                    for flow_data in recipe.calc_resource_flow_rate(
-                        calculated_direction=Direction.OUT,
-                        positive_direction=Direction.IN
-                    ):
-                        if flow_data.item == resource:
-                            # using recipes class identifier string instead of
-                            # the recipe object itself as recipe is unhashable
-                            constraint_variables.append(
-                                Variable(
-                                    recipe.internal_class_identifier,
-                                    Fraction(flow_data.amount)
-                                )
-                            )
-            except RecipeLookupError:
-                ProblemTabContent.logger.debug(
-                    'No recipes produce item with id '
-                    f'{resource.internal_class_identifier}'
-                    ', only adding data about manual input'
-                )
-
-            cons = Inequality(
-                constraint_variables,
-                (
-                    manually_set_constraint_values[resource]
-                    if resource in manually_set_constraints
-                    else 0
-                )
-            )
-            problem_constraints.append(cons)
-
-        # add the constraints for the recipes
-        for resource in items.values():
-            constraint_variables: list[Variable] = [
-                Variable(
-                    ItemVariableType(resource, ItemVariableTypes.TOTAL),
-                    -1
-                )
-            ]
-            if resource in target_items:
-                # also TODO: put this in the try block somehow, and if the except block is triggered when this condition is met then swap the variable in the objective equation to be of the TOTAL type instead of the OUTPUT type, to keep the tableau smaller
-                constraint_variables.append(Variable(ItemVariableType(resource, ItemVariableTypes.OUTPUT), 1))
-            try:
-                for recipe in lookup_recipes(resource, True, disabled_recipes):
-                    for flow_data in recipe.calc_resource_flow_rate(
-                        calculated_direction=Direction.IN,
-                        positive_direction=Direction.IN
-                    ):
-                        if flow_data.item == resource:
-                            # see previous note: recipe is unhashable
-                            constraint_variables.append(
-                                Variable(
-                                    recipe.internal_class_identifier,
-                                    Fraction(flow_data.amount)
-                                )
-                            )
-                if len(constraint_variables) == 1:
-                    ProblemTabContent.logger.debug(
-                        'No feasible recipe consumes item with id '
-                        f'{resource.internal_class_identifier}'
-                        ', not adding usage constraint'
-                    )
-                else:
-                    problem_constraints.append(Inequality(constraint_variables, 0))
-            except RecipeLookupError:
-                ProblemTabContent.logger.debug(
-                    'No recipes consume item with id '
-                    f'{resource.internal_class_identifier}'
-                    ', not adding usage constraint unless target'
-                )
-                # TODO: with regards to above about putting in the try block:
-                # replace this logic with something better
-                if len(constraint_variables) == 2:
-                    problem_constraints.append(
-                        Inequality(constraint_variables, 0)
-                    )
-
-        power_usage_weight = self.power_usage_spin_box.value()
-
-        recipe_weight_vars: list[Variable] = list()
-
-        for recipe in recipes.values():
-            # TODO: this will need a separate mechanism to exclude the
-            # disabled recipes
-
-            # could turn this into a list comprehension but if more weights
-            # are added (e.g. approximate number of machines) then it would
-            # rapidly become unreadable
-            recipe_power_weight = (
-                recipe.calc_power_flow_rate(positive_direction=Direction.OUT)
-                *
-                power_usage_weight
-            )
+        return problem_spec
+
+    def get_problem_spec(self) -> ProblemSpec:
+        '''Get the current inputs as a ProblemSpec'''
+        return ProblemSpec(
+            tuple(self.targets_widget.get_constraints()),
+            tuple(self.resource_availability_constraints_widget.get_constraints()),
+            self.power_usage_spin_box.value(),
+            frozenset(
+                recipe.internal_class_identifier
+                for recipe
+                in self.recipe_selector.disabled_recipes
+            ),
+            self.whole_machines_checkbox.isChecked()
+        )
 
-            recipe_weight_vars.append(
-                Variable(
-                    recipe.internal_class_identifier,
-                    Fraction(recipe_power_weight)
-                )
+    def get_solve_limits(self) -> SolveLimits:
+        '''Get the current solve limits, where zero means no limit'''
+        return SolveLimits(
+            self.max_pivots_spin_box.value() or None,
+            self.max_seconds_spin_box.value() or None,
+            (
+                Fraction(self.target_objective_spin_box.value())
+                if self.target_objective_checkbox.isChecked()
+                else None
             )
+        )
 
-        # add the objectives and their weights
-        problem_constraints.append(ObjectiveEquation(chain(
-            [
-                Variable(
-                    ItemVariableType(
-                        items[target_weight[0]],
-                        ItemVariableTypes.OUTPUT
-                    ),
-                    target_weight[1] * -1
-                )
-                for target_weight
-                in target_weights
-            ],
-            recipe_weight_vars
-        )))
-
-        self.main_window_reference.simplex_worker_thread = SimplexWorker(
-            problem_constraints
+    def start_simplex_worker(
+        self,
+        build: Callable[..., BuiltProblem],
+        limits: SolveLimits = SolveLimits(),
+        stream_snapshots: bool = False
+    ):
+        '''Start building and solving the problem on the thread pool, or in
+        a child process if the setting is on (see SimplexWorker for what
+        build is given and for the other arguments)'''
+        worker_class = (
+            ProcessSimplexWorker
+            if self.main_window_reference.settings.value(
+                'solver/separate_process',
+                True,
+                type=bool
+            )
+            else SimplexWorker
+        )
+        self.main_window_reference.simplex_worker_thread = worker_class(
+            build,
+            self.main_window_reference.solution_cache,
+            self.main_window_reference.settings.value(
+                'solver/progress_frequency',
+                DEFAULT_PROGRESS_FREQUENCY,
+                type=int
+            ),
+            limits,
+            stream_snapshots
+        )
+        self.main_window_reference.simplex_worker_thread.signals.build_progress.connect(
+            self.main_window_reference.process_build_progress
         )
         self.main_window_reference.simplex_worker_thread.signals.result.connect(
             self.main_window_reference.process_simplex_result
@@ -512,6 +735,21 @@ class ProblemTabContent(QWidget):
         self.main_window_reference.simplex_worker_thread.signals.error.connect(
             self.main_window_reference.process_simplex_error
         )
+        self.main_window_reference.simplex_worker_thread.signals.snapshot.connect(
+            self.main_window_reference.process_snapshot
+        )
+        self.main_window_reference.simplex_worker_thread.signals.not_optimal.connect(
+            self.main_window_reference.process_not_optimal
+        )
+        self.main_window_reference.simplex_worker_thread.signals.sensitivity_result.connect(
+            self.main_window_reference.process_sensitivity_result
+        )
+        self.main_window_reference.simplex_worker_thread.signals.analysis_progress.connect(
+            self.main_window_reference.process_analysis_progress
+        )
+        self.main_window_reference.simplex_worker_thread.signals.analysis_result.connect(
+            self.main_window_reference.process_analysis_result
+        )
 
         self.main_window_reference.thread_pool.start(
             self.main_window_reference.simplex_worker_thread
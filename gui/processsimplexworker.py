@@ -0,0 +1,261 @@
+"""A worker that builds and solves the problem in a child process instead of
+on a thread of the GUI.
+
+Pivoting with Fractions holds the GIL for most of a solve, so solving on a
+thread makes the GUI stutter, and a thread can only be cancelled between
+pivots.  Here the thread only waits for messages from the child process
+(which releases the GIL) and turns them into the same signals that
+SimplexWorker emits, and cancelling terminates the child straight away.
+Progress is coalesced in the child in the same way as by SimplexWorker, so
+the pipe carries no more messages than the GUI shows.
+
+The child is never forked from the GUI, which has other threads (e.g. of the
+thread pool) that may hold locks such as the logging lock, so it is started
+from the fork-safe context of headless.solverprocess.  The registries are
+handed to it when it starts in the same way as in headless.batch (so they
+are pickled, as is the partial that builds the problem).
+"""
+import logging
+import sys
+import traceback
+from enum import IntEnum
+from multiprocessing.connection import Connection
+from typing import Callable
+
+from PySide6.QtCore import QRunnable, Slot
+
+from optimisationsolver.anytime import SolveLimits, StopReason
+from optimisationsolver.solutioncache import CachedSolution, SolutionCache
+
+from satisfactoryobjects.itemhandler import items
+from satisfactoryobjects.machinehandler import machines
+from satisfactoryobjects.recipehandler import recipes
+
+from headless.batch import initialise_worker
+from headless.solverprocess import get_fork_safe_context
+
+from .config_constants import DEFAULT_PROGRESS_FREQUENCY
+from .simplexworker import (
+    BuiltProblem,
+    CancellationStatus,
+    RateLimiter,
+    SimplexWorkerSignals,
+    solve_built_problem
+)
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+class MessageType(IntEnum):
+    # followed by the number of steps done and the total number of steps
+    BUILD_PROGRESS = 0
+    # followed by the cache key of the built problem (or None)
+    BUILT = 1
+    # followed by a SolveProgress
+    PROGRESS = 2
+    # followed by whatever the analysis reported
+    ANALYSIS_PROGRESS = 3
+    # followed by the CachedSolution and the StopReason
+    RESULT = 4
+    # followed by the formatted traceback
+    ERROR = 5
+    # followed by a SolveSnapshot
+    SNAPSHOT = 6
+
+
+class SolverProcessError(Exception):
+    '''Raised in the GUI for an exception in the child process (or the child
+    process dying), with its traceback as the message'''
+    pass
+
+
+def _run_simplex_process(
+    connection: Connection,
+    build: Callable[..., BuiltProblem],
+    registries: tuple[dict, dict, dict],
+    progress_frequency: float,
+    limits: SolveLimits,
+    stream_snapshots: bool
+) -> None:
+    initialise_worker(registries)
+    # for the progress of building the problem and of any analysis
+    rate_limiter = RateLimiter(progress_frequency)
+
+    def send_build_progress(steps_done: int, total_steps: int) -> None:
+        # the last step is always sent, so that it is known when building
+        # has finished
+        if rate_limiter.ready(steps_done == total_steps):
+            connection.send(
+                (MessageType.BUILD_PROGRESS, steps_done, total_steps)
+            )
+
+    def send_analysis_progress(analysis_progress: object) -> None:
+        if rate_limiter.ready():
+            connection.send(
+                (MessageType.ANALYSIS_PROGRESS, analysis_progress)
+            )
+
+    try:
+        built_problem = build(progress=send_build_progress)
+        connection.send((MessageType.BUILT, built_problem.cache_key))
+        solution, stop_reason = solve_built_problem(
+            built_problem,
+            lambda solve_progress: connection.send(
+                (MessageType.PROGRESS, solve_progress)
+            ),
+            send_analysis_progress,
+            # stopped by being terminated instead
+            lambda: False,
+            progress_frequency,
+            limits,
+            (
+                (
+                    lambda solve_snapshot: connection.send(
+                        (MessageType.SNAPSHOT, solve_snapshot)
+                    )
+                )
+                if stream_snapshots
+                else None
+            ),
+            # this process is daemonic (so that it never outlives the GUI),
+            # and daemonic processes can not start a process pool
+            analysis_workers=0
+        )
+        connection.send((MessageType.RESULT, solution, stop_reason))
+    except BaseException:
+        connection.send((MessageType.ERROR, traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+class ProcessSimplexWorker(QRunnable):
+    def __init__(
+        self,
+        # as for SimplexWorker, but called in the child process
+        build: Callable[..., BuiltProblem],
+        solution_cache: SolutionCache | None = None,
+        progress_frequency: float = DEFAULT_PROGRESS_FREQUENCY,
+        limits: SolveLimits = SolveLimits(),
+        stream_snapshots: bool = False,
+        *args,
+        **kwargs
+    ):
+        super(ProcessSimplexWorker, self).__init__(*args, **kwargs)
+        self.solution_cache = solution_cache
+        self.signals = SimplexWorkerSignals()
+        self.cancelled = CancellationStatus.NOT_CANCELLED
+        context = get_fork_safe_context()
+        self._connection, child_connection = context.Pipe(duplex=False)
+        # started straight away so that it can be terminated at any time
+        self._process = context.Process(
+            target=_run_simplex_process,
+            args=(
+                child_connection,
+                build,
+                (items, machines, recipes),
+                progress_frequency,
+                limits,
+                stream_snapshots
+            ),
+            daemon=True
+        )
+        self._process.start()
+        # so that recv gives EOFError once the process has exited
+        child_connection.close()
+
+    def cancel_soon(self, on_exit_cancellation: bool = False):
+        '''Unlike SimplexWorker, the solve stops straight away'''
+        self.cancelled = (
+            CancellationStatus.ON_EXIT_CANCELLATION
+            if on_exit_cancellation
+            else CancellationStatus.NORMAL_CANELLATION
+        )
+        self._process.terminate()
+
+    def emit(self, signal, *args) -> None:
+        # once the program is exiting, Qt may already have deleted the
+        # signals (see the comment in SimplexWorker.report_progress)
+        if self.cancelled != CancellationStatus.ON_EXIT_CANCELLATION:
+            signal.emit(*args)
+
+    def receive_solution(
+        self
+    ) -> tuple[CachedSolution | None, StopReason]:
+        '''Turn messages from the child process into signals until it gives
+        the solution (see solve_built_problem), or None if it was
+        cancelled'''
+        logger = toplevel_logger.getChild(
+            'ProcessSimplexWorker.receive_solution'
+        )
+
+        cache_key = None
+        while True:
+            try:
+                message = self._connection.recv()
+            except EOFError:
+                if self.cancelled:
+                    return (None, StopReason.STOPPED)
+                self._process.join()
+                raise SolverProcessError(
+                    f'Solver process exited with code {self._process.exitcode}'
+                )
+            message_type = message[0]
+            if message_type == MessageType.BUILD_PROGRESS:
+                self.emit(self.signals.build_progress, *message[1:])
+            elif message_type == MessageType.BUILT:
+                cache_key = message[1]
+                if self.solution_cache is None or cache_key is None:
+                    continue
+                # the same problem may well have been solved before, e.g. if
+                # a recipe was disabled and then enabled again
+                solution = self.solution_cache.get(cache_key)
+                if solution is not None:
+                    logger.debug('Solution found in the cache, not solving')
+                    self._process.terminate()
+                    # only optimal solutions are cached
+                    return (solution, StopReason.OPTIMAL)
+            elif message_type == MessageType.PROGRESS:
+                self.emit(self.signals.progress, message[1])
+            elif message_type == MessageType.ANALYSIS_PROGRESS:
+                self.emit(self.signals.analysis_progress, message[1])
+            elif message_type == MessageType.SNAPSHOT:
+                self.emit(self.signals.snapshot, message[1])
+            elif message_type == MessageType.RESULT:
+                solution, stop_reason = message[1:]
+                if (
+                    stop_reason is StopReason.OPTIMAL
+                    and self.solution_cache is not None
+                    and cache_key is not None
+                ):
+                    self.solution_cache.put(cache_key, solution)
+                return (solution, stop_reason)
+            elif message_type == MessageType.ERROR:
+                raise SolverProcessError(message[1])
+
+    @Slot()
+    def run(self):
+        try:
+            solution, stop_reason = self.receive_solution()
+        # equivalent to bare except but doesn't trigger flake8
+        except BaseException:
+            traceback.print_exc()
+            self.emit(self.signals.error, sys.exc_info())
+        else:
+            if not self.cancelled and solution is not None:
+                self.emit(self.signals.result, solution.variable_values)
+                if stop_reason is not StopReason.OPTIMAL:
+                    self.emit(self.signals.not_optimal, stop_reason)
+                if solution.sensitivity_report is not None:
+                    self.emit(
+                        self.signals.sensitivity_result,
+                        solution.sensitivity_report
+                    )
+                if solution.analysis_result is not None:
+                    self.emit(
+                        self.signals.analysis_result,
+                        solution.analysis_result
+                    )
+        finally:
+            self._process.join()
+            self._connection.close()
+            self.emit(self.signals.finished)
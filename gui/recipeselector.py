@@ -1,8 +1,11 @@
+from bisect import bisect_right
 from functools import partial
 
 from PySide6.QtWidgets import QFormLayout, QCheckBox, QWidget, QHBoxLayout, QGridLayout, QGroupBox, QComboBox, QPushButton, QMessageBox
 from PySide6.QtCore import Qt, QSettings, QSignalBlocker
 
+from satisfactoryobjects.docsreload import RegistryDiff
+from utils import startupprofile
 from satisfactoryobjects.recipes import Recipe
 # CAUTION: these better have been populated already, or things will definitely
 # break
@@ -81,9 +84,9 @@ class RecipeSelector(QGridLayout):
         #):
         #    checkbox.setTristate(True)
         normal_group_box = QGroupBox('Normal')
-        normal_form = QFormLayout()
+        self.normal_form = QFormLayout()
         alternate_group_box = QGroupBox('Alternate')
-        alternate_form = QFormLayout()
+        self.alternate_form = QFormLayout()
         # code to allow for alphabetical sorting
         recipe_names: list[tuple[str, str]] = [
             (recipe_key, recipe.user_facing_name)
@@ -105,42 +108,14 @@ class RecipeSelector(QGridLayout):
         self.alternate_recipes_available = 0
         self.normal_recipes_active = 0
         self.alternate_recipes_active = 0
-        for id_recipe_tuple in map(
-            lambda id_name_tuple: (
-                id_name_tuple[0],
-                recipes[id_name_tuple[0]]
-            ),
-            recipe_names
-        ):
-            checkbox = QCheckBox()
-            (
-                alternate_form
-                if id_recipe_tuple[1].is_alternate
-                else normal_form
-            ).addRow(
-                id_recipe_tuple[1].user_facing_name, checkbox
-            )
-
-            checkbox.checkStateChanged.connect(
-                partial(
-                    self.generic_recipe_checkbox_callback,
-                    id_recipe_tuple[1].is_alternate
-                )
-            )
-
-            # self.addRow(id_recipe_tuple[1].user_facing_name, checkbox)
-            self.recipe_checkboxes[id_recipe_tuple[0]] = checkbox
-
-            if id_recipe_tuple[1].is_alternate:
-                self.alternate_recipe_identifiers.add(id_recipe_tuple[0])
-                self.alternate_recipes_available += 1
-            else:
-                self.normal_recipe_identifiers.add(id_recipe_tuple[0])
-                self.normal_recipes_available += 1
+        with startupprofile.phase('recipe checkboxes'):
+            for recipe_id, _ in recipe_names:
+                # already sorted, so just append each row
+                self.add_recipe_checkbox(recipe_id)
 
         for group_box, form in (
-            (normal_group_box, normal_form),
-            (alternate_group_box, alternate_form)
+            (normal_group_box, self.normal_form),
+            (alternate_group_box, self.alternate_form)
         ):
             group_box.setLayout(form)
 
@@ -153,7 +128,115 @@ class RecipeSelector(QGridLayout):
         self.addWidget(normal_group_box, 2, 0, 1, 2)
         self.addWidget(alternate_group_box, 2, 2, 1, 2)
 
-        self.load_profile_callback(internal_use_internal_load=True)
+        with startupprofile.phase('load recipe selection profile'):
+            self.load_profile_callback(internal_use_internal_load=True)
+
+    def add_recipe_checkbox(self, recipe_id: str, row: int = -1) -> QCheckBox:
+        '''Add the checkbox for a recipe at the given row of its form (or
+        at the end if row is -1).  The checkbox starts off unchecked.'''
+        recipe = recipes[recipe_id]
+        checkbox = QCheckBox()
+        # rows out of range are added at the end
+        (
+            self.alternate_form
+            if recipe.is_alternate
+            else self.normal_form
+        ).insertRow(row, recipe.user_facing_name, checkbox)
+
+        checkbox.checkStateChanged.connect(
+            partial(
+                self.generic_recipe_checkbox_callback,
+                recipe.is_alternate
+            )
+        )
+
+        self.recipe_checkboxes[recipe_id] = checkbox
+
+        if recipe.is_alternate:
+            self.alternate_recipe_identifiers.add(recipe_id)
+            self.alternate_recipes_available += 1
+        else:
+            self.normal_recipe_identifiers.add(recipe_id)
+            self.normal_recipes_available += 1
+        return checkbox
+
+    def remove_recipe_checkbox(self, recipe_id: str) -> bool:
+        '''Remove the checkbox for a recipe, returning whether it was
+        checked'''
+        checkbox = self.recipe_checkboxes.pop(recipe_id)
+        is_checked = checkbox.checkState() == Qt.CheckState.Checked
+        if recipe_id in self.alternate_recipe_identifiers:
+            self.alternate_recipe_identifiers.remove(recipe_id)
+            self.alternate_recipes_available -= 1
+            if is_checked:
+                self.alternate_recipes_active -= 1
+            self.alternate_form.removeRow(checkbox)
+        else:
+            self.normal_recipe_identifiers.remove(recipe_id)
+            self.normal_recipes_available -= 1
+            if is_checked:
+                self.normal_recipes_active -= 1
+            self.normal_form.removeRow(checkbox)
+        return is_checked
+
+    def apply_recipes_diff(self, registry_diff: RegistryDiff) -> None:
+        '''Update the checkboxes after the docs were reloaded, keeping the
+        check state of every recipe that is still present'''
+        profile_name = self.profile_name_combo_box.currentText()
+        for recipe_id in registry_diff.removed:
+            self.remove_recipe_checkbox(recipe_id)
+        for recipe_id in registry_diff.changed:
+            # removed and added again since the name (so the position) or
+            # whether it is an alternate (so the form) may have changed
+            is_checked = self.remove_recipe_checkbox(recipe_id)
+            self.add_recipe_checkbox(
+                recipe_id,
+                self.find_sorted_row(recipes[recipe_id])
+            ).setChecked(is_checked)
+        for recipe_id in registry_diff.added:
+            self.add_recipe_checkbox(
+                recipe_id,
+                self.find_sorted_row(recipes[recipe_id])
+            ).setChecked(
+                self.get_saved_check_state(
+                    profile_name,
+                    recipe_id,
+                    recipes[recipe_id].is_alternate
+                )
+            )
+        self.update_recipe_category_checkboxes()
+
+    def find_sorted_row(self, recipe: Recipe) -> int:
+        '''Find the row that a recipe should be inserted at in its form to
+        keep the form sorted alphabetically'''
+        form = self.alternate_form if recipe.is_alternate else self.normal_form
+        return bisect_right(
+            range(form.rowCount()),
+            recipe.user_facing_name,
+            key=lambda row: form.itemAt(
+                row,
+                QFormLayout.ItemRole.LabelRole
+            ).widget().text()
+        )
+
+    def get_saved_check_state(
+        self,
+        profile_name: str,
+        recipe_id: str,
+        is_alternate: bool
+    ) -> bool:
+        '''Get whether a recipe is checked in a saved profile, or by default
+        if the profile does not include it'''
+        check_state = self.recipe_selection_persistence_obj.value(
+            'profile-' + profile_name + '/recipes/' +
+            ('alternate' if is_alternate else 'normal') + '/' + recipe_id
+        )
+        if check_state == '1':
+            return True
+        elif check_state == '0':
+            return False
+        # load default
+        return not is_alternate
 
     def generic_recipe_checkbox_callback(
         self,
@@ -295,18 +378,18 @@ class RecipeSelector(QGridLayout):
         self.all_normal_recipe_checkbox.setChecked(False)
         self.all_alternate_recipe_checkbox.setChecked(False)
         for recipe_id, recipe_checkbox in self.recipe_checkboxes.items():
-            is_alternate = recipe_id in self.alternate_recipe_identifiers
-            check_state = self.recipe_selection_persistence_obj.value(
-                'profile-' + profile_name + '/recipes/' +
-                ('alternate' if is_alternate else 'normal') + '/' + recipe_id
+            recipe_checkbox.setChecked(
+                self.get_saved_check_state(
+                    profile_name,
+                    recipe_id,
+                    recipe_id in self.alternate_recipe_identifiers
+                )
             )
-            if check_state == '1':
-                recipe_checkbox.setChecked(True)
-            elif check_state == '0':
-                recipe_checkbox.setChecked(False)
-            else:
-                # load default
-                recipe_checkbox.setChecked(not is_alternate)
+        self.update_recipe_category_checkboxes()
+
+    def update_recipe_category_checkboxes(self) -> None:
+        '''Set the all normal and all alternate checkboxes from the number
+        of recipes of each category that are checked'''
         if self.normal_recipes_active == self.normal_recipes_available:
             self.all_normal_recipe_checkbox.setChecked(True)
             self.all_normal_recipe_checkbox.setTristate(False)
@@ -0,0 +1,118 @@
+'''Widget for displaying the shadow prices, reduced costs and ranging
+intervals of a solution'''
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QTabWidget,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView
+)
+
+from .tablehelpers import describe_variable, make_number_item, make_bound_item
+
+from optimisationsolver.sensitivity import SensitivityReport
+
+
+def make_read_only_table(column_labels: list[str]) -> QTableWidget:
+    '''Make an empty table with the given column headers'''
+    table = QTableWidget()
+    table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+    table.verticalHeader().setVisible(False)
+    table.setColumnCount(len(column_labels))
+    table.setHorizontalHeaderLabels(column_labels)
+    table.horizontalHeader().setSectionResizeMode(
+        QHeaderView.ResizeMode.ResizeToContents
+    )
+    return table
+
+
+class SensitivityReportView(QTabWidget):
+    def __init__(
+        self,
+        *args,
+        **kwargs
+    ):
+        super(SensitivityReportView, self).__init__(*args, **kwargs)
+
+        self.constraints_table = make_read_only_table(
+            [
+                'Constraint',
+                'Shadow price',
+                'Slack (/min)',
+                'Limit (/min)',
+                'Shadow price valid from (/min)',
+                'Shadow price valid to (/min)'
+            ]
+        )
+        self.constraints_table.setToolTip(
+            'The shadow price of a constraint is how much the objective '
+            'variable would increase per extra item per minute.  Constraints '
+            'with the largest shadow prices are the bottlenecks.'
+        )
+        self.recipes_table = make_read_only_table(
+            [
+                'Recipe',
+                'Number of machines',
+                'Reduced cost',
+                'Objective weight',
+                'Solution valid from weight',
+                'Solution valid to weight'
+            ]
+        )
+        self.recipes_table.setToolTip(
+            'The reduced cost of a recipe is how much the objective variable '
+            'would decrease per machine if it were forced into the solution.'
+        )
+
+        self.addTab(self.constraints_table, 'Bottlenecks')
+        self.addTab(self.recipes_table, 'Recipes')
+
+    def set_report(self, report: SensitivityReport):
+        '''Show a sensitivity report, replacing any previous report'''
+        self.reset_all()
+
+        # sorting has to be off while the table is being filled, or rows get
+        # moved around while they are being filled in
+        self.constraints_table.setRowCount(len(report.constraints))
+        for row, constraint in enumerate(report.constraints):
+            for column, table_item in enumerate((
+                QTableWidgetItem(str(constraint.constraint_id)),
+                make_number_item(constraint.shadow_price),
+                make_number_item(constraint.slack),
+                make_number_item(constraint.rhs),
+                make_bound_item(constraint.rhs_lower, False),
+                make_bound_item(constraint.rhs_upper, True)
+            )):
+                self.constraints_table.setItem(row, column, table_item)
+        self.constraints_table.setSortingEnabled(True)
+        # most significant bottleneck first
+        self.constraints_table.sortItems(1, Qt.SortOrder.DescendingOrder)
+
+        # only recipe variables are shown, since the item variables are just
+        # bookkeeping for the problem and have no meaningful cost
+        recipe_variables = [
+            variable
+            for variable
+            in report.variables
+            if isinstance(variable.variable.name, str)
+        ]
+        self.recipes_table.setRowCount(len(recipe_variables))
+        for row, variable in enumerate(recipe_variables):
+            for column, table_item in enumerate((
+                QTableWidgetItem(describe_variable(variable.variable)),
+                make_number_item(variable.value),
+                make_number_item(variable.reduced_cost),
+                make_number_item(variable.objective_coefficient),
+                make_bound_item(variable.objective_coefficient_lower, False),
+                make_bound_item(variable.objective_coefficient_upper, True)
+            )):
+                self.recipes_table.setItem(row, column, table_item)
+        self.recipes_table.setSortingEnabled(True)
+        # recipes that are closest to being worth using first
+        self.recipes_table.sortItems(2, Qt.SortOrder.AscendingOrder)
+
+    def reset_all(self):
+        for table in (self.constraints_table, self.recipes_table):
+            table.setSortingEnabled(False)
+            table.clearContents()
+            table.setRowCount(0)
@@ -11,9 +11,13 @@ from PySide6.QtWidgets import (
     QScrollArea,
     QMessageBox,
     QPushButton,
-    QRadioButton
+    QRadioButton,
+    QCheckBox,
+    QSpinBox
 )
 
+from .config_constants import DEFAULT_PROGRESS_FREQUENCY
+
 toplevel_logger = logging.getLogger(__name__)
 
 
@@ -108,6 +112,28 @@ class SettingsTabContent(QWidget):
 
         form_layout.addRow('Notification backend:', notification_backend_select_layout)
 
+        self.separate_process_checkbox = QCheckBox()
+        self.separate_process_checkbox.setToolTip(
+            'Solve in a separate process, so that the window stays responsive '
+            'and cancelling stops the solve straight away.  Turn off to solve '
+            'on a thread of this process instead.'
+        )
+        form_layout.addRow(
+            'Solve in a separate process:',
+            self.separate_process_checkbox
+        )
+
+        self.progress_frequency_spin_box = QSpinBox()
+        self.progress_frequency_spin_box.setRange(1, 60)
+        self.progress_frequency_spin_box.setSuffix(' Hz')
+        self.progress_frequency_spin_box.setToolTip(
+            'How many times a second the progress of a solve is shown'
+        )
+        form_layout.addRow(
+            'Progress updates:',
+            self.progress_frequency_spin_box
+        )
+
         form_layout_container.setLayout(form_layout)
 
         form_container.setWidget(form_layout_container)
@@ -137,6 +163,16 @@ class SettingsTabContent(QWidget):
         self.reload_settings()
 
     def reload_settings(self):
+        self.separate_process_checkbox.setChecked(
+            self.settings.value('solver/separate_process', True, type=bool)
+        )
+        self.progress_frequency_spin_box.setValue(
+            self.settings.value(
+                'solver/progress_frequency',
+                DEFAULT_PROGRESS_FREQUENCY,
+                type=int
+            )
+        )
         for button_setting_id, button_tuple in self.notification_backend_buttons.items():
             button_tuple[0].setChecked(
                 button_setting_id == self.settings.value(
@@ -145,6 +181,14 @@ class SettingsTabContent(QWidget):
             )
 
     def write_settings(self):
+        self.settings.setValue(
+            'solver/separate_process',
+            self.separate_process_checkbox.isChecked()
+        )
+        self.settings.setValue(
+            'solver/progress_frequency',
+            self.progress_frequency_spin_box.value()
+        )
         for button_setting_id, button_tuple in self.notification_backend_buttons.items():
             if button_tuple[0].isChecked():
                 self.settings.setValue(
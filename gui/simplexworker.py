@@ -1,13 +1,24 @@
 import traceback
 import sys
+import time
+from dataclasses import dataclass
 from enum import IntEnum
+from fractions import Fraction
+
+from typing import Callable
 
 from PySide6.QtCore import QRunnable, Slot, Signal, QObject
-from optimisationsolver.simplex import (
-    Tableau,
-    Inequality,
-    SimplexAlgorithmDoneException
+from optimisationsolver.simplex import Tableau, Inequality
+from optimisationsolver.anytime import (
+    SolveLimits,
+    StopReason,
+    get_snapshot_variable_values,
+    pivot_within_limits
 )
+from optimisationsolver.sensitivity import sensitivity_report
+from optimisationsolver.solutioncache import CachedSolution, SolutionCache
+
+from .config_constants import DEFAULT_PROGRESS_FREQUENCY, SNAPSHOT_FREQUENCY
 
 
 class CancellationStatus(IntEnum):
@@ -20,6 +31,189 @@ class CancellationStatus(IntEnum):
     # use-after-free for us if we try and use signals
     ON_EXIT_CANCELLATION = 2
 
+
+@dataclass
+class BuiltProblem:
+    problem: list[Inequality]
+    # run on the tableau once the problem has been solved, e.g. a
+    # parametric sweep.  it may pivot the tableau away from the solution.
+    analysis: Callable[[Tableau], object] | None = None
+    # if True, the analysis is also passed progress, should_stop and
+    # workers keyword arguments, so that it can report its progress, be
+    # cancelled part way through and be run on a process pool
+    long_running_analysis: bool = False
+    # if given, the solution is looked up in the cache under this key before
+    # solving, and put in it once it is solved (and analysed)
+    cache_key: str | None = None
+
+
+class BuildCancelledException(Exception):
+    '''Raised from the build progress callback to stop building the problem
+    once the worker has been cancelled'''
+    pass
+
+
+@dataclass
+class SolveProgress:
+    pivots: int
+    # of the tableau after the last pivot
+    objective_value: Fraction
+    # since the last time progress was reported
+    pivots_per_second: float
+    # the fraction of the pivots so far that did not change the objective
+    # value (e.g. because of a tie in the ratio test)
+    degenerate_ratio: float
+    elapsed_seconds: float
+
+
+class RateLimiter:
+    '''Lets something happen at most frequency times a second'''
+
+    def __init__(self, frequency: float):
+        self.interval = 1 / frequency
+        self.last_time: float | None = None
+
+    def ready(self, force: bool = False) -> bool:
+        '''Give whether it can happen now, counting it as having happened if
+        so.  If force is True, it always can.'''
+        now = time.monotonic()
+        if (
+            force
+            or self.last_time is None
+            or now - self.last_time >= self.interval
+        ):
+            self.last_time = now
+            return True
+        return False
+
+
+class SolveProgressTracker:
+    '''Counts pivots as they happen, giving a SolveProgress at most
+    frequency times a second'''
+
+    def __init__(self, frequency: float):
+        self.rate_limiter = RateLimiter(frequency)
+        self.start_time = time.monotonic()
+        self.pivots = 0
+        self.degenerate_pivots = 0
+        self.last_reported_time = self.start_time
+        self.last_reported_pivots = 0
+
+    def pivot_done(
+        self,
+        previous_objective_value: Fraction,
+        objective_value: Fraction
+    ) -> SolveProgress | None:
+        '''Count a pivot, giving the progress if it is time to report it'''
+        self.pivots += 1
+        if objective_value == previous_objective_value:
+            self.degenerate_pivots += 1
+        if not self.rate_limiter.ready():
+            return None
+        now = time.monotonic()
+        pivots_per_second = (
+            (self.pivots - self.last_reported_pivots)
+            /
+            max(now - self.last_reported_time, sys.float_info.epsilon)
+        )
+        self.last_reported_time = now
+        self.last_reported_pivots = self.pivots
+        return SolveProgress(
+            self.pivots,
+            objective_value,
+            pivots_per_second,
+            self.degenerate_pivots / self.pivots,
+            now - self.start_time
+        )
+
+
+@dataclass
+class SolveSnapshot:
+    pivots: int
+    # the basic feasible solution reached so far, as given by
+    # get_snapshot_variable_values (so without the non-basic variables)
+    variable_values: list
+
+
+def solve_built_problem(
+    built_problem: BuiltProblem,
+    progress: Callable[[SolveProgress], None],
+    analysis_progress: Callable[[object], None],
+    should_stop: Callable[[], bool],
+    progress_frequency: float = DEFAULT_PROGRESS_FREQUENCY,
+    limits: SolveLimits = SolveLimits(),
+    # if given, called with the solution reached so far at most
+    # SNAPSHOT_FREQUENCY times a second while pivoting
+    snapshot: Callable[[SolveSnapshot], None] | None = None,
+    # the number of worker processes for a long-running analysis (None for
+    # one per CPU, 0 to run it in this process)
+    analysis_workers: int | None = None
+) -> tuple[CachedSolution | None, StopReason]:
+    '''Solve (and analyse) the built problem, calling progress at most
+    progress_frequency times a second while pivoting.  Gives the solution (or
+    None if stopped before it was found) and why pivoting stopped.  If the
+    problem is unbounded or one of the limits was reached, the solution is
+    the one reached so far, without a sensitivity report or analysis (since
+    both need the optimal solution).'''
+    tableau = Tableau(built_problem.problem)
+    progress_tracker = SolveProgressTracker(progress_frequency)
+    snapshot_rate_limiter = RateLimiter(SNAPSHOT_FREQUENCY)
+
+    def pivot_done(
+        previous_objective_value: Fraction,
+        objective_value: Fraction
+    ) -> None:
+        solve_progress = progress_tracker.pivot_done(
+            previous_objective_value,
+            objective_value
+        )
+        if solve_progress is not None:
+            progress(solve_progress)
+        if snapshot is not None and snapshot_rate_limiter.ready():
+            snapshot(SolveSnapshot(
+                progress_tracker.pivots,
+                get_snapshot_variable_values(tableau)
+            ))
+
+    stop_reason = pivot_within_limits(
+        tableau,
+        limits,
+        pivot_done,
+        should_stop
+    ).stop_reason
+    if stop_reason is StopReason.STOPPED:
+        return (None, stop_reason)
+    # an unbounded problem gives the solution reached so far, as if a limit
+    # had been reached, since it is not optimal either
+    reached_limit = stop_reason is not StopReason.OPTIMAL
+    result = tableau.get_variable_values()
+    report = None if reached_limit else sensitivity_report(tableau)
+    basis = tableau.get_basis()
+    analysis_result = None
+    if built_problem.analysis is not None and not reached_limit:
+        # this may move the tableau away from the solution just read out, so
+        # must come after it
+        if built_problem.long_running_analysis:
+            analysis_result = built_problem.analysis(
+                tableau,
+                progress=analysis_progress,
+                should_stop=should_stop,
+                workers=analysis_workers
+            )
+        else:
+            analysis_result = built_problem.analysis(tableau)
+    return (
+        CachedSolution(
+            result,
+            report,
+            analysis_result,
+            basis,
+            progress_tracker.pivots
+        ),
+        stop_reason
+    )
+
+
 # using code from
 # https://www.pythonguis.com/tutorials/multithreading-pyside6-applications-qthreadpool/
 # [accessed 2025-01-06 at 13:55]
@@ -31,13 +225,57 @@ class SimplexWorkerSignals(QObject):
     finished = Signal()
     error = Signal(tuple)
     result = Signal(list)
-    progress = Signal(int)
+    # emitted while pivoting, with a SolveProgress
+    progress = Signal(object)
+    # emitted while the problem is being built, with the number of steps done
+    # and the total number of steps
+    build_progress = Signal(int, int)
+    # emitted while pivoting if snapshots were asked for, with a
+    # SolveSnapshot of the solution reached so far
+    snapshot = Signal(object)
+    # emitted after result if it is not optimal, with the StopReason
+    not_optimal = Signal(object)
+    # emitted after result (unless a limit was reached), with the shadow
+    # prices and ranging of the result
+    sensitivity_result = Signal(object)
+    # emitted after result if an analysis (e.g. a parametric sweep) was
+    # requested, with whatever the analysis returned
+    analysis_result = Signal(object)
+    # emitted while a long-running analysis is in progress, with whatever the
+    # analysis reported
+    analysis_progress = Signal(object)
 
 
 class SimplexWorker(QRunnable):
-    def __init__(self, problem: list[Inequality], *args, **kwargs):
+    def __init__(
+        self,
+        # builds the problem on the worker thread (so that a large problem
+        # does not freeze the GUI), from inputs that were read from the GUI
+        # beforehand.  it is passed a progress keyword argument, called with
+        # the number of steps done and the total number of steps.
+        build: Callable[..., BuiltProblem],
+        # solutions are looked up in and put in this if the built problem has
+        # a cache key
+        solution_cache: SolutionCache | None = None,
+        # the most times a second that progress is emitted
+        progress_frequency: float = DEFAULT_PROGRESS_FREQUENCY,
+        # once one is reached, the solution reached so far is given instead
+        # of the optimal one
+        limits: SolveLimits = SolveLimits(),
+        # whether to emit snapshots of the solution reached so far while
+        # pivoting
+        stream_snapshots: bool = False,
+        *args,
+        **kwargs
+    ):
         super(SimplexWorker, self).__init__(*args, **kwargs)
-        self.tableau = Tableau(problem)
+        self.build = build
+        self.solution_cache = solution_cache
+        self.progress_frequency = progress_frequency
+        self.limits = limits
+        self.stream_snapshots = stream_snapshots
+        # for the progress of building the problem and of any analysis
+        self.rate_limiter = RateLimiter(progress_frequency)
         self.signals = SimplexWorkerSignals()
         self.cancelled = CancellationStatus.NOT_CANCELLED
 
@@ -48,48 +286,98 @@ class SimplexWorker(QRunnable):
             else CancellationStatus.NORMAL_CANELLATION
         )
 
+    def report_build_progress(self, steps_done: int, total_steps: int):
+        if self.cancelled:
+            raise BuildCancelledException()
+        # the last step is always emitted, so that it is known when building
+        # has finished
+        if self.rate_limiter.ready(steps_done == total_steps):
+            self.signals.build_progress.emit(steps_done, total_steps)
+
+    def report_analysis_progress(self, analysis_progress: object):
+        # see the comment in solve about the race condition on exit
+        if (
+            self.cancelled != CancellationStatus.ON_EXIT_CANCELLATION
+            and self.rate_limiter.ready()
+        ):
+            self.signals.analysis_progress.emit(analysis_progress)
+
+    def get_cached_solution(
+        self,
+        built_problem: BuiltProblem
+    ) -> CachedSolution | None:
+        if self.solution_cache is None or built_problem.cache_key is None:
+            return None
+        return self.solution_cache.get(built_problem.cache_key)
+
+    def report_progress(self, solve_progress: SolveProgress):
+        # This turns out to have a race condition: if the GUI is
+        # quit the C++ representation of the SimplexWorkerSignals
+        # object that Qt uses may get deleted before cancellation
+        # is checked for.  This causes a RuntimeError to be raised.
+        # So far, I have only run into this once.
+        # Once the RuntimeError is raised, it gets caught by the
+        # outer try-except block in run.  As part of this, an error
+        # signal is emitted with details about the error.  However,
+        # this then causes a second RuntimeError to occur for the
+        # same reason.
+        # Since the outer try-except block has a finally block
+        # attached to it, further code runs even though an error
+        # occurs in the except block.  Because the finally block
+        # also emits a signal (to inform the main thread that the
+        # algorithm has terminated and the problem region can be
+        # re-enabled, even if the algorithm crashed for some
+        # reason) a third RuntimeError gets raised.  The thread
+        # then crashes.  This does not get picked up as a crash by
+        # my shell or vscode (both of which display an icon if a
+        # comand had a non-zero return code) since it is a crash
+        # in the thread rather than in the main program.
+        if self.cancelled != CancellationStatus.ON_EXIT_CANCELLATION:
+            self.signals.progress.emit(solve_progress)
+
+    def report_snapshot(self, solve_snapshot: SolveSnapshot):
+        # see the comment in report_progress about the race condition on exit
+        if self.cancelled != CancellationStatus.ON_EXIT_CANCELLATION:
+            self.signals.snapshot.emit(solve_snapshot)
+
+    def solve(
+        self,
+        built_problem: BuiltProblem
+    ) -> tuple[CachedSolution | None, StopReason]:
+        '''Solve (and analyse) the built problem (see solve_built_problem),
+        caching the solution if it is optimal'''
+        solution, stop_reason = solve_built_problem(
+            built_problem,
+            self.report_progress,
+            self.report_analysis_progress,
+            lambda: bool(self.cancelled),
+            self.progress_frequency,
+            self.limits,
+            self.report_snapshot if self.stream_snapshots else None
+        )
+        if (
+            stop_reason is StopReason.OPTIMAL
+            and not self.cancelled
+            and self.solution_cache is not None
+            and built_problem.cache_key is not None
+        ):
+            self.solution_cache.put(built_problem.cache_key, solution)
+        return (solution, stop_reason)
+
     @Slot()
     def run(self):
         try:
-            pivot_count = 0
             try:
-                while not self.cancelled:
-                    self.tableau.pivot()
-                    pivot_count += 1
-                    # This turns out to have a race condition: if the GUI is
-                    # quit the C++ representation of the SimplexWorkerSignals
-                    # object that Qt uses may get deleted before cancellation
-                    # is checked for.  This causes a RuntimeError to be raised.
-                    # So far, I have only run into this once.
-                    # Once the RuntimeError is raised, it gets caught by the
-                    # outer try-except block.  As part of this, an error
-                    # signal is emitted with details about the error.  However,
-                    # this then causes a second RuntimeError to occur for the
-                    # same reason.
-                    # Since the outer try-except block has a finally block
-                    # attached to it, further code runs even though an error
-                    # occurs in the except block.  Because the finally block
-                    # also emits a signal (to inform the main thread that the
-                    # algorithm has terminated and the problem region can be
-                    # re-enabled, even if the algorithm crashed for some
-                    # reason) a third RuntimeError gets raised.  The thread
-                    # then crashes.  This does not get picked up as a crash by
-                    # my shell or vscode (both of which display an icon if a
-                    # comand had a non-zero return code) since it is a crash
-                    # in the thread rather than in the main program.
-                    if self.cancelled != CancellationStatus.ON_EXIT_CANCELLATION:
-                        self.signals.progress.emit(pivot_count)
-            except SimplexAlgorithmDoneException:
-                pass
-            except ValueError:  # temp
-                print('TRAP!')
-                pass  # this actually seems to work - when the program crashes with this error it actually seems to have a solution (that also looks pretty optimal)
-                # for some cases (ai expansion server with hash randomisation off) this doesnt get triggered though interestingly
-            if self.cancelled == CancellationStatus.NORMAL_CANELLATION:
-                self.signals.finished.emit()
-            if self.cancelled:
+                built_problem = self.build(progress=self.report_build_progress)
+            except BuildCancelledException:
                 return
-            result = self.tableau.get_variable_values()
+            # the same problem may well have been solved before, e.g. if a
+            # recipe was disabled and then enabled again
+            solution = self.get_cached_solution(built_problem)
+            # only optimal solutions are cached
+            stop_reason = StopReason.OPTIMAL
+            if solution is None:
+                solution, stop_reason = self.solve(built_problem)
         # equivalent to bare except but doesn't trigger flake8
         except BaseException:
             traceback.print_exc()
@@ -98,8 +386,18 @@ class SimplexWorker(QRunnable):
                     sys.exc_info()
                 )
         else:
-            if not self.cancelled:
-                self.signals.result.emit(result)
+            if not self.cancelled and solution is not None:
+                self.signals.result.emit(solution.variable_values)
+                if stop_reason is not StopReason.OPTIMAL:
+                    self.signals.not_optimal.emit(stop_reason)
+                if solution.sensitivity_report is not None:
+                    self.signals.sensitivity_result.emit(
+                        solution.sensitivity_report
+                    )
+                if solution.analysis_result is not None:
+                    self.signals.analysis_result.emit(
+                        solution.analysis_result
+                    )
         finally:
             if self.cancelled != CancellationStatus.ON_EXIT_CANCELLATION:
                 self.signals.finished.emit()
@@ -100,6 +100,27 @@ class SolutionQuickOverview(QWidget):
         )
         self.objective_variable_value_label.setToolTip(str(value))
 
+    def set_optimality_gap(self, gap: Fraction):
+        '''Helper function to show how far the objective variable value could
+        be from the best possible, for solutions that are not proven to be
+        optimal'''
+        self.objective_variable_value_label.setText(
+            self.objective_variable_value_label.text()
+            + (
+                ' (optimal)'
+                if gap == 0
+                else f' (at most {float(gap)} from optimal)'
+            )
+        )
+
+    def set_not_optimal(self, description: str):
+        '''Helper function to show that the solution is not optimal, and
+        why'''
+        self.objective_variable_value_label.setText(
+            self.objective_variable_value_label.text()
+            + f' (not optimal: {description})'
+        )
+
     def reset_dynamic_labels(self):
         '''Resets the dynamic labels for objective variable value and total power consumption'''
         self.objective_variable_value_label.setText('Nothing yet')
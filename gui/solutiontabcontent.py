@@ -2,6 +2,10 @@ from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QSplitter, QWidget, QScrollArea
 
 from .solutionquickoverview import SolutionQuickOverview
+from .parametricsweepview import ParametricSweepView
+from .sensitivityreportview import SensitivityReportView
+from .alternaterankingview import AlternateRankingView
+from .unlocksearchview import UnlockSearchView
 from .config_constants import LARGE_STRETCH_FACTOR_CONSTANT
 
 from thirdparty.flowlayout import FlowLayout
@@ -45,6 +49,34 @@ class SolutionTabContent(QSplitter):
 
         self.addWidget(self.quick_view_widget)
 
+        # widget for the results of a parametric sweep, which is only shown
+        # if a sweep was run
+        self.parametric_sweep_widget = ParametricSweepView()
+        self.parametric_sweep_widget.hide()
+
+        self.addWidget(self.parametric_sweep_widget)
+
+        # widget for the ranking of disabled alternate recipes, which is only
+        # shown if a ranking was run
+        self.alternate_ranking_widget = AlternateRankingView()
+        self.alternate_ranking_widget.hide()
+
+        self.addWidget(self.alternate_ranking_widget)
+
+        # widget for the best set of alternate recipes to unlock, which is
+        # only shown if a search was run
+        self.unlock_search_widget = UnlockSearchView()
+        self.unlock_search_widget.hide()
+
+        self.addWidget(self.unlock_search_widget)
+
+        # widget for the shadow prices and ranging of the solution, which is
+        # only shown once there is a solution
+        self.sensitivity_report_widget = SensitivityReportView()
+        self.sensitivity_report_widget.hide()
+
+        self.addWidget(self.sensitivity_report_widget)
+
         # make the solution quick overview be the smaller one by default
         self.setStretchFactor(
             # act on first widget i.e. the solution details
@@ -61,8 +93,39 @@ class SolutionTabContent(QSplitter):
         self.add_requested_item_production_view_entry = self.quick_view_widget.add_requested_item_production_view_entry
         self.set_objective_variable_value = self.quick_view_widget.set_objective_variable_value
         self.set_total_power_consumption = self.quick_view_widget.set_total_power_consumption
+        self.set_optimality_gap = self.quick_view_widget.set_optimality_gap
+        self.set_not_optimal = self.quick_view_widget.set_not_optimal
         self.add_recipe_usage_widget_to_detail_view_layout = self.detail_view_layout.addWidget
 
-    def reset_all(self):
+    def show_parametric_sweep(self, sweep):
+        self.parametric_sweep_widget.set_sweep(sweep)
+        self.parametric_sweep_widget.show()
+
+    def show_alternate_ranking(self, ranking):
+        self.alternate_ranking_widget.set_ranking(ranking)
+        self.alternate_ranking_widget.show()
+
+    def show_unlock_search(self, result):
+        self.unlock_search_widget.set_result(result)
+        self.unlock_search_widget.show()
+
+    def show_sensitivity_report(self, report):
+        self.sensitivity_report_widget.set_report(report)
+        self.sensitivity_report_widget.show()
+
+    def clear_solution(self):
+        '''Clear the recipes used and the quick overview, leaving the results
+        of any analysis in place'''
         clear_layout(self.detail_view_layout)
         self.quick_view_widget.reset_all()
+
+    def reset_all(self):
+        self.clear_solution()
+        self.parametric_sweep_widget.reset_all()
+        self.parametric_sweep_widget.hide()
+        self.alternate_ranking_widget.reset_all()
+        self.alternate_ranking_widget.hide()
+        self.unlock_search_widget.reset_all()
+        self.unlock_search_widget.hide()
+        self.sensitivity_report_widget.reset_all()
+        self.sensitivity_report_widget.hide()
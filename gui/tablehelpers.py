@@ -0,0 +1,49 @@
+'''Helpers for showing solver output in a QTableWidget'''
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QTableWidgetItem
+
+from satisfactoryobjects.itemvariabletype import ItemVariableType
+from satisfactoryobjects.recipehandler import recipes
+from utils.variabletypetags import AnonymousTypeTag, VariableType
+
+
+def describe_variable(variable: AnonymousTypeTag) -> str:
+    '''Get a user-facing description of a variable from the tableau'''
+    if variable.type == VariableType.NORMAL:
+        if isinstance(variable.name, str):
+            return recipes[variable.name].user_facing_name
+        elif isinstance(variable.name, ItemVariableType):
+            return (
+                f'{variable.name.item.user_facing_name} '
+                f'({variable.name.type.name.lower().replace("_", " ")})'
+            )
+    return repr(variable)
+
+
+def make_number_item(value) -> QTableWidgetItem:
+    '''Make a table cell showing a rational number as a decimal, with the
+    exact value in the tooltip'''
+    table_item = QTableWidgetItem()
+    # setting the display role to a float (rather than using the text) means
+    # that sorting the table by this column sorts numerically
+    table_item.setData(
+        Qt.ItemDataRole.DisplayRole,
+        float(value)
+    )
+    table_item.setToolTip(str(value))
+    table_item.setTextAlignment(
+        Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+    )
+    return table_item
+
+
+def make_bound_item(bound, is_upper_bound: bool) -> QTableWidgetItem:
+    '''Make a table cell showing one end of a range, where None means that
+    the range is unbounded in that direction'''
+    if bound is not None:
+        return make_number_item(bound)
+    table_item = make_number_item(
+        float('inf') if is_upper_bound else float('-inf')
+    )
+    table_item.setToolTip('Unbounded')
+    return table_item
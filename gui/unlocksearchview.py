@@ -0,0 +1,67 @@
+'''Widget for displaying the best set of alternate recipes to unlock'''
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QTableWidgetItem
+)
+
+from .tablehelpers import make_number_item
+from .sensitivityreportview import make_read_only_table
+
+from optimisationsolver.subsetsearch import SubsetSearchResult
+from satisfactoryobjects.recipehandler import recipes
+
+
+class UnlockSearchView(QWidget):
+    def __init__(
+        self,
+        *args,
+        **kwargs
+    ):
+        super(UnlockSearchView, self).__init__(*args, **kwargs)
+
+        layout = QVBoxLayout()
+
+        self.title_label = QLabel(alignment=Qt.AlignmentFlag.AlignHCenter)
+        self.title_label.setWordWrap(True)
+        layout.addWidget(self.title_label)
+
+        self.table = make_read_only_table(
+            ['Recipe to unlock', 'Number of machines']
+        )
+        layout.addWidget(self.table)
+
+        self.setLayout(layout)
+
+    def set_result(self, result: SubsetSearchResult):
+        '''Show the result of a search, replacing any previous result'''
+        self.reset_all()
+
+        self.title_label.setText(
+            f'Best {result.k} alternate recipes to unlock give an objective '
+            f'variable of {float(result.objective_value)}'
+            + (
+                f' (proven optimal after {result.nodes_evaluated} nodes)'
+                if result.proven_optimal
+                else (
+                    f' (search stopped after {result.nodes_evaluated} nodes, '
+                    f'the best set is at most {float(result.gap)} better)'
+                )
+            )
+        )
+
+        self.table.setRowCount(len(result.enabled))
+        for row, recipe_id in enumerate(result.enabled):
+            self.table.setItem(
+                row, 0, QTableWidgetItem(recipes[recipe_id].user_facing_name)
+            )
+            self.table.setItem(
+                row, 1, make_number_item(result.values[recipe_id])
+            )
+
+    def reset_all(self):
+        self.title_label.clear()
+        self.table.clearContents()
+        self.table.setRowCount(0)
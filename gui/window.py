@@ -1,12 +1,29 @@
 import logging
+import pathlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
 
 from PySide6.QtWidgets import (
     QTabWidget,
     QMainWindow,
     QApplication
 )
-from PySide6.QtCore import QThreadPool, QSettings
+from PySide6.QtCore import QThreadPool, QSettings, QTimer
 
+from optimisationsolver.parametric import ParametricSweep
+from optimisationsolver.pricing import CandidateRanking
+from optimisationsolver.integerprogramming import (
+    IntegerSearchProgress,
+    IntegerSolution
+)
+from optimisationsolver.subsetsearch import (
+    SubsetSearchProgress,
+    SubsetSearchResult
+)
+
+from optimisationsolver.anytime import StopReason
+from optimisationsolver.solutioncache import SolutionCache
+from satisfactoryobjects import docsloader, docsreload
 from satisfactoryobjects.itemvariabletype import (
     ItemVariableType,
     ItemVariableTypes
@@ -15,11 +32,16 @@ from satisfactoryobjects.itemvariabletype import (
 # starts getting called or it will likely break
 from satisfactoryobjects.recipehandler import recipes
 
+from headless.solverprocess import get_fork_safe_context
+
+from utils import startupprofile
 from utils.directionenums import Direction
 from utils.variabletypetags import VariableType
 
+from .config_constants import DOCS_POLL_INTERVAL_MS
 from .recipeusage import RecipeUsage
-from .simplexworker import SimplexWorker
+from .simplexworker import SimplexWorker, SolveProgress, SolveSnapshot
+from .processsimplexworker import ProcessSimplexWorker
 from .settingstabcontent import SettingsTabContent
 from .solutiontabcontent import SolutionTabContent
 from .problemtabcontent import ProblemTabContent
@@ -29,6 +51,15 @@ from .notifications.notificationurgency import NotificationUrgency
 
 toplevel_logger = logging.getLogger(__name__)
 
+# shown next to the objective variable value of a solution that is not
+# optimal, for why solving stopped before the optimum
+STOP_REASON_DESCRIPTIONS = {
+    StopReason.UNBOUNDED: 'the problem is unbounded',
+    StopReason.MAX_PIVOTS: 'reached the maximum number of pivots',
+    StopReason.MAX_SECONDS: 'reached the maximum solving time',
+    StopReason.TARGET_OBJECTIVE: 'reached the target objective'
+}
+
 failed_notification_backend_imports: set[str] = set()
 notification_senders = {
     'null': lambda summary, body = '', urgency = NotificationUrgency.NORMAL, id_to_replace = 0: 0
@@ -52,6 +83,16 @@ class MainWindow(QMainWindow):
     def __init__(
         self,
         qt_application_reference: QApplication,
+        docs_paths: list[pathlib.Path] | None = None,
+        # loads the docs into new registries and gives them with their
+        # fingerprint (e.g. docsloader.load_docs_registries), run in another
+        # process so must be picklable
+        reload_docs: (
+            Callable[[], tuple[tuple[dict, ...], str | None]] | None
+        ) = None,
+        # where to keep solutions between runs of the program, or None to
+        # only keep them in memory
+        solution_cache_directory: pathlib.Path | None = None,
         *args,
         **kwargs
     ) -> None:
@@ -67,26 +108,36 @@ class MainWindow(QMainWindow):
 
         self.tabs = QTabWidget()
 
-        self.problem_tab_content_widget = ProblemTabContent(
-            main_window_reference=self
-        )
-        self.solution_tab_content_widget = SolutionTabContent()
+        with startupprofile.phase('problem tab'):
+            self.problem_tab_content_widget = ProblemTabContent(
+                main_window_reference=self
+            )
+        with startupprofile.phase('solution tab'):
+            self.solution_tab_content_widget = SolutionTabContent()
 
         # add the tabs
         self.tabs.addTab(self.problem_tab_content_widget, 'Problem')
         self.tabs.addTab(self.solution_tab_content_widget, 'Solution')
-        self.tabs.addTab(
-            SettingsTabContent(
-                self.settings,
-                failed_notification_backend_imports
-            ),
-            'Settings'
-        )
+        with startupprofile.phase('settings tab'):
+            self.tabs.addTab(
+                SettingsTabContent(
+                    self.settings,
+                    failed_notification_backend_imports
+                ),
+                'Settings'
+            )
 
         # set the tab layout as the main widget
         self.setCentralWidget(self.tabs)
 
-        self.simplex_worker_thread: SimplexWorker = None
+        self.simplex_worker_thread: SimplexWorker | ProcessSimplexWorker = None
+
+        # solutions of problems that have been solved before, for the docs
+        # that are loaded
+        self.solution_cache = SolutionCache(
+            solution_cache_directory,
+            docsloader.get_docs_fingerprint()
+        )
 
         self.thread_pool = QThreadPool()
         MainWindow.logger.info(
@@ -99,8 +150,83 @@ class MainWindow(QMainWindow):
         # note that this has to be in the self namespace so that it doesnt get
         # deleted when the constructor goes out of scope (which causes it to
         # never be rendered)
-        self.progress_dialog = CustomProgressDialog(
-            self.handle_cancellation_request
+        with startupprofile.phase('progress dialog'):
+            self.progress_dialog = CustomProgressDialog(
+                self.handle_cancellation_request
+            )
+
+        # reload the docs whenever they change (e.g. the game was updated),
+        # if given the means to
+        self.reload_docs = reload_docs
+        self.docs_watcher: docsreload.DocsWatcher | None = None
+        # the docs being loaded in another process, if they are
+        self.docs_reload: Future | None = None
+        if docs_paths is not None and reload_docs is not None:
+            self.docs_watcher = docsreload.DocsWatcher(docs_paths)
+            self.docs_poll_timer = QTimer(self)
+            self.docs_poll_timer.timeout.connect(self.poll_docs)
+            self.docs_poll_timer.start(DOCS_POLL_INTERVAL_MS)
+
+    def poll_docs(self):
+        if self.docs_reload is not None:
+            if self.docs_reload.done():
+                self.finish_docs_reload()
+            return
+        if not self.docs_watcher.poll():
+            return
+        MainWindow.logger.info('Docs changed, reloading them')
+        # parsed in a process that is not forked from this one (which has
+        # other threads), so that the window stays responsive
+        executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=get_fork_safe_context()
+        )
+        self.docs_reload = executor.submit(self.reload_docs)
+        # the process exits once it has loaded the docs
+        executor.shutdown(wait=False)
+
+    def finish_docs_reload(self):
+        if self.simplex_worker_thread is not None:
+            # the worker is reading the registries, so wait for it to finish
+            # (this is checked again on the next poll)
+            return
+        docs_reload = self.docs_reload
+        self.docs_reload = None
+        try:
+            new_registries, docs_fingerprint = docs_reload.result()
+            docs_diff = docsreload.apply_registries(new_registries)
+        except Exception:
+            MainWindow.logger.error(
+                'Failed to reload the docs, keeping what was loaded before',
+                exc_info=True
+            )
+            notification_senders[
+                self.settings.value('notifications/backend')
+            ](
+                'Reloading failed',
+                'The docs file changed but could not be loaded.  Everything '
+                'that was loaded before is still available.  See the program '
+                'log or the console for more info.',
+                NotificationUrgency.CRITICAL
+            )
+            return
+        finally:
+            # not retried until the docs change again
+            self.docs_watcher.mark_loaded()
+        docsloader.set_docs_fingerprint(docs_fingerprint)
+        # solutions cached for the old docs refer to their items and recipes
+        self.solution_cache.set_docs_fingerprint(docs_fingerprint)
+        if docs_diff.is_empty():
+            return
+        self.problem_tab_content_widget.apply_docs_diff(docs_diff)
+        notification_senders[
+            self.settings.value('notifications/backend')
+        ](
+            'Docs reloaded',
+            f'{len(docs_diff.items.added)} items and '
+            f'{len(docs_diff.recipes.added)} recipes added, '
+            f'{len(docs_diff.items.removed)} items and '
+            f'{len(docs_diff.recipes.removed)} recipes removed'
         )
 
     def closeEvent(self, event):
@@ -112,8 +238,11 @@ class MainWindow(QMainWindow):
     def handle_cancellation_request(self):
         self.simplex_worker_thread.cancel_soon(False)
 
-    def process_simplex_progress(self, progress: int):
-        self.progress_dialog.set_pivots(progress)
+    def process_build_progress(self, steps_done: int, total_steps: int):
+        self.progress_dialog.set_build_progress(steps_done, total_steps)
+
+    def process_simplex_progress(self, solve_progress: SolveProgress):
+        self.progress_dialog.set_progress(solve_progress)
 
     def process_simplex_terminate(self):
         self.simplex_worker_thread = None
@@ -133,12 +262,90 @@ class MainWindow(QMainWindow):
             exc_info=error_data
         )
 
+    def process_sensitivity_result(self, report):
+        self.solution_tab_content_widget.show_sensitivity_report(report)
+
+    def process_analysis_progress(self, analysis_progress):
+        if isinstance(analysis_progress, SubsetSearchProgress):
+            self.progress_dialog.set_status(
+                f'{analysis_progress.nodes_evaluated} nodes searched, best '
+                f'found {float(analysis_progress.incumbent_value):.6g} '
+                f'(at most {float(analysis_progress.gap):.6g} from optimal)'
+            )
+        elif isinstance(analysis_progress, IntegerSearchProgress):
+            if analysis_progress.incumbent_value is None:
+                self.progress_dialog.set_status(
+                    f'{analysis_progress.nodes_evaluated} nodes searched, no '
+                    'whole-number solution found yet'
+                )
+            else:
+                self.progress_dialog.set_status(
+                    f'{analysis_progress.nodes_evaluated} nodes searched, '
+                    f'best found {float(analysis_progress.incumbent_value):.6g} '
+                    f'(at most {float(analysis_progress.gap):.6g} from optimal)'
+                )
+
+    def process_analysis_result(self, analysis_result):
+        if isinstance(analysis_result, ParametricSweep):
+            self.solution_tab_content_widget.show_parametric_sweep(
+                analysis_result
+            )
+        elif isinstance(analysis_result, CandidateRanking):
+            self.solution_tab_content_widget.show_alternate_ranking(
+                analysis_result
+            )
+        elif isinstance(analysis_result, IntegerSolution):
+            self.show_integer_solution(analysis_result)
+        elif isinstance(analysis_result, SubsetSearchResult):
+            self.solution_tab_content_widget.show_unlock_search(
+                analysis_result
+            )
+        else:
+            MainWindow.logger.warning(
+                'Unknown analysis result of type '
+                f'{type(analysis_result).__name__}, ignoring'
+            )
+
+    def show_integer_solution(self, solution: IntegerSolution):
+        # replaces the solution of the relaxation, which has already been
+        # shown by process_simplex_result
+        self.solution_tab_content_widget.clear_solution()
+        if solution.objective_value is None:
+            notification_senders[
+                self.settings.value('notifications/backend')
+            ](
+                'No whole-number solution',
+                'There is no solution with whole numbers of machines',
+                NotificationUrgency.CRITICAL
+            )
+            return
+        self.show_solution(solution.variable_values)
+        self.solution_tab_content_widget.set_optimality_gap(solution.gap)
+
+    def process_snapshot(self, solve_snapshot: SolveSnapshot):
+        # replaces the previous snapshot
+        self.solution_tab_content_widget.clear_solution()
+        self.show_solution(solve_snapshot.variable_values)
+        self.solution_tab_content_widget.set_not_optimal(
+            f'still solving, {solve_snapshot.pivots} pivots so far'
+        )
+
+    def process_not_optimal(self, stop_reason: StopReason):
+        self.solution_tab_content_widget.set_not_optimal(
+            STOP_REASON_DESCRIPTIONS[stop_reason]
+        )
+
     def process_simplex_result(self, result: list):
+        # replaces any snapshot of the solution reached so far
+        self.solution_tab_content_widget.clear_solution()
         notification_senders[
             self.settings.value('notifications/backend')
         ](
             'Optimisation complete', 'View the results in the Solution tab'
         )
+        self.show_solution(result)
+
+    def show_solution(self, result: list):
         # TODO: this could easily go into the solution tab content widget file
         total_power_usage = float()
         for var_id, var_val in result:
@@ -0,0 +1,10 @@
+__all__ = [
+        "problemspec",
+        "problembuilder",
+        "solving",
+        "batch",
+        "solverprocess",
+        "server",
+        "distributed",
+        "portfolio"
+    ]
@@ -0,0 +1,147 @@
+"""Solving many problem files (scenarios) at once on a pool of worker
+processes.
+
+The docs are loaded once, in this process, and the registries are handed to
+each worker process when it starts.  If the workers are forked (the default
+on Linux) they are not even copied, since the workers already have them.
+Otherwise they are pickled once per worker, which is still much quicker than
+each worker loading the docs (or even the docs cache) itself.
+
+Results are given as each scenario finishes, rather than in the order the
+scenarios were given, so that a slow scenario does not hold up the rest.
+"""
+import gc
+import logging
+import os
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, NamedTuple, Sequence
+
+from satisfactoryobjects.itemhandler import items
+from satisfactoryobjects.machinehandler import machines
+from satisfactoryobjects.recipehandler import recipes
+
+from .problemspec import ProblemSpecError, load_problem_spec
+from .solving import solve_problem, solution_to_json
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+class ScenarioResult(NamedTuple):
+    problem_path: pathlib.Path
+    # as given by solution_to_json, or None if the scenario failed
+    solution: dict | None
+    # why the scenario failed, or None if it was solved
+    error: str | None
+    # wall time taken to read and solve the scenario
+    seconds: float
+
+    def to_json(self) -> dict:
+        if self.error is not None:
+            return {
+                'problem': str(self.problem_path),
+                'error': self.error,
+                'seconds': self.seconds
+            }
+        return {
+            'problem': str(self.problem_path),
+            'solution': self.solution,
+            'seconds': self.seconds
+        }
+
+
+def solve_scenario(
+    problem_path: pathlib.Path,
+    exact: bool = False
+) -> ScenarioResult:
+    '''Read and solve a single problem file.  The whole-number search (if
+    the problem asks for one) is run in this process, since the scenarios
+    are already spread over the processes.'''
+    logger = toplevel_logger.getChild('solve_scenario')
+
+    start = time.perf_counter()
+    solution = None
+    error = None
+    try:
+        solution = solution_to_json(
+            solve_problem(load_problem_spec(problem_path), workers=0),
+            exact
+        )
+    except (OSError, ProblemSpecError) as e:
+        error = str(e)
+    except Exception as e:
+        # a bug rather than a bad problem file, but the rest of the batch
+        # can still be solved
+        logger.exception(f'Scenario {problem_path} failed')
+        error = repr(e)
+    return ScenarioResult(
+        problem_path,
+        solution,
+        error,
+        time.perf_counter() - start
+    )
+
+
+def initialise_worker(registries: tuple[dict, dict, dict]) -> None:
+    '''Fill the registries of a worker process with those of the process
+    that started it'''
+    # the registries are all sent together so that the items and machines in
+    # the recipes stay the same objects as those in the other registries
+    for registry, contents in zip((items, machines, recipes), registries):
+        if registry is contents:
+            # forked, so already filled
+            continue
+        # updated in place since other modules hold references to them
+        registry.clear()
+        registry.update(contents)
+    # nothing that already exists will become garbage, so stop the garbage
+    # collector from looking through it (if the worker was forked, this is
+    # the whole heap of the parent, including the registries)
+    gc.freeze()
+
+
+def iter_scenario_results(
+    problem_paths: Sequence[pathlib.Path],
+    workers: int | None = None,
+    exact: bool = False
+) -> Iterator[ScenarioResult]:
+    '''Solve each problem file with the registries as they are in this
+    process, giving the result of each as soon as it is finished.
+
+    The scenarios are solved on a pool of worker processes (at most workers
+    of them, or os.cpu_count() if workers is None), or one after the other in
+    this process if workers is 0 or 1.  Scenarios that fail to be read or
+    solved give a result with an error instead of stopping the batch.
+    '''
+    logger = toplevel_logger.getChild('iter_scenario_results')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(problem_paths))
+    if workers <= 1:
+        for problem_path in problem_paths:
+            yield solve_scenario(problem_path, exact)
+        return
+
+    logger.info(
+        f'Solving {len(problem_paths)} scenarios on {workers} worker '
+        'processes'
+    )
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=initialise_worker,
+        initargs=((items, machines, recipes),)
+    ) as executor:
+        futures = {
+            executor.submit(solve_scenario, problem_path, exact): problem_path
+            for problem_path
+            in problem_paths
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # e.g. the worker process was killed
+                logger.error(f'Scenario {futures[future]} failed: {e!r}')
+                yield ScenarioResult(futures[future], None, repr(e), 0.0)
@@ -0,0 +1,523 @@
+"""Solving problems on worker processes that connect over TCP, possibly from
+other machines.
+
+A Coordinator listens for workers and hands each problem it is given to one
+of them, and run_worker connects to a coordinator and solves what it is sent
+until the coordinator goes away.  Each worker loads the docs itself, so every
+machine must have the same docs (or the same docs cache) as the others.
+
+Each message is a line of UTF-8 JSON with a "type":
+    worker to coordinator:
+        {"type": "hello", "version": 1, "name": str}
+        {"type": "heartbeat"}
+        {"type": "result", "task_id": str, "solution": {...} or
+         "error": str, "invalid": bool, "seconds": float}
+    coordinator to worker:
+        {"type": "task", "task_id": str, "problem": {...}, "exact": bool}
+        {"type": "cancel", "task_id": str}
+JSON rather than pickle, so that neither end can be made to run code by
+whatever it is connected to.
+
+Each worker is given up to prefetch tasks at a time, so that it has the next
+one to hand as soon as it finishes the last.  Once there are no more tasks to
+hand out, a worker that runs out of work steals the last task given to the
+worker with the most waiting, which is told to cancel it.  A worker sends a
+heartbeat every HEARTBEAT_INTERVAL seconds, including while solving, and one
+that is not heard from for heartbeat_timeout seconds (or whose connection
+drops) is treated as lost: its tasks are given to the other workers, up to
+max_attempts times each before the task fails.
+"""
+import collections
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Iterator, Mapping, NamedTuple
+
+from satisfactoryobjects.itemhandler import items
+from satisfactoryobjects.machinehandler import machines
+from satisfactoryobjects.recipehandler import recipes
+
+from .batch import initialise_worker
+from .problemspec import (
+    ProblemSpec,
+    ProblemSpecError,
+    problem_spec_from_dict,
+    problem_spec_to_dict
+)
+from .solving import solve_problem, solution_to_json
+
+toplevel_logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 8151
+# seconds
+HEARTBEAT_INTERVAL = 1.0
+DEFAULT_HEARTBEAT_TIMEOUT = 10.0
+DEFAULT_PREFETCH = 2
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class TaskResult(NamedTuple):
+    task_id: str
+    # as given by solution_to_json, or None if the task failed
+    solution: dict | None
+    # why the task failed, or None if it was solved
+    error: str | None
+    # the number of workers the task was given to, including ones that were
+    # lost while solving it
+    attempts: int
+    # the name of the worker that solved the task, or None if it was not
+    # solved by any
+    worker: str | None
+    # time taken by the worker to solve the task
+    seconds: float
+
+
+class _Task:
+    __slots__ = ('task_id', 'problem', 'attempts')
+
+    def __init__(self, task_id: str, problem: dict):
+        self.task_id = task_id
+        self.problem = problem
+        self.attempts = 0
+
+
+class _WorkerConnection:
+    __slots__ = ('name', 'sock', 'send_lock', 'last_heard', 'tasks')
+
+    def __init__(self, name: str, sock: socket.socket):
+        self.name = name
+        self.sock = sock
+        self.send_lock = threading.Lock()
+        self.last_heard = time.monotonic()
+        # the tasks given to the worker that it has not given results for,
+        # in the order they were given (so the first is the one being solved)
+        self.tasks: dict[str, _Task] = dict()
+
+
+def _send_message(
+    sock: socket.socket,
+    send_lock: threading.Lock,
+    message: dict
+) -> None:
+    encoded_message = json.dumps(message).encode('utf-8') + b'\n'
+    with send_lock:
+        sock.sendall(encoded_message)
+
+
+def _iter_messages(sock: socket.socket) -> Iterator[dict]:
+    '''Give each message received until the connection is closed'''
+    with sock.makefile('rb') as fptr:
+        for line in fptr:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError(f'Expected a JSON object, not {line!r}')
+            yield message
+
+
+class Coordinator:
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = DEFAULT_PORT,
+        prefetch: int = DEFAULT_PREFETCH,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        heartbeat_timeout: float = DEFAULT_HEARTBEAT_TIMEOUT,
+        exact: bool = False
+    ):
+        '''Listen for workers on host and port (port 0 picks a free port, see
+        address).  Listening on localhost only means that workers can only
+        connect from this machine.'''
+        self.prefetch = max(prefetch, 1)
+        self.max_attempts = max_attempts
+        self.heartbeat_timeout = heartbeat_timeout
+        self.exact = exact
+        # guards everything below
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers: list[_WorkerConnection] = list()
+        # tasks that are not given to any worker, in the order to give them
+        self._pending: collections.deque[_Task] = collections.deque()
+        self._results: queue.Queue[TaskResult] = queue.Queue()
+        # set along with _closed, for threads to wait on
+        self._closing = threading.Event()
+
+        self._listener = socket.create_server((host, port))
+        self.address: tuple[str, int] = self._listener.getsockname()[:2]
+        self._threads = [
+            threading.Thread(target=self._accept_workers, daemon=True),
+            threading.Thread(target=self._check_heartbeats, daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def get_worker_names(self) -> list[str]:
+        with self._lock:
+            return [worker.name for worker in self._workers]
+
+    def solve(
+        self,
+        problems: Mapping[str, ProblemSpec]
+    ) -> Iterator[TaskResult]:
+        '''Start solving each problem (by task ID) on the workers, giving an
+        iterator over the result of each as soon as it is finished (which
+        blocks until workers connect if there are none).  Only one solve can
+        be run at a time.'''
+        logger = toplevel_logger.getChild('Coordinator.solve')
+
+        with self._lock:
+            for task_id, spec in problems.items():
+                self._pending.append(
+                    _Task(task_id, problem_spec_to_dict(spec))
+                )
+            if len(self._workers) == 0:
+                logger.info(
+                    f'Waiting for workers to connect to {self.address}'
+                )
+            self._dispatch()
+        return self._iter_results(len(problems))
+
+    def _iter_results(self, n_results: int) -> Iterator[TaskResult]:
+        for _ in range(n_results):
+            yield self._results.get()
+
+    def close(self) -> None:
+        '''Stop listening and disconnect the workers, which then exit'''
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        self._closing.set()
+        # closing the listener alone does not stop a blocking accept
+        try:
+            self._listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._listener.close()
+        for thread in self._threads:
+            thread.join()
+        for worker in workers:
+            self._disconnect(worker)
+
+    def _accept_workers(self) -> None:
+        logger = toplevel_logger.getChild('Coordinator._accept_workers')
+
+        while True:
+            try:
+                sock, address = self._listener.accept()
+            except OSError:
+                # closed
+                break
+            logger.debug(f'Connection from {address}')
+            threading.Thread(
+                target=self._serve_worker,
+                args=(sock,),
+                daemon=True
+            ).start()
+
+    def _serve_worker(self, sock: socket.socket) -> None:
+        logger = toplevel_logger.getChild('Coordinator._serve_worker')
+
+        # so that results are sent as soon as they are ready
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        worker = None
+        try:
+            messages = _iter_messages(sock)
+            hello = next(messages, None)
+            if (
+                hello is None
+                or hello.get('type') != 'hello'
+                or hello.get('version') != PROTOCOL_VERSION
+            ):
+                logger.warning(f'Not a worker (or the wrong version): {hello}')
+                return
+            worker = _WorkerConnection(str(hello.get('name')), sock)
+            with self._lock:
+                if self._closed:
+                    return
+                self._workers.append(worker)
+                logger.info(
+                    f'Worker {worker.name} connected '
+                    f'({len(self._workers)} workers)'
+                )
+                self._dispatch()
+            for message in messages:
+                with self._lock:
+                    worker.last_heard = time.monotonic()
+                    if message.get('type') == 'result':
+                        self._handle_result(worker, message)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Connection to worker failed: {e!r}')
+        finally:
+            sock.close()
+            if worker is not None:
+                with self._lock:
+                    self._lose_worker(worker)
+
+    def _check_heartbeats(self) -> None:
+        logger = toplevel_logger.getChild('Coordinator._check_heartbeats')
+
+        while not self._closing.wait(self.heartbeat_timeout / 4):
+            with self._lock:
+                now = time.monotonic()
+                silent_workers = [
+                    worker
+                    for worker
+                    in self._workers
+                    if now - worker.last_heard > self.heartbeat_timeout
+                ]
+            for worker in silent_workers:
+                logger.warning(
+                    f'No heartbeat from worker {worker.name} for '
+                    f'{self.heartbeat_timeout} s'
+                )
+                # which makes its _serve_worker lose it
+                self._disconnect(worker)
+
+    def _disconnect(self, worker: _WorkerConnection) -> None:
+        try:
+            worker.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            # already disconnected
+            pass
+
+    def _send(self, worker: _WorkerConnection, message: dict) -> None:
+        try:
+            _send_message(worker.sock, worker.send_lock, message)
+        except OSError:
+            # found out by _serve_worker
+            pass
+
+    # the methods below must be called with self._lock held
+
+    def _handle_result(self, worker: _WorkerConnection, message: dict) -> None:
+        task = worker.tasks.pop(message.get('task_id'), None)
+        if task is None:
+            # e.g. stolen from it after it started solving it, and solved
+            # by the thief already
+            return
+        if 'error' in message:
+            result = TaskResult(
+                task.task_id,
+                None,
+                str(message['error']),
+                task.attempts,
+                worker.name,
+                message.get('seconds', 0.0)
+            )
+        else:
+            result = TaskResult(
+                task.task_id,
+                message.get('solution'),
+                None,
+                task.attempts,
+                worker.name,
+                message.get('seconds', 0.0)
+            )
+        self._results.put(result)
+        self._dispatch()
+
+    def _lose_worker(self, worker: _WorkerConnection) -> None:
+        logger = toplevel_logger.getChild('Coordinator._lose_worker')
+
+        if worker not in self._workers:
+            return
+        self._workers.remove(worker)
+        if not self._closed:
+            logger.warning(
+                f'Lost worker {worker.name} with {len(worker.tasks)} tasks '
+                f'({len(self._workers)} workers left)'
+            )
+        # retried before the tasks that have not been tried yet
+        for task in reversed(worker.tasks.values()):
+            if task.attempts >= self.max_attempts:
+                self._results.put(TaskResult(
+                    task.task_id,
+                    None,
+                    f'Lost {task.attempts} workers while solving',
+                    task.attempts,
+                    None,
+                    0.0
+                ))
+            else:
+                self._pending.appendleft(task)
+        worker.tasks.clear()
+        self._dispatch()
+
+    def _give_task(self, worker: _WorkerConnection, task: _Task) -> None:
+        task.attempts += 1
+        worker.tasks[task.task_id] = task
+        self._send(
+            worker,
+            {
+                'type': 'task',
+                'task_id': task.task_id,
+                'problem': task.problem,
+                'exact': self.exact
+            }
+        )
+
+    def _dispatch(self) -> None:
+        '''Give out pending tasks, and steal tasks for idle workers once
+        there are none'''
+        logger = toplevel_logger.getChild('Coordinator._dispatch')
+
+        if self._closed:
+            return
+        for worker in sorted(self._workers, key=lambda w: len(w.tasks)):
+            while self._pending and len(worker.tasks) < self.prefetch:
+                self._give_task(worker, self._pending.popleft())
+        if self._pending:
+            return
+        for worker in self._workers:
+            if len(worker.tasks) != 0:
+                continue
+            victim = max(self._workers, key=lambda w: len(w.tasks))
+            # the first task of the victim is being solved, so only those
+            # behind it can be stolen
+            if len(victim.tasks) < 2:
+                break
+            task_id, task = victim.tasks.popitem()
+            logger.debug(
+                f'Worker {worker.name} stealing {task_id} from {victim.name}'
+            )
+            self._send(victim, {'type': 'cancel', 'task_id': task_id})
+            # it was never started, so it does not count as an attempt
+            task.attempts -= 1
+            self._give_task(worker, task)
+
+
+def _solve_task(message: dict) -> dict:
+    start = time.perf_counter()
+    result = {'type': 'result', 'task_id': message['task_id']}
+    try:
+        result['solution'] = solution_to_json(
+            solve_problem(
+                problem_spec_from_dict(message['problem']),
+                workers=0
+            ),
+            message.get('exact', False)
+        )
+    except ProblemSpecError as e:
+        result['error'] = str(e)
+        result['invalid'] = True
+    except Exception as e:
+        toplevel_logger.getChild('_solve_task').exception('Solve failed')
+        result['error'] = repr(e)
+        result['invalid'] = False
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_worker(
+    address: tuple[str, int],
+    name: str | None = None,
+    heartbeat_interval: float = HEARTBEAT_INTERVAL
+) -> None:
+    '''Solve the tasks sent by the coordinator at address with the
+    registries as they are in this process, until the coordinator closes the
+    connection'''
+    logger = toplevel_logger.getChild('run_worker')
+
+    if name is None:
+        name = f'{socket.gethostname()}:{os.getpid()}'
+    sock = socket.create_connection(address)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    send_lock = threading.Lock()
+    # tasks received but not started, guarded by the condition
+    tasks: collections.deque[dict] = collections.deque()
+    condition = threading.Condition()
+    disconnected = threading.Event()
+
+    def send_heartbeats():
+        while not disconnected.wait(heartbeat_interval):
+            try:
+                _send_message(sock, send_lock, {'type': 'heartbeat'})
+            except OSError:
+                break
+
+    def receive_messages():
+        try:
+            for message in _iter_messages(sock):
+                with condition:
+                    if message.get('type') == 'task':
+                        tasks.append(message)
+                    elif message.get('type') == 'cancel':
+                        for task in tasks:
+                            if task['task_id'] == message.get('task_id'):
+                                tasks.remove(task)
+                                break
+                    condition.notify()
+        except (OSError, ValueError) as e:
+            logger.warning(f'Connection to coordinator failed: {e!r}')
+        finally:
+            with condition:
+                disconnected.set()
+                condition.notify()
+
+    _send_message(
+        sock,
+        send_lock,
+        {'type': 'hello', 'version': PROTOCOL_VERSION, 'name': name}
+    )
+    logger.info(f'Connected to coordinator at {address} as {name}')
+    threads = [
+        threading.Thread(target=send_heartbeats, daemon=True),
+        threading.Thread(target=receive_messages, daemon=True)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            with condition:
+                condition.wait_for(lambda: tasks or disconnected.is_set())
+                if disconnected.is_set():
+                    break
+                message = tasks.popleft()
+            logger.debug(f'Solving {message["task_id"]}')
+            try:
+                _send_message(sock, send_lock, _solve_task(message))
+            except OSError:
+                break
+    finally:
+        disconnected.set()
+        sock.close()
+    logger.info('Disconnected from coordinator')
+
+
+def _run_worker_process(
+    address: tuple[str, int],
+    registries: tuple[dict, dict, dict]
+) -> None:
+    initialise_worker(registries)
+    run_worker(address)
+
+
+def run_workers(
+    address: tuple[str, int],
+    processes: int | None = None
+) -> None:
+    '''Run a worker on each of processes worker processes (os.cpu_count()
+    of them if processes is None, or just this process if it is 0 or 1),
+    until the coordinator at address closes the connections'''
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 1:
+        run_worker(address)
+        return
+    worker_processes = [
+        multiprocessing.Process(
+            target=_run_worker_process,
+            args=(address, (items, machines, recipes))
+        )
+        for _
+        in range(processes)
+    ]
+    for worker_process in worker_processes:
+        worker_process.start()
+    for worker_process in worker_processes:
+        worker_process.join()
@@ -0,0 +1,175 @@
+"""Solving a problem with several pivot rules at once, in separate processes,
+and keeping whichever gives a verified optimal solution first.
+
+Which pivot rule takes the fewest (or quickest) pivots depends on the
+problem, and is hard to tell in advance, so with enough cores it is quicker
+to try them all and stop the rest as soon as one has finished.  A solution
+only wins if it is verified optimal, i.e. feasible and proven optimal by its
+duals when checked exactly against the problem (see solve_problem); if none
+is, the first solution given is used anyway.
+The winner is logged (with how long it took) so that the default rule can be
+tuned for each kind of problem.
+
+The processes are started in the same way as SolverProcess (so if they are
+forked the registries are not even copied), and the losers are terminated
+since the simplex can not be interrupted from outside.
+"""
+import logging
+import multiprocessing
+import time
+from multiprocessing.connection import Connection, wait
+from typing import NamedTuple, Sequence
+
+from optimisationsolver.anytime import SolveLimits
+from optimisationsolver.simplex import PivotRule
+
+from satisfactoryobjects.itemhandler import items
+from satisfactoryobjects.machinehandler import machines
+from satisfactoryobjects.recipehandler import recipes
+
+from .batch import initialise_worker
+from .problemspec import ProblemSpec, ProblemSpecError
+from .solving import ProblemSolution, solve_problem
+
+toplevel_logger = logging.getLogger(__name__)
+
+DEFAULT_PIVOT_RULES = (
+    PivotRule.DANTZIG,
+    PivotRule.STEEPEST_EDGE,
+    PivotRule.BLAND
+)
+
+
+class PortfolioError(Exception):
+    '''Raised when every pivot rule failed to solve the problem, with why
+    each one failed as the message'''
+    pass
+
+
+class PortfolioResult(NamedTuple):
+    solution: ProblemSolution
+    # the pivot rule that gave the solution
+    winner: PivotRule
+    # wall time from starting the processes to getting the solution
+    seconds: float
+
+
+def _run_portfolio_process(
+    connection: Connection,
+    registries: tuple[dict, dict, dict],
+    spec: ProblemSpec,
+    pivot_rule: PivotRule,
+    limits: SolveLimits
+) -> None:
+    logger = toplevel_logger.getChild('_run_portfolio_process')
+
+    initialise_worker(registries)
+    try:
+        # the whole-number search (if any) is run in this process, since
+        # the other pivot rules already have the other cores
+        message = (solve_problem(spec, 0, limits, pivot_rule), None)
+    except ProblemSpecError as e:
+        # the same for every pivot rule, so it is given as it is
+        message = (None, e)
+    except Exception as e:
+        logger.exception(f'Solve with {pivot_rule.value} failed')
+        message = (None, repr(e))
+    connection.send(message)
+    connection.close()
+
+
+def solve_portfolio(
+    spec: ProblemSpec,
+    pivot_rules: Sequence[PivotRule] = DEFAULT_PIVOT_RULES,
+    limits: SolveLimits = SolveLimits()
+) -> PortfolioResult:
+    '''Solve the problem with each of the pivot rules at once, each in its
+    own process, and give the first verified optimal solution (or, if there
+    is none, the first solution) once the rest have been stopped.  Raises
+    ProblemSpecError if the problem is invalid, or PortfolioError if every
+    pivot rule failed.'''
+    logger = toplevel_logger.getChild('solve_portfolio')
+
+    start = time.perf_counter()
+    # connection: (process, pivot rule)
+    running: dict[Connection, tuple[multiprocessing.Process, PivotRule]] = (
+        dict()
+    )
+    fallback = None
+    errors = list()
+    try:
+        for pivot_rule in pivot_rules:
+            connection, child_connection = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_run_portfolio_process,
+                args=(
+                    child_connection,
+                    (items, machines, recipes),
+                    spec,
+                    pivot_rule,
+                    limits
+                ),
+                daemon=True
+            )
+            process.start()
+            # so that recv gives EOFError if the process dies
+            child_connection.close()
+            running[connection] = (process, pivot_rule)
+
+        while len(running) > 0:
+            for connection in wait(list(running)):
+                process, pivot_rule = running.pop(connection)
+                try:
+                    solution, error = connection.recv()
+                except EOFError:
+                    process.join()
+                    solution = None
+                    error = (
+                        f'Solver process exited with code {process.exitcode}'
+                    )
+                finally:
+                    connection.close()
+                seconds = time.perf_counter() - start
+                if isinstance(error, ProblemSpecError):
+                    raise error
+                if error is not None:
+                    errors.append(f'{pivot_rule.value}: {error}')
+                    continue
+                result = PortfolioResult(solution, pivot_rule, seconds)
+                if solution.optimal:
+                    losers = [
+                        other_rule.value
+                        for _, other_rule
+                        in running.values()
+                    ]
+                    # with what kind of problem it was, to tune the default
+                    # pivot rule by
+                    logger.info(
+                        f'Won by {pivot_rule.value} in {seconds:.3f} s and '
+                        f'{solution.pivots} pivots, with '
+                        f'{len(spec.targets)} targets, '
+                        f'{len(spec.availability)} resources, '
+                        f'{len(spec.disabled_recipes)} disabled recipes and '
+                        f'whole machines {spec.whole_machines}, stopping '
+                        f'{losers}'
+                    )
+                    return result
+                logger.info(
+                    f'{pivot_rule.value} gave a solution that is not '
+                    f'verified optimal in {seconds:.3f} s'
+                )
+                if fallback is None:
+                    fallback = result
+    finally:
+        for connection, (process, _) in running.items():
+            process.terminate()
+            process.join()
+            connection.close()
+
+    if fallback is not None:
+        logger.warning(
+            'No pivot rule gave a verified optimal solution, giving the one '
+            f'from {fallback.winner.value}'
+        )
+        return fallback
+    raise PortfolioError('; '.join(errors))
@@ -0,0 +1,307 @@
+"""Building the linear programming problem for a ProblemSpec from the items
+and recipes that have been loaded from the docs."""
+import logging
+from fractions import Fraction
+from itertools import chain
+from typing import Callable
+
+from optimisationsolver.simplex import (
+    Inequality,
+    ObjectiveEquation,
+    Variable
+)
+from optimisationsolver.pricing import CandidateColumn, extract_columns
+
+from utils.directionenums import Direction
+
+from satisfactoryobjects.items import Item
+from satisfactoryobjects.recipes import Recipe
+from satisfactoryobjects.itemvariabletype import (
+    ItemVariableType,
+    ItemVariableTypes
+)
+from satisfactoryobjects.itemconstrainttype import (
+    ItemConstraintType,
+    ItemConstraintTypes
+)
+from satisfactoryobjects.lookuperrors import RecipeLookupError
+# CAUTION: these better have been populated already, or things will definitely
+# break
+from satisfactoryobjects.itemhandler import items
+from satisfactoryobjects.recipehandler import recipes
+from satisfactoryobjects.recipelookup import lookup_recipes
+
+from .problemspec import ProblemSpec, ProblemSpecError
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+def get_item(class_name: str) -> Item:
+    try:
+        return items[class_name]
+    except KeyError:
+        raise ProblemSpecError(f'No item has the class name {class_name}')
+
+
+def get_disabled_recipes(spec: ProblemSpec) -> list[Recipe]:
+    '''Get the recipes that the spec disables, in the order they were
+    loaded.  Recipes that do not exist (e.g. from a mod that has since been
+    removed) are ignored.'''
+    logger = toplevel_logger.getChild('get_disabled_recipes')
+
+    for class_name in spec.disabled_recipes - recipes.keys():
+        logger.warning(
+            f'No recipe has the class name {class_name}, so it cannot be '
+            'disabled'
+        )
+    return [
+        recipe
+        for class_name, recipe
+        in recipes.items()
+        if class_name in spec.disabled_recipes
+    ]
+
+
+def build_problem(
+    spec: ProblemSpec,
+    disabled_recipes: list[Recipe] | None = None,
+    progress: Callable[[int, int], None] | None = None
+) -> list[Inequality]:
+    '''Build the linear programming problem for the spec.  disabled_recipes
+    overrides the recipes that the spec disables, if it is not None.  If
+    progress is given, it is called with the number of steps done and the
+    total number of steps after each item and recipe is added.'''
+    logger = toplevel_logger.getChild('build_problem')
+
+    if disabled_recipes is None:
+        disabled_recipes = get_disabled_recipes(spec)
+
+    # each item is visited twice, then each recipe once
+    total_steps = 2 * len(items) + len(recipes)
+    steps_done = 0
+
+    target_weights: list[tuple[Item, float]] = [
+        (get_item(class_name), weight)
+        for class_name, weight
+        in spec.targets
+    ]
+    # used to more quickly filter what items need output "virtual recipes"
+    # created
+    target_items: set[Item] = {
+        target_weight[0]
+        for target_weight
+        in target_weights
+    }
+
+    manually_set_constraints: set[Item] = set()
+    problem_constraints: list[Inequality] = list()
+
+    manually_set_constraint_values: dict[Item, Fraction] = dict()
+
+    # add the constraints for the input items
+    for available_resource, available_resource_rate in spec.availability:
+        number_per_minute = available_resource_rate
+        if number_per_minute == 0:
+            logger.warning(
+                'Constraint for item with id '
+                f'{available_resource}'
+                ' is set to zero!  Skipping.'
+            )
+        else:
+            resource = get_item(available_resource)
+            manually_set_constraints.add(resource)
+            manually_set_constraint_values[resource] = Fraction(
+                number_per_minute
+            )
+
+    # add the constraints for the absolute numbers of items
+    for resource in items.values():
+        constraint_variables: list[Variable] = [
+            Variable(
+                ItemVariableType(resource, ItemVariableTypes.TOTAL),
+                1
+            )
+        ]
+        # add data on the recipes producing this item
+        try:
+            producing_recipes = lookup_recipes(
+                resource,
+                disabled_recipes=disabled_recipes
+            )
+            for recipe in producing_recipes:
+                for flow_data in recipe.calc_resource_flow_rate(
+                    calculated_direction=Direction.OUT,
+                    positive_direction=Direction.IN
+                ):
+                    if flow_data.item == resource:
+                        # using recipes class identifier string instead of
+                        # the recipe object itself as recipe is unhashable
+                        constraint_variables.append(
+                            Variable(
+                                recipe.internal_class_identifier,
+                                Fraction(flow_data.amount)
+                            )
+                        )
+        except RecipeLookupError:
+            logger.debug(
+                'No recipes produce item with id '
+                f'{resource.internal_class_identifier}'
+                ', only adding data about manual input'
+            )
+
+        cons = Inequality(
+            constraint_variables,
+            (
+                manually_set_constraint_values[resource]
+                if resource in manually_set_constraints
+                else 0
+            ),
+            ItemConstraintType(resource, ItemConstraintTypes.SUPPLY)
+        )
+        problem_constraints.append(cons)
+        steps_done += 1
+        if progress is not None:
+            progress(steps_done, total_steps)
+
+    # add the constraints for the recipes
+    for resource in items.values():
+        constraint_variables: list[Variable] = [
+            Variable(
+                ItemVariableType(resource, ItemVariableTypes.TOTAL),
+                -1
+            )
+        ]
+        if resource in target_items:
+            # also TODO: put this in the try block somehow, and if the except block is triggered when this condition is met then swap the variable in the objective equation to be of the TOTAL type instead of the OUTPUT type, to keep the tableau smaller
+            constraint_variables.append(Variable(ItemVariableType(resource, ItemVariableTypes.OUTPUT), 1))
+        try:
+            for recipe in lookup_recipes(resource, True, disabled_recipes):
+                for flow_data in recipe.calc_resource_flow_rate(
+                    calculated_direction=Direction.IN,
+                    positive_direction=Direction.IN
+                ):
+                    if flow_data.item == resource:
+                        # see previous note: recipe is unhashable
+                        constraint_variables.append(
+                            Variable(
+                                recipe.internal_class_identifier,
+                                Fraction(flow_data.amount)
+                            )
+                        )
+            if len(constraint_variables) == 1:
+                logger.debug(
+                    'No feasible recipe consumes item with id '
+                    f'{resource.internal_class_identifier}'
+                    ', not adding usage constraint'
+                )
+            else:
+                problem_constraints.append(
+                    Inequality(
+                        constraint_variables,
+                        0,
+                        ItemConstraintType(
+                            resource,
+                            ItemConstraintTypes.USAGE
+                        )
+                    )
+                )
+        except RecipeLookupError:
+            logger.debug(
+                'No recipes consume item with id '
+                f'{resource.internal_class_identifier}'
+                ', not adding usage constraint unless target'
+            )
+            # TODO: with regards to above about putting in the try block:
+            # replace this logic with something better
+            if len(constraint_variables) == 2:
+                problem_constraints.append(
+                    Inequality(
+                        constraint_variables,
+                        0,
+                        ItemConstraintType(
+                            resource,
+                            ItemConstraintTypes.USAGE
+                        )
+                    )
+                )
+        steps_done += 1
+        if progress is not None:
+            progress(steps_done, total_steps)
+
+    power_usage_weight = spec.power_usage_weight
+
+    recipe_weight_vars: list[Variable] = list()
+
+    for recipe in recipes.values():
+        # TODO: this will need a separate mechanism to exclude the
+        # disabled recipes
+
+        # could turn this into a list comprehension but if more weights
+        # are added (e.g. approximate number of machines) then it would
+        # rapidly become unreadable
+        recipe_power_weight = (
+            recipe.calc_power_flow_rate(positive_direction=Direction.OUT)
+            *
+            power_usage_weight
+        )
+
+        recipe_weight_vars.append(
+            Variable(
+                recipe.internal_class_identifier,
+                Fraction(recipe_power_weight)
+            )
+        )
+        steps_done += 1
+        if progress is not None:
+            progress(steps_done, total_steps)
+
+    # add the objectives and their weights
+    problem_constraints.append(ObjectiveEquation(chain(
+        [
+            Variable(
+                ItemVariableType(
+                    target_weight[0],
+                    ItemVariableTypes.OUTPUT
+                ),
+                target_weight[1] * -1
+            )
+            for target_weight
+            in target_weights
+        ],
+        recipe_weight_vars
+    )))
+
+    return problem_constraints
+
+
+def build_problem_with_alternate_candidates(
+    spec: ProblemSpec,
+    progress: Callable[[int, int], None] | None = None
+) -> tuple[list[Inequality], list[CandidateColumn]]:
+    '''Build the linear programming problem for the spec, with the columns
+    of the disabled alternate recipes returned separately.  progress is as
+    for build_problem.'''
+    disabled_recipes = get_disabled_recipes(spec)
+    # build the problem with the disabled alternates enabled, then take
+    # their columns back out so that the problem solved is the same as
+    # for a normal run
+    problem_constraints = build_problem(
+        spec,
+        [
+            recipe
+            for recipe
+            in disabled_recipes
+            if not recipe.is_alternate
+        ],
+        progress
+    )
+    candidate_columns = extract_columns(
+        problem_constraints,
+        [
+            recipe.internal_class_identifier
+            for recipe
+            in disabled_recipes
+            if recipe.is_alternate
+        ]
+    )
+    return (problem_constraints, candidate_columns)
@@ -0,0 +1,148 @@
+"""The inputs of an optimisation, as plain data.
+
+A ProblemSpec holds everything that the Problem tab would otherwise be asked
+for: the target items and their weights, the resources that are available,
+the weight of power usage, the recipes that are disabled and whether to use
+whole numbers of machines.  Items and recipes are referred to by their class
+names, so a spec can be written in a file (JSON or TOML) and read without the
+docs having been loaded.
+
+A problem file looks like this (in TOML):
+
+    power_usage_weight = -0.1
+    disabled_recipes = ["Recipe_Alternate_Screw_C"]
+    whole_machines = false
+
+    [targets]
+    Desc_IronPlate_C = 1
+    Desc_IronRod_C = 0.5
+
+    [availability]
+    Desc_OreIron_C = 120
+
+where each target is weighted by how much producing one of it per minute is
+worth, and each available resource has the number available per minute.
+"""
+import json
+import pathlib
+import tomllib
+from dataclasses import dataclass
+from numbers import Real
+
+
+class ProblemSpecError(ValueError):
+    """Raised when a problem file or spec is not valid"""
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class ProblemSpec:
+    # (item class name, weight) for each target
+    targets: tuple[tuple[str, float], ...]
+    # (item class name, number available per minute) for each resource
+    availability: tuple[tuple[str, float], ...] = tuple()
+    # how much using one megawatt is worth (zero or negative)
+    power_usage_weight: float = 0.0
+    # class names of the recipes that may not be used
+    disabled_recipes: frozenset[str] = frozenset()
+    whole_machines: bool = False
+
+
+_KEYS = frozenset({
+    'targets',
+    'availability',
+    'power_usage_weight',
+    'disabled_recipes',
+    'whole_machines'
+})
+
+
+def _get_amounts(data: dict, key: str) -> tuple[tuple[str, float], ...]:
+    amounts = data.get(key, dict())
+    if not isinstance(amounts, dict):
+        raise ProblemSpecError(
+            f'{key} must map item class names to numbers'
+        )
+    for class_name, amount in amounts.items():
+        # bool is a subclass of int, but true is not a sensible amount
+        if not isinstance(amount, Real) or isinstance(amount, bool):
+            raise ProblemSpecError(
+                f'{key} of {class_name} must be a number, not {amount!r}'
+            )
+    return tuple(
+        (class_name, float(amount))
+        for class_name, amount
+        in amounts.items()
+    )
+
+
+def problem_spec_from_dict(data: dict) -> ProblemSpec:
+    """Make a ProblemSpec from the deserialised contents of a problem file"""
+    if not isinstance(data, dict):
+        raise ProblemSpecError('A problem must be a JSON object or TOML table')
+    unknown_keys = data.keys() - _KEYS
+    if unknown_keys:
+        raise ProblemSpecError(
+            f'Unknown keys in problem: {", ".join(sorted(unknown_keys))}'
+        )
+
+    targets = _get_amounts(data, 'targets')
+    if len(targets) == 0:
+        raise ProblemSpecError('A problem must have at least one target')
+
+    power_usage_weight = data.get('power_usage_weight', 0.0)
+    if (
+        not isinstance(power_usage_weight, Real)
+        or isinstance(power_usage_weight, bool)
+        or power_usage_weight > 0
+    ):
+        raise ProblemSpecError(
+            'power_usage_weight must be zero or a negative number'
+        )
+
+    disabled_recipes = data.get('disabled_recipes', list())
+    if not isinstance(disabled_recipes, list) or not all(
+        isinstance(recipe, str) for recipe in disabled_recipes
+    ):
+        raise ProblemSpecError(
+            'disabled_recipes must be a list of recipe class names'
+        )
+
+    whole_machines = data.get('whole_machines', False)
+    if not isinstance(whole_machines, bool):
+        raise ProblemSpecError('whole_machines must be true or false')
+
+    return ProblemSpec(
+        targets,
+        _get_amounts(data, 'availability'),
+        float(power_usage_weight),
+        frozenset(disabled_recipes),
+        whole_machines
+    )
+
+
+def problem_spec_to_dict(spec: ProblemSpec) -> dict:
+    """Make the contents of a problem file from a ProblemSpec, the inverse of
+    problem_spec_from_dict"""
+    return {
+        'targets': dict(spec.targets),
+        'availability': dict(spec.availability),
+        'power_usage_weight': spec.power_usage_weight,
+        'disabled_recipes': sorted(spec.disabled_recipes),
+        'whole_machines': spec.whole_machines
+    }
+
+
+def load_problem_spec(path: pathlib.Path) -> ProblemSpec:
+    """Read a problem file, which is TOML if its name ends in .toml and JSON
+    otherwise"""
+    try:
+        if path.suffix.lower() == '.toml':
+            with open(path, 'rb') as fptr:
+                data = tomllib.load(fptr)
+        else:
+            with open(path, 'r', encoding='utf-8') as fptr:
+                data = json.load(fptr)
+    except (tomllib.TOMLDecodeError, json.JSONDecodeError) as e:
+        raise ProblemSpecError(f'Could not parse {path}: {e}') from e
+    return problem_spec_from_dict(data)
@@ -0,0 +1,529 @@
+"""A long-running HTTP server on localhost that solves problems sent to it as
+JSON, so that the docs are only loaded once rather than for every solve.
+
+Endpoints:
+    POST /solve
+        {"problem": {...}, "timeout": seconds, "exact": bool,
+         "request_id": str}
+        where problem is in the format of headless/problemspec.py, and the
+        rest are optional.  Responds once the problem is solved (or times out,
+        or is cancelled) with
+        {"request_id": str, "status": str, "solution": {...} or
+         "error": str, "seconds": float}
+    POST /cancel
+        {"request_id": str}
+        Cancels a queued or running solve, responding with
+        {"cancelled": bool}
+    GET /metrics
+        The number of solves in each status, the depth of the queue, how busy
+        the workers are and percentiles of the time solves spend queued and
+        in total.
+
+The problems are solved on a fixed number of solver processes (see
+headless/solverprocess.py), each fed from one queue by a worker thread.  The
+number of requests queued or being solved is bounded, so that a flood of
+requests is turned away (with 503) instead of piling up.  A solve that runs
+past its timeout or is cancelled has its process terminated and replaced,
+since the simplex can not be interrupted from outside.  The timeout of a
+request counts from when it arrives, so it includes any time spent queued,
+and a request that times out or is cancelled while queued is responded to
+straight away (and skipped once a worker gets to it).
+"""
+import json
+import logging
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from enum import Enum
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .problemspec import ProblemSpec, ProblemSpecError, problem_spec_from_dict
+from .solverprocess import (
+    SolverOutcome,
+    SolverProcess,
+    get_fork_safe_context
+)
+
+toplevel_logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8150
+# seconds
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MAX_PENDING = 64
+# how often (in seconds) a worker checks whether the solve it is waiting on
+# has been cancelled or has timed out
+CANCEL_CHECK_INTERVAL = 0.05
+# how many of the latest solves the latency percentiles are taken over
+LATENCY_WINDOW = 1000
+
+
+class SolveStatus(Enum):
+    SOLVED = 'solved'
+    # the problem was rejected by the solver, e.g. an unknown item
+    INVALID = 'invalid'
+    # a bug in the solver, or the solver process died
+    FAILED = 'failed'
+    TIMED_OUT = 'timed_out'
+    CANCELLED = 'cancelled'
+    # the queue was full (or the server was stopping)
+    REJECTED = 'rejected'
+
+
+HTTP_STATUSES = {
+    SolveStatus.SOLVED: HTTPStatus.OK,
+    SolveStatus.INVALID: HTTPStatus.BAD_REQUEST,
+    SolveStatus.FAILED: HTTPStatus.INTERNAL_SERVER_ERROR,
+    SolveStatus.TIMED_OUT: HTTPStatus.GATEWAY_TIMEOUT,
+    SolveStatus.CANCELLED: HTTPStatus.CONFLICT,
+    SolveStatus.REJECTED: HTTPStatus.SERVICE_UNAVAILABLE
+}
+
+
+class RequestRejectedError(Exception):
+    def __init__(self, message: str, http_status: HTTPStatus):
+        super(RequestRejectedError, self).__init__(message)
+        self.http_status = http_status
+
+
+class SolveRequest:
+    __slots__ = (
+        'request_id',
+        'spec',
+        'exact',
+        'arrival',
+        'deadline',
+        'cancelled',
+        'done',
+        'status',
+        'outcome'
+    )
+
+    def __init__(
+        self,
+        request_id: str,
+        spec: ProblemSpec,
+        exact: bool,
+        timeout: float
+    ):
+        self.request_id = request_id
+        self.spec = spec
+        self.exact = exact
+        # time.monotonic() rather than time.perf_counter() since requests
+        # can wait for a long time
+        self.arrival = time.monotonic()
+        self.deadline = self.arrival + timeout
+        self.cancelled = threading.Event()
+        # set once status (and outcome, if the problem got to be solved) are
+        self.done = threading.Event()
+        self.status: SolveStatus | None = None
+        self.outcome: SolverOutcome | None = None
+
+    def to_json(self) -> dict:
+        response = {
+            'request_id': self.request_id,
+            'status': self.status.value
+        }
+        if self.outcome is not None and self.outcome.error is None:
+            response['solution'] = self.outcome.solution
+        elif self.outcome is not None:
+            response['error'] = self.outcome.error
+        else:
+            response['error'] = self.status.value.replace('_', ' ')
+        response['seconds'] = time.monotonic() - self.arrival
+        return response
+
+
+def get_percentiles(values: list[float]) -> dict:
+    '''Summarise values with nearest-rank percentiles'''
+    if len(values) == 0:
+        return {'count': 0}
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values),
+        **{
+            f'p{percentile}': values[
+                math.ceil(percentile / 100 * len(values)) - 1
+            ]
+            for percentile
+            in (50, 90, 99)
+        },
+        'max': values[-1]
+    }
+
+
+class SolveServer(ThreadingHTTPServer):
+    # so that a client that never finishes its request can not stop the
+    # server from exiting
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = DEFAULT_PORT,
+        workers: int | None = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        default_timeout: float = DEFAULT_TIMEOUT
+    ):
+        '''Serve on localhost only (port 0 picks a free port, see
+        server_address), solving with the registries as they are now'''
+        logger = toplevel_logger.getChild('SolveServer.__init__')
+
+        super(SolveServer, self).__init__(
+            ('127.0.0.1', port),
+            SolveRequestHandler
+        )
+        self.default_timeout = default_timeout
+        self.max_pending = max_pending
+        self.started = time.monotonic()
+        # not bounded itself, since max_pending counts the requests being
+        # solved as well as those queued
+        self._queue: queue.Queue[SolveRequest | None] = queue.Queue()
+        # guards everything below
+        self._lock = threading.Lock()
+        self._stopping = False
+        # the requests that are queued or being solved, by request_id
+        self._in_flight: dict[str, SolveRequest] = dict()
+        self._busy_workers = 0
+        self._counts = {status: 0 for status in SolveStatus}
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._queue_waits: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(workers, 1)
+        logger.info(f'Starting {workers} solver processes')
+        # the first processes are all started here, before any other
+        # threads, so that none of them are forked while another thread holds
+        # a lock (any replacements are started without forking)
+        self._worker_threads = [
+            threading.Thread(
+                target=self._run_worker,
+                args=(SolverProcess(),),
+                name=f'solve-worker-{worker_index}',
+                daemon=True
+            )
+            for worker_index
+            in range(workers)
+        ]
+        for worker_thread in self._worker_threads:
+            worker_thread.start()
+
+    def submit(self, request: SolveRequest) -> None:
+        '''Queue a request to be solved.  Raises RequestRejectedError if it
+        can not be.'''
+        with self._lock:
+            if self._stopping:
+                self._counts[SolveStatus.REJECTED] += 1
+                raise RequestRejectedError(
+                    'Server is stopping',
+                    HTTPStatus.SERVICE_UNAVAILABLE
+                )
+            if request.request_id in self._in_flight:
+                raise RequestRejectedError(
+                    f'A request with id {request.request_id} is already '
+                    'queued or being solved',
+                    HTTPStatus.CONFLICT
+                )
+            if len(self._in_flight) >= self.max_pending:
+                self._counts[SolveStatus.REJECTED] += 1
+                raise RequestRejectedError(
+                    f'Too many requests queued or being solved '
+                    f'({self.max_pending})',
+                    HTTPStatus.SERVICE_UNAVAILABLE
+                )
+            self._in_flight[request.request_id] = request
+            self._queue.put(request)
+
+    def cancel(self, request_id: str) -> bool:
+        '''Cancel a queued or running request, giving whether there was one
+        to cancel'''
+        with self._lock:
+            request = self._in_flight.get(request_id)
+        if request is None:
+            return False
+        request.cancelled.set()
+        # if it is being solved, its worker also stops the solve
+        self._finish(request, SolveStatus.CANCELLED)
+        return True
+
+    def time_out(self, request: SolveRequest) -> None:
+        '''Finish a request that is past its deadline (if it has not already
+        finished), whether or not a worker has got to it yet'''
+        self._finish(request, SolveStatus.TIMED_OUT)
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            return {
+                'workers': len(self._worker_threads),
+                'busy_workers': self._busy_workers,
+                'queue_depth': self._queue.qsize(),
+                'max_pending': self.max_pending,
+                'requests': {
+                    status.value: count
+                    for status, count
+                    in self._counts.items()
+                },
+                # of the latest LATENCY_WINDOW requests that got to a worker
+                'queue_wait_seconds': get_percentiles(
+                    list(self._queue_waits)
+                ),
+                # of the latest LATENCY_WINDOW requests that were solved
+                'latency_seconds': get_percentiles(list(self._latencies)),
+                'uptime_seconds': time.monotonic() - self.started
+            }
+
+    def _finish(
+        self,
+        request: SolveRequest,
+        status: SolveStatus,
+        outcome: SolverOutcome | None = None
+    ) -> None:
+        # a request can be finished by its worker, by being cancelled and by
+        # its handler timing it out, so only the first of those counts
+        with self._lock:
+            if request.status is not None:
+                return
+            del self._in_flight[request.request_id]
+            self._counts[status] += 1
+            if status is SolveStatus.SOLVED:
+                self._latencies.append(time.monotonic() - request.arrival)
+            request.status = status
+            request.outcome = outcome
+        request.done.set()
+
+    def _run_worker(self, solver_process: SolverProcess) -> None:
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            if request.done.is_set():
+                # cancelled or timed out while it was queued
+                continue
+            with self._lock:
+                self._busy_workers += 1
+                self._queue_waits.append(time.monotonic() - request.arrival)
+            try:
+                solver_process = self._solve(solver_process, request)
+            finally:
+                with self._lock:
+                    self._busy_workers -= 1
+        solver_process.close()
+
+    def _solve(
+        self,
+        solver_process: SolverProcess,
+        request: SolveRequest
+    ) -> SolverProcess:
+        '''Solve a request on solver_process, giving the solver process to
+        use for the next request (a new one if it had to be terminated)'''
+        logger = toplevel_logger.getChild('SolveServer._solve')
+
+        if request.cancelled.is_set():
+            self._finish(request, SolveStatus.CANCELLED)
+            return solver_process
+        if time.monotonic() >= request.deadline:
+            self._finish(request, SolveStatus.TIMED_OUT)
+            return solver_process
+        if not solver_process.is_alive():
+            solver_process = self._start_solver_process()
+
+        try:
+            solver_process.submit(request.spec, request.exact)
+        except OSError as e:
+            # the process died after it was checked
+            logger.warning(
+                f'Could not submit request {request.request_id}, restarting '
+                f'its solver process: {e}'
+            )
+            solver_process.terminate()
+            self._finish(
+                request,
+                SolveStatus.FAILED,
+                SolverOutcome(None, f'Solver process died: {e}')
+            )
+            return self._start_solver_process()
+        while not solver_process.wait(CANCEL_CHECK_INTERVAL):
+            if request.cancelled.is_set():
+                status = SolveStatus.CANCELLED
+            elif time.monotonic() >= request.deadline:
+                status = SolveStatus.TIMED_OUT
+            else:
+                continue
+            logger.info(
+                f'Request {request.request_id} {status.name.lower()}, '
+                'restarting its solver process'
+            )
+            solver_process.terminate()
+            self._finish(request, status)
+            return self._start_solver_process()
+
+        outcome = solver_process.get_outcome()
+        if outcome.error is None:
+            status = SolveStatus.SOLVED
+        elif outcome.invalid:
+            status = SolveStatus.INVALID
+        else:
+            status = SolveStatus.FAILED
+        self._finish(request, status, outcome)
+        return solver_process
+
+    def _start_solver_process(self) -> SolverProcess:
+        # HTTP handler threads are running by now, so the process must not
+        # be forked (see __init__)
+        return SolverProcess(get_fork_safe_context())
+
+    def server_close(self) -> None:
+        '''Cancel everything that is queued or being solved and stop the
+        solver processes.  Call shutdown first if serve_forever is running.'''
+        super(SolveServer, self).server_close()
+        with self._lock:
+            self._stopping = True
+            in_flight = list(self._in_flight.values())
+        for request in in_flight:
+            self.cancel(request.request_id)
+        # after the cancelled requests, so the workers finish those first
+        for _ in self._worker_threads:
+            self._queue.put(None)
+        for worker_thread in self._worker_threads:
+            worker_thread.join()
+
+
+class SolveRequestHandler(BaseHTTPRequestHandler):
+    server: SolveServer
+    # keep connections open between requests, so that a client solving many
+    # problems does not have to connect for each one
+    protocol_version = 'HTTP/1.1'
+    # otherwise the body of each response waits on the client acknowledging
+    # the headers, which it delays by up to 40 ms on Linux
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args) -> None:
+        toplevel_logger.getChild('SolveRequestHandler').debug(
+            f'{self.address_string()} {format % args}'
+        )
+
+    def send_json(self, http_status: HTTPStatus, body: dict) -> None:
+        encoded_body = json.dumps(body).encode('utf-8')
+        self.send_response(http_status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded_body)))
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+    def send_error_json(self, http_status: HTTPStatus, error: str) -> None:
+        self.send_json(http_status, {'error': error})
+
+    def read_json(self) -> dict | None:
+        '''Read the body of the request as a JSON object, responding with an
+        error and giving None if it is not one'''
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, f'Invalid JSON: {e}')
+            return None
+        if not isinstance(body, dict):
+            self.send_error_json(
+                HTTPStatus.BAD_REQUEST,
+                'Expected a JSON object'
+            )
+            return None
+        return body
+
+    def do_GET(self) -> None:
+        if self.path == '/metrics':
+            self.send_json(HTTPStatus.OK, self.server.get_metrics())
+        else:
+            self.send_error_json(HTTPStatus.NOT_FOUND, 'Not found')
+
+    def do_POST(self) -> None:
+        if self.path not in ('/solve', '/cancel'):
+            self.send_error_json(HTTPStatus.NOT_FOUND, 'Not found')
+            return
+        body = self.read_json()
+        if body is None:
+            return
+        if self.path == '/solve':
+            self.solve(body)
+        else:
+            self.cancel(body)
+
+    def solve(self, body: dict) -> None:
+        unknown_keys = body.keys() - {
+            'problem',
+            'timeout',
+            'exact',
+            'request_id'
+        }
+        if unknown_keys:
+            self.send_error_json(
+                HTTPStatus.BAD_REQUEST,
+                f'Unknown keys: {", ".join(sorted(unknown_keys))}'
+            )
+            return
+        try:
+            spec = problem_spec_from_dict(body.get('problem'))
+        except ProblemSpecError as e:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        timeout = body.get('timeout', self.server.default_timeout)
+        if (
+            isinstance(timeout, bool)
+            or not isinstance(timeout, (int, float))
+            or not timeout > 0
+        ):
+            self.send_error_json(
+                HTTPStatus.BAD_REQUEST,
+                'timeout must be a positive number of seconds'
+            )
+            return
+        exact = body.get('exact', False)
+        if not isinstance(exact, bool):
+            self.send_error_json(
+                HTTPStatus.BAD_REQUEST,
+                'exact must be true or false'
+            )
+            return
+        request_id = body.get('request_id', uuid.uuid4().hex)
+        if not isinstance(request_id, str):
+            self.send_error_json(
+                HTTPStatus.BAD_REQUEST,
+                'request_id must be a string'
+            )
+            return
+
+        request = SolveRequest(
+            request_id,
+            spec,
+            exact,
+            timeout
+        )
+        try:
+            self.server.submit(request)
+        except RequestRejectedError as e:
+            self.send_error_json(e.http_status, str(e))
+            return
+        if not request.done.wait(
+            max(request.deadline - time.monotonic(), 0)
+        ):
+            # its worker (if it has one) stops solving it shortly after
+            self.server.time_out(request)
+        self.send_json(HTTP_STATUSES[request.status], request.to_json())
+
+    def cancel(self, body: dict) -> None:
+        request_id = body.get('request_id')
+        if not isinstance(request_id, str):
+            self.send_error_json(
+                HTTPStatus.BAD_REQUEST,
+                'request_id must be a string'
+            )
+            return
+        self.send_json(
+            HTTPStatus.OK,
+            {'cancelled': self.server.cancel(request_id)}
+        )
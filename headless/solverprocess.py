@@ -0,0 +1,129 @@
+"""A process that solves problems sent to it over a pipe, one at a time.
+
+Unlike a worker of a ProcessPoolExecutor, the process can be terminated in the
+middle of a solve (since the simplex can not be interrupted from outside) and
+replaced with a new one, which is how solves are timed out and cancelled.
+The registries are handed to the process when it starts in the same way as
+in headless.batch, so if it is forked they are not even copied.  Once other
+threads are running, processes should be started with get_fork_safe_context
+instead, since a forked child gets a copy of any lock that another thread
+held at the time, which is never released.
+"""
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from typing import NamedTuple
+
+from satisfactoryobjects.itemhandler import items
+from satisfactoryobjects.machinehandler import machines
+from satisfactoryobjects.recipehandler import recipes
+
+from .batch import initialise_worker
+from .problemspec import ProblemSpec, ProblemSpecError
+from .solving import solve_problem, solution_to_json
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+class SolverOutcome(NamedTuple):
+    # as given by solution_to_json, or None if the problem was not solved
+    solution: dict | None
+    # why the problem was not solved, or None if it was
+    error: str | None
+    # whether the error is the fault of the problem rather than the solver
+    invalid: bool = False
+
+
+def get_fork_safe_context() -> BaseContext:
+    '''Get a multiprocessing context that does not fork this process (the
+    default one, unless that forks)'''
+    if multiprocessing.get_start_method() != 'fork':
+        return multiprocessing.get_context()
+    # forks a separate server process (that has no other threads) instead
+    return multiprocessing.get_context('forkserver')
+
+
+def _run_solver_process(
+    connection: Connection,
+    registries: tuple[dict, dict, dict]
+) -> None:
+    logger = toplevel_logger.getChild('_run_solver_process')
+
+    initialise_worker(registries)
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            # whatever started the process has gone
+            break
+        if message is None:
+            break
+        spec, exact = message
+        try:
+            outcome = SolverOutcome(
+                solution_to_json(solve_problem(spec, workers=0), exact),
+                None
+            )
+        except ProblemSpecError as e:
+            outcome = SolverOutcome(None, str(e), True)
+        except Exception as e:
+            logger.exception('Solve failed')
+            outcome = SolverOutcome(None, repr(e))
+        connection.send(outcome)
+
+
+class SolverProcess:
+    def __init__(self, context: BaseContext | None = None):
+        '''Start the process with context (the default multiprocessing one if
+        None)'''
+        if context is None:
+            context = multiprocessing.get_context()
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(
+            target=_run_solver_process,
+            args=(child_connection, (items, machines, recipes)),
+            daemon=True
+        )
+        self._process.start()
+        # so that recv gives EOFError if the process dies
+        child_connection.close()
+
+    def submit(self, spec: ProblemSpec, exact: bool = False) -> None:
+        '''Start solving a problem.  Only one problem can be solved at a
+        time, so get its outcome before submitting another.'''
+        self._connection.send((spec, exact))
+
+    def wait(self, timeout: float | None) -> bool:
+        '''Wait up to timeout seconds for the outcome of the problem being
+        solved, giving whether it is ready (or the process has died)'''
+        return self._connection.poll(timeout)
+
+    def get_outcome(self) -> SolverOutcome:
+        try:
+            return self._connection.recv()
+        except EOFError:
+            # e.g. killed for using too much memory
+            return SolverOutcome(
+                None,
+                f'Solver process exited with code {self._process.exitcode}'
+            )
+
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def terminate(self) -> None:
+        '''Stop the process, whether or not it is solving anything'''
+        self._process.terminate()
+        self._process.join()
+        self._connection.close()
+
+    def close(self) -> None:
+        '''Stop the process once it has finished what it is solving'''
+        try:
+            self._connection.send(None)
+        except OSError:
+            # already dead
+            pass
+        self._process.join()
+        self._connection.close()
@@ -0,0 +1,218 @@
+"""Solving a ProblemSpec and reading the result out of the tableau, in the
+same way as the GUI does but without it."""
+import logging
+from dataclasses import dataclass
+from fractions import Fraction
+
+from optimisationsolver.simplex import (
+    PivotRule,
+    Tableau,
+    get_optimality_violations,
+    get_violations
+)
+from optimisationsolver.anytime import (
+    SolveLimits,
+    StopReason,
+    pivot_within_limits
+)
+from optimisationsolver.integerprogramming import solve_integer
+
+from utils.directionenums import Direction
+from utils.variabletypetags import VariableType
+
+from satisfactoryobjects.itemvariabletype import (
+    ItemVariableType,
+    ItemVariableTypes
+)
+from satisfactoryobjects.recipehandler import recipes
+
+from .problembuilder import build_problem
+from .problemspec import ProblemSpec
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProblemSolution:
+    # None if whole numbers of machines were asked for and there is no
+    # solution with them
+    objective_value: Fraction | None
+    # recipe class name: number of machines, for each recipe that is used
+    machines: dict[str, Fraction]
+    # item class name: number produced per minute, for each target
+    outputs: dict[str, Fraction]
+    # in megawatts
+    power_consumption: float
+    # False if the solution is not proven to be the best one (see
+    # solve_problem)
+    optimal: bool
+    pivots: int
+
+
+def solution_from_variable_values(
+    variable_values: list,
+    optimal: bool,
+    pivots: int
+) -> ProblemSolution:
+    '''Make a ProblemSolution from variable values in the format of
+    Tableau.get_variable_values()'''
+    objective_value = None
+    machines: dict[str, Fraction] = dict()
+    outputs: dict[str, Fraction] = dict()
+    power_consumption = float()
+    for var_id, var_val in variable_values:
+        if var_id.type == VariableType.NORMAL:
+            # recipes are the only variables with string ids
+            if isinstance(var_id.name, str) and var_val != 0:
+                machines[var_id.name] = var_val
+                power_consumption += (
+                    var_val * recipes[var_id.name].calc_power_flow_rate(
+                        positive_direction=Direction.IN
+                    )
+                )
+            elif isinstance(var_id.name, ItemVariableType):
+                if var_id.name.type is ItemVariableTypes.OUTPUT:
+                    outputs[
+                        var_id.name.item.internal_class_identifier
+                    ] = var_val
+        elif var_id.type == VariableType.OBJECTIVE:
+            objective_value = var_val
+    return ProblemSolution(
+        objective_value,
+        machines,
+        outputs,
+        float(power_consumption),
+        optimal,
+        pivots
+    )
+
+
+def solve_problem(
+    spec: ProblemSpec,
+    workers: int | None = None,
+    limits: SolveLimits = SolveLimits(),
+    pivot_rule: PivotRule = PivotRule.DANTZIG
+) -> ProblemSolution:
+    '''Build and solve the problem for the spec.
+
+    With whole numbers of machines, the whole-number search is run on
+    workers worker processes (see solve_integer), and the solution is only
+    optimal if every node of the search was evaluated.  Otherwise the
+    solution is optimal unless the problem turned out to be unbounded or one
+    of the limits was reached first, in which case the solution reached so
+    far is given (as the GUI does).  An optimal solution is also checked
+    exactly against the problem, and is not optimal unless it is feasible
+    (see get_violations) and the duals from the tableau prove it optimal
+    (see get_optimality_violations).  With whole numbers of machines, the
+    duals prove the relaxation optimal before the search, and the
+    whole-number solution must be feasible.
+    '''
+    logger = toplevel_logger.getChild('solve_problem')
+
+    problem = build_problem(spec)
+    tableau = Tableau(problem, pivot_rule)
+    simplex_run = pivot_within_limits(tableau, limits)
+    pivots = simplex_run.pivots
+    optimal = simplex_run.optimal
+    if simplex_run.stop_reason is StopReason.UNBOUNDED:
+        logger.warning(
+            f'Problem is unbounded after {pivots} pivots, giving the '
+            'solution reached so far'
+        )
+    elif not optimal:
+        logger.warning(
+            f'Stopped by the {simplex_run.stop_reason.value} limit after '
+            f'{pivots} pivots, giving the solution reached so far'
+        )
+    logger.info(f'Solved in {pivots} pivots')
+
+    # (there is no point searching for whole numbers of machines in an
+    # unbounded problem, and no time if a limit was reached)
+    if not spec.whole_machines or not optimal:
+        variable_values = tableau.get_variable_values()
+        return solution_from_variable_values(
+            variable_values,
+            (
+                optimal
+                and _verify(problem, variable_values, tableau.get_duals())
+            ),
+            pivots
+        )
+
+    # (the search changes the tableau, so the relaxation it starts from is
+    # checked first)
+    relaxation_verified = _verify(
+        problem,
+        tableau.get_variable_values(),
+        tableau.get_duals()
+    )
+    integer_solution = solve_integer(
+        tableau,
+        # every recipe variable is a number of machines
+        integer_variables=recipes.keys(),
+        workers=workers
+    )
+    if integer_solution.variable_values is None:
+        logger.warning('There is no solution with whole numbers of machines')
+        return ProblemSolution(None, dict(), dict(), 0.0, False, pivots)
+    return solution_from_variable_values(
+        integer_solution.variable_values,
+        (
+            relaxation_verified
+            and integer_solution.proven_optimal
+            and _verify(problem, integer_solution.variable_values)
+        ),
+        pivots
+    )
+
+
+def _verify(
+    problem: list,
+    variable_values: list,
+    duals: list | None = None
+) -> bool:
+    logger = toplevel_logger.getChild('_verify')
+
+    violations = get_violations(problem, variable_values)
+    for violation in violations:
+        logger.error(f'Solution is infeasible: {violation}')
+    if duals is None:
+        return len(violations) == 0
+    optimality_violations = get_optimality_violations(
+        problem,
+        variable_values,
+        duals
+    )
+    for violation in optimality_violations:
+        logger.error(f'Solution is not proven optimal: {violation}')
+    return len(violations) == 0 and len(optimality_violations) == 0
+
+
+def _number_to_json(number: Fraction, exact: bool) -> float | str:
+    return str(number) if exact else float(number)
+
+
+def solution_to_json(solution: ProblemSolution, exact: bool = False) -> dict:
+    '''Get a solution in a form that can be written as JSON.  Numbers are
+    given as floats, or as exact fractions in strings (e.g. "10/3") if exact
+    is True.'''
+    return {
+        'objective_value': (
+            None
+            if solution.objective_value is None
+            else _number_to_json(solution.objective_value, exact)
+        ),
+        'machines': {
+            class_name: _number_to_json(number, exact)
+            for class_name, number
+            in solution.machines.items()
+        },
+        'outputs': {
+            class_name: _number_to_json(number, exact)
+            for class_name, number
+            in solution.outputs.items()
+        },
+        'power_consumption': solution.power_consumption,
+        'optimal': solution.optimal,
+        'pivots': solution.pivots
+    }
@@ -1,3 +1,10 @@
 __all__ = [
-        "simplex"
+        "simplex",
+        "parametric",
+        "sensitivity",
+        "pricing",
+        "subsetsearch",
+        "integerprogramming",
+        "solutioncache",
+        "anytime"
     ]
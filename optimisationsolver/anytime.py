@@ -0,0 +1,114 @@
+"""Pivoting a tableau until it is solved or a limit is reached.
+
+Every tableau that the simplex algorithm pivots through is a basic feasible
+solution (since the problems start feasible, with every right-hand-side
+non-negative), and each pivot can only increase the objective variable.  So
+if solving takes too long, the solution reached so far can be given instead,
+marked as not being optimal.  The limits are on the number of pivots, on the
+time taken and on the objective variable value (stopping once it is good
+enough).
+
+The solution reached so far can also be read out while pivoting, from the
+basis alone (see get_snapshot_variable_values), which is much cheaper than
+Tableau.get_variable_values since it does not search every column.
+"""
+import time
+from dataclasses import dataclass
+from enum import Enum
+from fractions import Fraction
+from typing import Callable
+
+from .simplex import (
+    Tableau,
+    SimplexAlgorithmDoneException,
+    SimplexUnboundedError
+)
+
+
+@dataclass(frozen=True)
+class SolveLimits:
+    # None for no limit
+    max_pivots: int | None = None
+    max_seconds: float | None = None
+    # stop as soon as the objective variable value is at least this
+    target_objective: Fraction | None = None
+
+
+class StopReason(Enum):
+    OPTIMAL = 'optimal'
+    # no row limits the pivot column, so the objective variable can be
+    # increased forever
+    UNBOUNDED = 'unbounded'
+    MAX_PIVOTS = 'max_pivots'
+    MAX_SECONDS = 'max_seconds'
+    TARGET_OBJECTIVE = 'target_objective'
+    # by whatever called pivot_within_limits
+    STOPPED = 'stopped'
+
+
+@dataclass
+class SimplexRun:
+    stop_reason: StopReason
+    pivots: int
+
+    def _get_optimal(self) -> bool:
+        return self.stop_reason is StopReason.OPTIMAL
+
+    optimal = property(
+        fget=_get_optimal,
+        doc="Whether the tableau was pivoted until it was optimal"
+    )
+
+
+def get_snapshot_variable_values(tableau: Tableau) -> list:
+    '''Get the values of the basic variables and the objective variable, in
+    the format of Tableau.get_variable_values() (but without the non-basic
+    variables, which are all zero)'''
+    return tableau.get_basic_variable_values() + [
+        (tableau.get_basis()[-1], tableau.objective_value)
+    ]
+
+
+def pivot_within_limits(
+    tableau: Tableau,
+    limits: SolveLimits = SolveLimits(),
+    # called after each pivot with the objective variable values before and
+    # after it
+    pivot_done: Callable[[Fraction, Fraction], None] | None = None,
+    should_stop: Callable[[], bool] | None = None
+) -> SimplexRun:
+    '''Pivot the tableau until it is optimal, unbounded, one of the limits is
+    reached or should_stop gives True (checked before each pivot, but only
+    once the tableau is known not to be optimal).  Anything
+    raised by pivot_done or should_stop is passed on.'''
+    start_time = time.monotonic()
+    pivots = 0
+    while True:
+        # (so that reaching the optimum exactly at a limit is not mistaken
+        # for stopping early)
+        if tableau.is_optimal():
+            return SimplexRun(StopReason.OPTIMAL, pivots)
+        if should_stop is not None and should_stop():
+            return SimplexRun(StopReason.STOPPED, pivots)
+        if (
+            limits.target_objective is not None
+            and tableau.objective_value >= limits.target_objective
+        ):
+            return SimplexRun(StopReason.TARGET_OBJECTIVE, pivots)
+        if limits.max_pivots is not None and pivots >= limits.max_pivots:
+            return SimplexRun(StopReason.MAX_PIVOTS, pivots)
+        if (
+            limits.max_seconds is not None
+            and time.monotonic() - start_time >= limits.max_seconds
+        ):
+            return SimplexRun(StopReason.MAX_SECONDS, pivots)
+        previous_objective_value = tableau.objective_value
+        try:
+            tableau.pivot()
+        except SimplexAlgorithmDoneException:
+            return SimplexRun(StopReason.OPTIMAL, pivots)
+        except SimplexUnboundedError:
+            return SimplexRun(StopReason.UNBOUNDED, pivots)
+        pivots += 1
+        if pivot_done is not None:
+            pivot_done(previous_objective_value, tableau.objective_value)
@@ -0,0 +1,388 @@
+"""Whole-number solutions (e.g. whole numbers of machines) by branch and
+bound on the linear relaxation.
+
+Each node of the search is the relaxation with a list of extra bounds on the
+integer variables.  A node whose solution gives a fractional value v to some
+integer variable x is split into a child with x <= floor(v) and a child with
+x >= ceil(v).  The bound is added to the optimal tableau of the parent as a
+new row, and since the parent's solution is still optimal (just no longer
+feasible) the child is re-solved from there with the dual simplex algorithm
+instead of from scratch.
+
+Nodes are evaluated in worker processes, each of which keeps the tableaus of
+the nodes it has evaluated most recently so that children can be
+warm-started from their parent.  Nodes are always picked in order of the best
+bound, and a rounding heuristic is run on some of them so that a good
+incumbent is found early on, which lets more of the search be pruned.
+"""
+import heapq
+import logging
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    wait,
+    FIRST_COMPLETED
+)
+from dataclasses import dataclass
+from fractions import Fraction
+from itertools import count
+from typing import Callable, Iterable, NamedTuple
+
+from utils.variabletypetags import VariableType, AnonymousTypeTag
+from .simplex import Tableau, SimplexInfeasibleError
+
+toplevel_logger = logging.getLogger(__name__)
+
+# how many node tableaus each worker keeps for warm-starting their children
+NODE_CACHE_SIZE = 32
+# the most rounds of rounding that the heuristic will do before giving up
+MAX_ROUNDING_ROUNDS = 20
+
+# state of a worker process, set up once by _initialise_worker so that the
+# root tableau does not have to be sent with every node
+_worker_root: Tableau | None = None
+# None means every normal variable must be a whole number
+_worker_integer_variables: frozenset | None = None
+_worker_node_cache: OrderedDict[tuple, Tableau] = OrderedDict()
+
+
+class VariableBound(NamedTuple):
+    variable_id: object
+    # True for variable_id <= value, False for variable_id >= value
+    is_upper_bound: bool
+    value: int
+
+
+@dataclass
+class IntegerSearchProgress:
+    # None until a whole-number solution has been found
+    incumbent_value: Fraction | None
+    # an upper bound on the objective value of the best whole-number solution
+    best_bound: Fraction | None
+    nodes_evaluated: int
+    open_nodes: int
+
+    @property
+    def gap(self) -> Fraction | None:
+        if self.incumbent_value is None or self.best_bound is None:
+            return None
+        return self.best_bound - self.incumbent_value
+
+
+@dataclass
+class IntegerSolution:
+    # both None if no whole-number solution was found
+    objective_value: Fraction | None
+    # in the same format as Tableau.get_variable_values(), except that only
+    # the variables that can be non-zero are included
+    variable_values: list | None
+    # None if there is no whole-number solution at all
+    best_bound: Fraction | None
+    nodes_evaluated: int
+    # False if the search was stopped before every node was evaluated, in
+    # which case the best solution may be up to gap better than the one found
+    proven_optimal: bool
+
+    @property
+    def gap(self) -> Fraction | None:
+        if self.objective_value is None:
+            return None
+        return self.best_bound - self.objective_value
+
+
+class _NodeEvaluation(NamedTuple):
+    # None if the node is infeasible
+    objective_value: Fraction | None
+    # the variable to branch on and its fractional value, or None if the
+    # solution of the node is already whole
+    branch: tuple[object, Fraction] | None
+    solution: list | None
+    # the result of the rounding heuristic, if it was run and succeeded
+    heuristic_value: Fraction | None = None
+    heuristic_solution: list | None = None
+
+
+def _add_bound(tableau: Tableau, bound: VariableBound) -> None:
+    if bound.is_upper_bound:
+        tableau.add_row({bound.variable_id: 1}, bound.value, bound)
+    else:
+        tableau.add_row({bound.variable_id: -1}, -bound.value, bound)
+
+
+def _solution_values(tableau: Tableau) -> list:
+    return tableau.get_basic_variable_values() + [
+        (AnonymousTypeTag(VariableType.OBJECTIVE), tableau.objective_value)
+    ]
+
+
+def _fractional_variables(tableau: Tableau) -> list[tuple[object, Fraction]]:
+    return [
+        (variable.name, value)
+        for variable, value
+        in tableau.get_basic_variable_values()
+        if (
+            variable.type == VariableType.NORMAL
+            and (
+                _worker_integer_variables is None
+                or variable.name in _worker_integer_variables
+            )
+            and value.denominator != 1
+        )
+    ]
+
+
+def _initialise_worker(
+    tableau: Tableau,
+    integer_variables: frozenset | None
+) -> None:
+    global _worker_root, _worker_integer_variables
+    _worker_root = tableau
+    _worker_integer_variables = integer_variables
+    _worker_node_cache.clear()
+
+
+def _rounding_heuristic(tableau: Tableau) -> Tableau | None:
+    # repeatedly fix every fractional variable to its value rounded down and
+    # re-solve, until the solution is whole (or becomes infeasible)
+    trial = tableau.copy()
+    for _ in range(MAX_ROUNDING_ROUNDS):
+        fractional = _fractional_variables(trial)
+        if not fractional:
+            return trial
+        for variable_id, value in fractional:
+            for is_upper_bound in (True, False):
+                _add_bound(
+                    trial,
+                    VariableBound(variable_id, is_upper_bound, math.floor(value))
+                )
+        try:
+            trial.dual_pivot_until_done()
+        except SimplexInfeasibleError:
+            return None
+    return None
+
+
+def _evaluate_node(
+    bounds: tuple[VariableBound, ...],
+    run_heuristic: bool
+) -> _NodeEvaluation:
+    # start from the closest ancestor that this worker still has
+    for ancestor_length in range(len(bounds), 0, -1):
+        if bounds[:ancestor_length] in _worker_node_cache:
+            tableau = _worker_node_cache[bounds[:ancestor_length]].copy()
+            break
+    else:
+        ancestor_length = 0
+        tableau = _worker_root.copy()
+    try:
+        for bound in bounds[ancestor_length:]:
+            _add_bound(tableau, bound)
+            tableau.dual_pivot_until_done()
+    except SimplexInfeasibleError:
+        return _NodeEvaluation(None, None, None)
+
+    _worker_node_cache[bounds] = tableau
+    if len(_worker_node_cache) > NODE_CACHE_SIZE:
+        _worker_node_cache.popitem(last=False)
+
+    fractional = _fractional_variables(tableau)
+    if not fractional:
+        return _NodeEvaluation(
+            tableau.objective_value,
+            None,
+            _solution_values(tableau)
+        )
+
+    # branch on the most fractional variable
+    branch = min(
+        fractional,
+        key=lambda variable_value: abs(
+            variable_value[1] - math.floor(variable_value[1])
+            - Fraction(1, 2)
+        )
+    )
+    if run_heuristic:
+        rounded = _rounding_heuristic(tableau)
+        if rounded is not None:
+            return _NodeEvaluation(
+                tableau.objective_value,
+                branch,
+                None,
+                rounded.objective_value,
+                _solution_values(rounded)
+            )
+    return _NodeEvaluation(tableau.objective_value, branch, None)
+
+
+def solve_integer(
+    tableau: Tableau,
+    integer_variables: Iterable | None = None,
+    workers: int | None = None,
+    max_nodes: int | None = None,
+    heuristic_frequency: int = 20,
+    progress: Callable[[IntegerSearchProgress], None] | None = None,
+    should_stop: Callable[[], bool] | None = None
+) -> IntegerSolution:
+    """Find the best solution of the tableau in which every variable in
+    integer_variables (or every normal variable, if it is None) is a whole
+    number.
+
+    The tableau is solved first if it is not already solved, and is not
+    modified further.  Nodes are evaluated on a pool of worker processes
+    (os.cpu_count() of them if workers is None), or in this process if
+    workers is 0.  The rounding heuristic is run on the root node and every
+    heuristic_frequency nodes after that.  The search stops early once
+    max_nodes nodes have been evaluated or should_stop returns True, and
+    progress is called with the state of the search after every node.
+    """
+    logger = toplevel_logger.getChild('solve_integer')
+
+    tableau.pivot_until_done()
+    if integer_variables is not None:
+        integer_variables = frozenset(integer_variables)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    incumbent_value: Fraction | None = None
+    incumbent_solution: list | None = None
+
+    # heap of (-bound from parent, tiebreaker, bounds), so that the node
+    # with the best bound is always evaluated next.  the relaxation is a
+    # bound for the root node.
+    tiebreaker = count()
+    open_nodes: list[tuple[Fraction, int, tuple[VariableBound, ...]]] = [
+        (-tableau.objective_value, next(tiebreaker), tuple())
+    ]
+    # maps each node being evaluated to its bound from its parent
+    in_flight: dict[Future, tuple[Fraction, tuple[VariableBound, ...]]] = (
+        dict()
+    )
+    nodes_started = 0
+    nodes_evaluated = 0
+    stopped_early = False
+
+    def can_improve(bound: Fraction) -> bool:
+        return incumbent_value is None or bound > incumbent_value
+
+    def best_bound() -> Fraction | None:
+        bounds = [
+            -negative_bound
+            for negative_bound, _, _
+            in open_nodes
+            if can_improve(-negative_bound)
+        ] + [
+            bound
+            for bound, _
+            in in_flight.values()
+            if can_improve(bound)
+        ]
+        if not bounds:
+            # nothing left that could beat the incumbent
+            return incumbent_value
+        return max(bounds)
+
+    if workers == 0:
+        _initialise_worker(tableau, integer_variables)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialise_worker,
+            initargs=(tableau, integer_variables)
+        )
+
+    try:
+        while open_nodes or in_flight:
+            if (
+                (should_stop is not None and should_stop())
+                or
+                (max_nodes is not None and nodes_evaluated >= max_nodes)
+            ):
+                stopped_early = True
+                break
+
+            # keep every worker busy (with a spare node each so that they
+            # are not left waiting on this process)
+            while open_nodes and len(in_flight) < max(workers, 1) * 2:
+                negative_bound, _, bounds = heapq.heappop(open_nodes)
+                if not can_improve(-negative_bound):
+                    continue
+                run_heuristic = nodes_started % heuristic_frequency == 0
+                nodes_started += 1
+                if executor is None:
+                    future = Future()
+                    future.set_result(_evaluate_node(bounds, run_heuristic))
+                else:
+                    future = executor.submit(
+                        _evaluate_node,
+                        bounds,
+                        run_heuristic
+                    )
+                in_flight[future] = (-negative_bound, bounds)
+                if executor is None:
+                    # only evaluate one node at a time, so that the next one
+                    # is picked with the latest incumbent
+                    break
+
+            if not in_flight:
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                _, bounds = in_flight.pop(future)
+                evaluation = future.result()
+                nodes_evaluated += 1
+                for value, solution in (
+                    (evaluation.objective_value, evaluation.solution),
+                    (
+                        evaluation.heuristic_value,
+                        evaluation.heuristic_solution
+                    )
+                ):
+                    if solution is not None and can_improve(value):
+                        incumbent_value = value
+                        incumbent_solution = solution
+                        logger.info(
+                            'New incumbent with objective value '
+                            f'{float(incumbent_value)}'
+                        )
+                if (
+                    evaluation.branch is None
+                    or not can_improve(evaluation.objective_value)
+                ):
+                    continue
+                variable_id, value = evaluation.branch
+                for bound in (
+                    VariableBound(variable_id, True, math.floor(value)),
+                    VariableBound(variable_id, False, math.ceil(value))
+                ):
+                    heapq.heappush(
+                        open_nodes,
+                        (
+                            -evaluation.objective_value,
+                            next(tiebreaker),
+                            bounds + (bound,)
+                        )
+                    )
+
+            if progress is not None:
+                progress(IntegerSearchProgress(
+                    incumbent_value,
+                    best_bound(),
+                    nodes_evaluated,
+                    len(open_nodes) + len(in_flight)
+                ))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return IntegerSolution(
+        incumbent_value,
+        incumbent_solution,
+        best_bound() if stopped_early else incumbent_value,
+        nodes_evaluated,
+        not stopped_early
+    )
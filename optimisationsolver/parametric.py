@@ -0,0 +1,161 @@
+"""Parametric analysis of the right-hand-side of a constraint.
+
+Rather than re-solving the problem from scratch for every value of a
+right-hand-side, the optimal tableau is walked along the ray of values,
+stopping at each value where the optimal basis changes (a breakpoint) and
+restoring optimality with dual simplex pivots.
+"""
+import logging
+from dataclasses import dataclass, field
+from fractions import Fraction
+from numbers import Rational
+
+from utils.variabletypetags import AnonymousTypeTag, VariableType
+from .simplex import Tableau, SimplexInfeasibleError
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ParametricBreakpoint:
+    """The state of the solution at one value of the swept right-hand-side"""
+    rhs: Fraction
+    objective_value: Fraction
+    # values of the basic variables at this point (any other variable is zero)
+    variable_values: list = field(repr=False)
+    # the variable that was removed from the basis at this breakpoint, or None
+    # for the start and end of the sweep
+    leaving_variable: AnonymousTypeTag | None = None
+    # the variable that replaced it in the basis
+    entering_variable: AnonymousTypeTag | None = None
+    # the id of the constraint that became binding (i.e. whose slack variable
+    # left the basis), or None if the leaving variable was not a slack variable
+    binding_constraint: object = None
+
+
+@dataclass
+class ParametricSweep:
+    """The result of sweeping the right-hand-side of a constraint"""
+    constraint_id: object
+    start: Fraction
+    end: Fraction
+    breakpoints: list[ParametricBreakpoint]
+    # False if the problem becomes infeasible before the end of the sweep is
+    # reached (in which case the last breakpoint is the last feasible value)
+    reached_end: bool = True
+    pivots: int = 0
+
+
+def _make_breakpoint(
+    tableau: Tableau,
+    constraint_index: int,
+    leaving_column: int | None = None,
+    entering_column: int | None = None
+) -> ParametricBreakpoint:
+    leaving_variable = (
+        None
+        if leaving_column is None
+        else tableau._tableau_header[leaving_column]
+    )
+    binding_constraint = None
+    if (
+        leaving_variable is not None
+        and
+        leaving_variable.type == VariableType.SLACK
+    ):
+        # the name of a slack variable is the index of its constraint
+        binding_constraint = tableau._constraint_ids[leaving_variable.name]
+    return ParametricBreakpoint(
+        tableau._constraint_rhs[constraint_index],
+        tableau.objective_value,
+        tableau.get_basic_variable_values(),
+        leaving_variable,
+        (
+            None
+            if entering_column is None
+            else tableau._tableau_header[entering_column]
+        ),
+        binding_constraint
+    )
+
+
+def parametric_rhs_sweep(
+    tableau: Tableau,
+    constraint_index: int,
+    end: Rational
+) -> ParametricSweep:
+    """Sweep the right-hand-side of a constraint from its current value to
+    end, recording every breakpoint in the optimal solution along the way.
+
+    The tableau is solved first if it is not already optimal.  CAUTION: the
+    tableau is modified in-place, and is left at the optimal solution for the
+    final value reached.
+    """
+    logger = toplevel_logger.getChild('parametric_rhs_sweep')
+
+    tableau.pivot_until_done()
+
+    end = Fraction(end)
+    start = tableau._constraint_rhs[constraint_index]
+    column = tableau._get_slack_column(constraint_index)
+    # allow sweeping in either direction
+    direction = 1 if end >= start else -1
+
+    result = ParametricSweep(
+        tableau._constraint_ids[constraint_index],
+        start,
+        end,
+        [_make_breakpoint(tableau, constraint_index)]
+    )
+
+    while tableau._constraint_rhs[constraint_index] != end:
+        # find how far the right-hand-side can move before the value of a
+        # basic variable becomes negative.  the right-hand-side of each row
+        # moves at a rate of its entry in the slack column of the constraint,
+        # so only rows where this is negative (in the direction of the sweep)
+        # can become negative.
+        step = abs(end - tableau._constraint_rhs[constraint_index])
+        leaving_row = None
+        for row_idx, row in enumerate(tableau._tableau[:-1]):
+            rate = row[column] * direction
+            if rate < 0 and Fraction(row.rhs, -rate) < step:
+                step = Fraction(row.rhs, -rate)
+                leaving_row = row_idx
+
+        tableau._shift_rhs(constraint_index, step * direction)
+
+        if leaving_row is None:
+            # the current basis stays optimal up to the end of the sweep
+            break
+
+        # the basic variable of the leaving row is now zero, and would become
+        # negative if the sweep continued, so swap it out of the basis
+        leaving_column = tableau._basis[leaving_row]
+        try:
+            entering_column = tableau._get_dual_pivot_column(leaving_row)
+        except SimplexInfeasibleError:
+            logger.info(
+                'Problem becomes infeasible past right-hand-side value '
+                f'{tableau._constraint_rhs[constraint_index]}'
+            )
+            result.reached_end = False
+            result.breakpoints.append(
+                _make_breakpoint(tableau, constraint_index)
+            )
+            break
+        tableau._pivot_on(leaving_row, entering_column)
+        result.pivots += 1
+
+        result.breakpoints.append(
+            _make_breakpoint(
+                tableau,
+                constraint_index,
+                leaving_column,
+                entering_column
+            )
+        )
+
+    if result.reached_end:
+        result.breakpoints.append(_make_breakpoint(tableau, constraint_index))
+
+    return result
@@ -0,0 +1,186 @@
+"""Pricing of candidate variables against an optimal tableau.
+
+A candidate variable (e.g. a recipe that is currently disabled) is left out
+of the problem when it is solved.  Its column is then priced against the
+shadow prices of the optimal solution, which gives how much the objective
+would improve per unit of the candidate without having to solve the problem
+again.  The most promising candidates can then be added to a copy of the
+optimal tableau and re-optimised from there to find their exact benefit.
+"""
+import logging
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import Iterable
+
+from utils.variabletypetags import VariableType
+from .simplex import (
+    Tableau,
+    Inequality,
+    ObjectiveEquation,
+    SimplexUnboundedError
+)
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CandidateColumn:
+    variable_id: object
+    # maps the index of each constraint the variable appears in to its
+    # coefficient in that constraint
+    coefficients: dict[int, Fraction] = field(default_factory=dict)
+    objective_coefficient: Fraction = Fraction(0)
+
+
+@dataclass
+class PricedColumn:
+    column: CandidateColumn
+    # the increase in the objective per unit of the candidate, as predicted by
+    # the shadow prices (only valid for small amounts of the candidate)
+    improvement_per_unit: Fraction
+    # the actual increase in the objective once the candidate is added and
+    # the problem re-optimised, or None if this was not calculated (or the
+    # problem became unbounded)
+    exact_gain: Fraction | None = None
+    # the value of the candidate in the re-optimised solution
+    value: Fraction | None = None
+
+
+@dataclass
+class CandidateRanking:
+    objective_value: Fraction
+    # sorted from the most to the least promising candidate
+    ranking: list[PricedColumn]
+
+
+def extract_columns(
+    problem: list[Inequality],
+    variable_ids: Iterable
+) -> list[CandidateColumn]:
+    """Remove the given variables from the problem (in-place), returning
+    their columns so that they can be priced or added back later.
+
+    The objective equation must be the last inequality in the problem, as is
+    required by the Tableau constructor.
+    """
+    columns = {
+        variable_id: CandidateColumn(variable_id)
+        for variable_id
+        in variable_ids
+    }
+    for constraint_index, inequality in enumerate(problem):
+        for variable_id, column in columns.items():
+            try:
+                # inequality._lhs is the internal dictionary representation
+                # of the inequality (see Tableau constructor)
+                coefficient = Fraction(inequality._lhs.pop(variable_id))
+            except KeyError:
+                # variable not in this inequality
+                continue
+            if issubclass(type(inequality), ObjectiveEquation):
+                # the objective equation holds the negated coefficients
+                column.objective_coefficient = -coefficient
+            else:
+                column.coefficients[constraint_index] = coefficient
+    return list(columns.values())
+
+
+def price_columns(
+    tableau: Tableau,
+    columns: Iterable[CandidateColumn]
+) -> list[PricedColumn]:
+    """Price candidate columns against a solved tableau, returning them in
+    order of decreasing improvement per unit"""
+    objective_row = tableau._tableau[-1]
+    priced = [
+        PricedColumn(
+            column,
+            # the objective coefficient minus the value of everything the
+            # candidate uses up, at the shadow prices of the constraints
+            column.objective_coefficient - sum(
+                (
+                    objective_row[
+                        tableau._get_slack_column(constraint_index)
+                    ] * coefficient
+                    for constraint_index, coefficient
+                    in column.coefficients.items()
+                ),
+                Fraction(0)
+            )
+        )
+        for column
+        in columns
+    ]
+    priced.sort(key=lambda p: p.improvement_per_unit, reverse=True)
+    return priced
+
+
+def solve_with_columns(
+    tableau: Tableau,
+    columns: Iterable[CandidateColumn]
+) -> tuple[Fraction, dict[object, Fraction]]:
+    """Add candidate columns to a copy of a solved tableau and re-optimise it
+    from the current solution, returning the new objective value and the
+    value of each candidate.
+
+    Raises SimplexUnboundedError if the problem becomes unbounded.
+    """
+    trial = tableau.copy()
+    values: dict[object, Fraction] = dict()
+    for column in columns:
+        trial.add_column(
+            column.variable_id,
+            column.coefficients,
+            column.objective_coefficient
+        )
+        values[column.variable_id] = Fraction(0)
+    trial.pivot_until_done()
+    for variable, value in trial.get_basic_variable_values():
+        if variable.type == VariableType.NORMAL and variable.name in values:
+            values[variable.name] = value
+    return (trial.objective_value, values)
+
+
+def rank_candidates(
+    tableau: Tableau,
+    columns: Iterable[CandidateColumn],
+    top_k: int = 5
+) -> CandidateRanking:
+    """Solve the tableau (if it is not already solved), price every
+    candidate column, and find the exact gain for the top_k candidates by
+    re-optimising a copy of the tableau with each one added.
+
+    The tableau itself is left at its optimal solution without any of the
+    candidates.
+    """
+    logger = toplevel_logger.getChild('rank_candidates')
+
+    tableau.pivot_until_done()
+    base_objective = tableau.objective_value
+
+    ranking = price_columns(tableau, columns)
+
+    for rank, priced_column in enumerate(ranking):
+        if priced_column.improvement_per_unit <= 0:
+            # the current solution stays optimal with this candidate added,
+            # so the gain is known to be zero without re-optimising
+            priced_column.exact_gain = Fraction(0)
+            priced_column.value = Fraction(0)
+            continue
+        if rank >= top_k:
+            continue
+        try:
+            objective_value, values = solve_with_columns(
+                tableau,
+                [priced_column.column]
+            )
+        except SimplexUnboundedError:
+            logger.warning(
+                f'Problem is unbounded with {priced_column.column.variable_id}'
+                ' added, skipping'
+            )
+            continue
+        priced_column.exact_gain = objective_value - base_objective
+        priced_column.value = values[priced_column.column.variable_id]
+
+    return CandidateRanking(base_objective, ranking)
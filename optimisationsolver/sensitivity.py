@@ -0,0 +1,186 @@
+"""Sensitivity analysis (shadow prices, reduced costs and ranging) read from
+an optimal tableau.
+
+None of this requires any extra pivots: the objective row of the optimal
+tableau holds the shadow price of each constraint (in its slack column) and
+the reduced cost of each variable, and the slack columns hold the inverse of
+the basis matrix, which is all that is needed to find how far a
+right-hand-side or objective coefficient can change before the optimal basis
+changes.
+"""
+from dataclasses import dataclass
+from fractions import Fraction
+
+from utils.variabletypetags import NamedTypeTag
+from .simplex import Tableau
+
+
+@dataclass
+class ConstraintSensitivity:
+    constraint_id: object
+    rhs: Fraction
+    # the increase in the objective per unit increase of the right-hand-side
+    # (zero unless the constraint is binding)
+    shadow_price: Fraction
+    # how far the left-hand-side is below the right-hand-side
+    slack: Fraction
+    # the range of right-hand-side values for which the shadow price stays
+    # the same.  None if unbounded in that direction.
+    rhs_lower: Fraction | None
+    rhs_upper: Fraction | None
+
+
+@dataclass
+class VariableSensitivity:
+    variable: NamedTypeTag
+    value: Fraction
+    # how much the objective would decrease per unit of this variable if it
+    # were forced into the solution (zero for variables in the solution)
+    reduced_cost: Fraction
+    objective_coefficient: Fraction
+    # the range of objective coefficients for which the solution stays the
+    # same.  None if unbounded in that direction.
+    objective_coefficient_lower: Fraction | None
+    objective_coefficient_upper: Fraction | None
+
+
+@dataclass
+class SensitivityReport:
+    objective_value: Fraction
+    constraints: list[ConstraintSensitivity]
+    variables: list[VariableSensitivity]
+
+
+def _rhs_range(
+    tableau: Tableau,
+    constraint_index: int
+) -> tuple[Fraction | None, Fraction | None]:
+    # the right-hand-side of each row changes at the rate of its entry in the
+    # slack column of the constraint, and the basis stays feasible as long as
+    # none of them go negative
+    column = tableau._get_slack_column(constraint_index)
+    lower_delta = None
+    upper_delta = None
+    for row in tableau._tableau[:-1]:
+        rate = row[column]
+        if rate > 0:
+            delta = Fraction(-row.rhs, rate)
+            if lower_delta is None or delta > lower_delta:
+                lower_delta = delta
+        elif rate < 0:
+            delta = Fraction(row.rhs, -rate)
+            if upper_delta is None or delta < upper_delta:
+                upper_delta = delta
+    rhs = tableau._constraint_rhs[constraint_index]
+    return (
+        None if lower_delta is None else rhs + lower_delta,
+        None if upper_delta is None else rhs + upper_delta
+    )
+
+
+def _objective_coefficient_range(
+    tableau: Tableau,
+    column: int,
+    basic_rows: dict[int, int]
+) -> tuple[Fraction | None, Fraction | None]:
+    objective_row = tableau._tableau[-1]
+    coefficient = tableau._objective_coefficients[column]
+    if column not in basic_rows:
+        # a non-basic variable stays out of the solution until its
+        # coefficient increases by more than its reduced cost, but decreasing
+        # its coefficient can never bring it in
+        return (None, coefficient + objective_row[column])
+    # changing the coefficient of a basic variable changes the reduced cost
+    # of every non-basic variable by its entry in the row of the basic
+    # variable, and the solution stays optimal as long as none of them go
+    # negative
+    row = tableau._tableau[basic_rows[column]]
+    lower_delta = None
+    upper_delta = None
+    # exclude the objective and right-hand-side columns
+    for other_column in range(len(tableau._tableau_header) - 2):
+        if other_column in basic_rows:
+            continue
+        rate = row[other_column]
+        if rate > 0:
+            delta = Fraction(-objective_row[other_column], rate)
+            if lower_delta is None or delta > lower_delta:
+                lower_delta = delta
+        elif rate < 0:
+            delta = Fraction(objective_row[other_column], -rate)
+            if upper_delta is None or delta < upper_delta:
+                upper_delta = delta
+    return (
+        None if lower_delta is None else coefficient + lower_delta,
+        None if upper_delta is None else coefficient + upper_delta
+    )
+
+
+def sensitivity_report(tableau: Tableau) -> SensitivityReport:
+    """Get the shadow prices, reduced costs and ranging intervals of a solved
+    tableau.
+
+    CAUTION: the tableau must already be optimal, otherwise the report is
+    meaningless.
+    """
+    objective_row = tableau._tableau[-1]
+    # map each basic column to the row it is basic in
+    basic_rows: dict[int, int] = {
+        column: row_idx
+        for row_idx, column
+        # strip out the objective row
+        in enumerate(tableau._basis[:-1])
+    }
+
+    constraints: list[ConstraintSensitivity] = list()
+    for constraint_index, constraint_id in enumerate(
+        tableau._constraint_ids
+    ):
+        slack_column = tableau._get_slack_column(constraint_index)
+        rhs_lower, rhs_upper = _rhs_range(tableau, constraint_index)
+        constraints.append(
+            ConstraintSensitivity(
+                (
+                    constraint_index
+                    if constraint_id is None
+                    else constraint_id
+                ),
+                tableau._constraint_rhs[constraint_index],
+                objective_row[slack_column],
+                (
+                    tableau._tableau[basic_rows[slack_column]].rhs
+                    if slack_column in basic_rows
+                    else Fraction(0)
+                ),
+                rhs_lower,
+                rhs_upper
+            )
+        )
+
+    variables: list[VariableSensitivity] = list()
+    for column in range(tableau._slack_columns_start):
+        coefficient_lower, coefficient_upper = _objective_coefficient_range(
+            tableau,
+            column,
+            basic_rows
+        )
+        variables.append(
+            VariableSensitivity(
+                tableau._tableau_header[column],
+                (
+                    tableau._tableau[basic_rows[column]].rhs
+                    if column in basic_rows
+                    else Fraction(0)
+                ),
+                objective_row[column],
+                tableau._objective_coefficients[column],
+                coefficient_lower,
+                coefficient_upper
+            )
+        )
+
+    return SensitivityReport(
+        tableau.objective_value,
+        constraints,
+        variables
+    )
@@ -1,7 +1,9 @@
 import logging
+from copy import copy
+from enum import Enum
 from numbers import Rational
 from fractions import Fraction
-from typing import Iterable
+from typing import Hashable, Iterable
 from itertools import filterfalse, repeat, chain
 from utils.exceptions import AlgorithmDoneException
 from utils.variabletypetags import VariableType, NamedTypeTag, AnonymousTypeTag
@@ -17,6 +19,35 @@ class SimplexAlgorithmDoneException(AlgorithmDoneException):
         )
 
 
+class SimplexInfeasibleError(ValueError):
+    """Raised when a dual simplex pivot finds that no feasible solution
+    exists (i.e. a row with a negative right-hand-side has no negative entries
+    to pivot on)"""
+    pass
+
+
+class SimplexUnboundedError(ValueError):
+    """Raised when a primal simplex pivot finds that the objective variable
+    can be increased forever (i.e. the pivot column has no positive entries
+    to pivot on)"""
+    pass
+
+
+class PivotRule(Enum):
+    """How the pivot column (entering variable) of a primal pivot is chosen.
+    Which one takes the least time depends on the problem."""
+    # the most negative entry in the objective row (Dantzig's rule)
+    DANTZIG = 'dantzig'
+    # the most negative entry in the objective row relative to the length of
+    # its column, i.e. the steepest edge of the feasible region.  this
+    # usually takes fewer (but slower) pivots
+    STEEPEST_EDGE = 'steepest_edge'
+    # the leftmost negative entry in the objective row, with ties in the
+    # ratio test broken by the leftmost basic variable (Bland's rule).  this
+    # can take many more pivots, but never cycles on degenerate pivots
+    BLAND = 'bland'
+
+
 # helper utility that handles the special case of division by zero in the
 # simplex algorithm
 def pivot_div(numerator: Rational, denominator: Rational) -> Fraction | None:
@@ -158,8 +189,13 @@ class Inequality():
     def __init__(
         self,
         lhs: Iterable[Variable],
-        rhs: Rational
+        rhs: Rational,
+        id=None
     ):
+        # optional identifier used to refer back to this inequality once it
+        # has been turned into a row of the tableau (e.g. to report which
+        # constraint became binding).  like variable ids, this can be anything
+        self.id = id
         self._lhs = {
             var.id: var.coefficient
             for var
@@ -226,9 +262,13 @@ class Tableau():
     def __init__(
         self,
         inequalities: list[Inequality],
+        pivot_rule: PivotRule = PivotRule.DANTZIG
     ) -> None:
+        self.pivot_rule = pivot_rule
         self._tableau: list[TableauRow] = []
-        _vars = set()
+        # a dictionary (with no values) rather than a set, since it keeps
+        # the variables in the order they were first seen
+        _vars: dict[Hashable, None] = dict()
         for inequality in inequalities:
             for variable_id in inequality._lhs:
                 # inequality._lhs is the internal dictionary
@@ -237,78 +277,29 @@ class Tableau():
                 # quicker to just iterate through the keys directly,
                 # since this does not involve initialising new Variable
                 # objects.
-                _vars.add(variable_id)
+                _vars[variable_id] = None
 
         # to prevent fun bugs when the order of variables isnt consistent
         # throughout the tableau
-        # python sets are sorted from my experience, but considering how long
-        # i have spent debugging this file in particular i dont want to take
-        # chances
         _consistently_ordered_vars = list(_vars)
-        # see following comment: python sets may not always iterate
-        # consistently
         # Because my algorithm stores a header associating table columns with
         # their variables, I do not actually need to worry about sorting, as
-        # long as the order is consistent.  To save time, I therefore do not
-        # bother sorting the list (all the tests continue to pass, and the
-        # list keeps its particular order) but I still create a list to ensure
-        # that there is one canonical order.  Furthermore, no longer sorting
-        # the list allows for mixed types to be used as variable ids, even if
-        # they do not implement __lt__ for all the other types used for
-        # variable ids.
-
-        # Reference for the following paragraph-long comment is:
+        # long as the order is consistent.  Not sorting the list also allows
+        # for mixed types to be used as variable ids, even if they do not
+        # implement __lt__ for all the other types used for variable ids.
+
+        # This used to be a set, but the iteration order of a set depends on
+        # the hash values of its elements, and the hash values of strings
+        # (e.g. the class names of recipes) vary between Python invocations
+        # to mitigate denial-of-service attacks (see the note at the end of
         # https://docs.python.org/3/reference/datamodel.html#object.__hash__
-        # [accessed 2024-12-30 at 13:02]
-        # (specifically the note at the end of the documentation of __hash__)
-        # It turns out that in practice, the iteration order of sets is based
-        # on the hash values of the objects in the set.  For some datatypes,
-        # this varies between Python invocations to mitigate denial-of-service
-        # attacks.  It is implied that the iteration order would be consistent
-        # within the same invocation in most cases (based on experience, the
-        # set is likely a hash table which performs equality checks upon a
-        # collision and iterates through the underlying array) but it is not
-        # explicitly defined as such, and the case of a hash collision is
-        # undocumented and could theoretically be random (but I hypothesise
-        # that it is not, due to my theory that the underlying data structure
-        # is a hash table with presumably some form of variable-length list to
-        # handle collisions, it is likely that said list is consistent in
-        # ordering as it would be the least computationally expensive to
-        # implement it this way and would also prevent bugs introduced by
-        # programmers treating set ordering as consistent).
-
-        # A quick test with -1 and -2 (see next comment) in an interpreter
-        # adds evidence to my hypothesis: the iteration order of the set
-        # defined as {-1, -2} is -1, -2 (when processed directly by the
-        # interpreter or by a for loop), but the iteration order of the set
-        # defined as {-2, -1} is -2, -1 (under the same conditions) - this is
-        # consistent throughout repeats, suggesting that there is indeed some
-        # kind of (linked, or otherwise) list backing it in case of collisions
-        # and that is iterated through in its order (i.e. the order that
-        # elements with a hash collision would have been added to the set).
-        # However, since there are different python interpreters to CPython, I
-        # do not rely on this behaviour in case it differs in another
-        # implementation for whatever reason (or if it is changed in a future
-        # CPython version)
-
-        # basically, this means that the set itself can be unsortable
-        # (i.e. '<' operator is not supported by all elements against all
-        # elements - either because it is not implemented at all for at least
-        # one element or because mixed types that do not support comparison
-        # with each other are present) but will be sorted e.g. for positive
-        # integers (where my experience came from) due to these having hash
-        # values equal to themselves (for my testing on small integers this
-        # was the case, and when i used this behaviour in a previous program i
-        # was only dealing with integers 0 to 5 inclusive, although
-        # interestingly, for my version of python, this is not the case for
-        # negative numbers, with -1 having a hash value of -2, although for
-        # all the other integers i have tested the rule holds true - a quick
-        # web search reveals that the reason for this inconsistency is that -1
-        # is reserved in cpython to flag errors and if objects hash to it then
-        # their hash value is internally changed to -2)
-        # Reference for why the hash value of -1 is -2 is:
-        # https://stackoverflow.com/a/10130506
-        # [accessed 2025-01-04 at 12:21]
+        # [accessed 2024-12-30 at 13:02]).  So the columns of the same
+        # problem came out in a different order on each run unless hash
+        # randomisation was turned off, which meant that ties between
+        # pivots could be broken differently and a different (equally
+        # optimal) solution found.  Dictionaries iterate in insertion order,
+        # so the columns are now in the order that the variables first
+        # appear in the inequalities, which only depends on the problem.
 
         self._tableau_header: list[AnonymousTypeTag] = list(
             chain.from_iterable(
@@ -373,7 +364,194 @@ class Tableau():
             )
             self._tableau.append(TableauRow(_row))
 
+        # The basic variable of each row, as an index into the tableau
+        # header.  Initially, each constraint row has its own slack variable
+        # as its basic variable, and the objective row has the objective
+        # variable.  This is kept up to date by _pivot_on().
+        self._slack_columns_start = len(_consistently_ordered_vars)
+        self._basis: list[int] = [
+            self._slack_columns_start + row_idx
+            for row_idx
+            # this includes the objective row, whose basic variable (the
+            # objective variable) is in the column directly after the last
+            # slack variable
+            in range(len(inequalities))
+        ]
+
+        # keep track of the identifiers and right-hand-sides of the
+        # constraints (i.e. everything except the objective row) as they were
+        # originally specified, since once the tableau has been pivoted these
+        # can no longer be read back out of it
+        self._constraint_ids: list = [
+            inequality.id
+            for inequality
+            in inequalities[:-1]
+        ]
+        self._constraint_rhs: list[Fraction] = [
+            inequality.rhs
+            for inequality
+            in inequalities[:-1]
+        ]
+        # the coefficient of each normal variable in the objective function
+        # (i.e. the negated entries of the original objective row)
+        self._objective_coefficients: list[Fraction] = [
+            -coefficient
+            for coefficient
+            in self._tableau[-1]._row[:self._slack_columns_start]
+        ]
+
+    def _get_slack_column(self, constraint_index: int) -> int:
+        """Get the column of the slack variable for the constraint that was at
+        the given index in the list of inequalities given to the
+        constructor"""
+        return self._slack_columns_start + constraint_index
+
+    def _shift_rhs(self, constraint_index: int, delta: Rational) -> None:
+        """Change the right-hand-side of a constraint by delta, in-place,
+        without changing the basis.
+
+        Since the slack columns of the tableau always hold the inverse of the
+        basis matrix, the right-hand-side of every row (including the
+        objective row) changes by delta multiplied by its entry in the slack
+        column of the constraint.  Note that this can make the tableau
+        infeasible (a negative right-hand-side) - this is not checked.
+        """
+        column = self._get_slack_column(constraint_index)
+        for row in self._tableau:
+            row._row[-1] += row[column] * delta
+        self._constraint_rhs[constraint_index] += delta
+
+    def copy(self) -> type["Tableau"]:
+        """Get an independent copy of the tableau (e.g. to try out a change
+        without losing the current solution).
+
+        This is much quicker than copy.deepcopy, since the entries of the
+        tableau are immutable and so can be shared between the copies.
+        """
+        _ret = copy(self)
+        _ret._tableau = [TableauRow(list(row._row)) for row in self._tableau]
+        _ret._tableau_header = list(self._tableau_header)
+        _ret._basis = list(self._basis)
+        _ret._constraint_ids = list(self._constraint_ids)
+        _ret._constraint_rhs = list(self._constraint_rhs)
+        _ret._objective_coefficients = list(self._objective_coefficients)
+        return _ret
+
+    def add_column(
+        self,
+        variable_id,
+        coefficients: dict[int, Rational],
+        objective_coefficient: Rational = Fraction(0)
+    ) -> None:
+        """Add a new normal variable to the tableau, in-place.
+
+        coefficients maps the index of each constraint (in the list of
+        inequalities given to the constructor) that the variable appears in to
+        its coefficient in that inequality.  This can be done at any point,
+        including after pivoting: the column is transformed by the inverse of
+        the current basis (held in the slack columns), so the new variable
+        starts out non-basic and the current solution is unchanged.  Pivoting
+        again will then bring it into the solution if it is worth using.
+        """
+        if NamedTypeTag(VariableType.NORMAL, variable_id) in (
+            self._tableau_header[:self._slack_columns_start]
+        ):
+            raise ValueError(f"Variable {variable_id} already in tableau")
+        coefficients = {
+            constraint_index: Fraction(coefficient)
+            for constraint_index, coefficient
+            in coefficients.items()
+        }
+        column: list[Fraction] = [
+            sum(
+                (
+                    row[self._get_slack_column(constraint_index)]
+                    * coefficient
+                    for constraint_index, coefficient
+                    in coefficients.items()
+                ),
+                Fraction(0)
+            )
+            for row in self._tableau
+        ]
+        # the objective row additionally has the (negated) objective
+        # coefficient of the variable itself
+        column[-1] -= Fraction(objective_coefficient)
+
+        # put the new column after the existing normal variables
+        new_column_idx = self._slack_columns_start
+        for row, entry in zip(self._tableau, column):
+            row._row.insert(new_column_idx, entry)
+        self._tableau_header.insert(
+            new_column_idx,
+            NamedTypeTag(VariableType.NORMAL, variable_id)
+        )
+        self._basis = [
+            (column_idx + 1 if column_idx >= new_column_idx else column_idx)
+            for column_idx
+            in self._basis
+        ]
+        self._slack_columns_start += 1
+        self._objective_coefficients.append(Fraction(objective_coefficient))
+
+    def add_row(
+        self,
+        coefficients: dict,
+        rhs: Rational,
+        id=None
+    ) -> None:
+        """Add a new less-than-or-equal-to constraint to the tableau,
+        in-place.
+
+        coefficients maps the id of each normal variable in the constraint to
+        its coefficient.  As with add_column, this can be done after pivoting:
+        the row is rewritten in terms of the non-basic variables, and its
+        slack variable becomes its basic variable.  The objective row is
+        unchanged, so an optimal tableau stays optimal, but if the current
+        solution breaks the new constraint then the right-hand-side of the
+        new row is negative and dual_pivot_until_done() must be used to make
+        the tableau feasible again.
+        """
+        constraint_index = len(self._constraint_ids)
+        # the new slack column goes after the existing ones, and the new row
+        # goes before the objective row
+        new_column_idx = self._get_slack_column(constraint_index)
+        for row in self._tableau:
+            row._row.insert(new_column_idx, Fraction(0))
+        self._tableau_header.insert(
+            new_column_idx,
+            NamedTypeTag(VariableType.SLACK, constraint_index)
+        )
+        self._basis = [
+            (column_idx + 1 if column_idx >= new_column_idx else column_idx)
+            for column_idx
+            in self._basis
+        ]
+
+        new_row = [Fraction(0)] * len(self._tableau_header)
+        for variable_id, coefficient in coefficients.items():
+            new_row[
+                self._tableau_header.index(
+                    NamedTypeTag(VariableType.NORMAL, variable_id)
+                )
+            ] = Fraction(coefficient)
+        new_row[new_column_idx] = Fraction(1)
+        new_row[-1] = Fraction(rhs)
+        new_row = TableauRow(new_row)
+        # eliminate the basic variables from the new row, so that its slack
+        # variable is the only basic variable in it
+        for row, column_idx in zip(self._tableau[:-1], self._basis[:-1]):
+            if new_row[column_idx] != 0:
+                new_row = new_row - row * new_row[column_idx]
+
+        self._tableau.insert(constraint_index, new_row)
+        self._basis.insert(constraint_index, new_column_idx)
+        self._constraint_ids.append(id)
+        self._constraint_rhs.append(Fraction(rhs))
+
     def _get_pivot_column(self) -> int:
+        if self.pivot_rule is not PivotRule.DANTZIG:
+            return self._get_ranked_pivot_column()
         # get the objective row and find the value of the most negative entry
         most_neg = self._tableau[-1].min()
         # if there are no negative entries in the objective row, then the
@@ -386,6 +564,31 @@ class Tableau():
         # objective row, however it is more optimal to use the most negative
         # entry.
 
+    def _get_ranked_pivot_column(self) -> int:
+        objective_row = self._tableau[-1]
+        # as for the dual simplex algorithm, the objective and
+        # right-hand-side columns are never eligible
+        candidate_columns = [
+            column
+            for column
+            in range(len(self._tableau_header) - 2)
+            if objective_row[column] < 0
+        ]
+        if len(candidate_columns) == 0:
+            raise SimplexAlgorithmDoneException()
+        if self.pivot_rule is PivotRule.BLAND:
+            return candidate_columns[0]
+        # steepest edge: the squares are compared so that everything stays
+        # exact (the one is for the entering variable itself)
+        return max(
+            candidate_columns,
+            key=lambda column: (
+                objective_row[column] ** 2
+                /
+                (1 + sum(row[column] ** 2 for row in self._tableau[:-1]))
+            )
+        )
+
     def _get_pivot_row(self, pivot_column: int) -> int:
         row_ratios: list[Fraction | None] = [
             pivot_div(row[-1], row[pivot_column])
@@ -394,20 +597,93 @@ class Tableau():
             in self._tableau[:-1]
         ]
         # the pivot row is the row with the smallest non-negative ratio
-        return row_ratios.index(
-            # find the smallest ratio
-            min(
-                # filter out the negative ratios
-                filterfalse(
-                    lambda ratio: ratio is None or ratio < 0,
-                    row_ratios
-                )
+        eligible_ratios = list(
+            # filter out the negative ratios
+            filterfalse(
+                lambda ratio: ratio is None or ratio < 0,
+                row_ratios
+            )
+        )
+        if len(eligible_ratios) == 0:
+            # no row limits how far the pivot column's variable can increase
+            raise SimplexUnboundedError(
+                "The objective variable of the tableau is unbounded"
+            )
+        smallest_ratio = min(eligible_ratios)
+        if self.pivot_rule is PivotRule.BLAND:
+            return min(
+                (
+                    row
+                    for row, ratio
+                    in enumerate(row_ratios)
+                    if ratio == smallest_ratio
+                ),
+                key=lambda row: self._basis[row]
+            )
+        return row_ratios.index(smallest_ratio)
+
+    def _get_dual_pivot_row(self) -> int:
+        # the dual simplex algorithm removes the most negative right-hand-side
+        # (excluding the objective row) from the basis first
+        most_neg = min(row.rhs for row in self._tableau[:-1])
+        # if there are no negative right-hand-sides then the tableau is
+        # feasible again, so the dual simplex algorithm is complete
+        if most_neg >= 0:
+            raise SimplexAlgorithmDoneException()
+        return [row.rhs for row in self._tableau[:-1]].index(most_neg)
+
+    def _get_dual_pivot_column(self, pivot_row: int) -> int:
+        row = self._tableau[pivot_row]
+        objective_row = self._tableau[-1]
+        # only columns with a negative entry in the pivot row can be pivoted
+        # on (the objective and right-hand-side columns are never eligible).
+        # of these, the column with the smallest ratio between the objective
+        # row entry and the (absolute value of the) pivot row entry keeps
+        # every objective row entry non-negative, so the tableau stays
+        # optimal.  ties are broken by taking the leftmost column.
+        candidate_ratios: list[tuple[Fraction, int]] = [
+            (Fraction(objective_row[column], -row[column]), column)
+            for column
+            in range(len(self._tableau_header) - 2)
+            if row[column] < 0
+        ]
+        if len(candidate_ratios) == 0:
+            # every entry in the row is non-negative, so the basic variable of
+            # this row can never be made non-negative
+            raise SimplexInfeasibleError(
+                "No feasible solution exists for the tableau"
             )
+        return min(candidate_ratios)[1]
+
+    def is_optimal(self) -> bool:
+        """Whether there is nothing left to pivot on, i.e. no negative entry
+        in the objective row (so pivot() would raise
+        SimplexAlgorithmDoneException)"""
+        objective_row = self._tableau[-1]
+        # the objective and right-hand-side columns are never pivoted on
+        return all(
+            objective_row[column] >= 0
+            for column
+            in range(len(self._tableau_header) - 2)
         )
 
     def pivot(self) -> None:  # pivoting is in-place
         column = self._get_pivot_column()
         row = self._get_pivot_row(column)
+        self._pivot_on(row, column)
+
+    def dual_pivot(self) -> None:  # also in-place
+        """Perform one pivot of the dual simplex algorithm.
+
+        This requires every entry in the objective row to already be
+        non-negative (i.e. the tableau is optimal but may be infeasible, as is
+        the case after changing a right-hand-side of an optimal tableau).
+        """
+        row = self._get_dual_pivot_row()
+        column = self._get_dual_pivot_column(row)
+        self._pivot_on(row, column)
+
+    def _pivot_on(self, row: int, column: int) -> None:
         # get a copy of the pivot row, which will then be modified
         pivoted_row = self._tableau[row]
         # get a copy of the pivot element, which will be used to modify the
@@ -436,6 +712,9 @@ class Tableau():
             )
         ))
         self._tableau.insert(row, pivoted_row)
+        # the variable in the pivot column has replaced the previous basic
+        # variable of the pivot row
+        self._basis[row] = column
 
     def pivot_until_done(self) -> None:
         try:
@@ -444,6 +723,50 @@ class Tableau():
         except SimplexAlgorithmDoneException:
             return  # done now
 
+    def dual_pivot_until_done(self) -> None:
+        try:
+            while True:
+                self.dual_pivot()
+        except SimplexAlgorithmDoneException:
+            return  # feasible again now
+
+    def _get_objective_value(self) -> Fraction:
+        return self._tableau[-1].rhs
+
+    objective_value = property(
+        fget=_get_objective_value,
+        doc="The current value of the objective variable"
+    )
+
+    def get_basic_variable_values(self) -> list:
+        """Get the values of the basic variables (excluding the objective
+        variable), using the tracked basis rather than searching every column.
+
+        Any variable not returned is non-basic and has a value of zero.
+        """
+        return [
+            (self._tableau_header[column], row.rhs)
+            for column, row
+            # strip out the objective row
+            in zip(self._basis[:-1], self._tableau[:-1])
+        ]
+
+    def get_basis(self) -> list:
+        """Get the header of the basic variable of each row (including the
+        objective variable of the objective row), which together with the
+        problem is enough to rebuild the tableau as it is now."""
+        return [self._tableau_header[column] for column in self._basis]
+
+    def get_duals(self) -> list[Fraction]:
+        """Get the dual value (shadow price) of each constraint, in the order
+        they were given to the constructor, as it is now.  At the optimum
+        these prove it is optimal (see get_optimality_violations)."""
+        return [
+            self._tableau[-1][self._get_slack_column(constraint_index)]
+            for constraint_index
+            in range(len(self._constraint_ids))
+        ]
+
     def _get_variable_value(self, column: int) -> Fraction:
         # if the variable is basic, its column has all zeroes except for a
         # single row with a value of one.  the right hand side of the row with
@@ -484,3 +807,116 @@ class Tableau():
         ]
 
         return _ret
+
+
+def get_violations(
+    inequalities: list[Inequality],
+    variable_values: list
+) -> list[str]:
+    '''Check a solution against the problem it solves (in the format given to
+    Tableau, constraints followed by the objective), exactly and without the
+    tableau.  Gives a description of each variable that is negative and each
+    constraint that is not satisfied, so an empty list means the solution is
+    feasible.  Variables missing from variable_values (in the format of
+    Tableau.get_variable_values()) are zero.'''
+    values = {
+        var_id.name: value
+        for var_id, value
+        in variable_values
+        if var_id.type == VariableType.NORMAL
+    }
+    violations = [
+        f'variable {variable_id!r} is {value}'
+        for variable_id, value
+        in values.items()
+        if value < 0
+    ]
+    for inequality in inequalities[:-1]:
+        lhs = sum(
+            (
+                Fraction(coefficient) * values.get(variable_id, 0)
+                for variable_id, coefficient
+                in inequality._lhs.items()
+            ),
+            Fraction(0)
+        )
+        if lhs > inequality.rhs:
+            violations.append(
+                f'constraint {inequality.id!r} is {lhs} > {inequality.rhs}'
+            )
+    return violations
+
+
+def get_optimality_violations(
+    inequalities: list[Inequality],
+    variable_values: list,
+    duals: list
+) -> list[str]:
+    '''Check that a feasible solution (see get_violations) is optimal, given
+    the dual value of each constraint (as from Tableau.get_duals()), exactly
+    and against the problem rather than the tableau.  Gives a description of
+    each dual that is negative, each variable whose reduced cost is negative
+    and the gap between the objective and dual objective values, if any, so
+    an empty list means the duals are a feasible solution to the dual
+    problem with the same value and so (by weak duality) the solution is
+    optimal.'''
+    constraints = inequalities[:-1]
+    objective = inequalities[-1]
+    values = {
+        var_id.name: value
+        for var_id, value
+        in variable_values
+        if var_id.type == VariableType.NORMAL
+    }
+    violations = [
+        f'dual of constraint {constraint.id!r} is {dual}'
+        for constraint, dual
+        in zip(constraints, duals, strict=True)
+        if dual < 0
+    ]
+    # every variable in the problem, in the order they were first seen
+    variable_ids = dict.fromkeys(
+        chain.from_iterable(
+            inequality._lhs
+            for inequality
+            in inequalities
+        )
+    )
+    for variable_id in variable_ids:
+        # the objective function is the negated objective row, so the
+        # reduced cost is the entry the variable would have in the objective
+        # row of the tableau
+        reduced_cost = Fraction(objective._lhs.get(variable_id, 0)) + sum(
+            (
+                dual * Fraction(constraint._lhs.get(variable_id, 0))
+                for constraint, dual
+                in zip(constraints, duals)
+            ),
+            Fraction(0)
+        )
+        if reduced_cost < 0:
+            violations.append(
+                f'reduced cost of variable {variable_id!r} is {reduced_cost}'
+            )
+    objective_value = Fraction(objective.rhs) - sum(
+        (
+            Fraction(coefficient) * values.get(variable_id, 0)
+            for variable_id, coefficient
+            in objective._lhs.items()
+        ),
+        Fraction(0)
+    )
+    dual_objective_value = Fraction(objective.rhs) + sum(
+        (
+            dual * Fraction(constraint.rhs)
+            for constraint, dual
+            in zip(constraints, duals)
+        ),
+        Fraction(0)
+    )
+    if objective_value != dual_objective_value:
+        violations.append(
+            f'objective value {objective_value} is not the dual objective '
+            f'value {dual_objective_value}'
+        )
+    return violations
@@ -0,0 +1,285 @@
+"""Cache of the solutions of problems that have been solved before, keyed by
+a hash of the problem itself.
+
+The hash is of the problem as the tableau sees it (every variable and
+constraint, with exact coefficients and right-hand-sides, and the objective)
+along with any options that change what is solved for (e.g. whole numbers of
+machines), so the same problem always gets the same key however its inputs
+were given, and a problem that differs in any way never shares a key.  The
+variables of each constraint and the constraints themselves are sorted first,
+so the order they were built in does not matter.
+
+Solutions are kept in memory (the most recently used DEFAULT_MEMORY_ENTRIES of
+them) and, if given a directory, on disk too (up to DEFAULT_DISK_BYTES, with
+the least recently used removed first), so they survive a restart.  Entries
+on disk are grouped by the fingerprint of the docs they were solved with, and
+the groups for any other docs are removed whenever the fingerprint is set,
+since the ids in the solutions refer to the items and recipes of those docs.
+
+The entries on disk are unpickled, so the directory must only ever be
+somewhere that only the user can write to (by default, next to the docs
+cache in the user's cache directory).
+"""
+import collections
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from fractions import Fraction
+from typing import Mapping
+
+from .simplex import Inequality
+
+toplevel_logger = logging.getLogger(__name__)
+
+# increment whenever the hashing or CachedSolution change, so that old entries
+# are not mistaken for new ones
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MEMORY_ENTRIES = 32
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CachedSolution:
+    # as given by Tableau.get_variable_values()
+    variable_values: list
+    sensitivity_report: object
+    # whatever the analysis run on the solution returned, if there was one
+    analysis_result: object | None
+    # as given by Tableau.get_basis() at the solution
+    basis: list
+    pivots: int
+
+
+def _canonical(obj: object) -> str:
+    '''Give a string that is the same for equal ids (or coefficients) in
+    every run of the program, and different for different ones'''
+    if obj is None or isinstance(obj, bool):
+        return repr(obj)
+    if isinstance(obj, str):
+        return repr(obj)
+    if isinstance(obj, Enum):
+        return f'{type(obj).__name__}.{obj.name}'
+    if isinstance(obj, (int, float, Fraction)):
+        # exact, so 0.1 and 1/10 are different
+        return str(Fraction(obj))
+    if isinstance(obj, tuple):
+        return f'({",".join(map(_canonical, obj))})'
+    canonical_key = getattr(obj, 'canonical_key', None)
+    if canonical_key is not None:
+        return f'{type(obj).__name__}{_canonical(canonical_key())}'
+    raise TypeError(f'{obj!r} has no canonical form to hash')
+
+
+def _canonical_inequality(inequality: Inequality) -> str:
+    return ';'.join([
+        _canonical(inequality.id),
+        ','.join(sorted(
+            f'{_canonical(variable_id)}*{_canonical(coefficient)}'
+            for variable_id, coefficient
+            in inequality._lhs.items()
+        )),
+        _canonical(inequality.objective_coefficient),
+        _canonical(inequality.rhs)
+    ])
+
+
+def hash_problem(
+    problem: list[Inequality],
+    options: Mapping[str, object] = {}
+) -> str:
+    '''Hash a problem in the format given to Tableau (constraints followed by
+    the objective), along with the options that change its solution.  Raises
+    TypeError if an id in the problem can not be hashed the same way in
+    every run (see _canonical).'''
+    problem_hash = hashlib.sha256()
+    for line in (
+        f'version {CACHE_FORMAT_VERSION}',
+        f'objective {_canonical_inequality(problem[-1])}',
+        *sorted(
+            f'constraint {_canonical_inequality(inequality)}'
+            for inequality
+            in problem[:-1]
+        ),
+        *sorted(
+            f'option {_canonical(name)}={_canonical(value)}'
+            for name, value
+            in options.items()
+        )
+    ):
+        problem_hash.update(line.encode('utf-8') + b'\n')
+    return problem_hash.hexdigest()
+
+
+class SolutionCache:
+    def __init__(
+        self,
+        directory: pathlib.Path | None,
+        docs_fingerprint: str | None,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES
+    ):
+        '''Cache solutions in memory, and on disk in directory unless it is
+        None'''
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        # solutions are put by the worker thread and got by the GUI thread
+        self._lock = threading.Lock()
+        # least recently used first
+        self._memory: collections.OrderedDict[str, CachedSolution] = (
+            collections.OrderedDict()
+        )
+        self._docs_fingerprint = None
+        self.set_docs_fingerprint(docs_fingerprint)
+
+    def set_docs_fingerprint(self, docs_fingerprint: str | None) -> None:
+        '''Forget every solution that was not solved with the docs that have
+        this fingerprint (see docscache.get_docs_fingerprint).  None means
+        the docs are unknown, so nothing is kept on disk.'''
+        logger = toplevel_logger.getChild(
+            'SolutionCache.set_docs_fingerprint'
+        )
+
+        with self._lock:
+            if docs_fingerprint == self._docs_fingerprint:
+                return
+            self._docs_fingerprint = docs_fingerprint
+            self._memory.clear()
+            if self.directory is None or docs_fingerprint is None:
+                return
+            try:
+                stale_directories = [
+                    path
+                    for path
+                    in self.directory.iterdir()
+                    if path.is_dir() and path.name != docs_fingerprint
+                ]
+            except OSError:
+                # nothing cached yet
+                return
+            for stale_directory in stale_directories:
+                logger.info(
+                    f'Removing solutions cached for other docs in '
+                    f'{stale_directory}'
+                )
+                shutil.rmtree(stale_directory, ignore_errors=True)
+
+    def _get_entry_path(self, key: str) -> pathlib.Path | None:
+        if self.directory is None or self._docs_fingerprint is None:
+            return None
+        return self.directory.joinpath(self._docs_fingerprint, f'{key}.pickle')
+
+    def get(self, key: str) -> CachedSolution | None:
+        '''Get the cached solution of the problem with the key given by
+        hash_problem, or None if it has not been cached'''
+        logger = toplevel_logger.getChild('SolutionCache.get')
+
+        with self._lock:
+            solution = self._memory.get(key)
+            if solution is not None:
+                self._memory.move_to_end(key)
+                logger.debug(f'Solution {key} found in memory')
+                return solution
+            entry_path = self._get_entry_path(key)
+            if entry_path is None:
+                return None
+            try:
+                data = entry_path.read_bytes()
+            except OSError:
+                return None
+            try:
+                solution = pickle.loads(data)
+            except Exception as e:
+                # e.g. truncated, or pickled classes that no longer exist
+                logger.warning(f'Cached solution {entry_path} is corrupt: {e}')
+                entry_path.unlink(missing_ok=True)
+                return None
+            try:
+                # so that it is evicted last
+                os.utime(entry_path)
+            except OSError:
+                pass
+            logger.debug(f'Solution {key} found on disk')
+            self._put_in_memory(key, solution)
+            return solution
+
+    def put(self, key: str, solution: CachedSolution) -> None:
+        '''Cache the solution of the problem with the key given by
+        hash_problem.  Failing to write it to disk is logged and otherwise
+        ignored.'''
+        logger = toplevel_logger.getChild('SolutionCache.put')
+
+        with self._lock:
+            self._put_in_memory(key, solution)
+            entry_path = self._get_entry_path(key)
+            if entry_path is None:
+                return
+            try:
+                self._write_entry(
+                    entry_path,
+                    pickle.dumps(solution, protocol=pickle.HIGHEST_PROTOCOL)
+                )
+                self._evict_from_disk(entry_path.parent)
+            except OSError as e:
+                logger.warning(f'Could not cache solution {entry_path}: {e}')
+
+    def clear(self) -> None:
+        '''Forget every cached solution, including those on disk'''
+        with self._lock:
+            self._memory.clear()
+            if self.directory is not None:
+                shutil.rmtree(self.directory, ignore_errors=True)
+
+    # the methods below must be called with self._lock held
+
+    def _put_in_memory(self, key: str, solution: CachedSolution) -> None:
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _write_entry(self, entry_path: pathlib.Path, data: bytes) -> None:
+        # written to a temporary file first so that a crash (or another
+        # instance of the program) never leaves a half-written entry behind
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=entry_path.parent,
+            prefix=entry_path.name,
+            suffix='.tmp'
+        )
+        try:
+            with os.fdopen(file_descriptor, 'wb') as fptr:
+                fptr.write(data)
+            os.replace(temporary_path, entry_path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def _evict_from_disk(self, directory: pathlib.Path) -> None:
+        logger = toplevel_logger.getChild('SolutionCache._evict_from_disk')
+
+        entries = list()
+        for entry_path in directory.glob('*.pickle'):
+            try:
+                stat_result = entry_path.stat()
+            except OSError:
+                continue
+            entries.append(
+                (stat_result.st_mtime_ns, stat_result.st_size, entry_path)
+            )
+        total_bytes = sum(size for _, size, _ in entries)
+        # least recently used first
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total_bytes <= self.max_disk_bytes:
+                break
+            logger.debug(f'Evicting cached solution {entry_path}')
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size
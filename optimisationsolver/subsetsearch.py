@@ -0,0 +1,315 @@
+"""Search for the best set of at most k candidate variables to enable, by
+branch and bound over the candidates.
+
+Every node of the search has a set of candidates that must be enabled and a
+set that must not be.  A node is evaluated by solving the linear relaxation
+with every candidate that is not excluded enabled, which is an upper bound on
+the objective of any set the node could still choose.  If that solution uses
+no more than k candidates it is the best set for the node.  Otherwise the
+candidates it uses the most of are enabled to complete the set (a lower
+bound, and possibly a new incumbent), and the node is split on them: the
+first child excludes the first of them, the second includes the first and
+excludes the second, and so on.  Between them the children cover every set
+that the node could choose apart from the completed set itself.
+
+Nodes are evaluated in worker processes, each of which starts from a copy of
+the solved tableau without any of the candidates, so every relaxation is
+warm-started from that solution instead of being solved from scratch.
+"""
+import heapq
+import logging
+import os
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    wait,
+    FIRST_COMPLETED
+)
+from dataclasses import dataclass
+from fractions import Fraction
+from itertools import count
+from typing import Callable, Iterable, NamedTuple
+
+from .simplex import Tableau
+from .pricing import CandidateColumn, solve_with_columns
+
+toplevel_logger = logging.getLogger(__name__)
+
+# state of a worker process, set up once by _initialise_worker so that the
+# tableau and candidate columns do not have to be sent with every node
+_worker_tableau: Tableau | None = None
+_worker_columns: dict[object, CandidateColumn] = dict()
+
+
+@dataclass
+class SubsetSearchProgress:
+    # the objective value and candidates of the best set found so far
+    incumbent_value: Fraction
+    incumbent: frozenset
+    # an upper bound on the objective value of the best set
+    best_bound: Fraction
+    nodes_evaluated: int
+    open_nodes: int
+
+    @property
+    def gap(self) -> Fraction:
+        return self.best_bound - self.incumbent_value
+
+
+@dataclass
+class SubsetSearchResult:
+    k: int
+    objective_value: Fraction
+    # the candidates to enable, most used first
+    enabled: list
+    # the value of each enabled candidate in the solution
+    values: dict[object, Fraction]
+    best_bound: Fraction
+    nodes_evaluated: int
+    # False if the search was stopped before every node was evaluated, in
+    # which case the best set may be up to gap better than the one found
+    proven_optimal: bool
+
+    @property
+    def gap(self) -> Fraction:
+        return self.best_bound - self.objective_value
+
+
+class _NodeEvaluation(NamedTuple):
+    upper_bound: Fraction
+    # candidates used by the relaxation that are not already included, most
+    # used first
+    branch_candidates: list
+    # the set completed from the included and most used candidates
+    lower_bound: Fraction
+    lower_bound_values: dict[object, Fraction]
+
+
+def _initialise_worker(
+    tableau: Tableau,
+    columns: list[CandidateColumn]
+) -> None:
+    global _worker_tableau, _worker_columns
+    _worker_tableau = tableau
+    _worker_columns = {column.variable_id: column for column in columns}
+
+
+def _evaluate_node(
+    included: frozenset,
+    excluded: frozenset,
+    k: int
+) -> _NodeEvaluation:
+    if len(included) >= k:
+        # nothing else can be enabled
+        allowed = included
+    else:
+        allowed = _worker_columns.keys() - excluded
+    upper_bound, values = solve_with_columns(
+        _worker_tableau,
+        [_worker_columns[variable_id] for variable_id in allowed]
+    )
+    branch_candidates = sorted(
+        (
+            variable_id
+            for variable_id, value
+            in values.items()
+            if value > 0 and variable_id not in included
+        ),
+        key=lambda variable_id: values[variable_id],
+        reverse=True
+    )
+    if len(included) + len(branch_candidates) <= k:
+        # the relaxation is a valid set, so is the best set for this node
+        return _NodeEvaluation(upper_bound, [], upper_bound, values)
+    completed = included.union(
+        branch_candidates[:k - len(included)]
+    )
+    lower_bound, lower_bound_values = solve_with_columns(
+        _worker_tableau,
+        [_worker_columns[variable_id] for variable_id in completed]
+    )
+    return _NodeEvaluation(
+        upper_bound,
+        branch_candidates[:k - len(included)],
+        lower_bound,
+        lower_bound_values
+    )
+
+
+def best_subset_search(
+    tableau: Tableau,
+    columns: Iterable[CandidateColumn],
+    k: int,
+    workers: int | None = None,
+    max_nodes: int | None = None,
+    progress: Callable[[SubsetSearchProgress], None] | None = None,
+    should_stop: Callable[[], bool] | None = None
+) -> SubsetSearchResult:
+    """Find the set of at most k candidate columns that gives the best
+    objective value when added to the problem.
+
+    The tableau is solved first if it is not already solved, and is not
+    modified further.  Nodes are evaluated on a pool of worker processes
+    (os.cpu_count() of them if workers is None), or in this process if
+    workers is 0.  The search stops early once max_nodes nodes have been
+    evaluated or should_stop returns True, and progress is called with the
+    state of the search after every node.
+
+    Raises SimplexUnboundedError if the problem is unbounded with the
+    candidates added.
+    """
+    logger = toplevel_logger.getChild('best_subset_search')
+
+    tableau.pivot_until_done()
+    columns = list(columns)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # the empty set is always valid
+    incumbent_value = tableau.objective_value
+    incumbent: frozenset = frozenset()
+    incumbent_values: dict[object, Fraction] = dict()
+
+    # heap of (-bound from parent, tiebreaker, included, excluded), so that
+    # the node with the best bound is always evaluated next
+    tiebreaker = count()
+    open_nodes: list[tuple[Fraction | None, int, frozenset, frozenset]] = [
+        (None, next(tiebreaker), frozenset(), frozenset())
+    ]
+    # maps each node being evaluated to its bound from its parent
+    in_flight: dict[Future, tuple[Fraction | None, frozenset, frozenset]] = (
+        dict()
+    )
+    nodes_evaluated = 0
+    stopped_early = False
+
+    def best_bound() -> Fraction | None:
+        # None if the root node has not been evaluated yet
+        bounds = [incumbent_value]
+        for negative_bound, _, _, _ in open_nodes:
+            if negative_bound is None:
+                return None
+            bounds.append(-negative_bound)
+        for bound, _, _ in in_flight.values():
+            if bound is None:
+                return None
+            bounds.append(bound)
+        return max(bounds)
+
+    if workers == 0:
+        _initialise_worker(tableau, columns)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialise_worker,
+            initargs=(tableau, columns)
+        )
+
+    try:
+        while open_nodes or in_flight:
+            if (
+                (should_stop is not None and should_stop())
+                or
+                (max_nodes is not None and nodes_evaluated >= max_nodes)
+            ):
+                stopped_early = True
+                break
+
+            # keep every worker busy (with a spare node each so that they
+            # are not left waiting on this process)
+            while open_nodes and len(in_flight) < max(workers, 1) * 2:
+                negative_bound, _, included, excluded = heapq.heappop(
+                    open_nodes
+                )
+                if (
+                    negative_bound is not None
+                    and -negative_bound <= incumbent_value
+                ):
+                    # cannot beat the incumbent
+                    continue
+                bound = None if negative_bound is None else -negative_bound
+                if executor is None:
+                    future = Future()
+                    future.set_result(_evaluate_node(included, excluded, k))
+                else:
+                    future = executor.submit(
+                        _evaluate_node,
+                        included,
+                        excluded,
+                        k
+                    )
+                in_flight[future] = (bound, included, excluded)
+                if executor is None:
+                    # only evaluate one node at a time, so that the next one
+                    # is picked with the latest incumbent
+                    break
+
+            if not in_flight:
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                _, included, excluded = in_flight.pop(future)
+                evaluation = future.result()
+                nodes_evaluated += 1
+                if evaluation.lower_bound > incumbent_value:
+                    incumbent_value = evaluation.lower_bound
+                    incumbent_values = {
+                        variable_id: value
+                        for variable_id, value
+                        in evaluation.lower_bound_values.items()
+                        if value > 0
+                    }
+                    incumbent = frozenset(incumbent_values)
+                    logger.info(
+                        f'New incumbent with objective value '
+                        f'{float(incumbent_value)}'
+                    )
+                if evaluation.upper_bound <= incumbent_value:
+                    continue
+                for branch_index, branch_candidate in enumerate(
+                    evaluation.branch_candidates
+                ):
+                    heapq.heappush(
+                        open_nodes,
+                        (
+                            -evaluation.upper_bound,
+                            next(tiebreaker),
+                            included.union(
+                                evaluation.branch_candidates[:branch_index]
+                            ),
+                            excluded.union((branch_candidate,))
+                        )
+                    )
+
+            if progress is not None:
+                progress(SubsetSearchProgress(
+                    incumbent_value,
+                    incumbent,
+                    best_bound(),
+                    nodes_evaluated,
+                    len(open_nodes) + len(in_flight)
+                ))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    final_bound = best_bound() if stopped_early else incumbent_value
+    if final_bound is None:
+        # stopped before the root node was evaluated, so nothing is known
+        # about the bound without solving the full relaxation
+        final_bound, _ = solve_with_columns(tableau, columns)
+    return SubsetSearchResult(
+        k,
+        incumbent_value,
+        sorted(
+            incumbent,
+            key=lambda variable_id: incumbent_values[variable_id],
+            reverse=True
+        ),
+        incumbent_values,
+        max(final_bound, incumbent_value),
+        nodes_evaluated,
+        not stopped_early
+    )
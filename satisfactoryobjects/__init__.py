@@ -10,6 +10,13 @@ __all__ = [
         "lookuperrors",
         "recipelookup",
         "itemvariabletype",
+        "itemconstrainttype",
         "resourceduplicatetypingsaver",
-        "checkifrecipealternate"
+        "checkifrecipealternate",
+        "docsstream",
+        "docscache",
+        "unrealproperties",
+        "docsreload",
+        "docsoverlay",
+        "docsloader"
     ]
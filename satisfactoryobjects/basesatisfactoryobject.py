@@ -1,13 +1,23 @@
+import sys
+
+
 class BaseSatisfactoryObject:
     """A base class that contains the fields common to all satisfactory data
     objects
     """
+    # there are thousands of these, so no per-instance __dict__ (every
+    # subclass has to define __slots__ too, or it gets one anyway)
+    __slots__ = ('internal_class_identifier', 'user_facing_name')
+
     def __init__(
         self,
         internal_class_identifier: str,
         user_facing_name: str
     ) -> None:
-        self.internal_class_identifier = internal_class_identifier
+        # interned since class identifiers are used as keys everywhere (the
+        # registries, the variables of the problem), and so that every object
+        # loaded with the same identifier shares one copy of it
+        self.internal_class_identifier = sys.intern(internal_class_identifier)
         self.user_facing_name = user_facing_name
 
     def __eq__(self, other: object) -> bool:
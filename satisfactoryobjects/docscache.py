@@ -0,0 +1,264 @@
+"""Cache of the items, machines and recipes loaded from the docs.
+
+Loading the docs means decoding a large UTF-16 JSON file and running every
+handler on it, even though the docs only change when the game is updated.
+Once the registries have been populated, they are pickled into a cache file
+along with a header that identifies the docs they were loaded from.  On the
+next start-up the whole cache file is read at once and, if the header still
+matches the docs, the registries are filled straight from it.
+
+The header holds the path, size and modification time of each docs file
+that was loaded (the base game's docs and those of any mods, in the order they
+were merged in) and a hash of its contents.  If the paths, sizes and
+modification times all match then the docs are assumed to be unchanged
+without reading them.  If only the modification time of a file differs (e.g.
+the file was copied or the game was reinstalled), that file is hashed to check
+whether its contents actually changed.  Anything else, or a cache written by a
+different version of this format, means the docs have to be loaded again.
+
+The cache file is unpickled, so it must only ever be read from somewhere
+that only the user can write to (by default, the user's cache directory).
+"""
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import struct
+import sys
+import tempfile
+from typing import NamedTuple, Sequence
+
+from .itemhandler import items
+from .machinehandler import machines
+from .recipehandler import recipes
+
+toplevel_logger = logging.getLogger(__name__)
+
+# increment whenever the cached objects or the handlers change in a way that
+# means an old cache no longer gives the same result as loading the docs
+CACHE_FORMAT_VERSION = 3
+
+_MAGIC = b'SATOPTDC'
+# format version, number of docs files (each of which has a key after the
+# header)
+_HEADER = struct.Struct('<8sHH')
+# docs size, docs modification time (ns), sha256 of the docs, length of the
+# utf-8 encoded docs path (which follows the key)
+_DOCS_KEY = struct.Struct('<QQ32sH')
+
+
+class DocsKey(NamedTuple):
+    """What identifies the exact docs that a cache was made from"""
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: bytes
+
+
+def get_default_cache_path() -> pathlib.Path:
+    """Get the path of the cache file in the user's cache directory"""
+    match sys.platform:
+        case 'win32' | 'cygwin':
+            base = pathlib.Path(
+                os.environ.get('LOCALAPPDATA', '~/AppData/Local')
+            )
+        case 'darwin':
+            base = pathlib.Path('~/Library/Caches')
+        case _:
+            base = pathlib.Path(os.environ.get('XDG_CACHE_HOME', '~/.cache'))
+    return base.expanduser().joinpath(
+        'satisfactory-optimiser',
+        'docs.cache'
+    )
+
+
+def hash_docs(docs_path: pathlib.Path) -> bytes:
+    with open(docs_path, 'rb') as fptr:
+        return hashlib.file_digest(fptr, 'sha256').digest()
+
+
+def make_docs_key(docs_path: pathlib.Path) -> DocsKey:
+    """Get the key of the docs at docs_path as they are now"""
+    stat_result = os.stat(docs_path)
+    return DocsKey(
+        str(docs_path),
+        stat_result.st_size,
+        stat_result.st_mtime_ns,
+        hash_docs(docs_path)
+    )
+
+
+def get_docs_fingerprint(keys: Sequence[DocsKey]) -> str:
+    """Get a string that identifies the contents of the docs with these
+    keys (in the order they were merged), and so what was loaded from them.
+    Unlike the keys themselves, it does not change if the docs are only moved
+    or touched."""
+    fingerprint = hashlib.sha256(
+        CACHE_FORMAT_VERSION.to_bytes(2, 'little')
+    )
+    for key in keys:
+        fingerprint.update(key.content_hash)
+    return fingerprint.hexdigest()
+
+
+def _pack(keys: Sequence[DocsKey], payload: bytes) -> bytes:
+    packed = [_HEADER.pack(_MAGIC, CACHE_FORMAT_VERSION, len(keys))]
+    for key in keys:
+        encoded_path = key.path.encode('utf-8')
+        packed.append(
+            _DOCS_KEY.pack(
+                key.size,
+                key.mtime_ns,
+                key.content_hash,
+                len(encoded_path)
+            )
+        )
+        packed.append(encoded_path)
+    packed.append(payload)
+    return b''.join(packed)
+
+
+def _unpack(data: bytes) -> tuple[tuple[DocsKey, ...], memoryview] | None:
+    """Split the contents of a cache file into the keys of its docs and its
+    pickled registries, or return None if it is not a cache of this
+    format"""
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, n_keys = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != CACHE_FORMAT_VERSION:
+        return None
+    keys = list()
+    offset = _HEADER.size
+    for _ in range(n_keys):
+        if len(data) < offset + _DOCS_KEY.size:
+            return None
+        size, mtime_ns, content_hash, path_length = _DOCS_KEY.unpack_from(
+            data,
+            offset
+        )
+        path_start = offset + _DOCS_KEY.size
+        offset = path_start + path_length
+        keys.append(
+            DocsKey(
+                data[path_start:offset].decode('utf-8', errors='replace'),
+                size,
+                mtime_ns,
+                content_hash
+            )
+        )
+    return (tuple(keys), memoryview(data)[offset:])
+
+
+def _write_atomically(cache_path: pathlib.Path, data: bytes) -> None:
+    # write to a temporary file first so that a crash (or another instance of
+    # the program) never leaves a half-written cache behind
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=cache_path.parent,
+        prefix=cache_path.name,
+        suffix='.tmp'
+    )
+    try:
+        with os.fdopen(file_descriptor, 'wb') as fptr:
+            fptr.write(data)
+        os.replace(temporary_path, cache_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def save(cache_path: pathlib.Path, keys: Sequence[DocsKey]) -> None:
+    """Save the current contents of the registries to the cache file, as
+    having been loaded from the docs identified by keys (in the order they
+    were merged).  Failing to write the cache is logged and otherwise
+    ignored."""
+    logger = toplevel_logger.getChild('save')
+
+    # pickled together so that the items and machines referenced by the
+    # recipes are the same objects as the ones in the other registries
+    payload = pickle.dumps(
+        (items, machines, recipes),
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+    try:
+        _write_atomically(cache_path, _pack(keys, payload))
+    except OSError as e:
+        logger.warning(f'Could not write docs cache {cache_path}: {e}')
+        return
+    logger.info(f'Saved docs cache to {cache_path}')
+
+
+def load(
+    docs_paths: Sequence[pathlib.Path],
+    cache_path: pathlib.Path
+) -> list[DocsKey] | None:
+    """Fill the registries from the cache file if it was made from the docs
+    at docs_paths (in the same order) as they are now, returning the keys of
+    the docs.  Returns None (leaving the registries untouched) if the docs
+    need to be loaded instead."""
+    logger = toplevel_logger.getChild('load')
+
+    try:
+        # the whole cache in a single read
+        data = cache_path.read_bytes()
+    except OSError as e:
+        logger.info(f'No usable docs cache at {cache_path}: {e}')
+        return None
+    unpacked = _unpack(data)
+    if unpacked is None:
+        logger.info('Docs cache is from a different version, ignoring it')
+        return None
+    cached_keys, payload = unpacked
+    if len(cached_keys) != len(docs_paths):
+        logger.info('Different docs files were loaded into the cache')
+        return None
+
+    current_keys = list()
+    for cached_key, docs_path in zip(cached_keys, docs_paths):
+        stat_result = os.stat(docs_path)
+        if (
+            cached_key.path != str(docs_path)
+            or cached_key.size != stat_result.st_size
+        ):
+            logger.info(f'{docs_path} has changed since the cache was made')
+            return None
+        if cached_key.mtime_ns != stat_result.st_mtime_ns:
+            # same size but touched since, so check if the contents changed
+            if hash_docs(docs_path) != cached_key.content_hash:
+                logger.info(
+                    f'{docs_path} has changed since the cache was made'
+                )
+                return None
+            cached_key = cached_key._replace(
+                mtime_ns=stat_result.st_mtime_ns
+            )
+        current_keys.append(cached_key)
+    if current_keys != list(cached_keys):
+        logger.info('Docs were touched but are unchanged, updating cache')
+        try:
+            _write_atomically(cache_path, _pack(current_keys, payload))
+        except OSError as e:
+            logger.warning(f'Could not update docs cache {cache_path}: {e}')
+
+    try:
+        cached_items, cached_machines, cached_recipes = pickle.loads(payload)
+    except Exception as e:
+        # e.g. truncated, or pickled classes that no longer exist
+        logger.warning(f'Docs cache {cache_path} is corrupt: {e}')
+        return None
+
+    # the registries are updated in place since other modules hold
+    # references to them
+    for registry, cached_registry in (
+        (items, cached_items),
+        (machines, cached_machines),
+        (recipes, cached_recipes)
+    ):
+        registry.clear()
+        registry.update(cached_registry)
+    logger.info(
+        f'Loaded {len(items)} items, {len(machines)} machines and '
+        f'{len(recipes)} recipes from docs cache'
+    )
+    return current_keys
@@ -0,0 +1,260 @@
+"""Finding and loading the docs, without anything that needs the GUI.
+
+Used by both the GUI (main.py) and the command-line solver (solve.py).
+"""
+import logging
+import pathlib
+import sys
+
+from utils import startupprofile
+
+from . import (
+    itemhandler,
+    recipehandler,
+    machinehandler,
+    nativeclasses,
+    docsoverlay,
+    docscache,
+    docsreload
+)
+
+toplevel_logger = logging.getLogger(__name__)
+
+# the fingerprint (see docscache.get_docs_fingerprint) of the docs that were
+# last loaded, or None if none have been
+_docs_fingerprint: str | None = None
+
+
+def get_docs_fingerprint() -> str | None:
+    '''Get the fingerprint of the docs that were last loaded by load_docs,
+    e.g. to tell whether something derived from the registries is stale'''
+    return _docs_fingerprint
+
+
+def set_docs_fingerprint(docs_fingerprint: str | None) -> None:
+    '''Record the fingerprint of docs that were loaded in another process
+    (see load_docs_registries)'''
+    global _docs_fingerprint
+    _docs_fingerprint = docs_fingerprint
+
+
+def get_default_satisfactory_docs_path() -> pathlib.Path | None:
+    # think this is the same for all satisfactory installations
+    # TODO: allow passing the locale as an argument or try and autodetermine it
+    # from the system config?  since post-1.0 it changed to have multiple
+    # versions per-locale
+    # TODO: autodetect if the old docs path is present, and if so use it
+    # TODO: try a few possible different docs root paths (e.g. steam, then
+    # epic games on windows/mac, then heroic on mac/linux, then epic games via
+    # lutris on linux) - will probably not get done due to not owning the game
+    # on epic myself and not really having time to borrow a macbook to test
+    # steam on macos
+    # OLD_SATISFACTORY_DOCS = pathlib.Path('CommunityResources/Docs/Docs.json')
+    SATISFACTORY_DOCS = pathlib.Path('CommunityResources/Docs/en-GB.json')
+    # also if you are reading this and have the time and it is after my nea
+    # deadline and have satisfactory on eric james launcher i would appreciate
+    # it if you checked where it plonked satisfactory, so i can add it as an
+    # option (or you could make a pr)
+    # i only have satisfactory on steam
+    # also if you have the eric james version and use linux could you maybe
+    # test with heroic games launcher and/or lutris-installed eric james
+    # launcher (or some other launcher i havent heard of)
+    match sys.platform:
+        case 'emscripten' | 'wasi':
+            # webassembly
+            # probably wont work well, if at all
+            return None
+        case 'android':
+            # i think qt for python lets you build android apps but i dont
+            # know how open() would work there (probably not at all with SAF)
+            # this app may work there but isnt really designed for it.
+            # try this one at your own risk.
+            return None
+        case 'ios':
+            # does qt for python even support ios?
+            # would probably be hell to get working even if you do pay the
+            # recurring developer ransom
+            return None
+        case 'linux':
+            # best tested platform.
+            return pathlib.PosixPath(
+                '~/.local/share/Steam/steamapps/common/Satisfactory/'
+            ).expanduser().joinpath(SATISFACTORY_DOCS).resolve()
+        case 'win32' | 'cygwin':
+            # all windows
+            # i think cygwin lets you access windows paths directly
+            # windows is the only platform satisfactory itself officially
+            # supports
+            # TODO: check if a PosixPath is required under cygwin (pathlib
+            # will refuse to instantiate a WindowsPath on a posix system and
+            # vice versa)
+            return pathlib.WindowsPath(
+                'C:/Program Files (x86)/Steam/steamapps/common/Satisfactory/'
+            ).joinpath(SATISFACTORY_DOCS).resolve()
+        case 'darwin':
+            # macos (darwin bsd)
+            # official support not planned but should work
+            # feel free to add the path here and pull request
+            # from whenever my nea deadline has passed
+            # (idk lets say june 2025 will definitely be passed)
+            return None
+        case 'aix':
+            # likely would work decently if the docs file was provided
+            # but i doubt steam supports this platform
+            return None
+        case _:
+            # default pattern i.e. OS not in python documentation as of writing
+            return None
+
+
+def register_handlers() -> None:
+    '''Register the native class handlers used to load the required data.
+    WARNING: inadvisible to call this more than once
+    '''
+    logger = toplevel_logger.getChild('register_handlers')
+
+    logger.debug('Begin registering native class handlers')
+
+    nativeclasses.SatisfactoryNativeClassHandler(
+        (
+            "/Script/CoreUObject.Class'"
+            "/Script/FactoryGame.FGRecipe'"
+        ),
+        recipehandler.handler,
+        defer_pass=10,
+        registry_name='recipes'
+    )
+
+    nativeclasses.SatisfactoryNativeClassHandler(
+        (
+            "/Script/CoreUObject.Class'"
+            "/Script/FactoryGame.FGBuildableManufacturer'"
+        ),
+        machinehandler.fixed_power_machine_handler,
+        registry_name='machines'
+    )
+
+    nativeclasses.SatisfactoryNativeClassHandler(
+        (
+            "/Script/CoreUObject.Class'"
+            "/Script/FactoryGame.FGBuildableManufacturerVariablePower'"
+        ),
+        machinehandler.variable_power_machine_handler,
+        registry_name='machines'
+    )
+
+    # TODO: maybe this first one should be a different handler which saves to
+    # a different list?
+    nativeclasses.SatisfactoryNativeClassHandler(
+        (
+            "/Script/CoreUObject.Class'"
+            "/Script/FactoryGame.FGResourceDescriptor'"
+        ),
+        itemhandler.handler,
+        registry_name='items'
+    )
+
+    nativeclasses.SatisfactoryNativeClassHandler(
+        (
+            "/Script/CoreUObject.Class'"
+            "/Script/FactoryGame.FGItemDescriptor'"
+        ),
+        itemhandler.handler,
+        registry_name='items'
+    )
+
+    # TODO: maybe these should be derived classes?
+    nativeclasses.SatisfactoryNativeClassHandler(
+        (
+            "/Script/CoreUObject.Class'"
+            "/Script/FactoryGame.FGItemDescriptorNuclearFuel'"
+        ),
+        itemhandler.handler,
+        registry_name='items'
+    )
+    nativeclasses.SatisfactoryNativeClassHandler(
+        (
+            "/Script/CoreUObject.Class'"
+            "/Script/FactoryGame.FGItemDescriptorBiomass'"
+        ),
+        itemhandler.handler,
+        registry_name='items'
+    )
+
+    logger.debug('Finished registering native class handlers')
+
+
+def load_docs(
+    satisfactory_docs_absolute_paths: list[pathlib.Path],
+    cache_path: pathlib.Path | None = None
+) -> None:
+    '''Load the docs at the given paths (base game first, then any mods,
+    merged so that later files replace the classes of earlier ones) and
+    trigger handlers, or load the result of doing so from the cache at
+    cache_path if none of the docs have changed since.  The cache is not used
+    if cache_path is None.
+    WARNING: Inadvisable to call this more than once, except through
+    docsreload.load_registries (which empties the registries first).
+    '''
+    global _docs_fingerprint
+    logger = toplevel_logger.getChild('load_docs')
+
+    if cache_path is not None:
+        with startupprofile.phase('load docs cache'):
+            docs_keys = docscache.load(
+                satisfactory_docs_absolute_paths,
+                cache_path
+            )
+        if docs_keys is not None:
+            _docs_fingerprint = docscache.get_docs_fingerprint(docs_keys)
+            return
+    # keyed before loading, so that if the docs change while they are being
+    # loaded the cache is not mistaken for the new version.  this is done
+    # even without a cache, for the fingerprint.
+    with startupprofile.phase('hash docs'):
+        docs_keys = [
+            docscache.make_docs_key(satisfactory_docs_absolute_path)
+            for satisfactory_docs_absolute_path
+            in satisfactory_docs_absolute_paths
+        ]
+
+    logger.debug(
+        'Loading documentation data from '
+        f'{", ".join(map(str, satisfactory_docs_absolute_paths))}'
+    )
+    with startupprofile.phase('read docs'):
+        # each file is decoded one block at a time, and only the blocks
+        # with a registered handler are kept
+        for obj in docsoverlay.iter_merged_docs_blocks(
+            satisfactory_docs_absolute_paths,
+            nativeclasses.SatisfactoryNativeClassHandler.handlers
+        ):
+            # add the handlers to a priority queue
+            nativeclasses.SatisfactoryNativeClassHandler.enqueue_handle(obj)
+    logger.debug('Finished preparing documentation data load')
+    with startupprofile.phase('run handlers'):
+        # dequeue all the handlers in order
+        nativeclasses.SatisfactoryNativeClassHandler.handle()
+
+    if cache_path is not None:
+        with startupprofile.phase('save docs cache'):
+            docscache.save(cache_path, docs_keys)
+    _docs_fingerprint = docscache.get_docs_fingerprint(docs_keys)
+
+
+def load_docs_registries(
+    satisfactory_docs_absolute_paths: list[pathlib.Path],
+    cache_path: pathlib.Path | None = None
+) -> tuple[tuple[dict, ...], str | None]:
+    '''Load the docs as load_docs does, but into empty registries (see
+    docsreload.load_registries), and give those with the fingerprint of the
+    docs.  Meant to be run in a fresh process (e.g. from
+    headless.solverprocess.get_fork_safe_context()), so that reloading the
+    docs does not hold up the GUI, and the handlers are registered first if
+    they have not been.'''
+    if len(nativeclasses.SatisfactoryNativeClassHandler.handlers) == 0:
+        register_handlers()
+    registries = docsreload.load_registries(
+        lambda: load_docs(satisfactory_docs_absolute_paths, cache_path)
+    )
+    return (registries, get_docs_fingerprint())
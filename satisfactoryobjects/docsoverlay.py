@@ -0,0 +1,137 @@
+"""Loading the docs of the base game together with the docs of mods.
+
+Mods ship extra files in the same format as Docs.json, which add classes and
+may replace classes of the base game (or of another mod).  The files are
+given in order, base game first, and are merged so that the last file to have
+a class with a given ClassName wins.  Every class that is replaced is
+reported, since it usually means that two mods change the same thing.
+
+Each file is read by its own worker process, since reading a docs file is
+mostly spent decoding and scanning it in Python.
+"""
+import logging
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Collection, Iterator, NamedTuple, Sequence
+
+from .docsstream import iter_native_class_blocks
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+class DocsConflict(NamedTuple):
+    """A class in one docs file that was replaced by one in a later file"""
+    class_name: str
+    replaced_path: pathlib.Path
+    replacing_path: pathlib.Path
+
+
+def read_docs_blocks(
+    docs_path: pathlib.Path,
+    native_classes: Collection[str]
+) -> list[dict]:
+    """Read the NativeClass blocks of native_classes from a docs file"""
+    with open(docs_path, 'r', encoding='UTF-16') as fptr:
+        return list(iter_native_class_blocks(fptr, native_classes))
+
+
+def merge_docs_blocks(
+    docs_blocks: Sequence[tuple[pathlib.Path, list[dict]]]
+) -> tuple[list[dict], list[DocsConflict]]:
+    """Merge the NativeClass blocks read from each docs file (in the order
+    the files were given), so that there is one class for each ClassName,
+    from the last file that had it.  Returns the merged blocks and the
+    classes that were replaced."""
+    # ClassName: (NativeClass, class, path of the docs it came from)
+    # a replacing class keeps the position of the class it replaced
+    merged_classes: dict[str, tuple[str, dict, pathlib.Path]] = dict()
+    conflicts: list[DocsConflict] = list()
+    for docs_path, blocks in docs_blocks:
+        for block in blocks:
+            for class_ in block['Classes']:
+                class_name = class_['ClassName']
+                if class_name in merged_classes:
+                    conflicts.append(
+                        DocsConflict(
+                            class_name,
+                            merged_classes[class_name][2],
+                            docs_path
+                        )
+                    )
+                merged_classes[class_name] = (
+                    block['NativeClass'],
+                    class_,
+                    docs_path
+                )
+
+    # regrouped into one block per NativeClass, in the order the
+    # NativeClasses first appeared
+    merged_blocks: dict[str, list[dict]] = dict()
+    for native_class, class_, _ in merged_classes.values():
+        merged_blocks.setdefault(native_class, list()).append(class_)
+    return (
+        [
+            {'NativeClass': native_class, 'Classes': classes}
+            for native_class, classes
+            in merged_blocks.items()
+        ],
+        conflicts
+    )
+
+
+def iter_merged_docs_blocks(
+    docs_paths: Sequence[pathlib.Path],
+    native_classes: Collection[str],
+    workers: int | None = None
+) -> Iterator[dict]:
+    """Get the NativeClass blocks of native_classes from the docs files at
+    docs_paths (base game first, then each overlay), merged.
+
+    A single docs file is streamed in this process as it is read.  With more
+    than one, each file is read in a worker process (at most workers of them,
+    or os.cpu_count() if workers is None, or all in this process if workers
+    is 0 or 1) before they are merged.
+    """
+    logger = toplevel_logger.getChild('iter_merged_docs_blocks')
+
+    if len(docs_paths) == 1:
+        with open(docs_paths[0], 'r', encoding='UTF-16') as fptr:
+            yield from iter_native_class_blocks(fptr, native_classes)
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # a plain set, since the handlers dict is not worth pickling
+    native_classes = frozenset(native_classes)
+    if workers <= 1:
+        all_blocks = [
+            read_docs_blocks(docs_path, native_classes)
+            for docs_path
+            in docs_paths
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(docs_paths))
+        ) as executor:
+            all_blocks = list(
+                executor.map(
+                    read_docs_blocks,
+                    docs_paths,
+                    [native_classes] * len(docs_paths)
+                )
+            )
+
+    merged_blocks, conflicts = merge_docs_blocks(
+        list(zip(docs_paths, all_blocks))
+    )
+    for conflict in conflicts:
+        logger.warning(
+            f'{conflict.class_name} from {conflict.replaced_path} is '
+            f'replaced by the one from {conflict.replacing_path}'
+        )
+    logger.info(
+        f'Merged {len(docs_paths)} docs files, {len(conflicts)} classes '
+        'were replaced'
+    )
+    yield from merged_blocks
@@ -0,0 +1,253 @@
+"""Reloading the items, machines and recipes while the program is running.
+
+When the docs change (e.g. after the game or a mod is updated), the docs are
+loaded again into empty registries (in another process, for the GUI) and the
+result is compared with what was loaded before.  The registries are then
+brought up to date in place, keeping the existing object for anything that
+has not changed, so that whatever refers to those objects (or to their class
+names) stays valid and only what did change has to be refreshed.
+
+Changes to the docs are found by polling their size and modification time,
+which works the same on every platform and does not need anything outside of
+the program to be running.
+"""
+import logging
+import os
+import pathlib
+from typing import Callable, NamedTuple, Sequence
+
+from .basesatisfactoryobject import BaseSatisfactoryObject
+from .itemhandler import items
+from .machinehandler import machines
+from .recipehandler import recipes
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+class RegistryDiff(NamedTuple):
+    """The class names that were added to, removed from or changed in a
+    registry"""
+    added: frozenset[str] = frozenset()
+    removed: frozenset[str] = frozenset()
+    changed: frozenset[str] = frozenset()
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+class DocsDiff(NamedTuple):
+    """The differences in each registry after reloading the docs"""
+    items: RegistryDiff = RegistryDiff()
+    machines: RegistryDiff = RegistryDiff()
+    recipes: RegistryDiff = RegistryDiff()
+
+    def is_empty(self) -> bool:
+        return all(registry_diff.is_empty() for registry_diff in self)
+
+
+def _get_attributes(obj: BaseSatisfactoryObject) -> list:
+    # the objects have __slots__ rather than a __dict__, so go through the
+    # slots of every class that they are an instance of
+    attributes = list()
+    for class_ in type(obj).__mro__:
+        for attribute in getattr(class_, '__slots__', ()):
+            if attribute.startswith('__'):
+                # private, so the slot has the mangled name
+                attribute = f'_{class_.__name__.lstrip("_")}{attribute}'
+            attributes.append(getattr(obj, attribute))
+    return attributes
+
+
+def _is_unchanged(
+    old: BaseSatisfactoryObject,
+    new: BaseSatisfactoryObject
+) -> bool:
+    # __eq__ only compares the class name and display name of recipes, so
+    # compare every attribute instead
+    return (
+        type(old) is type(new)
+        and _get_attributes(old) == _get_attributes(new)
+    )
+
+
+def diff_registry(
+    old: dict[str, BaseSatisfactoryObject],
+    new: dict[str, BaseSatisfactoryObject]
+) -> RegistryDiff:
+    """Compare the contents of a registry before and after reloading"""
+    return RegistryDiff(
+        frozenset(new.keys() - old.keys()),
+        frozenset(old.keys() - new.keys()),
+        frozenset(
+            class_name
+            for class_name
+            in old.keys() & new.keys()
+            if not _is_unchanged(old[class_name], new[class_name])
+        )
+    )
+
+
+def _apply_diff(
+    registry: dict[str, BaseSatisfactoryObject],
+    old: dict[str, BaseSatisfactoryObject],
+    new: dict[str, BaseSatisfactoryObject],
+    registry_diff: RegistryDiff
+) -> None:
+    # rebuilt in the order of the new registry, which is the order the docs
+    # list things in, but with the old object for anything unchanged
+    registry.clear()
+    for class_name, obj in new.items():
+        if class_name in registry_diff.added or (
+            class_name in registry_diff.changed
+        ):
+            registry[class_name] = obj
+        else:
+            registry[class_name] = old[class_name]
+
+
+def _relink_recipes(class_names: frozenset[str]) -> None:
+    # newly loaded recipes refer to newly loaded items and machines, which
+    # are equal to (but not the same objects as) the ones that were kept
+    for class_name in class_names:
+        recipe = recipes[class_name]
+        for resource in recipe.dependencies + recipe.products:
+            resource.item = items.get(
+                resource.item.internal_class_identifier,
+                resource.item
+            )
+        recipe.machines = [
+            machines.get(machine.internal_class_identifier, machine)
+            for machine
+            in recipe.machines
+        ]
+
+
+def _get_recipes_using(
+    item_class_names: frozenset[str],
+    machine_class_names: frozenset[str]
+) -> frozenset[str]:
+    # kept recipes still refer to the old objects of any items and machines
+    # that changed
+    return frozenset(
+        class_name
+        for class_name, recipe
+        in recipes.items()
+        if any(
+            resource.item.internal_class_identifier in item_class_names
+            for resource
+            in recipe.dependencies + recipe.products
+        ) or any(
+            machine.internal_class_identifier in machine_class_names
+            for machine
+            in recipe.machines
+        )
+    )
+
+
+def load_registries(
+    load: Callable[[], None]
+) -> tuple[dict[str, BaseSatisfactoryObject], ...]:
+    """Fill empty registries with load (e.g. docsloader.load_docs) and give
+    what it loaded (items, machines and recipes), leaving the registries as
+    they were.  This can be run in another process (see
+    docsloader.load_docs_registries), so that the docs are not parsed on the
+    same thread as the GUI."""
+    registries = (items, machines, recipes)
+    old_registries = tuple(dict(registry) for registry in registries)
+    for registry in registries:
+        registry.clear()
+    try:
+        load()
+        return tuple(dict(registry) for registry in registries)
+    finally:
+        for registry, old in zip(registries, old_registries):
+            registry.clear()
+            registry.update(old)
+
+
+def apply_registries(
+    new_registries: tuple[dict[str, BaseSatisfactoryObject], ...]
+) -> DocsDiff:
+    """Update the registries in place with newly loaded ones (see
+    load_registries)"""
+    logger = toplevel_logger.getChild('apply_registries')
+
+    registries = (items, machines, recipes)
+    old_registries = tuple(dict(registry) for registry in registries)
+    docs_diff = DocsDiff(
+        *(
+            diff_registry(old, new)
+            for old, new
+            in zip(old_registries, new_registries)
+        )
+    )
+    for registry, old, new, registry_diff in zip(
+        registries,
+        old_registries,
+        new_registries,
+        docs_diff
+    ):
+        _apply_diff(registry, old, new, registry_diff)
+    _relink_recipes(
+        docs_diff.recipes.added
+        | docs_diff.recipes.changed
+        | _get_recipes_using(
+            docs_diff.items.changed,
+            docs_diff.machines.changed
+        )
+    )
+
+    for name, registry_diff in zip(DocsDiff._fields, docs_diff):
+        logger.info(
+            f'Reloaded {name}: {len(registry_diff.added)} added, '
+            f'{len(registry_diff.removed)} removed, '
+            f'{len(registry_diff.changed)} changed'
+        )
+    return docs_diff
+
+
+def reload_registries(load: Callable[[], None]) -> DocsDiff:
+    """Reload the registries with load, which fills them from the docs (e.g.
+    docsloader.load_docs), and update them in place with the result.  If load
+    raises, the registries are left as they were."""
+    return apply_registries(load_registries(load))
+
+
+class DocsWatcher:
+    """Polls the docs files for changes to their size or modification time.
+
+    A change is only reported once the docs have stayed the same for a whole
+    poll, so that docs which are still being written (e.g. by a game update)
+    are not reloaded half-way through.
+    """
+    def __init__(self, docs_paths: Sequence[pathlib.Path]) -> None:
+        self.docs_paths = docs_paths
+        self._loaded_signature = self._get_signature()
+        self._pending_signature = self._loaded_signature
+
+    def _get_signature(self) -> tuple[tuple[int, int], ...] | None:
+        signature = list()
+        for docs_path in self.docs_paths:
+            try:
+                stat_result = os.stat(docs_path)
+            except OSError:
+                # e.g. removed while the game is being reinstalled
+                return None
+            signature.append((stat_result.st_size, stat_result.st_mtime_ns))
+        return tuple(signature)
+
+    def poll(self) -> bool:
+        """Check whether the docs have changed since they were last loaded,
+        and have finished changing"""
+        signature = self._get_signature()
+        previous_signature = self._pending_signature
+        self._pending_signature = signature
+        return (
+            signature is not None
+            and signature != self._loaded_signature
+            and signature == previous_signature
+        )
+
+    def mark_loaded(self) -> None:
+        """Record that the docs have been loaded as they are now"""
+        self._loaded_signature = self._pending_signature
@@ -0,0 +1,157 @@
+"""Incremental reading of the Docs.json file.
+
+Docs.json is a JSON array of NativeClass blocks, each of the form
+{"NativeClass": "...", "Classes": [...]}.  Only a handful of these blocks are
+of any use (those with a registered native class handler), so instead of
+deserialising the whole file at once, the file is read in chunks and decoded
+one block at a time.  Only the wanted blocks are kept, so at most one block
+(rather than the whole file) is held in memory.
+
+Working out where a block ends is left to the C decoder of the json module,
+since any scan of the text in Python (even with regular expressions) is
+slower than decoding it.  Before decoding a block, the file is read up to the
+NativeClass key of the next block (found with str.find, which is much
+quicker still), which is nearly always enough to decode the block in one go.
+"""
+import json
+import logging
+import re
+from typing import Container, Iterator, TextIO
+
+toplevel_logger = logging.getLogger(__name__)
+
+# number of characters read from the file at a time
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+# the key that (nearly) every block in the docs starts with
+_NATIVE_CLASS_KEY = '"NativeClass"'
+
+
+class _ChunkedReader:
+    """Buffer over a text file that is filled in chunks.
+
+    Text before pos is thrown away when more is read.
+    """
+
+    def __init__(self, fptr: TextIO, chunk_size: int) -> None:
+        self._fptr = fptr
+        self._chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+
+    def read_more(self) -> bool:
+        """Read another chunk into the buffer, returning False at the end of
+        the file"""
+        chunk = self._fptr.read(self._chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self) -> None:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.read_more():
+                return
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character, or an empty string at the
+        end of the file"""
+        self.skip_whitespace()
+        return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, character: str) -> None:
+        if self.peek() != character:
+            raise ValueError(
+                f'Expected {character!r} in docs but found '
+                f'{self.buffer[self.pos:self.pos + 20]!r}'
+            )
+        self.pos += 1
+
+    def read_past_next_key(self) -> None:
+        """Read until the buffer has the NativeClass key after the one of
+        the block at pos (i.e. the start of the next block), or the end of
+        the file"""
+        keys_needed = 2
+        # relative to pos, which moves when more is read
+        search_from = 0
+        while keys_needed > 0:
+            found = self.buffer.find(
+                _NATIVE_CLASS_KEY,
+                self.pos + search_from
+            )
+            if found == -1:
+                # the key may have been cut off by the end of the buffer
+                search_from = max(
+                    search_from,
+                    len(self.buffer) - self.pos - len(_NATIVE_CLASS_KEY)
+                )
+                if not self.read_more():
+                    return
+                continue
+            keys_needed -= 1
+            search_from = found + len(_NATIVE_CLASS_KEY) - self.pos
+
+    def decode_value(self) -> object:
+        """Decode the value starting at pos and move pos past it"""
+        self.read_past_next_key()
+        while True:
+            try:
+                value, self.pos = _DECODER.raw_decode(self.buffer, self.pos)
+                return value
+            except json.JSONDecodeError:
+                # cut off by the end of the buffer (e.g. the key after this
+                # one was inside a string).  the buffer is at least doubled
+                # each time so that the failed attempts take no longer than
+                # the one that succeeds.
+                target_length = 2 * (len(self.buffer) - self.pos)
+                read_anything = False
+                while len(self.buffer) - self.pos < target_length:
+                    if not self.read_more():
+                        break
+                    read_anything = True
+                if not read_anything:
+                    raise
+
+
+def iter_native_class_blocks(
+    fptr: TextIO,
+    native_classes: Container[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[dict]:
+    """Yield the NativeClass blocks of an open docs file whose NativeClass is
+    in native_classes (or every block, if it is None), throwing away the rest
+    as soon as they have been read."""
+    logger = toplevel_logger.getChild('iter_native_class_blocks')
+
+    reader = _ChunkedReader(fptr, chunk_size)
+    reader.expect('[')
+    skipped = 0
+    if reader.peek() == ']':
+        return
+    while True:
+        if reader.peek() != '{':
+            raise ValueError(
+                'Expected a NativeClass block in docs but found '
+                f'{reader.buffer[reader.pos:reader.pos + 20]!r}'
+            )
+        block = reader.decode_value()
+        if native_classes is None or block.get('NativeClass') in (
+            native_classes
+        ):
+            yield block
+        else:
+            logger.debug(f'Skipping class {block.get("NativeClass")}')
+            skipped += 1
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == ']':
+            break
+        if separator != ',':
+            raise ValueError(
+                f'Expected "," or "]" in docs but found {separator!r}'
+            )
+    logger.debug(f'Skipped {skipped} NativeClass blocks')
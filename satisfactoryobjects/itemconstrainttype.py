@@ -0,0 +1,66 @@
+"""Class to represent which balance of an item a constraint in the linear
+programming problem enforces, and an enum to define these different
+possibilities.
+
+This is used as the id of each inequality, so that a row of the tableau can
+be traced back to the item it concerns (e.g. to report which resource is a
+bottleneck).
+"""
+from enum import IntEnum
+from .items import Item
+
+
+class ItemConstraintTypes(IntEnum):
+    # the total amount of the item cannot exceed the manual input plus what
+    # recipes produce
+    SUPPLY = 0
+    # what recipes consume plus what is output cannot exceed the total amount
+    # of the item
+    USAGE = 1
+
+
+class ItemConstraintType():
+    __slots__ = ('item', 'type')
+
+    def __init__(
+        self,
+        item: Item,
+        type: ItemConstraintTypes = ItemConstraintTypes.SUPPLY
+    ):
+        self.item = item
+        self.type = type
+
+    def __eq__(self, other: object) -> bool:
+        if issubclass(type(other), ItemConstraintType):
+            return (
+                self.item.__eq__(other.item)
+                and
+                self.type == other.type
+            )
+        return False
+
+    def canonical_key(self) -> tuple[str, ItemConstraintTypes]:
+        # the same in every run of the program, unlike the hash (see
+        # optimisationsolver.solutioncache)
+        return (self.item.internal_class_identifier, self.type)
+
+    def __hash__(self) -> int:
+        # this implementation of __hash__(self) is the same as the one in
+        # itemvariabletype.py, which was written using the help of
+        # https://docs.python.org/3/reference/datamodel.html#object.__hash__
+        # [accessed 2024-12-30 at 13:02]
+        return (
+            self.item.__hash__()
+            ^
+            self.type.__hash__()
+        )
+
+    def __repr__(self) -> str:
+        return f'{self.type.name}:{self.item.__repr__()}'
+
+    def __str__(self) -> str:
+        return (
+            ('Supply of ' if self.type == ItemConstraintTypes.SUPPLY else
+             'Usage of ')
+            + self.item.user_facing_name
+        )
@@ -5,6 +5,8 @@ toplevel_logger = logging.getLogger(__name__)
 
 
 class Item(BaseSatisfactoryObject):
+    __slots__ = ('energy_value', 'is_fluid')
+
     def __init__(
         self,
         internal_class_identifier: str,
@@ -14,6 +14,8 @@ class ItemVariableTypes(IntEnum):
 
 
 class ItemVariableType():
+    __slots__ = ('item', 'type')
+
     def __init__(
         self,
         item: Item,
@@ -31,6 +33,11 @@ class ItemVariableType():
             )
         return False
 
+    def canonical_key(self) -> tuple[str, ItemVariableTypes]:
+        # the same in every run of the program, unlike the hash (see
+        # optimisationsolver.solutioncache)
+        return (self.item.internal_class_identifier, self.type)
+
     def __hash__(self) -> int:
         # this implementation of __hash__(self) was written using the help of
         # https://docs.python.org/3/reference/datamodel.html#object.__hash__
@@ -5,6 +5,8 @@ toplevel_logger = logging.getLogger(__name__)
 
 
 class Machine(BaseSatisfactoryObject):
+    __slots__ = ()
+
     def __init__(
         self,
         internal_class_identifier: str,
@@ -35,6 +37,8 @@ class Machine(BaseSatisfactoryObject):
 
 
 class FixedPowerMachine(Machine):
+    __slots__ = ('power_flow_rate',)
+
     def __init__(
         self,
         internal_class_identifier: str,
@@ -1,23 +1,139 @@
+import functools
+import gc
+import importlib
+import io
 import logging
-from typing import Type
-from utils.queueutils import PrioritisedItem
-from utils.trees import BinaryTreeNode
+import operator
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Type
+from utils.queueutils import BucketedPriorityQueue
+from utils import startupprofile
 
 toplevel_logger = logging.getLogger(__name__)
 
+# a defer pass is only handled in worker processes if it has at least this
+# many classes, since starting the processes takes longer than handling the
+# few thousand classes in the unmodded docs
+PARALLEL_HANDLING_THRESHOLD = 5000
+# the most classes handled by a worker process in one go
+HANDLING_CHUNK_SIZE = 500
+# how many denamespaced classnames are remembered.  the unmodded docs only
+# reference a few hundred different classes (thousands of times each).
+DENAMESPACE_CACHE_SIZE = 4096
+
+# the objects in the registries filled by earlier defer passes, by id, along
+# with where they are in the registries.  set up in worker processes by
+# _initialise_worker.
+_worker_references: dict[int, tuple["_RegistryReference", object]] = dict()
+
+
+def _get_registry(module_name: str, registry_name: str) -> dict:
+    return getattr(importlib.import_module(module_name), registry_name)
+
+
+class _RegistryReference(NamedTuple):
+    """Stands in for a registry when pickling, and is unpickled as the
+    registry of the same name in the unpickling process"""
+    module_name: str
+    registry_name: str
+
+    def __reduce__(self):
+        return (_get_registry, tuple(self))
+
+
+class _RegistryPickler(pickle.Pickler):
+    """Pickler that refers to objects in the registries filled by earlier
+    defer passes by their key instead of copying them.  When unpickled, these
+    are looked up in the registries of the unpickling process, so that e.g.
+    the items in recipes made in a worker process are the same objects as the
+    ones in the item registry."""
+    def reducer_override(self, obj):
+        # not called for most built in types, so this is much faster than
+        # persistent_id
+        reference = _worker_references.get(id(obj))
+        if reference is None:
+            return NotImplemented
+        # the registry reference is only pickled once, so each object is
+        # unpickled with a single (built in) lookup
+        return (operator.getitem, reference)
+
+
+def _initialise_worker(registries: list[tuple[str, str, dict]]) -> None:
+    # the registries are all sent together so that objects shared between
+    # them stay shared
+    _worker_references.clear()
+    for module_name, registry_name, contents in registries:
+        registry = _get_registry(module_name, registry_name)
+        # updated in place since other modules hold references to them
+        # (copied first, since if the worker was forked then contents may
+        # already be the registry itself)
+        contents = dict(contents)
+        registry.clear()
+        registry.update(contents)
+        registry_reference = _RegistryReference(module_name, registry_name)
+        for key, value in registry.items():
+            _worker_references[id(value)] = (registry_reference, key)
+    # nothing that already exists will become garbage, so stop the garbage
+    # collector from looking through it (if the worker was forked, this is
+    # the whole heap of the parent, including the docs)
+    gc.freeze()
+
+
+def _handle_chunk(
+    handler_function: Callable[[dict], None],
+    registry_name: str,
+    obj: dict
+) -> bytes:
+    """Run the handler on obj in a worker process, and get what it added to
+    its registry (pickled with _RegistryPickler)"""
+    registry = _get_registry(handler_function.__module__, registry_name)
+    before = dict(registry)
+    handler_function(obj)
+    added = {
+        key: value
+        for key, value
+        in registry.items()
+        if before.get(key) is not value
+    }
+    # leave the registry as it was for the next chunk
+    registry.clear()
+    registry.update(before)
+    buffer = io.BytesIO()
+    _RegistryPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(added)
+    return buffer.getvalue()
+
 
 class SatisfactoryNativeClassHandler:
     logger = toplevel_logger.getChild("SatisfactoryNativeClassHandler")
     handlers: dict[str, Type["SatisfactoryNativeClassHandler"]] = dict()
-    _handler_queue: BinaryTreeNode = None
+    # there are only a couple of distinct defer passes, so one bucket per
+    # pass keeps enqueueing constant time
+    _handler_queue: BucketedPriorityQueue = BucketedPriorityQueue()
+
+    def __init__(
+        self,
+        class_name,
+        handler_function,
+        defer_pass=0,
+        registry_name: str | None = None
+    ) -> None:
+        """Register handler_function to be called on the NativeClass blocks
+        of class_name.  Handlers with a lower defer_pass are all run first.
 
-    def __init__(self, class_name, handler_function, defer_pass=0) -> None:
+        registry_name is the name of the dict in the module of
+        handler_function that the handler adds its results to.  Only
+        handlers with one can be run in worker processes, and they must not
+        depend on anything else added by handlers with the same defer_pass.
+        """
         SatisfactoryNativeClassHandler.logger.debug(
             f"Registering new native class handler for class {class_name}"
         )
         self.class_name = class_name
         self._handle = handler_function
         self._defer_pass = defer_pass
+        self._registry_name = registry_name
         # if self._defer_pass > SatisfactoryNativeClassHandler._max_defer_pass:
         #     SatisfactoryNativeClassHandler._max_defer_pass = defer_pass
         SatisfactoryNativeClassHandler.handlers[class_name] = self
@@ -30,33 +146,134 @@ class SatisfactoryNativeClassHandler:
             SatisfactoryNativeClassHandler.logger.debug(
                     f'Enqueueing handling of class {obj["NativeClass"]}'
                 )
-            if SatisfactoryNativeClassHandler._handler_queue is None:
-                SatisfactoryNativeClassHandler._handler_queue = BinaryTreeNode(
-                    PrioritisedItem(handler._defer_pass, obj)
-                )
-            else:
-                SatisfactoryNativeClassHandler._handler_queue.add_child(
-                    PrioritisedItem(handler._defer_pass, obj)
-                )
+            SatisfactoryNativeClassHandler._handler_queue.push(
+                handler._defer_pass,
+                obj
+            )
         except KeyError:
             # no registered handler for class
             SatisfactoryNativeClassHandler.logger.debug(
                 f'No handler registered for class {obj["NativeClass"]}'
             )
 
-    def handle() -> None:
-        """Execute the enqueued handlers"""
+    def handle(workers: int | None = None) -> None:
+        """Execute the enqueued handlers, one defer pass at a time.
+
+        Defer passes with at least PARALLEL_HANDLING_THRESHOLD classes are
+        split into chunks which are handled on a pool of worker processes
+        (os.cpu_count() of them if workers is None), and the results are
+        merged into the registries in the same order as if they had been
+        handled here.  If workers is 0 or 1, everything is handled in this
+        process.
+        """
         SatisfactoryNativeClassHandler.logger.info("Running handlers")
-        for prioritised_item in (
-            SatisfactoryNativeClassHandler._handler_queue.in_order_traverse()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # registries filled by the defer passes handled so far
+        filled_registries: dict[tuple[str, str], dict] = dict()
+        for defer_pass, objs in (
+            SatisfactoryNativeClassHandler._handler_queue.drain_buckets()
         ):
-            obj = prioritised_item.item
-            handler = SatisfactoryNativeClassHandler.handlers[
-                obj["NativeClass"]
-            ]
+            n_classes = sum(len(obj["Classes"]) for obj in objs)
+            if workers <= 1 or n_classes < PARALLEL_HANDLING_THRESHOLD:
+                with startupprofile.phase(f'defer pass {defer_pass}'):
+                    for obj in objs:
+                        SatisfactoryNativeClassHandler._handle_obj(obj)
+            else:
+                SatisfactoryNativeClassHandler.logger.info(
+                    f'Handling {n_classes} classes of defer pass '
+                    f'{defer_pass} on {workers} worker processes'
+                )
+                with startupprofile.phase(
+                    f'defer pass {defer_pass} on {workers} workers'
+                ):
+                    SatisfactoryNativeClassHandler._handle_in_workers(
+                        objs,
+                        workers,
+                        filled_registries
+                    )
+            for obj in objs:
+                handler = SatisfactoryNativeClassHandler.handlers[
+                    obj["NativeClass"]
+                ]
+                if handler._registry_name is not None:
+                    registry_id = (
+                        handler._handle.__module__,
+                        handler._registry_name
+                    )
+                    filled_registries[registry_id] = _get_registry(
+                        *registry_id
+                    )
+
+    def _handle_obj(obj) -> None:
+        handler = SatisfactoryNativeClassHandler.handlers[obj["NativeClass"]]
+        with startupprofile.phase(obj["NativeClass"]):
             handler._handle(obj)
+        SatisfactoryNativeClassHandler.logger.debug(
+            f'Handled class {obj["NativeClass"]}'
+        )
+
+    def _handle_in_workers(
+        objs,
+        workers: int,
+        filled_registries: dict[tuple[str, str], dict]
+    ) -> None:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialise_worker,
+            initargs=([
+                (*registry_id, registry)
+                for registry_id, registry
+                in filled_registries.items()
+            ],)
+        ) as executor:
+            # submitted in the order they would be handled in this process,
+            # so that merging them in the same order gives the same result
+            chunks = list()
+            for obj in objs:
+                handler = SatisfactoryNativeClassHandler.handlers[
+                    obj["NativeClass"]
+                ]
+                if handler._registry_name is None:
+                    # no way of getting its results back from a worker
+                    SatisfactoryNativeClassHandler._handle_obj(obj)
+                    continue
+                for chunk_start in range(
+                    0,
+                    len(obj["Classes"]),
+                    HANDLING_CHUNK_SIZE
+                ):
+                    chunks.append((
+                        handler,
+                        executor.submit(
+                            _handle_chunk,
+                            handler._handle,
+                            handler._registry_name,
+                            {
+                                **obj,
+                                "Classes": obj["Classes"][
+                                    chunk_start:
+                                    chunk_start + HANDLING_CHUNK_SIZE
+                                ]
+                            }
+                        )
+                    ))
+            # unpickling makes lots of objects, none of which are garbage,
+            # which would otherwise set off many collections of the whole
+            # (large) heap and take longer than the unpickling itself
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                for handler, future in chunks:
+                    _get_registry(
+                        handler._handle.__module__,
+                        handler._registry_name
+                    ).update(pickle.loads(future.result()))
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
             SatisfactoryNativeClassHandler.logger.debug(
-                f'Handled class {obj["NativeClass"]}'
+                f'Handled {len(chunks)} chunks in worker processes'
             )
 
     # some test handlers
@@ -86,11 +303,13 @@ def _log_denamespace_failure(
     raise ValueError("Invalid namespaced satisfactory classname.")
 
 
+@functools.lru_cache(maxsize=DENAMESPACE_CACHE_SIZE)
 def denamespace_satisfactory_classname(namespaced_classname: str) -> str:
     """Removes the namespace from a classname referenced in docs.json
 
     The returned classname is the format seemingly used in the referenced
-    objects definition, so said objects can be looked up.
+    objects definition, so said objects can be looked up.  Results are
+    memoised (failures are not, and raise every time).
     """
     unparsed_namespace, _, unparsed_classname \
         = namespaced_classname.rpartition("/")
@@ -8,25 +8,38 @@ from .itemhandler import items
 from .machines import Machine, FixedPowerMachine
 from .machinehandler import machines
 from .nativeclasses import denamespace_satisfactory_classname
+from .unrealproperties import parse_item_amounts, parse_class_paths
 from .lookuperrors import MachineLookupError, ItemLookupError
 from utils.directionenums import Direction
 
 toplevel_logger = logging.getLogger(__name__)
 
 
-@dataclass
+# slotted since every recipe has several of each.  (named tuples would be
+# the other option, but they are larger and slower to read from)
+@dataclass(slots=True)
 class RecipeResource:
     item: Item
     amount: Rational
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipeResourceFlowData:
     item: Item
     amount: float
 
 
 class Recipe(BaseSatisfactoryObject):
+    __slots__ = (
+        'dependencies',
+        'products',
+        'machines',
+        'time_',
+        'is_alternate',
+        # mangled to _Recipe__average_power_consumption like the attribute
+        '__average_power_consumption'
+    )
+
     def __init__(
         self,
         internal_class_identifier: str,
@@ -142,15 +155,35 @@ class Recipe(BaseSatisfactoryObject):
     ) -> list[RecipeResource]:
         # recipe_name is only used in logs to help with debugging
         result = list()
-        for unparsed_resource in (unparsed_resources
-                                  # strip enclosing brackets of resource
-                                  # array, as well as first bracket of first
-                                  # resource and last bracket of last resource
-                                  [2:-2]
-                                  # split into a list of resources and
-                                  # strip remaining brackets
-                                  .split("),(")
-                                  ):
+        for unparsed_class, parsed_amount in parse_item_amounts(
+            unparsed_resources
+        ):
+            # the class path is the same for every use of an item, so the
+            # (memoised) denamespacing is usually just a lookup
+            parsed_class = denamespace_satisfactory_classname(unparsed_class)
+            # attempt to look up the item
+            try:
+                item = items[parsed_class]
+            except KeyError:
+                # item not found
+                toplevel_logger.error(
+                    f"Resource {parsed_class} "
+                    f"of recipe {recipe_name} "
+                    "not registered!"
+                )
+                raise ItemLookupError("Recipe references nonexistent item!")
+            if item.is_fluid:
+                # see comments in items.py
+                # internal units for fluid volume are not those presented to
+                # the player
+                parsed_amount = Fraction(parsed_amount, 1000)
+            result.append(
+                RecipeResource(
+                    item,
+                    parsed_amount
+                )
+            )
+        if len(result) == 0:
             # this is for a SINGLE case in version 1.0
             # specifically, excited photonic matter
             # (internally: Recipe_QuantumEnergy_C) has no ingredients
@@ -174,39 +207,9 @@ class Recipe(BaseSatisfactoryObject):
             # infeasible - properly solving this would likely require some
             # variation of integer programming and would cause the time
             # complexity to skyrocket)
-            if len(unparsed_resource) == 0:
-                toplevel_logger.debug(
-                    "Got zero-length resource while parsing recipe "
-                    f"{recipe_name}"
-                )
-                continue
-            unparsed_class, unparsed_amount = unparsed_resource.split(",")
-            # no need to remove the ItemClass= manually since it will be
-            # truncated during denamespacing anyway
-            parsed_class = denamespace_satisfactory_classname(unparsed_class)
-            # attempt to look up the item
-            try:
-                item = items[parsed_class]
-            except KeyError:
-                # item not found
-                toplevel_logger.error(
-                    f"Resource {parsed_class} "
-                    f"of recipe {recipe_name} "
-                    "not registered!"
-                )
-                raise ItemLookupError("Recipe references nonexistent item!")
-            # remove the Amount= and convert to integer
-            parsed_amount = int(unparsed_amount[7:])
-            if item.is_fluid:
-                # see comments in items.py
-                # internal units for fluid volume are not those presented to
-                # the player
-                parsed_amount = Fraction(parsed_amount, 1000)
-            result.append(
-                RecipeResource(
-                    item,
-                    parsed_amount
-                )
+            toplevel_logger.debug(
+                "Got zero-length resource while parsing recipe "
+                f"{recipe_name}"
             )
         return result
 
@@ -218,15 +221,7 @@ class Recipe(BaseSatisfactoryObject):
         # list here because of course theres multiple machines that can make
         # recipes (like the workbench, actually it makes logical sense now)
         result = list()
-        for unparsed_machine in (unparsed_produced_in
-                                 # strip enclosing brackets of machine array
-                                 # as well as leading quote on first machine
-                                 # and trailing quote on last machine
-                                 [2:-2]
-                                 # split into a list of machines and strip
-                                 # remaining quotes
-                                 .split('","')
-                                 ):
+        for unparsed_machine in parse_class_paths(unparsed_produced_in):
             parsed_class = denamespace_satisfactory_classname(
                 unparsed_machine
             )
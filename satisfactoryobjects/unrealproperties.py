@@ -0,0 +1,66 @@
+"""Tokenizers for the Unreal Engine property text that some values in the
+docs are written in.
+
+The ingredients and products of a recipe are a list of item classes and
+amounts, e.g.
+((ItemClass="/Script/Engine.BlueprintGeneratedClass'/Game/.../Desc_Ore.Desc_Ore_C'",Amount=3),(ItemClass=...,Amount=1))
+and the machines a recipe is made in are a list of quoted class paths, e.g.
+("/Game/.../Build_Smelter.Build_Smelter_C","/Game/.../BP_WorkBenchComponent.BP_WorkBenchComponent_C")
+Class paths never contain brackets, commas or double quotes, so the lists are
+split on the whole text that separates their elements.  This means that each
+list is scanned once by str.split (and each element once more by
+str.partition), which is faster than matching a regular expression against
+every element.
+"""
+
+_ITEM_AMOUNT_LIST_START = '((ItemClass='
+_ITEM_AMOUNT_SEPARATOR = '),(ItemClass='
+_AMOUNT_SEPARATOR = ',Amount='
+_ITEM_AMOUNT_LIST_END = '))'
+
+_CLASS_PATH_LIST_START = '("'
+_CLASS_PATH_SEPARATOR = '","'
+_CLASS_PATH_LIST_END = '")'
+
+# the docs have empty strings for empty lists
+_EMPTY_LISTS = ('', '()')
+
+
+def _split_list(text: str, start: str, separator: str, end: str) -> list[str]:
+    if text in _EMPTY_LISTS:
+        return []
+    if (
+        len(text) < len(start) + len(end)
+        or not text.startswith(start)
+        or not text.endswith(end)
+    ):
+        raise ValueError(f'Invalid list {text!r}')
+    return text[len(start):-len(end)].split(separator)
+
+
+def parse_item_amounts(text: str) -> list[tuple[str, int]]:
+    """Get the (item class path, amount) of each element of a list of item
+    amounts.  The class paths still need to be denamespaced."""
+    result = list()
+    for element in _split_list(
+        text,
+        _ITEM_AMOUNT_LIST_START,
+        _ITEM_AMOUNT_SEPARATOR,
+        _ITEM_AMOUNT_LIST_END
+    ):
+        item_class, separator, amount = element.partition(_AMOUNT_SEPARATOR)
+        if not separator or not amount.isdigit():
+            raise ValueError(f'Invalid item amount {element!r} in {text!r}')
+        result.append((item_class, int(amount)))
+    return result
+
+
+def parse_class_paths(text: str) -> list[str]:
+    """Get each class path in a list of quoted class paths.  The class paths
+    still need to be denamespaced."""
+    return _split_list(
+        text,
+        _CLASS_PATH_LIST_START,
+        _CLASS_PATH_SEPARATOR,
+        _CLASS_PATH_LIST_END
+    )
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""Solve problem files without the GUI, and write the solutions as JSON.
+
+Nothing here imports PySide6, so this can be run in scripts and batch jobs
+where Qt is not installed (or there is no display).  See
+headless/problemspec.py for the format of problem files.
+
+Given more than one problem file (or --jsonl), the problems are solved as a
+batch on a pool of worker processes, and each result is written as a line of
+JSON as soon as it is finished (see headless/batch.py).
+
+With --serve, the docs are loaded once and problems are solved as they are
+sent to an HTTP server on localhost, for tools that solve many problems and
+do not want to pay for loading the docs each time (see headless/server.py).
+
+With --coordinate, the problem files are instead solved on workers started
+elsewhere (e.g. on other machines) with --worker, which connect over TCP (see
+headless/distributed.py).
+
+With more than one rule in --pivot-rules, a single problem file is solved
+with each of them at once and the first verified optimal solution is used
+(see headless/portfolio.py).
+"""
+import argparse
+import contextlib
+import json
+import logging
+import pathlib
+import sys
+from fractions import Fraction
+
+from optimisationsolver.anytime import SolveLimits
+from optimisationsolver.simplex import PivotRule
+
+from headless.batch import ScenarioResult, iter_scenario_results
+from headless.distributed import (
+    DEFAULT_PORT as DEFAULT_COORDINATOR_PORT,
+    Coordinator,
+    run_workers
+)
+from headless.portfolio import PortfolioError, solve_portfolio
+from headless.problemspec import ProblemSpecError, load_problem_spec
+from headless.server import (
+    DEFAULT_MAX_PENDING,
+    DEFAULT_PORT,
+    DEFAULT_TIMEOUT,
+    SolveServer
+)
+from headless.solving import solve_problem, solution_to_json
+
+from satisfactoryobjects import docscache
+from satisfactoryobjects.docsloader import (
+    get_default_satisfactory_docs_path,
+    register_handlers,
+    load_docs
+)
+
+from utils.loglevels import VALID_LOG_VERBOSITY_LEVELS
+
+toplevel_logger = logging.getLogger(__name__)
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(':')
+    try:
+        return host, int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f'{address} is not of the form host:port'
+        )
+
+
+def parse_pivot_rules(pivot_rules: str) -> list[PivotRule]:
+    try:
+        return [
+            PivotRule(pivot_rule.strip())
+            for pivot_rule
+            in pivot_rules.split(',')
+        ]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f'{pivot_rules} is not a comma-separated list of '
+            f'{", ".join(pivot_rule.value for pivot_rule in PivotRule)}'
+        )
+
+
+def parse_arguments(argv: list[str] | None = None) -> argparse.Namespace:
+    # the same options as main.py where they make sense, but with argparse
+    # since Qt is not available to parse them
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        'problems',
+        nargs='*',
+        type=pathlib.Path,
+        metavar='problem',
+        help='Path to a problem file (TOML if it ends in .toml, JSON '
+        'otherwise)'
+    )
+    parser.add_argument(
+        '-p',
+        dest='docs_paths',
+        action='append',
+        type=pathlib.Path,
+        metavar='path',
+        help='Path to Docs.json.  Can be given more than once to load the '
+        'docs of mods over those of the base game (which must come first)'
+    )
+    parser.add_argument(
+        '-l',
+        dest='verbosity',
+        choices=VALID_LOG_VERBOSITY_LEVELS.keys(),
+        default='warn',
+        help='Log verbosity level'
+    )
+    parser.add_argument(
+        '-c',
+        dest='cache_path',
+        type=pathlib.Path,
+        default=docscache.get_default_cache_path(),
+        metavar='path',
+        help='Path to the cache of the data loaded from Docs.json'
+    )
+    parser.add_argument(
+        '--no-docs-cache',
+        action='store_true',
+        help='Always load Docs.json, without reading or writing the cache'
+    )
+    parser.add_argument(
+        '-o',
+        dest='output_path',
+        type=pathlib.Path,
+        metavar='path',
+        help='Write the solution to this path instead of standard output'
+    )
+    parser.add_argument(
+        '--jsonl',
+        action='store_true',
+        help='Write one line of JSON for each problem as it is solved, with '
+        'the path of the problem and its solution (or why it failed).  This '
+        'is the default if more than one problem is given'
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        metavar='n',
+        help='Number of worker processes to solve the problems on (defaults '
+        'to the number of CPUs, 0 to solve them one after the other in this '
+        'process)'
+    )
+    parser.add_argument(
+        '--exact',
+        action='store_true',
+        help='Write numbers as exact fractions in strings rather than as '
+        'floats'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        metavar='n',
+        help='Number of worker processes for the whole-number search '
+        '(defaults to the number of CPUs, 0 to search in this process).  In '
+        'a batch, each search is done in the process solving its problem'
+    )
+    parser.add_argument(
+        '--max-pivots',
+        type=int,
+        metavar='n',
+        help='Stop after this many pivots, giving the solution reached so '
+        'far (marked as not optimal)'
+    )
+    parser.add_argument(
+        '--max-seconds',
+        type=float,
+        metavar='seconds',
+        help='Stop pivoting after this long, giving the solution reached so '
+        'far (marked as not optimal)'
+    )
+    parser.add_argument(
+        '--target-objective',
+        type=Fraction,
+        metavar='value',
+        help='Stop pivoting once the objective variable value is at least '
+        'this, giving the solution reached so far (marked as not optimal)'
+    )
+    parser.add_argument(
+        '--pivot-rules',
+        type=parse_pivot_rules,
+        default=[PivotRule.DANTZIG],
+        metavar='rule,...',
+        help='How to choose each pivot: '
+        f'{", ".join(pivot_rule.value for pivot_rule in PivotRule)} '
+        '(default dantzig).  Given more than one, each is run in its own '
+        'process and the first to give a verified optimal solution is used'
+    )
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument(
+        '--serve',
+        action='store_true',
+        help='Instead of solving problem files, serve solve requests over '
+        'HTTP on localhost until interrupted.  -j sets the number of solver '
+        'processes'
+    )
+    mode_group.add_argument(
+        '--coordinate',
+        action='store_true',
+        help='Solve the problem files on workers started with --worker '
+        'rather than on this machine'
+    )
+    mode_group.add_argument(
+        '--worker',
+        type=parse_address,
+        metavar='host:port',
+        help='Instead of solving problem files, solve what the coordinator '
+        'at host:port sends until it finishes.  -j sets the number of worker '
+        'processes'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        metavar='port',
+        help=f'Port to serve on (default {DEFAULT_PORT}) or coordinate on '
+        f'(default {DEFAULT_COORDINATOR_PORT}), 0 to pick a free one'
+    )
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        metavar='address',
+        help='Address to listen for workers on with --coordinate (0.0.0.0 '
+        'for workers on other machines to be able to connect)'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        metavar='seconds',
+        help='Timeout of solve requests that do not give their own'
+    )
+    parser.add_argument(
+        '--max-pending',
+        type=int,
+        default=DEFAULT_MAX_PENDING,
+        metavar='n',
+        help='Number of solve requests that can be queued or being solved '
+        'before more are turned away'
+    )
+    arguments = parser.parse_args(argv)
+
+    solving_problem_files = not arguments.serve and arguments.worker is None
+    if not solving_problem_files and arguments.problems:
+        parser.error('Problem files can not be given with --serve or --worker')
+    if solving_problem_files and not arguments.problems:
+        parser.error('At least one problem file must be given')
+    arguments.limits = SolveLimits(
+        arguments.max_pivots,
+        arguments.max_seconds,
+        arguments.target_objective
+    )
+    if arguments.limits != SolveLimits() and (
+        not solving_problem_files
+        or arguments.coordinate
+        or len(arguments.problems) > 1
+    ):
+        parser.error(
+            '--max-pivots, --max-seconds and --target-objective can only be '
+            'given when solving a single problem file'
+        )
+    if arguments.pivot_rules != [PivotRule.DANTZIG] and (
+        not solving_problem_files
+        or arguments.coordinate
+        or len(arguments.problems) > 1
+    ):
+        parser.error(
+            '--pivot-rules can only be given when solving a single problem '
+            'file'
+        )
+    if arguments.port is None:
+        arguments.port = (
+            DEFAULT_COORDINATOR_PORT
+            if arguments.coordinate
+            else DEFAULT_PORT
+        )
+
+    # only the workers need the docs when coordinating
+    if arguments.docs_paths is None and not arguments.coordinate:
+        default_docs_path = get_default_satisfactory_docs_path()
+        if default_docs_path is None:
+            parser.error(
+                'Path could not be autodetermined and was not specified!'
+            )
+        arguments.docs_paths = [default_docs_path]
+    if arguments.docs_paths is not None:
+        arguments.docs_paths = [
+            docs_path.expanduser().resolve()
+            for docs_path
+            in arguments.docs_paths
+        ]
+    arguments.jsonl = (
+        arguments.jsonl
+        or arguments.coordinate
+        or len(arguments.problems) > 1
+    )
+    arguments.cache_path = (
+        None
+        if arguments.no_docs_cache
+        else arguments.cache_path.expanduser().resolve()
+    )
+    return arguments
+
+
+def solve_single(arguments: argparse.Namespace) -> int:
+    logger = toplevel_logger.getChild('solve_single')
+
+    try:
+        spec = load_problem_spec(arguments.problems[0])
+    except (OSError, ProblemSpecError) as e:
+        print(f'Could not read problem: {e}', file=sys.stderr)
+        return 1
+
+    register_handlers()
+    load_docs(arguments.docs_paths, arguments.cache_path)
+
+    try:
+        if len(arguments.pivot_rules) > 1:
+            solution = solve_portfolio(
+                spec,
+                arguments.pivot_rules,
+                arguments.limits
+            ).solution
+        else:
+            solution = solve_problem(
+                spec,
+                arguments.workers,
+                arguments.limits,
+                arguments.pivot_rules[0]
+            )
+    except ProblemSpecError as e:
+        print(f'Invalid problem: {e}', file=sys.stderr)
+        return 1
+    except PortfolioError as e:
+        print(f'Could not solve problem: {e}', file=sys.stderr)
+        return 1
+    logger.debug('Solved, writing solution')
+
+    solution_json = solution_to_json(solution, arguments.exact)
+    if arguments.output_path is None:
+        json.dump(solution_json, sys.stdout, indent='\t')
+        print()
+    else:
+        with open(arguments.output_path, 'w', encoding='utf-8') as fptr:
+            json.dump(solution_json, fptr, indent='\t')
+    return 0
+
+
+@contextlib.contextmanager
+def open_output(arguments: argparse.Namespace):
+    if arguments.output_path is None:
+        yield sys.stdout
+    else:
+        with open(arguments.output_path, 'w', encoding='utf-8') as output:
+            yield output
+
+
+def write_result_line(output, result_json: dict) -> None:
+    output.write(json.dumps(result_json) + '\n')
+    # so that whatever is reading the results gets each one as soon as it is
+    # finished
+    output.flush()
+
+
+def solve_batch(arguments: argparse.Namespace) -> int:
+    logger = toplevel_logger.getChild('solve_batch')
+
+    register_handlers()
+    load_docs(arguments.docs_paths, arguments.cache_path)
+
+    n_failed = 0
+    with open_output(arguments) as output:
+        for result in iter_scenario_results(
+            arguments.problems,
+            arguments.jobs,
+            arguments.exact
+        ):
+            if result.error is not None:
+                n_failed += 1
+            write_result_line(output, result.to_json())
+    logger.info(
+        f'Solved {len(arguments.problems) - n_failed} of '
+        f'{len(arguments.problems)} problems'
+    )
+    return 0 if n_failed == 0 else 1
+
+
+def coordinate(arguments: argparse.Namespace) -> int:
+    logger = toplevel_logger.getChild('coordinate')
+
+    # the workers load the docs, so they are not needed here
+    n_failed = 0
+    problems = dict()
+    with open_output(arguments) as output:
+        for problem_path in arguments.problems:
+            try:
+                problems[str(problem_path)] = load_problem_spec(problem_path)
+            except (OSError, ProblemSpecError) as e:
+                n_failed += 1
+                write_result_line(
+                    output,
+                    ScenarioResult(problem_path, None, str(e), 0.0).to_json()
+                )
+
+        coordinator = Coordinator(
+            arguments.host,
+            arguments.port,
+            exact=arguments.exact
+        )
+        host, port = coordinator.address
+        # printed whatever the log verbosity, so that the workers can be
+        # pointed at it
+        print(f'Coordinating on {host}:{port}', file=sys.stderr, flush=True)
+        try:
+            for result in coordinator.solve(problems):
+                if result.error is not None:
+                    n_failed += 1
+                write_result_line(
+                    output,
+                    {
+                        **ScenarioResult(
+                            pathlib.Path(result.task_id),
+                            result.solution,
+                            result.error,
+                            result.seconds
+                        ).to_json(),
+                        'worker': result.worker,
+                        'attempts': result.attempts
+                    }
+                )
+        finally:
+            coordinator.close()
+    logger.info(
+        f'Solved {len(arguments.problems) - n_failed} of '
+        f'{len(arguments.problems)} problems'
+    )
+    return 0 if n_failed == 0 else 1
+
+
+def work(arguments: argparse.Namespace) -> int:
+    register_handlers()
+    load_docs(arguments.docs_paths, arguments.cache_path)
+
+    try:
+        run_workers(arguments.worker, arguments.jobs)
+    except OSError as e:
+        print(
+            f'Could not connect to coordinator at {arguments.worker}: {e}',
+            file=sys.stderr
+        )
+        return 1
+    return 0
+
+
+def serve(arguments: argparse.Namespace) -> int:
+    register_handlers()
+    load_docs(arguments.docs_paths, arguments.cache_path)
+
+    server = SolveServer(
+        arguments.port,
+        arguments.jobs,
+        arguments.max_pending,
+        arguments.timeout
+    )
+    host, port = server.server_address
+    # printed whatever the log verbosity, so that whatever started the server
+    # can tell which port it is on
+    print(f'Serving on http://{host}:{port}', file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def main(arguments: argparse.Namespace) -> int:
+    if arguments.serve:
+        return serve(arguments)
+    if arguments.worker is not None:
+        return work(arguments)
+    if arguments.coordinate:
+        return coordinate(arguments)
+    if arguments.jsonl:
+        return solve_batch(arguments)
+    return solve_single(arguments)
+
+
+if __name__ == '__main__':
+    configured_arguments = parse_arguments()
+    # to standard error (rather than last.log like the GUI), since there is
+    # no window to show errors in
+    logging.basicConfig(
+        level=VALID_LOG_VERBOSITY_LEVELS[configured_arguments.verbosity]
+    )
+    sys.exit(main(configured_arguments))
@@ -0,0 +1,30 @@
+'''Stand-ins for what the handlers would have loaded from the docs, for the
+tests of solving problems without the GUI'''
+from satisfactoryobjects import itemhandler, machinehandler, recipehandler
+from satisfactoryobjects.items import Item
+from satisfactoryobjects.machines import FixedPowerMachine
+from satisfactoryobjects.recipes import Recipe, RecipeResource
+
+
+def fill_ingot_registries() -> None:
+    '''Fill the registries with ore, ingots and a smelter
+    (Build_Smelter_C) that turns 30 ore into 30 ingots per minute'''
+    ore = Item('Desc_Ore_C', 'Ore', 0.0)
+    ingot = Item('Desc_Ingot_C', 'Ingot', 0.0)
+    smelter = FixedPowerMachine('Build_Smelter_C', 'Smelter', -4.0)
+    itemhandler.items.update({'Desc_Ore_C': ore, 'Desc_Ingot_C': ingot})
+    machinehandler.machines['Build_Smelter_C'] = smelter
+    recipehandler.recipes['Recipe_Ingot_C'] = Recipe(
+        'Recipe_Ingot_C',
+        'Ingot',
+        [RecipeResource(ore, 1)],
+        [RecipeResource(ingot, 1)],
+        [smelter],
+        2.0
+    )
+
+
+def clear_registries() -> None:
+    itemhandler.items.clear()
+    machinehandler.machines.clear()
+    recipehandler.recipes.clear()
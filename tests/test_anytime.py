@@ -0,0 +1,114 @@
+import unittest
+from fractions import Fraction
+from optimisationsolver import anytime, simplex
+from utils.variabletypetags import VariableType, AnonymousTypeTag, NamedTypeTag
+
+
+class TestPivotWithinLimits(unittest.TestCase):
+    def tableau(self) -> simplex.Tableau:
+        # optimal after two pivots, with an objective variable value of 600
+        return simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1)], 40),
+                simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 1)], 100),
+                simplex.ObjectiveEquation([simplex.Variable(0, -20), simplex.Variable(1, -10)], 0, 1)
+            ]
+        )
+
+    def test_optimal(self):
+        t = self.tableau()
+        run = anytime.pivot_within_limits(t)
+        self.assertEqual(run.stop_reason, anytime.StopReason.OPTIMAL)
+        self.assertTrue(run.optimal)
+        self.assertEqual(run.pivots, 2)
+        self.assertEqual(t.objective_value, 600)
+
+    def test_max_pivots(self):
+        t = self.tableau()
+        run = anytime.pivot_within_limits(
+            t,
+            anytime.SolveLimits(max_pivots=1)
+        )
+        self.assertEqual(run.stop_reason, anytime.StopReason.MAX_PIVOTS)
+        self.assertFalse(run.optimal)
+        self.assertEqual(run.pivots, 1)
+        # the basic feasible solution after the first pivot
+        self.assertCountEqual(
+            anytime.get_snapshot_variable_values(t),
+            [
+                (NamedTypeTag(VariableType.NORMAL, 0), 25),
+                (NamedTypeTag(VariableType.SLACK, 0), 15),
+                (AnonymousTypeTag(VariableType.OBJECTIVE), 500)
+            ]
+        )
+
+    def test_optimal_at_limits(self):
+        # reaching the optimum exactly at a limit is still optimal
+        for limits in (
+            anytime.SolveLimits(max_pivots=2),
+            anytime.SolveLimits(target_objective=Fraction(600)),
+            anytime.SolveLimits(max_pivots=0, target_objective=Fraction(0))
+        ):
+            with self.subTest(limits=limits):
+                t = self.tableau()
+                if limits.max_pivots == 0:
+                    t.pivot_until_done()
+                run = anytime.pivot_within_limits(
+                    t,
+                    limits,
+                    should_stop=t.is_optimal
+                )
+                self.assertEqual(run.stop_reason, anytime.StopReason.OPTIMAL)
+                self.assertEqual(t.objective_value, 600)
+
+    def test_max_seconds(self):
+        run = anytime.pivot_within_limits(
+            self.tableau(),
+            anytime.SolveLimits(max_seconds=0)
+        )
+        self.assertEqual(run.stop_reason, anytime.StopReason.MAX_SECONDS)
+        self.assertEqual(run.pivots, 0)
+
+    def test_target_objective(self):
+        objective_values = list()
+        run = anytime.pivot_within_limits(
+            self.tableau(),
+            anytime.SolveLimits(target_objective=Fraction(450)),
+            lambda previous, current: objective_values.append(
+                (previous, current)
+            )
+        )
+        self.assertEqual(
+            run.stop_reason,
+            anytime.StopReason.TARGET_OBJECTIVE
+        )
+        self.assertEqual(objective_values, [(0, 500)])
+
+    def test_should_stop(self):
+        run = anytime.pivot_within_limits(
+            self.tableau(),
+            should_stop=lambda: True
+        )
+        self.assertEqual(run.stop_reason, anytime.StopReason.STOPPED)
+        self.assertEqual(run.pivots, 0)
+
+    def test_unbounded(self):
+        # nothing limits x1
+        t = simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, -1)], 10),
+                simplex.ObjectiveEquation([simplex.Variable(0, -1), simplex.Variable(1, -1)], 0, 1)
+            ]
+        )
+        run = anytime.pivot_within_limits(t)
+        self.assertEqual(run.stop_reason, anytime.StopReason.UNBOUNDED)
+        self.assertFalse(run.optimal)
+        with self.assertRaises(simplex.SimplexUnboundedError):
+            t.pivot()
+
+    def test_callback_errors_are_passed_on(self):
+        def pivot_done(previous, current):
+            raise ValueError('callback failed')
+
+        with self.assertRaisesRegex(ValueError, 'callback failed'):
+            anytime.pivot_within_limits(self.tableau(), pivot_done=pivot_done)
@@ -1,5 +1,9 @@
+import sys
 import unittest
 from satisfactoryobjects import basesatisfactoryobject
+from satisfactoryobjects.items import Item
+from satisfactoryobjects.machines import FixedPowerMachine
+from satisfactoryobjects.recipes import Recipe
 
 
 class TestBaseSatisfactoryObject(unittest.TestCase):
@@ -103,3 +107,26 @@ class TestBaseSatisfactoryObject(unittest.TestCase):
             object_under_test_1,
             object_under_test_2
         )
+
+    def test_class_identifier_interned(self):
+        # built at runtime so that it is not already interned as a constant
+        class_identifier = ''.join(['Desc_', 'Interned', '_C'])
+        object_under_test = basesatisfactoryobject.BaseSatisfactoryObject(
+            class_identifier,
+            "Some user facing name for an object under test"
+        )
+        self.assertIs(
+            object_under_test.internal_class_identifier,
+            sys.intern('Desc_Interned_C')
+        )
+
+    def test_no_instance_dict(self):
+        # every subclass needs __slots__ too, or its instances get a __dict__
+        # anyway
+        for object_under_test in (
+            Item("Desc_Test_C", "Test", 0.0),
+            FixedPowerMachine("Build_Test_C", "Test", 0.0),
+            Recipe("Recipe_Test_C", "Test", [], [], [], 1.0)
+        ):
+            with self.subTest(type(object_under_test).__name__):
+                self.assertFalse(hasattr(object_under_test, '__dict__'))
@@ -0,0 +1,111 @@
+import gc
+import pathlib
+import tempfile
+import unittest
+from headless import batch, problembuilder, solving
+from satisfactoryobjects import itemhandler, machinehandler, recipehandler
+from utils.suppressalllogs import SuppressAll
+from ingotregistries import clear_registries, fill_ingot_registries
+
+
+class TestIterScenarioResults(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestIterScenarioResults, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the modules under test
+        self.__log_filter_obj = SuppressAll()
+        for module in (batch, problembuilder, solving):
+            module.toplevel_logger.addFilter(self.__log_filter_obj)
+
+        fill_ingot_registries()
+
+        self.__temporary_directory = tempfile.TemporaryDirectory()
+        directory = pathlib.Path(self.__temporary_directory.name)
+        # a scenario for each amount of ore available
+        self.problem_paths = list()
+        for ore_available in (30, 60, 90):
+            problem_path = directory.joinpath(f'ore{ore_available}.toml')
+            problem_path.write_text(
+                '[targets]\n'
+                'Desc_Ingot_C = 1\n'
+                '[availability]\n'
+                f'Desc_Ore_C = {ore_available}\n',
+                encoding='utf-8'
+            )
+            self.problem_paths.append(problem_path)
+        self.invalid_problem_path = directory.joinpath('invalid.json')
+        self.invalid_problem_path.write_text(
+            '{"targets": {"Desc_Nothing_C": 1}}',
+            encoding='utf-8'
+        )
+
+    def tearDown(self, *args, **kwargs):
+        super(TestIterScenarioResults, self).tearDown(
+            *args,
+            **kwargs
+        )
+        self.__temporary_directory.cleanup()
+        # clear up global state
+        clear_registries()
+        # re-enable logging for the modules under test
+        for module in (batch, problembuilder, solving):
+            module.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def test_results(self):
+        for workers in (0, 2):
+            with self.subTest(workers=workers):
+                results = {
+                    result.problem_path: result
+                    for result
+                    in batch.iter_scenario_results(
+                        self.problem_paths + [self.invalid_problem_path],
+                        workers
+                    )
+                }
+                self.assertEqual(
+                    results.keys(),
+                    set(self.problem_paths) | {self.invalid_problem_path}
+                )
+                for problem_path, ore_available in zip(
+                    self.problem_paths,
+                    (30, 60, 90)
+                ):
+                    self.assertIsNone(results[problem_path].error)
+                    self.assertEqual(
+                        results[problem_path].solution['objective_value'],
+                        ore_available
+                    )
+                self.assertIsNone(
+                    results[self.invalid_problem_path].solution
+                )
+                self.assertIn(
+                    'Desc_Nothing_C',
+                    results[self.invalid_problem_path].to_json()['error']
+                )
+
+    def test_initialise_worker(self):
+        # as if the worker was not forked, and so started with empty
+        # registries
+        registries = (
+            dict(itemhandler.items),
+            dict(machinehandler.machines),
+            dict(recipehandler.recipes)
+        )
+        itemhandler.items.clear()
+        machinehandler.machines.clear()
+        recipehandler.recipes.clear()
+        batch.initialise_worker(registries)
+        # which froze everything so far, which only makes sense in a worker
+        gc.unfreeze()
+        self.assertEqual(
+            (
+                itemhandler.items,
+                machinehandler.machines,
+                recipehandler.recipes
+            ),
+            registries
+        )
+        result = batch.solve_scenario(self.problem_paths[0])
+        self.assertEqual(result.solution['objective_value'], 30)
@@ -0,0 +1,197 @@
+import json
+import multiprocessing
+import socket
+import threading
+import unittest
+from headless import batch, distributed, problembuilder, solving
+from headless.problemspec import ProblemSpec
+from utils.suppressalllogs import SuppressAll
+from ingotregistries import clear_registries, fill_ingot_registries
+
+
+class FakeWorker:
+    '''A worker that never solves anything, optionally sending heartbeats'''
+
+    def __init__(self, address: tuple[str, int], heartbeats: bool):
+        self.sock = socket.create_connection(address)
+        self.fptr = self.sock.makefile('rb')
+        self.send({'type': 'hello', 'version': 1, 'name': 'fake'})
+        self.stopped = threading.Event()
+        if heartbeats:
+            threading.Thread(target=self.send_heartbeats, daemon=True).start()
+
+    def send(self, message: dict):
+        self.sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+    def send_heartbeats(self):
+        while not self.stopped.wait(0.1):
+            try:
+                self.send({'type': 'heartbeat'})
+            except OSError:
+                break
+
+    def receive(self) -> dict:
+        return json.loads(self.fptr.readline())
+
+    def close(self):
+        self.stopped.set()
+        # rather than just closing, since forked worker processes have
+        # copies of the socket
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.fptr.close()
+        self.sock.close()
+
+
+class TestCoordinator(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestCoordinator, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the modules under test
+        self.__log_filter_obj = SuppressAll()
+        for module in (batch, distributed, problembuilder, solving):
+            module.toplevel_logger.addFilter(self.__log_filter_obj)
+
+        fill_ingot_registries()
+        # a problem for each amount of ore available
+        self.problems = {
+            f'ore{ore_available}': ProblemSpec(
+                (('Desc_Ingot_C', 1.0),),
+                (('Desc_Ore_C', float(ore_available)),)
+            )
+            for ore_available
+            in (30, 60, 90, 120)
+        }
+
+        self.coordinator = None
+        self.worker_processes = list()
+        self.fake_workers = list()
+
+    def tearDown(self, *args, **kwargs):
+        super(TestCoordinator, self).tearDown(
+            *args,
+            **kwargs
+        )
+        for fake_worker in self.fake_workers:
+            fake_worker.close()
+        if self.coordinator is not None:
+            self.coordinator.close()
+        # the workers exit once the coordinator disconnects them
+        for worker_process in self.worker_processes:
+            worker_process.join(10)
+            worker_process.kill()
+        # clear up global state
+        clear_registries()
+        # re-enable logging for the modules under test
+        for module in (batch, distributed, problembuilder, solving):
+            module.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def start_coordinator(self, **kwargs) -> distributed.Coordinator:
+        self.coordinator = distributed.Coordinator(port=0, **kwargs)
+        return self.coordinator
+
+    def start_worker(self, name: str):
+        # forked, so it has the registries
+        worker_process = multiprocessing.Process(
+            target=distributed.run_worker,
+            args=(self.coordinator.address, name, 0.1)
+        )
+        worker_process.start()
+        self.worker_processes.append(worker_process)
+
+    def start_fake_worker(self, heartbeats: bool) -> FakeWorker:
+        fake_worker = FakeWorker(self.coordinator.address, heartbeats)
+        self.fake_workers.append(fake_worker)
+        return fake_worker
+
+    def assert_solved(self, results: dict[str, distributed.TaskResult]):
+        self.assertEqual(results.keys(), self.problems.keys())
+        for task_id, result in results.items():
+            self.assertIsNone(result.error)
+            self.assertEqual(
+                result.solution['objective_value'],
+                float(task_id.removeprefix('ore'))
+            )
+
+    def test_solve(self):
+        self.start_coordinator()
+        self.start_worker('worker1')
+        self.start_worker('worker2')
+        results = {
+            result.task_id: result
+            for result
+            in self.coordinator.solve({
+                **self.problems,
+                'invalid': ProblemSpec((('Desc_Nothing_C', 1.0),))
+            })
+        }
+        self.assertIn('Desc_Nothing_C', results.pop('invalid').error)
+        self.assert_solved(results)
+        for result in results.values():
+            self.assertIn(result.worker, ('worker1', 'worker2'))
+            self.assertEqual(result.attempts, 1)
+
+    def test_work_stealing(self):
+        self.start_coordinator(prefetch=4)
+        # given every task, since it is the only worker
+        fake_worker = self.start_fake_worker(heartbeats=True)
+        results = self.coordinator.solve(self.problems)
+        received = [fake_worker.receive() for _ in range(4)]
+        self.assertEqual(
+            [message['task_id'] for message in received],
+            list(self.problems)
+        )
+        self.start_worker('thief')
+        # everything but the task the fake worker would be solving
+        stolen_results = {
+            result.task_id: result
+            for result
+            in (next(results) for _ in range(3))
+        }
+        self.assertEqual(
+            stolen_results.keys(),
+            {'ore60', 'ore90', 'ore120'}
+        )
+        self.assertEqual(
+            [fake_worker.receive() for _ in range(3)],
+            [
+                {'type': 'cancel', 'task_id': task_id}
+                for task_id
+                in ('ore120', 'ore90', 'ore60')
+            ]
+        )
+        for result in stolen_results.values():
+            self.assertEqual(result.worker, 'thief')
+            self.assertEqual(result.attempts, 1)
+
+        # and once it is lost, its last task is retried on the thief
+        fake_worker.close()
+        retried_result = next(results)
+        self.assertEqual(retried_result.task_id, 'ore30')
+        self.assertEqual(retried_result.attempts, 2)
+        self.assert_solved({'ore30': retried_result, **stolen_results})
+
+    def test_heartbeat_timeout(self):
+        self.start_coordinator(heartbeat_timeout=0.5)
+        # never sends a heartbeat, so is lost with the tasks it was given
+        self.start_fake_worker(heartbeats=False)
+        results = self.coordinator.solve(self.problems)
+        self.start_worker('worker')
+        results = {result.task_id: result for result in results}
+        self.assert_solved(results)
+        self.assertEqual(self.coordinator.get_worker_names(), ['worker'])
+
+    def test_max_attempts(self):
+        self.start_coordinator(max_attempts=1)
+        fake_worker = self.start_fake_worker(heartbeats=True)
+        results = self.coordinator.solve({'ore30': self.problems['ore30']})
+        fake_worker.receive()
+        fake_worker.close()
+        result = next(results)
+        self.assertIsNone(result.solution)
+        self.assertEqual(result.attempts, 1)
+        self.assertIn('Lost 1 workers', result.error)
@@ -0,0 +1,178 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from fractions import Fraction
+from satisfactoryobjects import (
+    docscache,
+    itemhandler,
+    machinehandler,
+    recipehandler
+)
+from satisfactoryobjects.items import Item
+from satisfactoryobjects.machines import FixedPowerMachine
+from satisfactoryobjects.recipes import Recipe, RecipeResource
+from utils.suppressalllogs import SuppressAll
+
+
+class TestDocsCache(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestDocsCache, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        docscache.toplevel_logger.addFilter(self.__log_filter_obj)
+
+        self.__temporary_directory = tempfile.TemporaryDirectory()
+        directory = pathlib.Path(self.__temporary_directory.name)
+        self.docs_path = directory.joinpath('Docs.json')
+        self.docs_path.write_text('[]', encoding='UTF-16')
+        self.cache_path = directory.joinpath('cache', 'docs.cache')
+
+        # stand-ins for what the handlers would have loaded from the docs
+        ore = Item('Desc_Ore_C', 'Ore', 0.0)
+        water = Item('Desc_Water_C', 'Water', 0.0, True)
+        smelter = FixedPowerMachine('Build_Smelter_C', 'Smelter', -4.0)
+        self.registries = (
+            {'Desc_Ore_C': ore, 'Desc_Water_C': water},
+            {'Build_Smelter_C': smelter},
+            {
+                'Recipe_Ingot_C': Recipe(
+                    'Recipe_Ingot_C',
+                    'Ingot',
+                    [RecipeResource(water, Fraction(1, 2))],
+                    [RecipeResource(ore, 1)],
+                    [smelter],
+                    2.0,
+                    is_alternate=True
+                )
+            }
+        )
+        self.fill_registries()
+
+    def tearDown(self, *args, **kwargs):
+        super(TestDocsCache, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # clear up global state
+        self.clear_registries()
+        self.__temporary_directory.cleanup()
+        # re-enable logging for the module under test
+        docscache.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def fill_registries(self):
+        for registry, contents in zip(
+            (itemhandler.items, machinehandler.machines, recipehandler.recipes),
+            self.registries
+        ):
+            registry.update(contents)
+
+    def clear_registries(self):
+        itemhandler.items.clear()
+        machinehandler.machines.clear()
+        recipehandler.recipes.clear()
+
+    def save(self):
+        docscache.save(
+            self.cache_path,
+            [docscache.make_docs_key(self.docs_path)]
+        )
+        self.clear_registries()
+
+    def test_round_trip(self):
+        self.save()
+        self.assertTrue(docscache.load([self.docs_path], self.cache_path))
+        self.assertEqual(
+            (itemhandler.items, machinehandler.machines, recipehandler.recipes),
+            self.registries
+        )
+        # the recipes still share their items with the item registry
+        recipe = recipehandler.recipes['Recipe_Ingot_C']
+        self.assertIs(
+            recipe.products[0].item,
+            itemhandler.items['Desc_Ore_C']
+        )
+        self.assertIs(
+            recipe.machines[0],
+            machinehandler.machines['Build_Smelter_C']
+        )
+
+    def test_missing_cache(self):
+        self.clear_registries()
+        self.assertFalse(docscache.load([self.docs_path], self.cache_path))
+
+    def test_changed_docs_invalidate_cache(self):
+        self.save()
+        # same size, different contents
+        self.docs_path.write_text('{}', encoding='UTF-16')
+        self.assertFalse(docscache.load([self.docs_path], self.cache_path))
+        self.docs_path.write_text('[ ]', encoding='UTF-16')
+        self.assertFalse(docscache.load([self.docs_path], self.cache_path))
+        self.assertEqual(itemhandler.items, dict())
+
+    def test_touched_docs_keep_cache(self):
+        self.save()
+        fingerprint = docscache.get_docs_fingerprint(
+            [docscache.make_docs_key(self.docs_path)]
+        )
+        stat_result = os.stat(self.docs_path)
+        new_mtime_ns = stat_result.st_mtime_ns + 10 ** 9
+        os.utime(
+            self.docs_path,
+            ns=(stat_result.st_atime_ns, new_mtime_ns)
+        )
+        docs_keys = docscache.load([self.docs_path], self.cache_path)
+        self.assertTrue(docs_keys)
+        # only the contents matter to the fingerprint
+        self.assertEqual(
+            docscache.get_docs_fingerprint(docs_keys),
+            fingerprint
+        )
+        self.docs_path.write_text('[ ]', encoding='UTF-16')
+        self.assertNotEqual(
+            docscache.get_docs_fingerprint(
+                [docscache.make_docs_key(self.docs_path)]
+            ),
+            fingerprint
+        )
+        # the cache now has the new modification time
+        cached_keys, _ = docscache._unpack(self.cache_path.read_bytes())
+        self.assertEqual(cached_keys[0].mtime_ns, new_mtime_ns)
+
+    def test_multiple_docs_files(self):
+        mod_docs_path = self.docs_path.with_name('Mod.json')
+        mod_docs_path.write_text('[]', encoding='UTF-16')
+        docs_paths = [self.docs_path, mod_docs_path]
+        docscache.save(
+            self.cache_path,
+            [docscache.make_docs_key(docs_path) for docs_path in docs_paths]
+        )
+        self.clear_registries()
+        self.assertTrue(docscache.load(docs_paths, self.cache_path))
+        self.clear_registries()
+        # a different set or order of docs files is a different merge
+        self.assertFalse(docscache.load([self.docs_path], self.cache_path))
+        self.assertFalse(
+            docscache.load(docs_paths[::-1], self.cache_path)
+        )
+        mod_docs_path.write_text('[ ]', encoding='UTF-16')
+        self.assertFalse(docscache.load(docs_paths, self.cache_path))
+        self.assertEqual(itemhandler.items, dict())
+
+    def test_other_format_version_ignored(self):
+        self.save()
+        data = bytearray(self.cache_path.read_bytes())
+        # bump the format version
+        data[8] += 1
+        self.cache_path.write_bytes(data)
+        self.assertFalse(docscache.load([self.docs_path], self.cache_path))
+
+    def test_corrupt_cache_ignored(self):
+        self.save()
+        data = self.cache_path.read_bytes()
+        self.cache_path.write_bytes(data[:-10])
+        self.assertFalse(docscache.load([self.docs_path], self.cache_path))
+        self.assertEqual(recipehandler.recipes, dict())
@@ -0,0 +1,172 @@
+import json
+import pathlib
+import tempfile
+import unittest
+from satisfactoryobjects import docsoverlay
+from utils.suppressalllogs import SuppressAll
+
+ITEM = "/Script/CoreUObject.Class'/Script/FactoryGame.FGItemDescriptor'"
+FUEL = (
+    "/Script/CoreUObject.Class'/Script/FactoryGame.FGItemDescriptorNuclearFuel'"
+)
+RECIPE = "/Script/CoreUObject.Class'/Script/FactoryGame.FGRecipe'"
+WALL = "/Script/CoreUObject.Class'/Script/FactoryGame.FGBuildableWall'"
+
+
+class TestDocsOverlay(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestDocsOverlay, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        docsoverlay.toplevel_logger.addFilter(self.__log_filter_obj)
+
+        self.__temporary_directory = tempfile.TemporaryDirectory()
+        directory = pathlib.Path(self.__temporary_directory.name)
+        self.base_path = directory.joinpath('Docs.json')
+        self.mod_path = directory.joinpath('Mod.json')
+        self.second_mod_path = directory.joinpath('SecondMod.json')
+        for path, docs in (
+            (
+                self.base_path,
+                [
+                    {
+                        "NativeClass": ITEM,
+                        "Classes": [
+                            {"ClassName": "Desc_Ore_C", "mDisplayName": "Ore"},
+                            {"ClassName": "Desc_Rod_C", "mDisplayName": "Rod"}
+                        ]
+                    },
+                    {
+                        "NativeClass": WALL,
+                        "Classes": [{"ClassName": "Build_Wall_C"}]
+                    },
+                    {
+                        "NativeClass": RECIPE,
+                        "Classes": [{"ClassName": "Recipe_Rod_C"}]
+                    }
+                ]
+            ),
+            (
+                self.mod_path,
+                [
+                    {
+                        "NativeClass": ITEM,
+                        "Classes": [
+                            {"ClassName": "Desc_Ore_C", "mDisplayName": "Mod"},
+                            {"ClassName": "Desc_Gem_C", "mDisplayName": "Gem"}
+                        ]
+                    }
+                ]
+            ),
+            (
+                self.second_mod_path,
+                [
+                    {
+                        "NativeClass": FUEL,
+                        "Classes": [
+                            # changes what kind of item it is
+                            {"ClassName": "Desc_Rod_C", "mDisplayName": "Fuel"}
+                        ]
+                    },
+                    {
+                        "NativeClass": ITEM,
+                        "Classes": [
+                            {"ClassName": "Desc_Ore_C", "mDisplayName": "Last"}
+                        ]
+                    }
+                ]
+            )
+        ):
+            with open(path, 'w', encoding='UTF-16') as fptr:
+                json.dump(docs, fptr, indent='\t')
+        self.docs_paths = [self.base_path, self.mod_path, self.second_mod_path]
+
+    def tearDown(self, *args, **kwargs):
+        super(TestDocsOverlay, self).tearDown(
+            *args,
+            **kwargs
+        )
+        self.__temporary_directory.cleanup()
+        # re-enable logging for the module under test
+        docsoverlay.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    expected_blocks = [
+        {
+            "NativeClass": ITEM,
+            "Classes": [
+                # keeps its place, but from the last file that has it
+                {"ClassName": "Desc_Ore_C", "mDisplayName": "Last"},
+                {"ClassName": "Desc_Gem_C", "mDisplayName": "Gem"}
+            ]
+        },
+        {
+            "NativeClass": FUEL,
+            "Classes": [{"ClassName": "Desc_Rod_C", "mDisplayName": "Fuel"}]
+        },
+        {
+            "NativeClass": RECIPE,
+            "Classes": [{"ClassName": "Recipe_Rod_C"}]
+        }
+    ]
+
+    def test_merge(self):
+        for workers in (0, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(
+                    list(
+                        docsoverlay.iter_merged_docs_blocks(
+                            self.docs_paths,
+                            {ITEM, FUEL, RECIPE},
+                            workers
+                        )
+                    ),
+                    self.expected_blocks
+                )
+
+    def test_conflicts(self):
+        _, conflicts = docsoverlay.merge_docs_blocks(
+            [
+                (
+                    docs_path,
+                    docsoverlay.read_docs_blocks(docs_path, {ITEM, FUEL})
+                )
+                for docs_path
+                in self.docs_paths
+            ]
+        )
+        self.assertEqual(
+            conflicts,
+            [
+                docsoverlay.DocsConflict(
+                    'Desc_Ore_C',
+                    self.base_path,
+                    self.mod_path
+                ),
+                docsoverlay.DocsConflict(
+                    'Desc_Rod_C',
+                    self.base_path,
+                    self.second_mod_path
+                ),
+                docsoverlay.DocsConflict(
+                    'Desc_Ore_C',
+                    self.mod_path,
+                    self.second_mod_path
+                )
+            ]
+        )
+
+    def test_single_file_is_not_merged(self):
+        self.assertEqual(
+            list(
+                docsoverlay.iter_merged_docs_blocks([self.base_path], {WALL})
+            ),
+            [
+                {
+                    "NativeClass": WALL,
+                    "Classes": [{"ClassName": "Build_Wall_C"}]
+                }
+            ]
+        )
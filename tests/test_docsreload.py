@@ -0,0 +1,283 @@
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+import tempfile
+import unittest
+from unittest import mock
+from satisfactoryobjects import (
+    docsreload,
+    itemhandler,
+    machinehandler,
+    recipehandler
+)
+from satisfactoryobjects.items import Item
+from satisfactoryobjects.machines import FixedPowerMachine
+from satisfactoryobjects.recipes import Recipe, RecipeResource
+from headless.solverprocess import get_fork_safe_context
+from utils.suppressalllogs import SuppressAll
+
+
+def make_registries(
+    ore_energy_value=0.0,
+    ingot_time=2.0,
+    alternate=False,
+    smelter_power=-4.0
+):
+    '''Stand-ins for what the handlers would have loaded from the docs'''
+    ore = Item('Desc_Ore_C', 'Ore', ore_energy_value)
+    water = Item('Desc_Water_C', 'Water', 0.0, True)
+    smelter = FixedPowerMachine('Build_Smelter_C', 'Smelter', smelter_power)
+    recipes = {
+        'Recipe_Ingot_C': Recipe(
+            'Recipe_Ingot_C',
+            'Ingot',
+            [RecipeResource(ore, 1)],
+            [RecipeResource(ore, 1)],
+            [smelter],
+            ingot_time
+        ),
+        'Recipe_Pump_C': Recipe(
+            'Recipe_Pump_C',
+            'Pump',
+            [],
+            [RecipeResource(water, 1)],
+            [smelter],
+            1.0
+        )
+    }
+    if alternate:
+        recipes['Recipe_Alternate_C'] = Recipe(
+            'Recipe_Alternate_C',
+            'Alternate',
+            [RecipeResource(water, 2)],
+            [RecipeResource(ore, 1)],
+            [smelter],
+            4.0,
+            is_alternate=True
+        )
+    return (
+        {'Desc_Ore_C': ore, 'Desc_Water_C': water},
+        {'Build_Smelter_C': smelter},
+        recipes
+    )
+
+
+def fill_alternate_registries():
+    for registry, contents in zip(
+        (itemhandler.items, machinehandler.machines, recipehandler.recipes),
+        make_registries(alternate=True)
+    ):
+        registry.update(contents)
+
+
+class TestReloadRegistries(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestReloadRegistries, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        docsreload.toplevel_logger.addFilter(self.__log_filter_obj)
+
+        self.registries = (
+            itemhandler.items,
+            machinehandler.machines,
+            recipehandler.recipes
+        )
+        self.fill_registries(make_registries())
+
+    def tearDown(self, *args, **kwargs):
+        super(TestReloadRegistries, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # clear up global state
+        for registry in self.registries:
+            registry.clear()
+        # re-enable logging for the module under test
+        docsreload.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def fill_registries(self, contents):
+        for registry, registry_contents in zip(self.registries, contents):
+            registry.update(registry_contents)
+
+    def test_diff(self):
+        old_recipe = recipehandler.recipes['Recipe_Pump_C']
+        docs_diff = docsreload.reload_registries(
+            lambda: self.fill_registries(
+                make_registries(
+                    ore_energy_value=1.0,
+                    ingot_time=2.0,
+                    alternate=True
+                )
+            )
+        )
+        self.assertEqual(
+            docs_diff,
+            docsreload.DocsDiff(
+                docsreload.RegistryDiff(changed=frozenset({'Desc_Ore_C'})),
+                docsreload.RegistryDiff(),
+                docsreload.RegistryDiff(
+                    added=frozenset({'Recipe_Alternate_C'}),
+                    # because its ore changed
+                    changed=frozenset({'Recipe_Ingot_C'})
+                )
+            )
+        )
+        self.assertFalse(docs_diff.is_empty())
+        # unchanged objects are kept
+        self.assertIs(recipehandler.recipes['Recipe_Pump_C'], old_recipe)
+        self.assertEqual(itemhandler.items['Desc_Ore_C'].energy_value, 1.0)
+        # and new recipes refer to them
+        new_recipe = recipehandler.recipes['Recipe_Alternate_C']
+        self.assertIs(
+            new_recipe.dependencies[0].item,
+            itemhandler.items['Desc_Water_C']
+        )
+        self.assertIs(
+            new_recipe.machines[0],
+            machinehandler.machines['Build_Smelter_C']
+        )
+
+        # removing it again
+        docs_diff = docsreload.reload_registries(
+            lambda: self.fill_registries(
+                make_registries(ore_energy_value=1.0)
+            )
+        )
+        self.assertEqual(
+            docs_diff.recipes,
+            docsreload.RegistryDiff(removed=frozenset({'Recipe_Alternate_C'}))
+        )
+        self.assertNotIn('Recipe_Alternate_C', recipehandler.recipes)
+
+    def test_relink_kept_recipes(self):
+        kept_recipes = dict(recipehandler.recipes)
+        is_unchanged = docsreload._is_unchanged
+        # recipes compare their items and machines too, so treat them as
+        # unchanged to check that a kept recipe is still relinked
+        with mock.patch.object(
+            docsreload,
+            '_is_unchanged',
+            lambda old, new: (
+                isinstance(old, Recipe) or is_unchanged(old, new)
+            )
+        ):
+            docs_diff = docsreload.reload_registries(
+                lambda: self.fill_registries(
+                    make_registries(ore_energy_value=1.0, smelter_power=-5.0)
+                )
+            )
+        self.assertEqual(docs_diff.recipes, docsreload.RegistryDiff())
+        for class_name, recipe in recipehandler.recipes.items():
+            self.assertIs(recipe, kept_recipes[class_name])
+            self.assertIs(
+                recipe.machines[0],
+                machinehandler.machines['Build_Smelter_C']
+            )
+            for resource in recipe.dependencies + recipe.products:
+                self.assertIs(
+                    resource.item,
+                    itemhandler.items[resource.item.internal_class_identifier]
+                )
+        self.assertEqual(
+            recipehandler.recipes['Recipe_Ingot_C'].dependencies[0].item
+            .energy_value,
+            1.0
+        )
+
+    def test_load_in_another_process(self):
+        old_recipe = recipehandler.recipes['Recipe_Pump_C']
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=get_fork_safe_context()
+        ) as executor:
+            new_registries = executor.submit(
+                docsreload.load_registries,
+                fill_alternate_registries
+            ).result()
+        self.assertNotIn('Recipe_Alternate_C', recipehandler.recipes)
+        docs_diff = docsreload.apply_registries(new_registries)
+        self.assertEqual(
+            docs_diff.recipes.added,
+            frozenset({'Recipe_Alternate_C'})
+        )
+        self.assertIs(recipehandler.recipes['Recipe_Pump_C'], old_recipe)
+        # the new recipe refers to the objects that were kept, not the copies
+        # that came back from the other process
+        self.assertIs(
+            recipehandler.recipes['Recipe_Alternate_C'].machines[0],
+            machinehandler.machines['Build_Smelter_C']
+        )
+
+    def test_unchanged(self):
+        old_registries = tuple(dict(registry) for registry in self.registries)
+        docs_diff = docsreload.reload_registries(
+            lambda: self.fill_registries(make_registries())
+        )
+        self.assertTrue(docs_diff.is_empty())
+        for registry, old_registry in zip(self.registries, old_registries):
+            self.assertEqual(registry.keys(), old_registry.keys())
+            for class_name, obj in registry.items():
+                self.assertIs(obj, old_registry[class_name])
+
+    def test_failed_reload_keeps_registries(self):
+        old_registries = tuple(dict(registry) for registry in self.registries)
+
+        def load():
+            # fails part of the way through
+            itemhandler.items['Desc_New_C'] = Item('Desc_New_C', 'New', 0.0)
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            docsreload.reload_registries(load)
+        self.assertEqual(self.registries, old_registries)
+
+
+class TestDocsWatcher(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestDocsWatcher, self).setUp(
+            *args,
+            **kwargs
+        )
+        self.__temporary_directory = tempfile.TemporaryDirectory()
+        self.docs_path = pathlib.Path(
+            self.__temporary_directory.name
+        ).joinpath('Docs.json')
+        self.docs_path.write_text('[]', encoding='UTF-16')
+
+    def tearDown(self, *args, **kwargs):
+        super(TestDocsWatcher, self).tearDown(
+            *args,
+            **kwargs
+        )
+        self.__temporary_directory.cleanup()
+
+    def touch(self):
+        stat_result = os.stat(self.docs_path)
+        os.utime(
+            self.docs_path,
+            ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10 ** 9)
+        )
+
+    def test_poll(self):
+        watcher = docsreload.DocsWatcher([self.docs_path])
+        self.assertFalse(watcher.poll())
+        self.touch()
+        # not reported until it has stayed the same for a whole poll
+        self.assertFalse(watcher.poll())
+        self.assertTrue(watcher.poll())
+        # and keeps being reported until it is reloaded
+        self.assertTrue(watcher.poll())
+        watcher.mark_loaded()
+        self.assertFalse(watcher.poll())
+
+    def test_missing_docs(self):
+        watcher = docsreload.DocsWatcher([self.docs_path])
+        self.docs_path.unlink()
+        self.assertFalse(watcher.poll())
+        self.assertFalse(watcher.poll())
+        self.docs_path.write_text('[ ]', encoding='UTF-16')
+        self.assertFalse(watcher.poll())
+        self.assertTrue(watcher.poll())
@@ -0,0 +1,97 @@
+import io
+import json
+import unittest
+from satisfactoryobjects import docsstream
+from utils.suppressalllogs import SuppressAll
+
+
+class TestIterNativeClassBlocks(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestIterNativeClassBlocks, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        docsstream.toplevel_logger.addFilter(self.__log_filter_obj)
+
+    def tearDown(self, *args, **kwargs):
+        super(TestIterNativeClassBlocks, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # re-enable logging for the module under test
+        docsstream.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    # cut down from the format of the real docs, with some awkward strings
+    docs = [
+        {
+            "NativeClass": "/Script/CoreUObject.Class'/Script/FactoryGame.FGItemDescriptor'",
+            "Classes": [
+                {
+                    "ClassName": "Desc_Test_C",
+                    "mDisplayName": "Test \"item\" with [brackets] and {braces}",
+                    "mDescription": "Escaped backslash \\ and unicode é",
+                    "mEnergyValue": "0.000000",
+                    "mForm": "RF_SOLID"
+                }
+            ]
+        },
+        {
+            "NativeClass": "/Script/CoreUObject.Class'/Script/FactoryGame.FGBuildableWall'",
+            "Classes": [
+                {"ClassName": "Build_Wall_C", "mDisplayName": "Wall ]}\\\"", "mNested": [[{}], []]},
+                # looks like the start of the next block
+                {"ClassName": "NativeClass", "NativeClass": {"NativeClass": "NativeClass"}}
+            ]
+        },
+        {
+            "Classes": [],
+            "NativeClass": "/Script/CoreUObject.Class'/Script/FactoryGame.FGRecipe'"
+        },
+        {
+            "NativeClass": "/Script/CoreUObject.Class'/Script/FactoryGame.FGRecipe'",
+            "Classes": [{"ClassName": "Recipe_Test_C", "mIngredients": "((ItemClass=\"/Game/Desc_Test.Desc_Test_C\",Amount=1))"}]
+        }
+    ]
+
+    def read(self, native_classes, chunk_size) -> list[dict]:
+        return list(
+            docsstream.iter_native_class_blocks(
+                io.StringIO(json.dumps(self.docs, indent='\t')),
+                native_classes,
+                chunk_size
+            )
+        )
+
+    def test_reads_everything(self):
+        for chunk_size in (1, 7, docsstream.DEFAULT_CHUNK_SIZE):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.read(None, chunk_size), self.docs)
+
+    def test_skips_unwanted_blocks(self):
+        wanted = {
+            "/Script/CoreUObject.Class'/Script/FactoryGame.FGItemDescriptor'",
+            "/Script/CoreUObject.Class'/Script/FactoryGame.FGRecipe'"
+        }
+        for chunk_size in (1, 7, docsstream.DEFAULT_CHUNK_SIZE):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    self.read(wanted, chunk_size),
+                    [self.docs[0], self.docs[2], self.docs[3]]
+                )
+
+    def test_empty_docs(self):
+        self.assertEqual(
+            list(docsstream.iter_native_class_blocks(io.StringIO(' [ ] '))),
+            []
+        )
+
+    def test_truncated_docs_errors(self):
+        with self.assertRaises(ValueError):
+            list(
+                docsstream.iter_native_class_blocks(
+                    io.StringIO(json.dumps(self.docs)[:-20]),
+                    set()
+                )
+            )
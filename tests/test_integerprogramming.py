@@ -0,0 +1,172 @@
+import multiprocessing
+import unittest
+from fractions import Fraction
+from itertools import product
+from optimisationsolver import simplex, integerprogramming
+from utils.suppressalllogs import SuppressAll
+from utils.variabletypetags import VariableType, NamedTypeTag
+
+
+def solve_and_send(connection, tableau, workers):
+    try:
+        connection.send(
+            integerprogramming.solve_integer(tableau, workers=workers)
+            .objective_value
+        )
+    except Exception as e:
+        connection.send(e)
+
+
+class TestSolveInteger(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestSolveInteger, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        integerprogramming.toplevel_logger.addFilter(self.__log_filter_obj)
+
+    def tearDown(self, *args, **kwargs):
+        super(TestSolveInteger, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # re-enable logging for the module under test
+        integerprogramming.toplevel_logger.removeFilter(
+            self.__log_filter_obj
+        )
+
+    def tableau_0(self) -> simplex.Tableau:
+        # the relaxation has its optimum at x=3, y=3/2 (objective 21), but
+        # the best whole-number solution is x=4, y=0 (objective 20)
+        return simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable('x', 6), simplex.Variable('y', 4)], 24),
+                simplex.Inequality([simplex.Variable('x', 1), simplex.Variable('y', 2)], 6),
+                simplex.ObjectiveEquation([simplex.Variable('x', -5), simplex.Variable('y', -4)], 0, 1)
+            ]
+        )
+
+    def tableau_1(self) -> simplex.Tableau:
+        # three machines sharing two resources, with objective coefficients
+        # picked so that the relaxation is fractional
+        return simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable(0, 3), simplex.Variable(1, 5), simplex.Variable(2, 7)], 37),
+                simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 2), simplex.Variable(2, 3)], 29),
+                simplex.ObjectiveEquation([simplex.Variable(0, -7), simplex.Variable(1, -9), simplex.Variable(2, -13)], 0, 1)
+            ]
+        )
+
+    def brute_force_1(self) -> Fraction:
+        return max(
+            7 * a + 9 * b + 13 * c
+            for a, b, c
+            in product(range(13), repeat=3)
+            if 3 * a + 5 * b + 7 * c <= 37 and 4 * a + 2 * b + 3 * c <= 29
+        )
+
+    def test_whole_number_solution(self):
+        solution = integerprogramming.solve_integer(self.tableau_0(), workers=0)
+        self.assertTrue(solution.proven_optimal)
+        self.assertEqual(solution.objective_value, 20)
+        self.assertEqual(solution.gap, 0)
+        values = {
+            variable.name: value
+            for variable, value
+            in solution.variable_values
+            if variable.type == VariableType.NORMAL
+        }
+        self.assertEqual(values.get('x', 0), 4)
+        self.assertEqual(values.get('y', 0), 0)
+
+    def test_only_integer_variables_are_rounded(self):
+        # with only y required to be whole, x can make up the difference
+        # (y=0, x=4 gives 20, y=1, x=10/3 gives 62/3 and y=2, x=2 gives 18,
+        # so y=1 is best)
+        solution = integerprogramming.solve_integer(
+            self.tableau_0(),
+            integer_variables=['y'],
+            workers=0
+        )
+        self.assertEqual(solution.objective_value, Fraction(62, 3))
+        self.assertIn(
+            (NamedTypeTag(VariableType.NORMAL, 'y'), 1),
+            solution.variable_values
+        )
+
+    def test_matches_brute_force(self):
+        for heuristic_frequency in (1, 1000):
+            with self.subTest(heuristic_frequency=heuristic_frequency):
+                solution = integerprogramming.solve_integer(
+                    self.tableau_1(),
+                    workers=0,
+                    heuristic_frequency=heuristic_frequency
+                )
+                self.assertEqual(solution.objective_value, self.brute_force_1())
+
+    def test_process_pool(self):
+        progress_reports = list()
+        solution = integerprogramming.solve_integer(
+            self.tableau_1(),
+            workers=2,
+            progress=progress_reports.append
+        )
+        self.assertEqual(solution.objective_value, self.brute_force_1())
+        self.assertEqual(
+            progress_reports[-1].nodes_evaluated,
+            solution.nodes_evaluated
+        )
+        self.assertEqual(progress_reports[-1].gap, 0)
+
+    def test_daemonic_process(self):
+        # the GUI solves in a daemonic process, which can not start a process
+        # pool, so the search has to be run in that process itself
+        for workers, expected in ((0, self.brute_force_1()), (2, None)):
+            with self.subTest(workers=workers):
+                connection, child_connection = multiprocessing.Pipe(
+                    duplex=False
+                )
+                process = multiprocessing.Process(
+                    target=solve_and_send,
+                    args=(child_connection, self.tableau_1(), workers),
+                    daemon=True
+                )
+                process.start()
+                child_connection.close()
+                result = connection.recv()
+                process.join()
+                if expected is None:
+                    self.assertIsInstance(result, AssertionError)
+                    self.assertIn('daemonic', str(result))
+                else:
+                    self.assertEqual(result, expected)
+
+    def test_stopped_early_reports_gap(self):
+        solution = integerprogramming.solve_integer(
+            self.tableau_1(),
+            workers=0,
+            max_nodes=1
+        )
+        self.assertFalse(solution.proven_optimal)
+        self.assertEqual(solution.nodes_evaluated, 1)
+        # the root node runs the heuristic, so there is an incumbent
+        self.assertIsNotNone(solution.objective_value)
+        self.assertLessEqual(solution.objective_value, self.brute_force_1())
+        self.assertGreaterEqual(solution.best_bound, self.brute_force_1())
+
+    def test_infeasible(self):
+        # 2x = 1 has no whole-number solution
+        t = simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable('x', 2)], 1),
+                simplex.Inequality([simplex.Variable('x', -2)], -1),
+                simplex.ObjectiveEquation([simplex.Variable('x', -1)], 0, 1)
+            ]
+        )
+        t.dual_pivot_until_done()
+        solution = integerprogramming.solve_integer(t, workers=0)
+        self.assertTrue(solution.proven_optimal)
+        self.assertIsNone(solution.objective_value)
+        self.assertIsNone(solution.best_bound)
@@ -19,7 +19,7 @@ class TestItemHandler(unittest.TestCase):
             **kwargs
         )
         # clear up global state
-        itemhandler.items = dict()
+        itemhandler.items.clear()
         # re-enable logging for the module under test
         items.toplevel_logger.removeFilter(self.__log_filter_obj)
 
@@ -1,5 +1,10 @@
 import unittest
-from satisfactoryobjects import nativeclasses
+from satisfactoryobjects import (
+    nativeclasses,
+    itemhandler,
+    machinehandler,
+    recipehandler
+)
 from utils.suppressalllogs import SuppressAll
 
 
@@ -94,6 +99,22 @@ class TestDenamespaceSatisfactoryClassname(unittest.TestCase):
             "Desc_IronIngot_C"
         )
 
+    def test_memoised(self):
+        namespaced_classname = (
+            "/Game/FactoryGame/Buildable/Factory/SmelterMk1/"
+            "Build_SmelterMk1.Build_SmelterMk1_C"
+        )
+        nativeclasses.denamespace_satisfactory_classname.cache_clear()
+        for _ in range(3):
+            self.assertEqual(
+                nativeclasses.denamespace_satisfactory_classname(
+                    namespaced_classname
+                ),
+                "Build_SmelterMk1_C"
+            )
+        cache_info = nativeclasses.denamespace_satisfactory_classname.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses), (2, 1))
+
     def test_with_release_one_point_zero_parameters(self):
         # the order of the quote types was reversed in the release 1.0
         # docs.json for whatever reason
@@ -105,3 +126,156 @@ class TestDenamespaceSatisfactoryClassname(unittest.TestCase):
             ),
             "Desc_IronIngot_C"
         )
+
+
+class TestSatisfactoryNativeClassHandler(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestSatisfactoryNativeClassHandler, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        nativeclasses.toplevel_logger.addFilter(self.__log_filter_obj)
+        # register test handlers in place of whatever was registered
+        self.__old_handlers = dict(
+            nativeclasses.SatisfactoryNativeClassHandler.handlers
+        )
+        nativeclasses.SatisfactoryNativeClassHandler.handlers.clear()
+        self.__old_threshold = nativeclasses.PARALLEL_HANDLING_THRESHOLD
+        self.__old_chunk_size = nativeclasses.HANDLING_CHUNK_SIZE
+        nativeclasses.SatisfactoryNativeClassHandler(
+            "Test.Recipe",
+            recipehandler.handler,
+            defer_pass=10,
+            registry_name='recipes'
+        )
+        nativeclasses.SatisfactoryNativeClassHandler(
+            "Test.Machine",
+            machinehandler.fixed_power_machine_handler,
+            registry_name='machines'
+        )
+        nativeclasses.SatisfactoryNativeClassHandler(
+            "Test.Item",
+            itemhandler.handler,
+            registry_name='items'
+        )
+
+    def tearDown(self, *args, **kwargs):
+        super(TestSatisfactoryNativeClassHandler, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # clear up global state
+        nativeclasses.SatisfactoryNativeClassHandler.handlers.clear()
+        nativeclasses.SatisfactoryNativeClassHandler.handlers.update(
+            self.__old_handlers
+        )
+        nativeclasses.PARALLEL_HANDLING_THRESHOLD = self.__old_threshold
+        nativeclasses.HANDLING_CHUNK_SIZE = self.__old_chunk_size
+        self.clear_registries()
+        # re-enable logging for the module under test
+        nativeclasses.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def clear_registries(self):
+        itemhandler.items.clear()
+        machinehandler.machines.clear()
+        recipehandler.recipes.clear()
+
+    def docs(self) -> list[dict]:
+        def item_reference(item_index: int) -> str:
+            return (
+                "ItemClass=\"/Script/Engine.BlueprintGeneratedClass'/Game/"
+                f"Desc_Part{item_index}.Desc_Part{item_index}_C'\""
+            )
+
+        return [
+            {
+                "NativeClass": "Test.Recipe",
+                "Classes": [
+                    {
+                        "ClassName": f"Recipe_{recipe_index}_C",
+                        "FullName": f"Recipe_{recipe_index}_C",
+                        "mDisplayName": f"Recipe {recipe_index}",
+                        "mIngredients": (
+                            f"(({item_reference(recipe_index % 5)},"
+                            f"Amount={recipe_index + 1}))"
+                        ),
+                        "mProduct": (
+                            f"(({item_reference((recipe_index + 1) % 5)},"
+                            "Amount=1))"
+                        ),
+                        "mManufactoringDuration": "4.000000",
+                        "mProducedIn": (
+                            '("/Game/Build_Machine.Build_Machine_C")'
+                        ),
+                        "mVariablePowerConsumptionConstant": "0.000000",
+                        "mVariablePowerConsumptionFactor": "1.000000"
+                    }
+                    for recipe_index
+                    in range(12)
+                ]
+            },
+            {
+                "NativeClass": "Test.Item",
+                "Classes": [
+                    {
+                        "ClassName": f"Desc_Part{item_index}_C",
+                        "mDisplayName": f"Part {item_index}",
+                        "mEnergyValue": "0.000000",
+                        "mForm": "RF_LIQUID" if item_index == 0 else "RF_SOLID"
+                    }
+                    for item_index
+                    in range(5)
+                ]
+            },
+            {
+                "NativeClass": "Test.Machine",
+                "Classes": [
+                    {
+                        "ClassName": "Build_Machine_C",
+                        "mDisplayName": "Machine",
+                        "mPowerConsumption": "4.000000"
+                    }
+                ]
+            }
+        ]
+
+    def handle(self, workers: int) -> tuple[dict, dict, dict]:
+        for obj in self.docs():
+            nativeclasses.SatisfactoryNativeClassHandler.enqueue_handle(obj)
+        nativeclasses.SatisfactoryNativeClassHandler.handle(workers)
+        registries = (
+            dict(itemhandler.items),
+            dict(machinehandler.machines),
+            dict(recipehandler.recipes)
+        )
+        self.clear_registries()
+        return registries
+
+    def test_handles_in_defer_pass_order(self):
+        items, machines, recipes = self.handle(0)
+        self.assertEqual(len(items), 5)
+        self.assertEqual(len(machines), 1)
+        self.assertEqual(len(recipes), 12)
+        self.assertIs(
+            recipes['Recipe_0_C'].dependencies[0].item,
+            items['Desc_Part0_C']
+        )
+
+    def test_worker_processes_match_this_process(self):
+        expected = self.handle(0)
+        # small enough chunks that every defer pass is split up
+        nativeclasses.PARALLEL_HANDLING_THRESHOLD = 1
+        nativeclasses.HANDLING_CHUNK_SIZE = 5
+        items, machines, recipes = self.handle(2)
+        self.assertEqual((items, machines, recipes), expected)
+        self.assertEqual(list(recipes), list(expected[2]))
+        # the recipes still share their items and machines with the other
+        # registries, even though they were made in another process
+        for recipe in recipes.values():
+            self.assertIs(
+                recipe.dependencies[0].item,
+                items[recipe.dependencies[0].item.internal_class_identifier]
+            )
+            self.assertIs(recipe.machines[0], machines['Build_Machine_C'])
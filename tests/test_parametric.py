@@ -0,0 +1,101 @@
+import unittest
+from fractions import Fraction
+from optimisationsolver import simplex, parametric
+from utils.suppressalllogs import SuppressAll
+from utils.variabletypetags import VariableType, NamedTypeTag
+
+
+class TestParametricRhsSweep(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestParametricRhsSweep, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        parametric.toplevel_logger.addFilter(self.__log_filter_obj)
+
+    def tearDown(self, *args, **kwargs):
+        super(TestParametricRhsSweep, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # re-enable logging for the module under test
+        parametric.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def tableau_0(self) -> simplex.Tableau:
+        # same problem as tableau_0 in test_simplex.py, but with ids on the
+        # constraints
+        return simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1)], 40, 'a'),
+                simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 1)], 100, 'b'),
+                simplex.ObjectiveEquation([simplex.Variable(0, -20), simplex.Variable(1, -10)], 0, 1)
+            ]
+        )
+
+    def test_sweep_up_finds_breakpoint(self):
+        # at b=100, the optimum is x0=20, x1=20 (objective 600).  as b
+        # increases, x0 increases and x1 decreases until x1 reaches zero at
+        # b=160 (x0=40, objective 800).  past that, x0 is limited by the
+        # first constraint, so the objective stays at 800.
+        sweep = parametric.parametric_rhs_sweep(self.tableau_0(), 1, 200)
+        self.assertTrue(sweep.reached_end)
+        self.assertEqual(sweep.constraint_id, 'b')
+        self.assertEqual(
+            [(bp.rhs, bp.objective_value) for bp in sweep.breakpoints],
+            [(100, 600), (160, 800), (200, 800)]
+        )
+        self.assertEqual(
+            sweep.breakpoints[1].leaving_variable,
+            NamedTypeTag(VariableType.NORMAL, 1)
+        )
+        # slack for constraint b enters, so it is no longer binding
+        self.assertEqual(
+            sweep.breakpoints[1].entering_variable,
+            NamedTypeTag(VariableType.SLACK, 1)
+        )
+        self.assertIsNone(sweep.breakpoints[1].binding_constraint)
+
+    def test_sweep_down_until_infeasible(self):
+        # decreasing b, x1 drops to zero at b=40 and then the problem becomes
+        # infeasible once b would go below zero
+        sweep = parametric.parametric_rhs_sweep(self.tableau_0(), 1, -10)
+        self.assertFalse(sweep.reached_end)
+        self.assertEqual(
+            [(bp.rhs, bp.objective_value) for bp in sweep.breakpoints],
+            [(100, 600), (40, 400), (0, 0)]
+        )
+
+    def test_sweep_reports_binding_constraint(self):
+        # starting from a=0 (so nothing can be made), increasing a means that
+        # constraint b becomes binding at a=25 (x0=25 uses all of b).  after
+        # that, x1 starts to be used and the objective increases at a slower
+        # rate of 20/3 per unit of a.
+        t = self.tableau_0()
+        t._shift_rhs(0, -40)
+        sweep = parametric.parametric_rhs_sweep(t, 0, 50)
+        self.assertEqual(
+            [(bp.rhs, bp.objective_value) for bp in sweep.breakpoints],
+            [(0, 0), (25, 500), (50, Fraction(2000, 3))]
+        )
+        self.assertEqual(sweep.breakpoints[1].binding_constraint, 'b')
+
+    def test_sweep_matches_resolving(self):
+        # the objective at the end of a sweep should be the same as solving
+        # the problem from scratch with the final right-hand-side
+        t = self.tableau_0()
+        parametric.parametric_rhs_sweep(t, 0, Fraction(75, 2))
+        resolved = simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1)], Fraction(75, 2)),
+                simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 1)], 100),
+                simplex.ObjectiveEquation([simplex.Variable(0, -20), simplex.Variable(1, -10)], 0, 1)
+            ]
+        )
+        resolved.pivot_until_done()
+        self.assertEqual(t.objective_value, resolved.objective_value)
+        self.assertCountEqual(
+            t.get_variable_values(),
+            resolved.get_variable_values()
+        )
@@ -0,0 +1,72 @@
+import unittest
+from fractions import Fraction
+from optimisationsolver.anytime import SolveLimits
+from optimisationsolver.simplex import PivotRule
+from headless import batch, portfolio, problembuilder, solving
+from headless.problemspec import ProblemSpec, ProblemSpecError
+from utils.suppressalllogs import SuppressAll
+from ingotregistries import clear_registries, fill_ingot_registries
+
+
+class TestSolvePortfolio(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestSolvePortfolio, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the modules under test
+        self.__log_filter_obj = SuppressAll()
+        for module in (batch, portfolio, problembuilder, solving):
+            module.toplevel_logger.addFilter(self.__log_filter_obj)
+
+        fill_ingot_registries()
+        self.spec = ProblemSpec(
+            (('Desc_Ingot_C', 1.0),),
+            (('Desc_Ore_C', 45.0),)
+        )
+
+    def tearDown(self, *args, **kwargs):
+        super(TestSolvePortfolio, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # clear up global state
+        clear_registries()
+        # re-enable logging for the modules under test
+        for module in (batch, portfolio, problembuilder, solving):
+            module.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def test_solve(self):
+        result = portfolio.solve_portfolio(self.spec)
+        self.assertIn(result.winner, portfolio.DEFAULT_PIVOT_RULES)
+        self.assertTrue(result.solution.optimal)
+        self.assertEqual(result.solution.objective_value, 45)
+        self.assertEqual(
+            result.solution.machines,
+            {'Recipe_Ingot_C': Fraction(3, 2)}
+        )
+
+    def test_pivot_rules_agree(self):
+        for pivot_rule in PivotRule:
+            with self.subTest(pivot_rule=pivot_rule):
+                solution = solving.solve_problem(
+                    self.spec,
+                    pivot_rule=pivot_rule
+                )
+                self.assertTrue(solution.optimal)
+                self.assertEqual(solution.objective_value, 45)
+
+    def test_not_optimal(self):
+        # no pivot rule can finish, so the first solution is given anyway
+        result = portfolio.solve_portfolio(
+            self.spec,
+            limits=SolveLimits(max_pivots=0)
+        )
+        self.assertFalse(result.solution.optimal)
+        self.assertEqual(result.solution.objective_value, 0)
+
+    def test_invalid_problem(self):
+        with self.assertRaises(ProblemSpecError):
+            portfolio.solve_portfolio(
+                ProblemSpec((('Desc_Nothing_C', 1.0),))
+            )
@@ -0,0 +1,99 @@
+import unittest
+from fractions import Fraction
+from optimisationsolver import simplex, pricing
+from utils.suppressalllogs import SuppressAll
+
+
+class TestCandidatePricing(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestCandidatePricing, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        pricing.toplevel_logger.addFilter(self.__log_filter_obj)
+
+    def tearDown(self, *args, **kwargs):
+        super(TestCandidatePricing, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # re-enable logging for the module under test
+        pricing.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def problem_0(self) -> list[simplex.Inequality]:
+        # same problem as tableau_0 in test_simplex.py, with two extra
+        # candidate variables: 2 is worth using (it is cheap in the binding
+        # constraint b) and 3 is not
+        return [
+            simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1), simplex.Variable(2, 1), simplex.Variable(3, 1)], 40),
+            simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 1), simplex.Variable(2, 1), simplex.Variable(3, 4)], 100),
+            simplex.ObjectiveEquation([simplex.Variable(0, -20), simplex.Variable(1, -10), simplex.Variable(2, -15), simplex.Variable(3, -10)], 0, 1)
+        ]
+
+    def test_extract_columns(self):
+        problem = self.problem_0()
+        columns = pricing.extract_columns(problem, [2, 3])
+        self.assertEqual(columns[0].variable_id, 2)
+        self.assertEqual(columns[0].coefficients, {0: 1, 1: 1})
+        self.assertEqual(columns[0].objective_coefficient, 15)
+        self.assertEqual(columns[1].coefficients, {0: 1, 1: 4})
+        self.assertEqual(columns[1].objective_coefficient, 10)
+        # the candidates should no longer be in the problem
+        for inequality in problem:
+            self.assertNotIn(2, inequality._lhs)
+            self.assertNotIn(3, inequality._lhs)
+
+    def test_price_columns(self):
+        problem = self.problem_0()
+        columns = pricing.extract_columns(problem, [3, 2])
+        t = simplex.Tableau(problem)
+        t.pivot_until_done()
+        # the shadow prices are (20/3, 10/3), so candidate 2 improves the
+        # objective by 15 - 20/3 - 10/3 = 5 per unit and candidate 3 makes it
+        # worse by 10 - 20/3 - 40/3 = -10 per unit
+        priced = pricing.price_columns(t, columns)
+        self.assertEqual(
+            [(p.column.variable_id, p.improvement_per_unit) for p in priced],
+            [(2, 5), (3, -10)]
+        )
+
+    def test_rank_candidates_matches_resolving(self):
+        problem = self.problem_0()
+        columns = pricing.extract_columns(problem, [2, 3])
+        t = simplex.Tableau(problem)
+        ranking = pricing.rank_candidates(t, columns)
+        self.assertEqual(ranking.objective_value, 600)
+        # the exact gain should be the same as solving the problem from
+        # scratch with the candidate included
+        resolved = simplex.Tableau([
+            simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1), simplex.Variable(2, 1)], 40),
+            simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 1), simplex.Variable(2, 1)], 100),
+            simplex.ObjectiveEquation([simplex.Variable(0, -20), simplex.Variable(1, -10), simplex.Variable(2, -15)], 0, 1)
+        ])
+        resolved.pivot_until_done()
+        best = ranking.ranking[0]
+        self.assertEqual(best.column.variable_id, 2)
+        self.assertEqual(
+            ranking.objective_value + best.exact_gain,
+            resolved.objective_value
+        )
+        self.assertEqual(best.value, 20)
+        # a candidate that does not improve the objective is known not to be
+        # used without re-solving
+        self.assertEqual(ranking.ranking[1].exact_gain, 0)
+        self.assertEqual(ranking.ranking[1].value, 0)
+        # the original tableau is left at its solution without the candidates
+        self.assertEqual(t.objective_value, 600)
+
+    def test_rank_candidates_top_k(self):
+        problem = self.problem_0()
+        columns = pricing.extract_columns(problem, [2, 3])
+        ranking = pricing.rank_candidates(
+            simplex.Tableau(problem),
+            columns,
+            top_k=0
+        )
+        self.assertEqual(ranking.ranking[0].improvement_per_unit, 5)
+        self.assertIsNone(ranking.ranking[0].exact_gain)
@@ -0,0 +1,94 @@
+import pathlib
+import tempfile
+import unittest
+from headless.problemspec import (
+    ProblemSpec,
+    ProblemSpecError,
+    load_problem_spec,
+    problem_spec_from_dict,
+    problem_spec_to_dict
+)
+
+
+class TestProblemSpec(unittest.TestCase):
+    def test_from_dict(self):
+        self.assertEqual(
+            problem_spec_from_dict({
+                'targets': {'Desc_IronPlate_C': 1, 'Desc_IronRod_C': 0.5},
+                'availability': {'Desc_OreIron_C': 120},
+                'power_usage_weight': -0.1,
+                'disabled_recipes': ['Recipe_A_C', 'Recipe_B_C'],
+                'whole_machines': True
+            }),
+            ProblemSpec(
+                (('Desc_IronPlate_C', 1.0), ('Desc_IronRod_C', 0.5)),
+                (('Desc_OreIron_C', 120.0),),
+                -0.1,
+                frozenset({'Recipe_A_C', 'Recipe_B_C'}),
+                True
+            )
+        )
+
+    def test_to_dict(self):
+        spec = ProblemSpec(
+            (('Desc_IronPlate_C', 1.0), ('Desc_IronRod_C', 0.5)),
+            (('Desc_OreIron_C', 120.0),),
+            -0.1,
+            frozenset({'Recipe_A_C', 'Recipe_B_C'}),
+            True
+        )
+        self.assertEqual(
+            problem_spec_from_dict(problem_spec_to_dict(spec)),
+            spec
+        )
+
+    def test_defaults(self):
+        self.assertEqual(
+            problem_spec_from_dict({'targets': {'Desc_IronPlate_C': 1}}),
+            ProblemSpec((('Desc_IronPlate_C', 1.0),))
+        )
+
+    def test_invalid(self):
+        for data in (
+            [],
+            {},
+            {'targets': {}},
+            {'targets': ['Desc_IronPlate_C']},
+            {'targets': {'Desc_IronPlate_C': '1'}},
+            {'targets': {'Desc_IronPlate_C': True}},
+            {'targets': {'Desc_IronPlate_C': 1}, 'power_usage_weight': 1},
+            {'targets': {'Desc_IronPlate_C': 1}, 'disabled_recipes': 'A'},
+            {'targets': {'Desc_IronPlate_C': 1}, 'whole_machines': 1},
+            {'targets': {'Desc_IronPlate_C': 1}, 'target': {}}
+        ):
+            with self.subTest(data=data):
+                with self.assertRaises(ProblemSpecError):
+                    problem_spec_from_dict(data)
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = pathlib.Path(temporary_directory)
+            toml_path = directory.joinpath('problem.toml')
+            toml_path.write_text(
+                'power_usage_weight = -1\n'
+                '[targets]\n'
+                'Desc_IronPlate_C = 2\n'
+                '[availability]\n'
+                'Desc_OreIron_C = 60\n',
+                encoding='utf-8'
+            )
+            json_path = directory.joinpath('problem.json')
+            json_path.write_text(
+                '{"power_usage_weight": -1, '
+                '"targets": {"Desc_IronPlate_C": 2}, '
+                '"availability": {"Desc_OreIron_C": 60}}',
+                encoding='utf-8'
+            )
+            self.assertEqual(
+                load_problem_spec(toml_path),
+                load_problem_spec(json_path)
+            )
+
+            json_path.write_text('{"targets": ', encoding='utf-8')
+            with self.assertRaises(ProblemSpecError):
+                load_problem_spec(json_path)
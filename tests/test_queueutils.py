@@ -0,0 +1,45 @@
+import unittest
+from utils.queueutils import BucketedPriorityQueue
+
+
+class TestBucketedPriorityQueue(unittest.TestCase):
+    def test_drains_in_priority_order(self):
+        queue = BucketedPriorityQueue()
+        for priority, item in ((10, 'a'), (0, 'b'), (5, 'c'), (0, 'd')):
+            queue.push(priority, item)
+        self.assertEqual(len(queue), 4)
+        self.assertEqual(list(queue.drain()), ['b', 'd', 'c', 'a'])
+        self.assertEqual(len(queue), 0)
+
+    def test_same_priority_is_first_in_first_out(self):
+        queue = BucketedPriorityQueue()
+        for item in range(100000):
+            queue.push(item % 2, item)
+        self.assertEqual(
+            list(queue.drain()),
+            list(range(0, 100000, 2)) + list(range(1, 100000, 2))
+        )
+
+    def test_push_while_draining(self):
+        queue = BucketedPriorityQueue()
+        queue.push(1, 'a')
+        queue.push(2, 'b')
+        drained = list()
+        for item in queue.drain():
+            drained.append(item)
+            if item == 'a':
+                # same, lower and higher priority than the current bucket
+                queue.push(1, 'c')
+                queue.push(0, 'd')
+                queue.push(3, 'e')
+        self.assertEqual(drained, ['a', 'c', 'd', 'b', 'e'])
+
+    def test_drain_buckets(self):
+        queue = BucketedPriorityQueue()
+        for priority, item in ((10, 'a'), (0, 'b'), (10, 'c')):
+            queue.push(priority, item)
+        self.assertEqual(
+            [(priority, list(bucket)) for priority, bucket in queue.drain_buckets()],
+            [(0, ['b']), (10, ['a', 'c'])]
+        )
+        self.assertEqual(len(queue), 0)
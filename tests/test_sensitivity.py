@@ -0,0 +1,96 @@
+import unittest
+from fractions import Fraction
+from optimisationsolver import simplex, sensitivity
+from utils.variabletypetags import VariableType, NamedTypeTag
+
+
+class TestSensitivityReport(unittest.TestCase):
+    # sensitivity.py does not have logging, so no need to enable or disable it
+    def tableau_0(self) -> simplex.Tableau:
+        # same problem as tableau_0 in test_simplex.py, but with ids on the
+        # constraints
+        return simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1)], 40, 'a'),
+                simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 1)], 100, 'b'),
+                simplex.ObjectiveEquation([simplex.Variable(0, -20), simplex.Variable(1, -10)], 0, 1)
+            ]
+        )
+
+    def test_shadow_prices_and_rhs_ranging(self):
+        t = self.tableau_0()
+        t.pivot_until_done()
+        report = sensitivity.sensitivity_report(t)
+        self.assertEqual(report.objective_value, 600)
+        # both constraints are binding at the optimum (20, 20).  the ranges
+        # are where the other constraint stops being the limit on the corner
+        # of the feasible region.
+        self.assertEqual(
+            report.constraints,
+            [
+                sensitivity.ConstraintSensitivity(
+                    'a', 40, Fraction(20, 3), 0, 25, 100
+                ),
+                sensitivity.ConstraintSensitivity(
+                    'b', 100, Fraction(10, 3), 0, 40, 160
+                )
+            ]
+        )
+
+    def test_objective_coefficient_ranging(self):
+        t = self.tableau_0()
+        t.pivot_until_done()
+        report = sensitivity.sensitivity_report(t)
+        # the corner (20, 20) stays optimal as long as the ratio of the
+        # objective coefficients stays between the gradients of the two
+        # constraints (1 and 4)
+        self.assertEqual(
+            report.variables,
+            [
+                sensitivity.VariableSensitivity(
+                    NamedTypeTag(VariableType.NORMAL, 0), 20, 0, 20, 10, 40
+                ),
+                sensitivity.VariableSensitivity(
+                    NamedTypeTag(VariableType.NORMAL, 1), 20, 0, 10, 5, 20
+                )
+            ]
+        )
+
+    def test_non_basic_variable_and_unbounded_ranges(self):
+        # y is not worth making (it uses 3 of the limit for 1 objective, x
+        # uses 1 for 1) so it has a reduced cost of 2, and its coefficient can
+        # increase by up to that much before it would be used
+        t = simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable('x', 1), simplex.Variable('y', 3)], 10, 'limit'),
+                simplex.Inequality([simplex.Variable('x', 1)], 20, 'loose'),
+                simplex.ObjectiveEquation([simplex.Variable('x', -1), simplex.Variable('y', -1)], 0, 1)
+            ]
+        )
+        t.pivot_until_done()
+        report = sensitivity.sensitivity_report(t)
+        self.assertEqual(
+            report.constraints,
+            [
+                sensitivity.ConstraintSensitivity(
+                    'limit', 10, 1, 0, 0, 20
+                ),
+                # non-binding constraint: no shadow price, and can be
+                # loosened forever without changing anything
+                sensitivity.ConstraintSensitivity(
+                    'loose', 20, 0, 10, 10, None
+                )
+            ]
+        )
+        self.assertEqual(
+            report.variables,
+            [
+                sensitivity.VariableSensitivity(
+                    NamedTypeTag(VariableType.NORMAL, 'x'), 10, 0, 1,
+                    Fraction(1, 3), None
+                ),
+                sensitivity.VariableSensitivity(
+                    NamedTypeTag(VariableType.NORMAL, 'y'), 0, 2, 1, None, 3
+                )
+            ]
+        )
@@ -0,0 +1,274 @@
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+import urllib.error
+import urllib.request
+from headless import batch, problembuilder, server, solverprocess, solving
+from satisfactoryobjects import itemhandler, machinehandler, recipehandler
+from satisfactoryobjects.items import Item
+from satisfactoryobjects.recipes import Recipe, RecipeResource
+from utils.suppressalllogs import SuppressAll
+from ingotregistries import clear_registries, fill_ingot_registries
+
+# a problem that takes more than a second to solve, for timing out and
+# cancelling
+SLOW_PROBLEM = {
+    'targets': {f'Desc_Part{part_index}_C': 1 for part_index in range(1, 20)},
+    'availability': {'Desc_Part0_C': 1000}
+}
+
+
+class TestSolveServer(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestSolveServer, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the modules under test
+        self.__log_filter_obj = SuppressAll()
+        for module in (batch, problembuilder, server, solverprocess, solving):
+            module.toplevel_logger.addFilter(self.__log_filter_obj)
+
+        fill_ingot_registries()
+        smelter = machinehandler.machines['Build_Smelter_C']
+        # parts that can each be made from two of the parts before them, for
+        # SLOW_PROBLEM
+        parts = [
+            Item(f'Desc_Part{part_index}_C', f'Part {part_index}', 0.0)
+            for part_index
+            in range(20)
+        ]
+        for part in parts:
+            itemhandler.items[part.internal_class_identifier] = part
+        for part_index in range(1, 20):
+            for ingredient_index in (part_index - 1, part_index // 2):
+                recipe_class_name = (
+                    f'Recipe_Part{part_index}From{ingredient_index}_C'
+                )
+                recipehandler.recipes[recipe_class_name] = Recipe(
+                    recipe_class_name,
+                    f'Part {part_index}',
+                    [
+                        RecipeResource(
+                            parts[ingredient_index],
+                            1 + (part_index + ingredient_index) % 3
+                        )
+                    ],
+                    [RecipeResource(parts[part_index], 1)],
+                    [smelter],
+                    2.0
+                )
+
+        self.server = server.SolveServer(0, workers=1, max_pending=2)
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever
+        )
+        self.server_thread.start()
+        host, port = self.server.server_address
+        self.url = f'http://{host}:{port}'
+
+    def tearDown(self, *args, **kwargs):
+        super(TestSolveServer, self).tearDown(
+            *args,
+            **kwargs
+        )
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+        # clear up global state
+        clear_registries()
+        # re-enable logging for the modules under test
+        for module in (batch, problembuilder, server, solverprocess, solving):
+            module.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def request(self, path: str, body: dict | None = None) -> tuple[int, dict]:
+        '''POST body to path (or GET it if there is no body), giving the
+        status and the JSON that was responded with'''
+        http_request = urllib.request.Request(
+            self.url + path,
+            None if body is None else json.dumps(body).encode('utf-8'),
+            {'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(http_request) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    def wait_for_busy_worker(self):
+        for _ in range(200):
+            if self.request('/metrics')[1]['busy_workers'] == 1:
+                return
+            time.sleep(0.01)
+        self.fail('Solve never started')
+
+    def test_solve(self):
+        status, response = self.request(
+            '/solve',
+            {
+                'problem': {
+                    'targets': {'Desc_Ingot_C': 1},
+                    'availability': {'Desc_Ore_C': 45}
+                },
+                'exact': True,
+                'request_id': 'ingots'
+            }
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(response['request_id'], 'ingots')
+        self.assertEqual(response['status'], 'solved')
+        self.assertEqual(response['solution']['objective_value'], '45')
+        self.assertEqual(
+            response['solution']['machines'],
+            {'Recipe_Ingot_C': '3/2'}
+        )
+
+        status, metrics = self.request('/metrics')
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics['requests']['solved'], 1)
+        self.assertEqual(metrics['queue_depth'], 0)
+        self.assertEqual(metrics['latency_seconds']['count'], 1)
+        self.assertEqual(metrics['queue_wait_seconds']['count'], 1)
+
+    def test_invalid_requests(self):
+        for body, expected_error in (
+            ({'problem': {'targets': {}}}, 'at least one target'),
+            (
+                {'problem': {'targets': {'Desc_Ingot_C': 1}}, 'timeout': 0},
+                'timeout'
+            ),
+            (
+                {'problem': {'targets': {'Desc_Ingot_C': 1}}, 'colour': 1},
+                'colour'
+            ),
+            # only found to be invalid by the solver process
+            ({'problem': {'targets': {'Desc_Nothing_C': 1}}}, 'Desc_Nothing_C')
+        ):
+            with self.subTest(body=body):
+                status, response = self.request('/solve', body)
+                self.assertEqual(status, 400)
+                self.assertIn(expected_error, response['error'])
+        self.assertEqual(self.request('/solve', [])[0], 400)
+        self.assertEqual(self.request('/nothing')[0], 404)
+
+    def test_timeout(self):
+        status, response = self.request(
+            '/solve',
+            {'problem': SLOW_PROBLEM, 'timeout': 0.2}
+        )
+        self.assertEqual(status, 504)
+        self.assertEqual(response['status'], 'timed_out')
+        self.assertLess(response['seconds'], 1)
+        # on a new solver process
+        status, response = self.request(
+            '/solve',
+            {'problem': {'targets': {'Desc_Ingot_C': 1}}}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            self.request('/metrics')[1]['requests']['timed_out'],
+            1
+        )
+
+    def test_timeout_while_queued(self):
+        responses = dict()
+
+        def solve():
+            responses['running'] = self.request(
+                '/solve',
+                {'problem': SLOW_PROBLEM, 'request_id': 'running'}
+            )
+
+        solve_thread = threading.Thread(target=solve)
+        solve_thread.start()
+        self.wait_for_busy_worker()
+        # responded to without waiting for the worker to get to it
+        status, response = self.request(
+            '/solve',
+            {'problem': SLOW_PROBLEM, 'timeout': 0.2}
+        )
+        self.assertEqual(status, 504)
+        self.assertLess(response['seconds'], 0.5)
+        self.assertEqual(self.request('/metrics')[1]['busy_workers'], 1)
+        self.request('/cancel', {'request_id': 'running'})
+        solve_thread.join()
+        self.assertEqual(responses['running'][0], 409)
+
+    def test_solver_process_died(self):
+        submit = solverprocess.SolverProcess.submit
+        submits = list()
+
+        def submit_once(solver_process, *args):
+            # as if the process died between being checked and being given
+            # the first problem
+            submits.append(args)
+            if len(submits) == 1:
+                raise BrokenPipeError('Broken pipe')
+            submit(solver_process, *args)
+
+        problem = {'targets': {'Desc_Ingot_C': 1}}
+        with mock.patch.object(
+            solverprocess.SolverProcess,
+            'submit',
+            submit_once
+        ):
+            status, response = self.request('/solve', {'problem': problem})
+            self.assertEqual(status, 500)
+            self.assertIn('Broken pipe', response['error'])
+            # the worker carries on with a new solver process
+            status, response = self.request('/solve', {'problem': problem})
+            self.assertEqual(status, 200)
+
+    def test_cancel_and_queue_full(self):
+        responses = dict()
+
+        def solve(request_id: str):
+            responses[request_id] = self.request(
+                '/solve',
+                {'problem': SLOW_PROBLEM, 'request_id': request_id}
+            )
+
+        solve_threads = [threading.Thread(target=solve, args=('running',))]
+        solve_threads[0].start()
+        self.wait_for_busy_worker()
+        solve_threads.append(threading.Thread(target=solve, args=('queued',)))
+        solve_threads[1].start()
+        for _ in range(200):
+            if self.request('/metrics')[1]['queue_depth'] == 1:
+                break
+            time.sleep(0.01)
+        # max_pending is 2
+        status, response = self.request(
+            '/solve',
+            {'problem': SLOW_PROBLEM}
+        )
+        self.assertEqual(status, 503)
+
+        for request_id in ('queued', 'running'):
+            self.assertEqual(
+                self.request('/cancel', {'request_id': request_id}),
+                (200, {'cancelled': True})
+            )
+        for solve_thread in solve_threads:
+            solve_thread.join()
+        for request_id in ('queued', 'running'):
+            status, response = responses[request_id]
+            self.assertEqual(status, 409)
+            self.assertEqual(response['status'], 'cancelled')
+        self.assertEqual(
+            self.request('/cancel', {'request_id': 'running'}),
+            (200, {'cancelled': False})
+        )
+        self.assertEqual(
+            self.request('/metrics')[1]['requests'],
+            {
+                'solved': 0,
+                'invalid': 0,
+                'failed': 0,
+                'timed_out': 0,
+                'cancelled': 2,
+                'rejected': 1
+            }
+        )
@@ -69,6 +69,35 @@ class TestTableau(unittest.TestCase):
         # so the -1/3 in col 4 row 2 is now +1/3
         # and the 15/4 in col 4 row 3 is now 10/3
 
+    def test_column_order_is_insertion_order(self):
+        # the columns are in the order the variables first appear in the
+        # inequalities, rather than an order that depends on the hashes of
+        # the variable ids
+        t = self.tableau_1()
+        self.assertEqual(
+            t._tableau_header[:3],
+            [
+                NamedTypeTag(VariableType.NORMAL, "x"),
+                NamedTypeTag(VariableType.NORMAL, "y"),
+                NamedTypeTag(VariableType.NORMAL, "z")
+            ]
+        )
+        t = simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable("z", 1)], 10),
+                simplex.Inequality([simplex.Variable("y", 1), simplex.Variable("z", 1)], 10),
+                simplex.ObjectiveEquation([simplex.Variable("x", -1), simplex.Variable("y", -1)], 0, 1)
+            ]
+        )
+        self.assertEqual(
+            t._tableau_header[:3],
+            [
+                NamedTypeTag(VariableType.NORMAL, "z"),
+                NamedTypeTag(VariableType.NORMAL, "y"),
+                NamedTypeTag(VariableType.NORMAL, "x")
+            ]
+        )
+
     def test_constructor_does_not_error_1(self):
         self.tableau_1()
 
@@ -259,3 +288,132 @@ class TestTableau(unittest.TestCase):
                 (AnonymousTypeTag(VariableType.OBJECTIVE), 8)
             ]
         )
+
+    def test_dual_pivot_restores_feasibility(self):
+        # solve, then lower the right-hand-side of the second constraint so
+        # that the current basis becomes infeasible.  the dual simplex
+        # algorithm should then reach the same solution as solving the changed
+        # problem from scratch.
+        t = self.tableau_0()
+        t.pivot_until_done()
+        t._shift_rhs(1, -70)
+        t.dual_pivot_until_done()
+        self.assertCountEqual(
+            t.get_variable_values(),
+            [
+                (NamedTypeTag(VariableType.NORMAL, 0), 0),
+                (NamedTypeTag(VariableType.NORMAL, 1), 30),
+                (NamedTypeTag(VariableType.SLACK, 0), 10),
+                (NamedTypeTag(VariableType.SLACK, 1), 0),
+                (AnonymousTypeTag(VariableType.OBJECTIVE), 300)
+            ]
+        )
+
+    def test_dual_pivot_detects_infeasibility(self):
+        # no non-negative solution can satisfy x0 + x1 <= -1
+        t = simplex.Tableau(
+            inequalities=[
+                simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1)], -1),
+                simplex.ObjectiveEquation([simplex.Variable(0, -1)], 0, 1)
+            ]
+        )
+        with self.assertRaises(simplex.SimplexInfeasibleError):
+            t.dual_pivot_until_done()
+
+    def test_add_row_after_solving(self):
+        # the optimum of tableau_0 is x0=20, x1=20.  adding x0 <= 10 cuts it
+        # off, and the dual simplex algorithm should then reach the same
+        # solution as solving the problem with the extra constraint from
+        # scratch (x0=10, x1=30).
+        t = self.tableau_0()
+        t.pivot_until_done()
+        t.add_row({0: 1}, 10, 'c')
+        t.dual_pivot_until_done()
+        self.assertCountEqual(
+            t.get_variable_values(),
+            [
+                (NamedTypeTag(VariableType.NORMAL, 0), 10),
+                (NamedTypeTag(VariableType.NORMAL, 1), 30),
+                (NamedTypeTag(VariableType.SLACK, 0), 0),
+                (NamedTypeTag(VariableType.SLACK, 1), 30),
+                (NamedTypeTag(VariableType.SLACK, 2), 0),
+                (AnonymousTypeTag(VariableType.OBJECTIVE), 500)
+            ]
+        )
+        self.assertEqual(t._constraint_ids, [None, None, 'c'])
+
+    def test_pivot_rules(self):
+        # every pivot rule should reach the same optimum, including on the
+        # degenerate pivots of tableau_1
+        for pivot_rule in simplex.PivotRule:
+            with self.subTest(pivot_rule=pivot_rule):
+                t = self.tableau_1()
+                t.pivot_rule = pivot_rule
+                t.pivot_until_done()
+                self.assertEqual(t.objective_value, Fraction(348, 10))
+                # and carry over to copies
+                self.assertIs(t.copy().pivot_rule, pivot_rule)
+
+    def test_get_violations(self):
+        inequalities = [
+            simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1)], 40, 'a'),
+            simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 1)], 100, 'b'),
+            simplex.ObjectiveEquation([simplex.Variable(0, -20), simplex.Variable(1, -10)], 0, 1)
+        ]
+        t = simplex.Tableau(inequalities)
+        t.pivot_until_done()
+        self.assertEqual(
+            simplex.get_violations(inequalities, t.get_variable_values()),
+            []
+        )
+        violations = simplex.get_violations(
+            inequalities,
+            [
+                (NamedTypeTag(VariableType.NORMAL, 0), 30),
+                (NamedTypeTag(VariableType.NORMAL, 1), -1)
+            ]
+        )
+        self.assertEqual(len(violations), 2)
+        self.assertIn('variable 1 is -1', violations)
+        self.assertIn("constraint 'b' is 119 > 100", violations)
+
+    def test_get_optimality_violations(self):
+        inequalities = [
+            simplex.Inequality([simplex.Variable(0, 1), simplex.Variable(1, 1)], 40, 'a'),
+            simplex.Inequality([simplex.Variable(0, 4), simplex.Variable(1, 1)], 100, 'b'),
+            simplex.ObjectiveEquation([simplex.Variable(0, -20), simplex.Variable(1, -10)], 0, 1)
+        ]
+        t = simplex.Tableau(inequalities)
+        t.pivot_until_done()
+        self.assertEqual(t.get_duals(), [Fraction(20, 3), Fraction(10, 3)])
+        self.assertEqual(
+            simplex.get_optimality_violations(
+                inequalities,
+                t.get_variable_values(),
+                t.get_duals()
+            ),
+            []
+        )
+        # the duals of a feasible solution that is not optimal
+        violations = simplex.get_optimality_violations(
+            inequalities,
+            [
+                (NamedTypeTag(VariableType.NORMAL, 0), 25),
+                (NamedTypeTag(VariableType.NORMAL, 1), 0)
+            ],
+            [0, 5]
+        )
+        self.assertEqual(violations, ['reduced cost of variable 1 is -5'])
+        # optimal duals, but not for this solution
+        self.assertEqual(
+            simplex.get_optimality_violations(inequalities, [], t.get_duals()),
+            ['objective value 0 is not the dual objective value 600']
+        )
+        self.assertIn(
+            "dual of constraint 'a' is -1",
+            simplex.get_optimality_violations(
+                inequalities,
+                t.get_variable_values(),
+                [-1, 10]
+            )
+        )
@@ -0,0 +1,162 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from optimisationsolver import simplex, solutioncache
+from utils.suppressalllogs import SuppressAll
+
+
+def make_problem(
+    coefficient: int = 4,
+    reverse: bool = False
+) -> list[simplex.Inequality]:
+    constraints = [
+        simplex.Inequality(
+            [simplex.Variable('x', 1), simplex.Variable('y', 1)],
+            40,
+            'first'
+        ),
+        simplex.Inequality(
+            [simplex.Variable('x', coefficient), simplex.Variable('y', 1)],
+            100,
+            'second'
+        )
+    ]
+    if reverse:
+        constraints = [
+            simplex.Inequality(
+                reversed(constraint.lhs),
+                constraint.rhs,
+                constraint.id
+            )
+            for constraint
+            in reversed(constraints)
+        ]
+    return constraints + [
+        simplex.ObjectiveEquation(
+            [simplex.Variable('x', -20), simplex.Variable('y', -10)],
+            0,
+            1
+        )
+    ]
+
+
+def make_solution(pivots: int) -> solutioncache.CachedSolution:
+    return solutioncache.CachedSolution(
+        [('x', 20), ('y', 20)],
+        None,
+        None,
+        ['x', 'y'],
+        pivots
+    )
+
+
+class TestHashProblem(unittest.TestCase):
+    def test_order_does_not_matter(self):
+        self.assertEqual(
+            solutioncache.hash_problem(make_problem()),
+            solutioncache.hash_problem(make_problem(reverse=True))
+        )
+
+    def test_differences_change_hash(self):
+        problem_hash = solutioncache.hash_problem(make_problem())
+        self.assertNotEqual(
+            solutioncache.hash_problem(make_problem(coefficient=5)),
+            problem_hash
+        )
+        self.assertNotEqual(
+            solutioncache.hash_problem(
+                make_problem(),
+                {'whole_machines': True}
+            ),
+            problem_hash
+        )
+
+    def test_uncanonical_id_raises(self):
+        problem = make_problem()
+        problem[0].id = object()
+        with self.assertRaises(TypeError):
+            solutioncache.hash_problem(problem)
+
+
+class TestSolutionCache(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestSolutionCache, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        solutioncache.toplevel_logger.addFilter(self.__log_filter_obj)
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.directory = pathlib.Path(self.temporary_directory.name)
+
+    def tearDown(self, *args, **kwargs):
+        super(TestSolutionCache, self).tearDown(
+            *args,
+            **kwargs
+        )
+        self.temporary_directory.cleanup()
+        # re-enable logging for the module under test
+        solutioncache.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def test_memory_is_least_recently_used(self):
+        cache = solutioncache.SolutionCache(
+            None,
+            None,
+            max_memory_entries=2
+        )
+        cache.put('a', make_solution(1))
+        cache.put('b', make_solution(2))
+        cache.get('a')
+        cache.put('c', make_solution(3))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a').pivots, 1)
+        self.assertEqual(cache.get('c').pivots, 3)
+
+    def test_survives_restart(self):
+        cache = solutioncache.SolutionCache(self.directory, 'docs')
+        cache.put('a', make_solution(1))
+        cache = solutioncache.SolutionCache(self.directory, 'docs')
+        self.assertEqual(cache.get('a'), make_solution(1))
+
+    def test_other_docs_are_removed(self):
+        cache = solutioncache.SolutionCache(self.directory, 'docs')
+        cache.put('a', make_solution(1))
+        cache.set_docs_fingerprint('new docs')
+        self.assertIsNone(cache.get('a'))
+        self.assertFalse(self.directory.joinpath('docs').exists())
+        # and likewise for another instance
+        cache.put('a', make_solution(2))
+        cache = solutioncache.SolutionCache(self.directory, 'docs')
+        self.assertIsNone(cache.get('a'))
+
+    def test_disk_is_bounded(self):
+        cache = solutioncache.SolutionCache(self.directory, 'docs')
+        cache.put('a', make_solution(1))
+        entry_size = self.directory.joinpath('docs', 'a.pickle').stat().st_size
+        # room for two entries
+        cache = solutioncache.SolutionCache(
+            self.directory,
+            'docs',
+            max_disk_bytes=2 * entry_size
+        )
+        # make 'a' older than 'b' even on coarse filesystem timestamps
+        os.utime(self.directory.joinpath('docs', 'a.pickle'), (0, 0))
+        cache.put('b', make_solution(2))
+        cache.put('c', make_solution(3))
+        self.assertEqual(
+            sorted(self.directory.joinpath('docs').iterdir()),
+            [
+                self.directory.joinpath('docs', 'b.pickle'),
+                self.directory.joinpath('docs', 'c.pickle')
+            ]
+        )
+
+    def test_corrupt_entry_is_ignored(self):
+        cache = solutioncache.SolutionCache(self.directory, 'docs')
+        cache.put('a', make_solution(1))
+        self.directory.joinpath('docs', 'a.pickle').write_bytes(b'corrupt')
+        cache = solutioncache.SolutionCache(self.directory, 'docs')
+        self.assertIsNone(cache.get('a'))
+        self.assertFalse(self.directory.joinpath('docs', 'a.pickle').exists())
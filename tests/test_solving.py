@@ -0,0 +1,293 @@
+import dataclasses
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from fractions import Fraction
+from optimisationsolver.anytime import SolveLimits
+from headless import problembuilder, solving
+from headless.problemspec import ProblemSpec, ProblemSpecError
+from utils.suppressalllogs import SuppressAll
+from ingotregistries import clear_registries, fill_ingot_registries
+
+# the root of the repository, where solve.py is
+REPOSITORY_PATH = pathlib.Path(__file__).resolve().parent.parent
+
+
+class TestSolveProblem(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestSolveProblem, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the modules under test
+        self.__log_filter_obj = SuppressAll()
+        problembuilder.toplevel_logger.addFilter(self.__log_filter_obj)
+        solving.toplevel_logger.addFilter(self.__log_filter_obj)
+
+        fill_ingot_registries()
+
+    def tearDown(self, *args, **kwargs):
+        super(TestSolveProblem, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # clear up global state
+        clear_registries()
+        # re-enable logging for the modules under test
+        problembuilder.toplevel_logger.removeFilter(self.__log_filter_obj)
+        solving.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    def test_solve(self):
+        solution = solving.solve_problem(
+            ProblemSpec(
+                (('Desc_Ingot_C', 1.0),),
+                (('Desc_Ore_C', 45.0),)
+            )
+        )
+        self.assertEqual(solution.objective_value, 45)
+        self.assertEqual(solution.machines, {'Recipe_Ingot_C': Fraction(3, 2)})
+        self.assertEqual(solution.outputs, {'Desc_Ingot_C': 45})
+        self.assertEqual(solution.power_consumption, 6.0)
+        self.assertTrue(solution.optimal)
+        self.assertEqual(
+            solving.solution_to_json(solution, exact=True)['machines'],
+            {'Recipe_Ingot_C': '3/2'}
+        )
+
+    def test_whole_machines(self):
+        solution = solving.solve_problem(
+            ProblemSpec(
+                (('Desc_Ingot_C', 1.0),),
+                (('Desc_Ore_C', 45.0),),
+                whole_machines=True
+            ),
+            workers=0
+        )
+        self.assertEqual(solution.objective_value, 30)
+        self.assertEqual(solution.machines, {'Recipe_Ingot_C': 1})
+        self.assertTrue(solution.optimal)
+
+    def test_not_proven_optimal(self):
+        spec = ProblemSpec(
+            (('Desc_Ingot_C', 1.0),),
+            (('Desc_Ore_C', 45.0),)
+        )
+        # duals that do not prove the solution optimal, as if the tableau
+        # were wrong
+        with mock.patch.object(
+            solving.Tableau,
+            'get_duals',
+            lambda self: [Fraction(0)] * len(self._constraint_ids)
+        ):
+            self.assertFalse(solving.solve_problem(spec).optimal)
+            self.assertFalse(
+                solving.solve_problem(
+                    dataclasses.replace(spec, whole_machines=True),
+                    workers=0
+                ).optimal
+            )
+
+    def test_disabled_recipe(self):
+        solution = solving.solve_problem(
+            ProblemSpec(
+                (('Desc_Ingot_C', 1.0),),
+                (('Desc_Ore_C', 45.0),),
+                disabled_recipes=frozenset({'Recipe_Ingot_C', 'Recipe_Gone_C'})
+            )
+        )
+        self.assertEqual(solution.objective_value, 0)
+        self.assertEqual(solution.machines, {})
+
+    def test_unknown_item(self):
+        with self.assertRaises(ProblemSpecError):
+            problembuilder.build_problem(
+                ProblemSpec((('Desc_Nothing_C', 1.0),))
+            )
+
+    def test_limits(self):
+        solution = solving.solve_problem(
+            ProblemSpec(
+                (('Desc_Ingot_C', 1.0),),
+                (('Desc_Ore_C', 45.0),)
+            ),
+            limits=SolveLimits(max_pivots=0)
+        )
+        # nothing is made at the starting basic feasible solution
+        self.assertFalse(solution.optimal)
+        self.assertEqual(solution.objective_value, 0)
+        self.assertEqual(solution.pivots, 0)
+
+    def test_build_progress(self):
+        reported = list()
+        problembuilder.build_problem(
+            ProblemSpec((('Desc_Ingot_C', 1.0),)),
+            progress=lambda done, total: reported.append((done, total))
+        )
+        # two items, each visited twice, then one recipe
+        self.assertEqual(reported, [(done, 5) for done in range(1, 6)])
+
+
+class TestSolveCommand(unittest.TestCase):
+    DOCS = [
+        {
+            'NativeClass': (
+                "/Script/CoreUObject.Class'"
+                "/Script/FactoryGame.FGResourceDescriptor'"
+            ),
+            'Classes': [{
+                'ClassName': 'Desc_Ore_C',
+                'mDisplayName': 'Ore',
+                'mEnergyValue': '0.000000',
+                'mForm': 'RF_SOLID'
+            }]
+        },
+        {
+            'NativeClass': (
+                "/Script/CoreUObject.Class'"
+                "/Script/FactoryGame.FGItemDescriptor'"
+            ),
+            'Classes': [{
+                'ClassName': 'Desc_Ingot_C',
+                'mDisplayName': 'Ingot',
+                'mEnergyValue': '0.000000',
+                'mForm': 'RF_SOLID'
+            }]
+        },
+        {
+            'NativeClass': (
+                "/Script/CoreUObject.Class'"
+                "/Script/FactoryGame.FGBuildableManufacturer'"
+            ),
+            'Classes': [{
+                'ClassName': 'Build_Smelter_C',
+                'mDisplayName': 'Smelter',
+                'mPowerConsumption': '4.000000'
+            }]
+        },
+        {
+            'NativeClass': (
+                "/Script/CoreUObject.Class'/Script/FactoryGame.FGRecipe'"
+            ),
+            'Classes': [{
+                'ClassName': 'Recipe_Ingot_C',
+                'FullName': (
+                    'BlueprintGeneratedClass /Game/FactoryGame/Recipes/'
+                    'Recipe_Ingot.Recipe_Ingot_C'
+                ),
+                'mDisplayName': 'Ingot',
+                'mIngredients': (
+                    "((ItemClass=\"/Script/Engine.BlueprintGeneratedClass'"
+                    "/Game/Desc_Ore.Desc_Ore_C'\",Amount=1))"
+                ),
+                'mProduct': (
+                    "((ItemClass=\"/Script/Engine.BlueprintGeneratedClass'"
+                    "/Game/Desc_Ingot.Desc_Ingot_C'\",Amount=1))"
+                ),
+                'mManufactoringDuration': '2.000000',
+                'mProducedIn': '("/Game/Build_Smelter.Build_Smelter_C")',
+                'mVariablePowerConsumptionConstant': '0.000000',
+                'mVariablePowerConsumptionFactor': '1.000000'
+            }]
+        }
+    ]
+
+    def setUp(self, *args, **kwargs):
+        super(TestSolveCommand, self).setUp(
+            *args,
+            **kwargs
+        )
+        self.__temporary_directory = tempfile.TemporaryDirectory()
+        self.directory = pathlib.Path(self.__temporary_directory.name)
+        self.docs_path = self.directory.joinpath('Docs.json')
+        self.docs_path.write_text(json.dumps(self.DOCS), encoding='UTF-16')
+
+    def tearDown(self, *args, **kwargs):
+        super(TestSolveCommand, self).tearDown(
+            *args,
+            **kwargs
+        )
+        self.__temporary_directory.cleanup()
+
+    def write_problem(self, name: str, ore_available: int) -> pathlib.Path:
+        problem_path = self.directory.joinpath(name)
+        problem_path.write_text(
+            '[targets]\n'
+            'Desc_Ingot_C = 1\n'
+            '[availability]\n'
+            f'Desc_Ore_C = {ore_available}\n',
+            encoding='utf-8'
+        )
+        return problem_path
+
+    def run_solve(self, *arguments: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [
+                sys.executable,
+                # fail if anything imports Qt
+                '-c',
+                'import sys; sys.modules["PySide6"] = None; '
+                'import runpy; runpy.run_path("solve.py", '
+                'run_name="__main__")',
+                '-p', str(self.docs_path),
+                '--no-docs-cache',
+                '-l', 'crit',
+                *arguments
+            ],
+            cwd=REPOSITORY_PATH,
+            capture_output=True,
+            text=True
+        )
+
+    def test_solve_command(self):
+        completed_process = self.run_solve(
+            str(self.write_problem('problem.toml', 60))
+        )
+        self.assertEqual(
+            completed_process.returncode,
+            0,
+            completed_process.stderr
+        )
+        solution_json = json.loads(completed_process.stdout)
+        self.assertGreater(solution_json.pop('pivots'), 0)
+        self.assertEqual(
+            solution_json,
+            {
+                'objective_value': 60.0,
+                'machines': {'Recipe_Ingot_C': 2.0},
+                'outputs': {'Desc_Ingot_C': 60.0},
+                'power_consumption': 8.0,
+                'optimal': True
+            }
+        )
+
+    def test_solve_command_batch(self):
+        problem_paths = [
+            self.write_problem('ore30.toml', 30),
+            self.write_problem('ore90.toml', 90),
+            self.directory.joinpath('missing.toml')
+        ]
+        completed_process = self.run_solve(
+            '-j', '2',
+            *map(str, problem_paths)
+        )
+        # since one of the problems is missing
+        self.assertEqual(completed_process.returncode, 1)
+        results = {
+            result['problem']: result
+            for result
+            in map(json.loads, completed_process.stdout.splitlines())
+        }
+        self.assertEqual(results.keys(), set(map(str, problem_paths)))
+        self.assertEqual(
+            results[str(problem_paths[0])]['solution']['objective_value'],
+            30.0
+        )
+        self.assertEqual(
+            results[str(problem_paths[1])]['solution']['objective_value'],
+            90.0
+        )
+        self.assertIn('error', results[str(problem_paths[2])])
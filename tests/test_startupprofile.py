@@ -0,0 +1,84 @@
+import json
+import pathlib
+import pstats
+import tempfile
+import unittest
+from utils import startupprofile
+
+
+class TestStartupProfile(unittest.TestCase):
+    def tearDown(self, *args, **kwargs):
+        super(TestStartupProfile, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # clear up global state
+        startupprofile.activate(None)
+
+    def test_nested_phases(self):
+        profile = startupprofile.StartupProfile()
+        startupprofile.activate(profile)
+        with startupprofile.phase('load docs'):
+            for _ in range(3):
+                with startupprofile.phase('handler'):
+                    # something to allocate
+                    kept = [object() for _ in range(1000)]
+        report = profile.finish()
+        self.assertEqual(report['name'], 'startup')
+        self.assertEqual(len(report['children']), 1)
+        load_docs = report['children'][0]
+        self.assertEqual(load_docs['name'], 'load docs')
+        self.assertEqual(load_docs['calls'], 1)
+        # added up into one record
+        self.assertEqual(len(load_docs['children']), 1)
+        handler = load_docs['children'][0]
+        self.assertEqual(handler['calls'], 3)
+        self.assertGreaterEqual(handler['allocated_blocks'], 1000)
+        self.assertGreaterEqual(load_docs['wall_s'], handler['wall_s'])
+        self.assertGreaterEqual(report['wall_s'], load_docs['wall_s'])
+        del kept
+
+    def test_inactive(self):
+        profile = startupprofile.StartupProfile()
+        with startupprofile.phase('not recorded'):
+            pass
+        self.assertEqual(profile.finish()['children'], [])
+
+    def test_sections(self):
+        profile = startupprofile.StartupProfile()
+        startupprofile.activate(profile)
+        with startupprofile.phase('window'):
+            sections = startupprofile.Sections()
+            sections.start('first')
+            sections.start('second')
+            sections.end()
+            with startupprofile.phase('after'):
+                pass
+        self.assertEqual(
+            [
+                child['name']
+                for child
+                in profile.finish()['children'][0]['children']
+            ],
+            ['first', 'second', 'after']
+        )
+
+    def test_write(self):
+        profile = startupprofile.StartupProfile()
+        startupprofile.activate(profile)
+        profile.enable_cprofile()
+        with startupprofile.phase('phase'):
+            sorted(range(1000), key=str)
+        profile.record_since_start('everything')
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = pathlib.Path(directory, 'startup.json')
+            cprofile_path = pathlib.Path(directory, 'startup.prof')
+            profile.write(report_path, cprofile_path)
+            with open(report_path, 'r', encoding='utf-8') as fptr:
+                report = json.load(fptr)
+            self.assertEqual(
+                [child['name'] for child in report['children']],
+                ['phase', 'everything']
+            )
+            # a valid cProfile dump
+            pstats.Stats(str(cprofile_path))
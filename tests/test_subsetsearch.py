@@ -0,0 +1,143 @@
+import multiprocessing
+import unittest
+from fractions import Fraction
+from itertools import combinations
+from optimisationsolver import simplex, pricing, subsetsearch
+from utils.suppressalllogs import SuppressAll
+
+
+def search_and_send(connection, tableau, columns, k):
+    try:
+        connection.send(
+            subsetsearch.best_subset_search(tableau, columns, k, workers=0)
+            .objective_value
+        )
+    except Exception as e:
+        connection.send(e)
+
+
+class TestBestSubsetSearch(unittest.TestCase):
+    def setUp(self, *args, **kwargs):
+        super(TestBestSubsetSearch, self).setUp(
+            *args,
+            **kwargs
+        )
+        # disable logging for the module under test
+        self.__log_filter_obj = SuppressAll()
+        subsetsearch.toplevel_logger.addFilter(self.__log_filter_obj)
+
+    def tearDown(self, *args, **kwargs):
+        super(TestBestSubsetSearch, self).tearDown(
+            *args,
+            **kwargs
+        )
+        # re-enable logging for the module under test
+        subsetsearch.toplevel_logger.removeFilter(self.__log_filter_obj)
+
+    # three resources, one base variable and six candidates that each use the
+    # resources in different ratios, so that which candidates are best
+    # depends on how many can be used
+    base_coefficients = [(1, 1, 1), (2, 3, 1), (1, 4, 2), (3, 1, 1), (1, 1, 5), (2, 2, 2), (4, 1, 3)]
+    objective_coefficients = [1, 5, 6, 4, 5, 6, 7]
+    availability = [40, 60, 50]
+
+    def problem(self, variables: list[int]) -> list[simplex.Inequality]:
+        return [
+            simplex.Inequality(
+                [
+                    simplex.Variable(variable, self.base_coefficients[variable][resource])
+                    for variable
+                    in variables
+                ],
+                self.availability[resource]
+            )
+            for resource
+            in range(3)
+        ] + [
+            simplex.ObjectiveEquation(
+                [
+                    simplex.Variable(variable, -self.objective_coefficients[variable])
+                    for variable
+                    in variables
+                ],
+                0,
+                1
+            )
+        ]
+
+    def brute_force(self, k: int) -> Fraction:
+        best = None
+        for subset_size in range(k + 1):
+            for subset in combinations(range(1, 7), subset_size):
+                t = simplex.Tableau(self.problem([0, *subset]))
+                t.pivot_until_done()
+                if best is None or t.objective_value > best:
+                    best = t.objective_value
+        return best
+
+    def search(self, k: int, **kwargs) -> subsetsearch.SubsetSearchResult:
+        problem = self.problem(list(range(7)))
+        columns = pricing.extract_columns(problem, range(1, 7))
+        return subsetsearch.best_subset_search(
+            simplex.Tableau(problem),
+            columns,
+            k,
+            **kwargs
+        )
+
+    def test_matches_brute_force(self):
+        for k in range(4):
+            with self.subTest(k=k):
+                result = self.search(k, workers=0)
+                self.assertTrue(result.proven_optimal)
+                self.assertEqual(result.gap, 0)
+                self.assertLessEqual(len(result.enabled), k)
+                self.assertEqual(result.objective_value, self.brute_force(k))
+
+    def test_result_is_achievable(self):
+        result = self.search(2, workers=0)
+        t = simplex.Tableau(self.problem([0, *result.enabled]))
+        t.pivot_until_done()
+        self.assertEqual(t.objective_value, result.objective_value)
+
+    def test_process_pool(self):
+        progress_reports = list()
+        result = self.search(2, workers=2, progress=progress_reports.append)
+        self.assertEqual(result.objective_value, self.brute_force(2))
+        self.assertEqual(
+            progress_reports[-1].nodes_evaluated,
+            result.nodes_evaluated
+        )
+        # the incumbent can only improve and the bound can only tighten
+        for earlier, later in zip(progress_reports, progress_reports[1:]):
+            self.assertLessEqual(earlier.incumbent_value, later.incumbent_value)
+            self.assertGreaterEqual(earlier.best_bound, later.best_bound)
+
+    def test_daemonic_process(self):
+        # the GUI solves in a daemonic process, which can not start a process
+        # pool, so the search is run in that process itself
+        problem = self.problem(list(range(7)))
+        # (which takes the candidates out of the problem)
+        columns = pricing.extract_columns(problem, range(1, 7))
+        connection, child_connection = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=search_and_send,
+            args=(child_connection, simplex.Tableau(problem), columns, 2),
+            daemon=True
+        )
+        process.start()
+        child_connection.close()
+        result = connection.recv()
+        process.join()
+        self.assertEqual(result, self.brute_force(2))
+
+    def test_stopped_early_reports_gap(self):
+        result = self.search(2, workers=0, should_stop=lambda: True)
+        self.assertFalse(result.proven_optimal)
+        self.assertEqual(result.nodes_evaluated, 0)
+        # the bound is the relaxation with every candidate enabled
+        problem = self.problem(list(range(7)))
+        t = simplex.Tableau(problem)
+        t.pivot_until_done()
+        self.assertEqual(result.best_bound, t.objective_value)
+        self.assertGreaterEqual(result.gap, 0)
@@ -0,0 +1,88 @@
+import unittest
+from satisfactoryobjects import unrealproperties
+
+
+class TestParseItemAmounts(unittest.TestCase):
+    def test_release_one_point_zero_format(self):
+        self.assertEqual(
+            unrealproperties.parse_item_amounts(
+                "((ItemClass=\"/Script/Engine.BlueprintGeneratedClass'/Game/"
+                "FactoryGame/Resource/Parts/IronIngot/Desc_IronIngot."
+                "Desc_IronIngot_C'\",Amount=3),(ItemClass=\"/Script/Engine."
+                "BlueprintGeneratedClass'/Game/FactoryGame/Resource/RawResources"
+                "/Water/Desc_Water.Desc_Water_C'\",Amount=1000))"
+            ),
+            [
+                (
+                    "\"/Script/Engine.BlueprintGeneratedClass'/Game/FactoryGame"
+                    "/Resource/Parts/IronIngot/Desc_IronIngot.Desc_IronIngot_C'"
+                    "\"",
+                    3
+                ),
+                (
+                    "\"/Script/Engine.BlueprintGeneratedClass'/Game/FactoryGame"
+                    "/Resource/RawResources/Water/Desc_Water.Desc_Water_C'\"",
+                    1000
+                )
+            ]
+        )
+
+    def test_update_eight_format(self):
+        self.assertEqual(
+            unrealproperties.parse_item_amounts(
+                "((ItemClass=/Script/Engine.BlueprintGeneratedClass'\"/Game/"
+                "FactoryGame/Resource/Parts/IronIngot/Desc_IronIngot."
+                "Desc_IronIngot_C\"',Amount=12))"
+            ),
+            [
+                (
+                    "/Script/Engine.BlueprintGeneratedClass'\"/Game/FactoryGame"
+                    "/Resource/Parts/IronIngot/Desc_IronIngot.Desc_IronIngot_C"
+                    "\"'",
+                    12
+                )
+            ]
+        )
+
+    def test_empty(self):
+        # e.g. the ingredients of excited photonic matter
+        self.assertEqual(unrealproperties.parse_item_amounts(""), [])
+        self.assertEqual(unrealproperties.parse_item_amounts("()"), [])
+
+    def test_invalid_errors(self):
+        for text in (
+            "((ItemClass=Desc_A.Desc_A_C,Amount=1)",
+            "(ItemClass=Desc_A.Desc_A_C,Amount=1))",
+            "((ItemClass=Desc_A.Desc_A_C,Amount=one))",
+            "((ItemClass=Desc_A.Desc_A_C))",
+            "((ItemClass=Desc_A.Desc_A_C,Amount=1);(ItemClass=Desc_B.Desc_B_C,Amount=2))",
+            "(("
+        ):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    unrealproperties.parse_item_amounts(text)
+
+
+class TestParseClassPaths(unittest.TestCase):
+    def test_multiple_machines(self):
+        self.assertEqual(
+            unrealproperties.parse_class_paths(
+                "(\"/Game/FactoryGame/Buildable/Factory/SmelterMk1/"
+                "Build_SmelterMk1.Build_SmelterMk1_C\",\"/Game/FactoryGame/"
+                "Buildable/-Shared/WorkBench/BP_WorkBenchComponent."
+                "BP_WorkBenchComponent_C\")"
+            ),
+            [
+                "/Game/FactoryGame/Buildable/Factory/SmelterMk1/"
+                "Build_SmelterMk1.Build_SmelterMk1_C",
+                "/Game/FactoryGame/Buildable/-Shared/WorkBench/"
+                "BP_WorkBenchComponent.BP_WorkBenchComponent_C"
+            ]
+        )
+
+    def test_empty(self):
+        self.assertEqual(unrealproperties.parse_class_paths(""), [])
+
+    def test_invalid_errors(self):
+        with self.assertRaises(ValueError):
+            unrealproperties.parse_class_paths("(/Game/Build_A.Build_A_C)")
@@ -3,5 +3,7 @@ __all__ = [
     "directionenums",
     "trees",
     "variabletypeenums",
-    "exceptions"
+    "exceptions",
+    "startupprofile",
+    "loglevels"
 ]
@@ -0,0 +1,9 @@
+import logging
+
+VALID_LOG_VERBOSITY_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warn': logging.WARNING,
+    'error': logging.ERROR,
+    'crit': logging.CRITICAL
+}
@@ -5,8 +5,9 @@ minor modification (british spelling + docstring). See
 https://docs.python.org/3/library/queue.html#queue.PriorityQueue
 for original implementation."""
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterator
 
 
 @dataclass(order=True)
@@ -14,3 +15,49 @@ class PrioritisedItem:
     """An item with a priority, for use in a priority queue"""
     priority: int
     item: Any = field(compare=False)
+
+
+class BucketedPriorityQueue:
+    """A priority queue for when there are only a few distinct priorities.
+
+    Items are kept in one first in, first out bucket per priority, so adding
+    an item takes constant time no matter how many items are queued, and
+    items with the same priority come out in the order they were added.
+    Lower priorities come out first.
+    """
+    def __init__(self) -> None:
+        self._buckets: dict[int, deque] = dict()
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def push(self, priority: int, item: Any) -> None:
+        try:
+            self._buckets[priority].append(item)
+        except KeyError:
+            self._buckets[priority] = deque((item,))
+
+    def drain(self) -> Iterator[Any]:
+        """Remove and yield every item, in order of priority.
+
+        Items may be pushed while this is running.  They will still be
+        yielded, but if their priority is lower than that of the bucket
+        currently being emptied then they come out once it is empty.
+        """
+        while self._buckets:
+            priority = min(self._buckets)
+            bucket = self._buckets[priority]
+            while bucket:
+                yield bucket.popleft()
+            del self._buckets[priority]
+
+    def drain_buckets(self) -> Iterator[tuple[int, deque]]:
+        """Remove and yield each bucket along with its priority, in order of
+        priority.
+
+        Items pushed with the same priority as a bucket after it has been
+        yielded go into a new bucket, which is yielded next.
+        """
+        while self._buckets:
+            priority = min(self._buckets)
+            yield (priority, self._buckets.pop(priority))
@@ -0,0 +1,175 @@
+"""Recording where the time goes while the program starts up.
+
+Code that runs during start-up wraps each of its phases in phase(name).  When
+no StartupProfile is active (i.e. --profile-startup was not given) this does
+nothing.  Otherwise the wall time, CPU time and number of memory blocks
+allocated (and not yet freed) are recorded for the phase.  Phases can be
+nested, and a phase that is entered more than once under the same parent
+(e.g. the handler for a NativeClass that has several blocks) is added up
+into a single record.
+"""
+import contextlib
+import cProfile
+import json
+import pathlib
+import sys
+import time
+from typing import Iterator
+
+
+class PhaseRecord:
+    """The totals for one phase, and the phases nested in it"""
+    __slots__ = (
+        'name',
+        'wall_s',
+        'cpu_s',
+        'allocated_blocks',
+        'calls',
+        'children'
+    )
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.allocated_blocks = 0
+        self.calls = 0
+        self.children: dict[str, PhaseRecord] = dict()
+
+    def child(self, name: str) -> 'PhaseRecord':
+        try:
+            return self.children[name]
+        except KeyError:
+            record = self.children[name] = PhaseRecord(name)
+            return record
+
+    def to_json(self) -> dict:
+        return {
+            'name': self.name,
+            'wall_s': self.wall_s,
+            'cpu_s': self.cpu_s,
+            'allocated_blocks': self.allocated_blocks,
+            'calls': self.calls,
+            'children': [
+                child.to_json()
+                for child
+                in self.children.values()
+            ]
+        }
+
+
+class StartupProfile:
+    """The phases recorded from when it was made until it is finished"""
+    def __init__(self) -> None:
+        self._root = PhaseRecord('startup')
+        self._stack = [self._root]
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_blocks = sys.getallocatedblocks()
+        self._cprofile: cProfile.Profile | None = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        record = self._stack[-1].child(name)
+        self._stack.append(record)
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        start_blocks = sys.getallocatedblocks()
+        try:
+            yield
+        finally:
+            record.wall_s += time.perf_counter() - start_wall
+            record.cpu_s += time.process_time() - start_cpu
+            record.allocated_blocks += sys.getallocatedblocks() - start_blocks
+            record.calls += 1
+            self._stack.pop()
+
+    def record_since_start(self, name: str) -> None:
+        """Record everything from when the profile was made until now as a
+        phase (e.g. the imports that had to happen before phase() could be
+        used)"""
+        record = self._stack[-1].child(name)
+        record.wall_s += time.perf_counter() - self._start_wall
+        record.cpu_s += time.process_time() - self._start_cpu
+        record.allocated_blocks += (
+            sys.getallocatedblocks() - self._start_blocks
+        )
+        record.calls += 1
+
+    def enable_cprofile(self) -> None:
+        """Also run cProfile from now until the profile is finished"""
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def finish(self) -> dict:
+        """Stop recording and get the report"""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self._root.wall_s = time.perf_counter() - self._start_wall
+        self._root.cpu_s = time.process_time() - self._start_cpu
+        self._root.allocated_blocks = (
+            sys.getallocatedblocks() - self._start_blocks
+        )
+        self._root.calls = 1
+        return {
+            'python': sys.version,
+            'platform': sys.platform,
+            'argv': sys.argv,
+            **self._root.to_json()
+        }
+
+    def write(
+        self,
+        report_path: pathlib.Path,
+        cprofile_path: pathlib.Path | None = None
+    ) -> None:
+        """Finish the profile, then write the report as JSON to report_path
+        and the cProfile statistics (if cProfile was enabled) to
+        cprofile_path"""
+        report = self.finish()
+        with open(report_path, 'w', encoding='utf-8') as fptr:
+            json.dump(report, fptr, indent='\t')
+        if self._cprofile is not None and cprofile_path is not None:
+            self._cprofile.dump_stats(cprofile_path)
+
+
+# the profile that phase() records into, if any
+_active_profile: StartupProfile | None = None
+
+
+def activate(profile: StartupProfile | None) -> None:
+    """Set the profile that phases are recorded into (None to stop
+    recording)"""
+    global _active_profile
+    _active_profile = profile
+
+
+def phase(name: str) -> contextlib.AbstractContextManager:
+    """Record the code run in this context as a phase of the active
+    profile (if there is one)"""
+    if _active_profile is None:
+        return contextlib.nullcontext()
+    return _active_profile.phase(name)
+
+
+class Sections:
+    """Consecutive phases, each of which ends where the next one starts.
+
+    For long stretches of code (like building the widgets of a tab) that are
+    split up by comments rather than functions, and so would be awkward to
+    wrap in phase() blocks.
+    """
+    def __init__(self) -> None:
+        self._current: contextlib.AbstractContextManager | None = None
+
+    def start(self, name: str) -> None:
+        """End the current section (if any) and start the next"""
+        self.end()
+        self._current = phase(name)
+        self._current.__enter__()
+
+    def end(self) -> None:
+        """End the current section (if any)"""
+        if self._current is not None:
+            self._current.__exit__(None, None, None)
+            self._current = None